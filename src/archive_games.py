@@ -0,0 +1,70 @@
+# src/archive_games.py
+# Verschiebt die Aktionen abgeschlossener Spiele aus der Datenbank in das Spaltenarchiv
+# (eine Generation von .npy-Dateien pro Saison, siehe modules/data/action_archive.py).
+#
+# Beispiele (aus dem src-Ordner):
+#   python archive_games.py --list
+#   python archive_games.py --days 60 --dry-run
+#   python archive_games.py --days 60 --vacuum
+#   python archive_games.py --game 12 --game 13
+#   python archive_games.py --restore 12
+
+import argparse
+import json
+import os
+import sys
+from modules.config import ARCHIVE_AFTER_DAYS, DB_PATH, JOURNAL_PATH
+from modules.data.db_manager import DBManager
+from modules.data.game_journal import GameJournal, replay_journal
+
+
+def _active_game_id(db_path: str):
+    # Das laufende Spiel (offenes Journal der Haupt-Datenbank) wird nie archiviert
+    if os.path.abspath(db_path) != os.path.abspath(DB_PATH) or not os.path.exists(JOURNAL_PATH):
+        return None
+    state = replay_journal(GameJournal(JOURNAL_PATH).read())
+    return state['game_id'] if state else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archiviert Aktionen alter Spiele in spaltenweise Saison-Dateien.")
+    parser.add_argument("--db", default=DB_PATH, help="Pfad zur Datenbank")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="Spiele archivieren, die älter sind (Tage)")
+    parser.add_argument("--game", type=int, action="append", help="Nur dieses Spiel archivieren (mehrfach angebbar)")
+    parser.add_argument("--restore", type=int, action="append", help="Spiel aus dem Archiv zurückholen (mehrfach angebbar)")
+    parser.add_argument("--list", action="store_true", help="Archivierte Saisons anzeigen")
+    parser.add_argument("--dry-run", action="store_true", help="Nur anzeigen, was archiviert würde")
+    parser.add_argument("--vacuum", action="store_true", help="Datenbankdatei danach per VACUUM verkleinern")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Fehler: Datenbank '{args.db}' nicht gefunden.")
+        return 2
+    db_manager = DBManager(db_path=args.db)
+    db_manager.setup_database() # Legt die Manifest-Tabellen in älteren Datenbanken an
+    archive = db_manager.get_action_archive()
+
+    try:
+        if args.list:
+            result = {season: {'generation': generation, 'rows': rows}
+                      for season, generation, rows in archive.seasons()}
+        elif args.restore:
+            result = {'restored_actions': archive.restore_games(args.restore)}
+        else:
+            active = _active_game_id(args.db)
+            result = archive.archive_games(older_than_days=args.days, game_ids=args.game,
+                                           exclude_game_ids=[active] if active else [], dry_run=args.dry_run)
+            if args.vacuum and not args.dry_run and result['actions']:
+                db_manager.execute_query("VACUUM")
+    except (RuntimeError, OSError, ValueError) as e:
+        print(f"Fehler bei der Archivierung: {e}")
+        return 1
+    finally:
+        db_manager.close()
+
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
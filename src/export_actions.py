@@ -0,0 +1,65 @@
+# src/export_actions.py
+# Exportiert Aktionen (mit Spiel, Satz, Teams und Spielern) blockweise nach Parquet, Arrow IPC oder CSV.
+#
+# Beispiele (aus dem src-Ordner):
+#   python export_actions.py --out ../resources/exports/saison.parquet
+#   python export_actions.py --out spiel_12.csv --game 12
+#   python export_actions.py --out gegner.arrow --team "TSV Musterstadt" --from 2025-09-01 --to 2026-04-30
+
+import argparse
+import datetime
+import json
+import os
+import sys
+from modules.config import DB_PATH, EXPORT_CHUNK_ROWS, EXPORT_FOLDER
+from modules.data.action_export import FORMATS, export_actions
+from modules.data.db_manager import DBManager
+
+
+def _date(value: str) -> str:
+    try:
+        return datetime.date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültiges Datum '{value}' (erwartet YYYY-MM-DD).")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamt Aktionen nach Parquet, Arrow IPC oder CSV.")
+    parser.add_argument("--db", default=DB_PATH, help="Pfad zur Datenbank")
+    parser.add_argument("--out", default=os.path.join(EXPORT_FOLDER, "actions.parquet"),
+                        help="Zieldatei; das Format folgt aus der Endung (.parquet, .arrow, .csv)")
+    parser.add_argument("--format", choices=list(FORMATS), help="Format erzwingen statt aus der Endung ableiten")
+    parser.add_argument("--game", type=int, action="append", help="Nur dieses Spiel (mehrfach angebbar)")
+    parser.add_argument("--team", help="Nur Spiele dieses Teams (ID oder Name, Heim oder Gast)")
+    parser.add_argument("--from", dest="date_from", type=_date, help="Spiele ab diesem Datum (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=_date, help="Spiele bis einschließlich diesem Datum")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_ROWS, help="Zeilen pro Block")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Fehler: Datenbank '{args.db}' nicht gefunden.")
+        return 2
+    db_manager = DBManager(db_path=args.db, profile="analytics")
+
+    team_id = None
+    if args.team:
+        team_id = int(args.team) if args.team.isdigit() else db_manager.find_team_id(args.team)
+        if team_id is None:
+            print(f"Fehler: Team '{args.team}' nicht gefunden.")
+            return 2
+
+    try:
+        summary = export_actions(db_manager, args.out, fmt=args.format, game_ids=args.game, team_id=team_id,
+                                 date_from=args.date_from, date_to=args.date_to, chunk_size=args.chunk_size)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Fehler beim Export: {e}")
+        return 1
+    finally:
+        db_manager.close()
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+# src/generate_season.py
+# Erzeugt eine synthetische Saison für Last- und Benchmark-Tests.
+#
+# Beispiel (aus dem src-Ordner):
+#   python generate_season.py --db ../resources/db/bench.db --games 1000 --seed 42
+
+import argparse
+import json
+import os
+import sys
+from modules.data.db_manager import DBManager
+from modules.logic.season_generator import SeasonGenerator
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generiert Teams, Spieler und komplette Spiele (seeded).")
+    parser.add_argument("--db", required=True, help="Pfad zur Ziel-Datenbank (wird angelegt, falls nicht vorhanden)")
+    parser.add_argument("--games", type=int, default=100, help="Anzahl der Spiele")
+    parser.add_argument("--seed", type=int, default=42, help="Zufalls-Seed für reproduzierbare Daten")
+    parser.add_argument("--mode", choices=["bulk", "controller"], default="bulk",
+                        help="bulk: executemany-Inserts, controller: über den GameController")
+    parser.add_argument("--opponents", type=int, default=11, help="Anzahl der Gegner-Teams in der Liga")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+    db_manager = DBManager(db_path=args.db)
+    db_manager.setup_database()
+
+    generator = SeasonGenerator(db_manager, seed=args.seed)
+    generator.create_own_team()
+    generator.create_league(args.opponents)
+    summary = generator.generate_games(args.games, mode=args.mode)
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
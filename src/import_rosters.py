@@ -0,0 +1,43 @@
+# src/import_rosters.py
+# Importiert Kader (Teams + Spieler) aus CSV- oder JSON-Dateien in einer Transaktion.
+#
+# Beispiele (aus dem src-Ordner):
+#   python import_rosters.py --db ../resources/db/stats.db liga.csv
+#   python import_rosters.py --db ../resources/db/stats.db teams/*.json --dry-run
+
+import argparse
+import json
+import os
+import sys
+from modules.config import DB_PATH
+from modules.data.db_manager import DBManager
+from modules.data.roster_import import read_roster_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importiert Kader mehrerer Teams aus CSV/JSON.")
+    parser.add_argument("files", nargs="+", help="CSV- oder JSON-Dateien (Spalten: team, name, jersey_number, position)")
+    parser.add_argument("--db", default=DB_PATH, help="Pfad zur Datenbank")
+    parser.add_argument("--dry-run", action="store_true", help="Nur prüfen, nichts speichern")
+    args = parser.parse_args()
+
+    try:
+        rows = read_roster_files(args.files)
+    except (OSError, ValueError) as e:
+        print(f"Fehler beim Lesen: {e}")
+        return 2
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+    db_manager = DBManager(db_path=args.db)
+    db_manager.setup_database()
+    summary = db_manager.import_rosters(rows, dry_run=args.dry_run)
+    db_manager.close()
+
+    for error in summary["errors"]:
+        print(f"  - {error}")
+    print(json.dumps({k: v for k, v in summary.items() if k != "errors"}, indent=2))
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,9 @@ import customtkinter as ctk # Importiere CustomTkinter
 from modules.data.db_manager import DBManager
 from modules.gui.main_window import MainWindow 
 from modules.logic.game_controller import GameController 
-from modules.config import DB_PATH
+from modules.config import DB_PATH, TRACE_EXPORT_FOLDER, ANALYTICS_DB_PROFILE, JOURNAL_PATH, STATS_API_ENABLED
+from modules.data.game_journal import GameJournal
+from modules.tracing import tracer
 
 
 ctk.set_appearance_mode("System")  # Modes: "System" (default), "Dark", "Light"
@@ -28,8 +30,14 @@ class VolleyballApp(ctk.CTk):
         self.initialize_database()
         
         # HINZUGEFÜGT: Game Controller und Stats Calculator
-        self.game_controller = GameController(db_manager=self.db_manager) 
-        self.stats_calculator = StatisticCalculator(db_manager=self.db_manager) # Für später
+        self.game_controller = GameController(db_manager=self.db_manager, journal=GameJournal(JOURNAL_PATH)) 
+        # Nach einem Absturz das offene Spiel (inkl. Aufstellung) aus dem Journal fortsetzen
+        self.game_controller.resume_from_journal()
+        # Eigene Lese-Verbindung mit Analyse-Profil, damit Auswertungen die Erfassung nicht ausbremsen
+        self.stats_calculator = StatisticCalculator(
+            db_manager=DBManager(db_path=DB_PATH, query_stats=self.db_manager.query_stats, profile=ANALYTICS_DB_PROFILE)
+        )
+        self.stats_server = self.start_stats_api() if STATS_API_ENABLED else None
 
         
         # Konfiguriere das Grid für das Hauptfenster
@@ -48,6 +56,18 @@ class VolleyballApp(ctk.CTk):
         os.makedirs(db_dir, exist_ok=True)
         self.db_manager.setup_database()
         
+    def start_stats_api(self):
+        """Stats-API für Trainer-Geräte im Hintergrund (eigener DBManager, eigene Worker-Threads)."""
+        from modules.logic.stats_api import StatsApiServer
+        try:
+            server = StatsApiServer(DBManager(db_path=DB_PATH, query_stats=self.db_manager.query_stats,
+                                              profile=ANALYTICS_DB_PROFILE)).start()
+        except OSError as e:
+            print(f"Stats-API konnte nicht gestartet werden: {e}")
+            return None
+        print(f"Stats-API läuft unter {server.url}/api/games")
+        return server
+
     # Eine zentrale Methode, um auf den DB-Manager von überall zuzugreifen
     def get_db_manager(self):
         return self.db_manager
@@ -63,11 +83,26 @@ class VolleyballApp(ctk.CTk):
     def get_main_window(self):
         return self.main_window
 
+def export_trace():
+    """Schreibt die gesammelten Latenz-Daten (JSON + Chrome-Trace) und gibt die Zusammenfassung aus."""
+    import datetime
+    os.makedirs(TRACE_EXPORT_FOLDER, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    tracer.export_json(os.path.join(TRACE_EXPORT_FOLDER, f"latency_{stamp}.json"))
+    tracer.export_chrome_trace(os.path.join(TRACE_EXPORT_FOLDER, f"latency_{stamp}.trace.json"))
+    for name, stats in tracer.summary().items():
+        print(f"{name}: n={stats['count']} p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms")
+    print(f"Latenz-Traces gespeichert in: {TRACE_EXPORT_FOLDER}")
+
 def main():
     """Der Hauptprozess, der die App startet."""
     try:
         app = VolleyballApp()
         app.mainloop()
+        if app.stats_server:
+            app.stats_server.stop()
+        if tracer.enabled:
+            export_trace()
     except Exception as e:
         print(f"Ein kritischer Fehler ist aufgetreten: {e}")
         # Hier könnte man eine GUI-Fehlermeldung anzeigen
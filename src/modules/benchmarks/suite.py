@@ -0,0 +1,857 @@
+# src/modules/benchmarks/suite.py
+
+import contextlib
+import datetime
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from ..config import (BENCHMARK_REGRESSION_THRESHOLD, BENCHMARK_MIN_DELTA_MS, DB_PRAGMA_PROFILES, DB_PROFILE,
+                      ANALYTICS_DB_PROFILE)
+from ..data.db_manager import DBManager
+from ..data.game_journal import GameJournal
+from ..data.query_stats import QueryStats
+from ..logic.game_controller import GameController
+from ..logic.season_generator import SeasonGenerator
+
+# Wurzel des src-Ordners (für den Import-Benchmark in einem frischen Interpreter)
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """Median, p95, Minimum und Mittelwert einer Messreihe (ms)."""
+    ordered = sorted(samples_ms)
+    p95_index = max(0, min(len(ordered) - 1, int(round(0.95 * len(ordered))) - 1))
+    return {
+        "samples": len(ordered),
+        "median_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(ordered[p95_index], 4),
+        "min_ms": round(ordered[0], 4),
+        "mean_ms": round(statistics.fmean(ordered), 4),
+    }
+
+
+def _time_calls(func: Callable[[], Any], repeat: int) -> List[float]:
+    """Führt func repeat-mal aus und gibt die Einzelzeiten in ms zurück."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+class _AppStub:
+    """Minimaler app_controller für Views, die nur den DBManager brauchen."""
+    def __init__(self, db_manager: DBManager):
+        self.db_manager = db_manager
+
+    def get_db_manager(self):
+        return self.db_manager
+
+
+class BenchmarkSuite:
+    """
+    Offline-Benchmarks auf einer generierten Saison (siehe SeasonGenerator).
+    Jeder Benchmark liefert Median/p95/Min/Mittelwert in ms; Ergebnisse werden
+    als JSON geschrieben und können mit compare_results() gegen eine Baseline
+    geprüft werden.
+    """
+
+    def __init__(self, games: int = 100, seed: int = 42, repeat: int = 20, work_dir: Optional[str] = None):
+        self.games = games
+        self.seed = seed
+        self.repeat = repeat
+        self._own_work_dir = work_dir is None
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix="volley_bench_")
+        self.db_path = os.path.join(self.work_dir, "bench.db")
+        self.db_summary: Dict[str, Any] = {}
+        self.generator: Optional[SeasonGenerator] = None
+
+        # Reihenfolge = Ausgabe-Reihenfolge
+        self.benchmarks: Dict[str, Callable[[], Dict[str, Any]]] = {
+            "app_import": self.bench_app_import,
+            "process_action": self.bench_process_action,
+            "process_action_under_analysis": lambda: self.bench_process_action(concurrent_analysis=True),
+            "process_action[journal]": lambda: self.bench_process_action(journal=True),
+            "journal_resume": self.bench_journal_resume,
+            "get_latest_actions": self.bench_get_latest_actions,
+            "load_game_context": self.bench_load_game_context,
+            "live_player_stats": self.bench_live_player_stats,
+            "calculate_player_general_stats": self.bench_player_general_stats,
+            "calculate_setter_attacker_efficiency": self.bench_setter_attacker_efficiency,
+            "calculate_setting_distribution": self.bench_setting_distribution,
+            "export_to_pdf": self.bench_export_to_pdf,
+            "admin_view_lists": self.bench_admin_view_lists,
+            "db_fixture_in_memory": self.bench_db_fixture_in_memory,
+            "roster_import": self.bench_roster_import,
+            "team_assignment": self.bench_team_assignment,
+            "export_actions[csv]": lambda: self.bench_export_actions("csv"),
+            "export_actions[parquet]": lambda: self.bench_export_actions("parquet"),
+            "player_search": self.bench_player_search,
+            "season_analysis[streaming]": self.bench_season_analysis,
+            "season_analysis[archive]": self.bench_season_archive,
+            "game_package": self.bench_game_package,
+            "delta_sync[local]": lambda: self.bench_delta_sync("local"),
+            "delta_sync[http]": lambda: self.bench_delta_sync("http"),
+            "commit_latency[sync]": lambda: self.bench_commit_latency(DB_PROFILE, sync=True),
+            "process_action_under_api_polling": self.bench_process_action_api_polling,
+        }
+        # Vergleich der PRAGMA-Profile: Commit-Latenz (nur schreibbare Profile) und Analyse-Durchsatz
+        for profile, pragmas in DB_PRAGMA_PROFILES.items():
+            if pragmas.get("query_only") != "ON":
+                self.benchmarks[f"commit_latency[{profile}]"] = lambda p=profile: self.bench_commit_latency(p)
+            self.benchmarks[f"analysis[{profile}]"] = lambda p=profile: self.bench_analysis(p)
+
+    # --- ABLAUF ---
+
+    def setup(self):
+        """Erzeugt die Benchmark-Datenbank (einmal pro Lauf)."""
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+        with self._quiet():
+            db_manager = DBManager(db_path=self.db_path, query_stats=QueryStats(enabled=False))
+            db_manager.setup_database()
+            self.generator = SeasonGenerator(db_manager, seed=self.seed)
+            self.generator.create_own_team()
+            self.generator.create_league()
+            self.db_summary = self.generator.generate_games(self.games, mode="bulk")
+
+        # Referenzspiel für die Statistik-Benchmarks: das Spiel mit den meisten Aktionen
+        self.game_id = db_manager.execute_query_fetch_one(
+            """SELECT s.game_id FROM actions a JOIN sets s ON a.set_id = s.set_id
+               GROUP BY s.game_id ORDER BY COUNT(*) DESC LIMIT 1"""
+        )[0]
+        db_manager.close() # Schließt den WAL ab, damit Kopien vollständig sind
+
+    def run(self, only: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Führt alle (oder die ausgewählten) Benchmarks aus und gibt das Ergebnis-Dokument zurück."""
+        unknown = set(only or []) - set(self.benchmarks)
+        if unknown:
+            raise ValueError(f"Unbekannte Benchmarks: {', '.join(sorted(unknown))}")
+
+        self.setup()
+        results: Dict[str, Any] = {}
+        try:
+            for name, bench in self.benchmarks.items():
+                if only and name not in only:
+                    continue
+                print(f"Benchmark: {name} ...")
+                results[name] = bench()
+        finally:
+            self.cleanup()
+
+        return {
+            "meta": {
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "games": self.games,
+                "seed": self.seed,
+                "repeat": self.repeat,
+                "dataset": self.db_summary,
+            },
+            "benchmarks": results,
+        }
+
+    def cleanup(self):
+        if self._own_work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _quiet():
+        """Unterdrückt die print-Ausgaben der Anwendung während der Messung."""
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+
+    def _db_manager(self, db_path: Optional[str] = None, **kwargs) -> DBManager:
+        # Ohne Query-Statistik, damit die Instrumentierung die Messung nicht verfälscht
+        return DBManager(db_path=db_path or self.db_path, query_stats=QueryStats(enabled=False), **kwargs)
+
+    def _copy_db(self, name: str) -> str:
+        """Kopie der Benchmark-DB für schreibende Benchmarks."""
+        path = os.path.join(self.work_dir, name)
+        # Backup-API statt Dateikopie: berücksichtigt auch Inhalte, die noch im WAL liegen
+        source, target = sqlite3.connect(self.db_path), sqlite3.connect(path)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+            target.close()
+        return path
+
+    # --- BENCHMARKS ---
+
+    def bench_app_import(self) -> Dict[str, Any]:
+        """Importzeit von main.py (inkl. GUI-, pandas- und reportlab-Imports) in einem frischen Interpreter."""
+        code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+        samples = []
+        for _ in range(max(3, self.repeat // 4)):
+            output = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True,
+                                    text=True, check=True).stdout
+            samples.append(float(output.strip().splitlines()[-1]) * 1000)
+        return summarize(samples)
+
+    def bench_process_action(self, concurrent_analysis: bool = False, journal: bool = False) -> Dict[str, Any]:
+        """
+        Latenz pro process_action (inkl. Insert + Score-Update) und Durchsatz in Aktionen/s.
+        Mit concurrent_analysis=True läuft parallel eine Dauer-Auswertung in einem zweiten
+        Thread (Trainer in der AnalysisView, während der Scout erfasst).
+        Mit journal=True schreibt der Controller zusätzlich das Journal (mit fdatasync).
+        """
+        action_count = max(500, self.repeat * 50) * (10 if concurrent_analysis else 1)
+        db_path = self._copy_db("process_action_analysis.db" if concurrent_analysis else "process_action.db")
+        db_manager = self._db_manager(db_path)
+        lineup, events = self.generator.generate_events(action_count)
+
+        stop, running = threading.Event(), threading.Event()
+        analysis_runs = [0]
+
+        def analyse_continuously():
+            calculator = self._stats_calculator(db_path=db_path, profile=ANALYTICS_DB_PROFILE)
+            while not stop.is_set():
+                calculator.calculate_player_general_stats(self.game_id)
+                analysis_runs[0] += 1
+                running.set()
+
+        samples = []
+        with self._quiet():
+            worker = threading.Thread(target=analyse_continuously, daemon=True) if concurrent_analysis else None
+            if worker:
+                worker.start()
+                running.wait() # Messung erst, wenn die Auswertung tatsächlich läuft
+            game_journal = GameJournal(os.path.join(self.work_dir, "process_action.journal")) if journal else None
+            controller = GameController(db_manager, journal=game_journal)
+            game_id = controller.start_new_game(own_team_id=self.generator.own_team_id, opponent_name="Benchmark Gegner")
+            controller.add_players_to_active_game(lineup)
+            for action_type, executor_id, result_type, target_id, detail in events:
+                started = time.perf_counter()
+                _, is_set_over = controller.process_action(action_type=action_type, executor_id=executor_id,
+                                                           result_type=result_type, target_id=target_id,
+                                                           point_detail_type=detail)
+                samples.append((time.perf_counter() - started) * 1000)
+                if is_set_over:
+                    controller.start_new_set(game_id)
+            stop.set()
+            if worker:
+                worker.join()
+
+        result = summarize(samples)
+        result["actions_per_sec"] = round(len(samples) / (sum(samples) / 1000), 1)
+        if concurrent_analysis:
+            result["analysis_runs"] = analysis_runs[0]
+        return result
+
+    def bench_process_action_api_polling(self, clients: int = 32, interval: float = 0.1,
+                                         tap_interval: float = 0.005) -> Dict[str, Any]:
+        """
+        Latenz pro process_action, während clients Geräte die Stats-API des laufenden Spiels im
+        interval-Takt abfragen (Spielerstatistik und Zuspieler/Angreifer, mit If-None-Match).
+        Erfasst wird alle tap_interval Sekunden, damit Erfassung und Abfragen sich überlappen.
+        requests/not_modified/request_p95_ms beschreiben die API-Seite.
+        """
+        import urllib.error
+        import urllib.request
+        from ..logic.stats_api import StatsApiServer
+        db_path = self._copy_db("process_action_api.db")
+        db_manager = self._db_manager(db_path)
+        lineup, events = self.generator.generate_events(max(500, self.repeat * 50))
+        stop = threading.Event()
+        request_ms, statuses = [], []
+
+        def poll(url: str):
+            etags = {}
+            while not stop.is_set():
+                for endpoint in ("players", "setter-attacker"):
+                    headers = {"Accept-Encoding": "gzip"}
+                    if endpoint in etags:
+                        headers["If-None-Match"] = etags[endpoint]
+                    started = time.perf_counter()
+                    try:
+                        with urllib.request.urlopen(urllib.request.Request(f"{url}/{endpoint}", headers=headers)) as response:
+                            response.read()
+                            etags[endpoint], status = response.headers["ETag"], response.status
+                    except urllib.error.HTTPError as e:
+                        status = e.code
+                    request_ms.append((time.perf_counter() - started) * 1000)
+                    statuses.append(status)
+                stop.wait(interval)
+
+        samples = []
+        with self._quiet():
+            controller = GameController(db_manager)
+            game_id = controller.start_new_game(own_team_id=self.generator.own_team_id, opponent_name="Benchmark Gegner")
+            controller.add_players_to_active_game(lineup)
+            server = StatsApiServer(self._db_manager(db_path, profile=ANALYTICS_DB_PROFILE), host="127.0.0.1", port=0).start()
+            workers = [threading.Thread(target=poll, args=(f"{server.url}/api/games/{game_id}",), daemon=True)
+                       for _ in range(clients)]
+            for worker in workers:
+                worker.start()
+            while len(statuses) < clients: # Messung erst, wenn alle Geräte abfragen
+                time.sleep(0.01)
+            try:
+                for action_type, executor_id, result_type, target_id, detail in events:
+                    time.sleep(tap_interval)
+                    started = time.perf_counter()
+                    _, is_set_over = controller.process_action(action_type=action_type, executor_id=executor_id,
+                                                               result_type=result_type, target_id=target_id,
+                                                               point_detail_type=detail)
+                    samples.append((time.perf_counter() - started) * 1000)
+                    if is_set_over:
+                        controller.start_new_set(game_id)
+            finally:
+                stop.set()
+                for worker in workers:
+                    worker.join()
+                server.stop()
+
+        result = summarize(samples)
+        result["actions_per_sec"] = round(len(samples) / (sum(samples) / 1000), 1)
+        result["clients"] = clients
+        result["requests"] = len(statuses)
+        result["not_modified"] = statuses.count(304)
+        result["request_p95_ms"] = summarize(request_ms)["p95_ms"] if request_ms else None
+        result["recomputes"] = server.service.misses
+        return result
+
+    def bench_journal_resume(self) -> Dict[str, Any]:
+        """
+        Wiederanlauf nach einem Absturz im fünften Satz: Snapshot + Journal-Ereignisse einlesen
+        und den Controller-Zustand herstellen. Prüft das Ergebnis gegen load_game_context.
+        """
+        db_manager = self._db_manager(self._copy_db("journal_resume.db"))
+        journal_path = os.path.join(self.work_dir, "resume.journal")
+        lineup, events = self.generator.generate_events(1200)
+        with self._quiet():
+            controller = GameController(db_manager, journal=GameJournal(journal_path, fsync=False))
+            game_id = controller.start_new_game(own_team_id=self.generator.own_team_id, opponent_name="Benchmark Gegner")
+            controller.add_players_to_active_game(lineup)
+            for action_type, executor_id, result_type, target_id, detail in events:
+                _, is_set_over = controller.process_action(executor_id, action_type, result_type, target_id, detail)
+                if is_set_over:
+                    controller.start_new_set(game_id)
+        with open(journal_path, "rb") as f:
+            crashed_journal = f.read()
+
+        def resume():
+            with open(journal_path, "wb") as f:
+                f.write(crashed_journal)
+            resumed = GameController(db_manager, journal=GameJournal(journal_path))
+            started = time.perf_counter()
+            resumed.resume_from_journal()
+            return (time.perf_counter() - started) * 1000, resumed
+
+        samples = []
+        with self._quiet():
+            for _ in range(self.repeat):
+                elapsed, resumed = resume()
+                samples.append(elapsed)
+            reference = GameController(db_manager)
+            reference.load_game_context(game_id)
+        if (resumed.get_latest_actions(limit=2000) != reference.get_latest_actions(limit=2000)
+                or resumed.get_live_player_stats() != reference.get_live_player_stats()
+                or resumed.get_current_set() != reference.get_current_set()):
+            raise AssertionError("Wiederanlauf aus dem Journal weicht von load_game_context ab.")
+
+        result = summarize(samples)
+        result["journal_bytes"] = len(crashed_journal)
+        result["actions"] = len(resumed._action_log)
+        return result
+
+    def bench_load_game_context(self) -> Dict[str, Any]:
+        """Spiel in der InputView öffnen: load_game_context + Spieler/Sätze/Historie für load_game_data."""
+        controller = GameController(self._db_manager())
+
+        def open_game():
+            controller.load_game_context(self.game_id)
+            controller.get_all_players()
+            controller.get_all_sets_for_current_game()
+            controller.get_latest_actions(limit=50)
+
+        with self._quiet():
+            return summarize(_time_calls(open_game, self.repeat))
+
+    def bench_get_latest_actions(self) -> Dict[str, Any]:
+        """Latenz von get_latest_actions(50) für das größte Spiel (Aktionsliste der InputView)."""
+        with self._quiet():
+            controller = GameController(self._db_manager())
+            controller.load_game_context(self.game_id)
+        result = summarize(_time_calls(lambda: controller.get_latest_actions(limit=50), self.repeat * 5))
+        # Speicherbedarf des Aktions-Logs (Struct-of-Arrays) pro Aktion
+        log = controller._action_log
+        result["action_log_bytes_per_action"] = round(log.memory_bytes() / max(len(log), 1), 1)
+        return result
+
+    def bench_live_player_stats(self) -> Dict[str, Any]:
+        """Live-Statistik (Zähler im GameController) für das größte Spiel – Gegenstück zu calculate_player_general_stats."""
+        with self._quiet():
+            controller = GameController(self._db_manager())
+            controller.load_game_context(self.game_id)
+        return summarize(_time_calls(controller.get_live_player_stats, self.repeat * 5))
+
+    def _stats_calculator(self, **kwargs):
+        # Import erst hier: pandas/reportlab sollen nicht in die Setup-Zeit fallen
+        from ..logic.statistic_calculator import StatisticCalculator
+        return StatisticCalculator(self._db_manager(**kwargs))
+
+    def bench_player_general_stats(self) -> Dict[str, Any]:
+        calculator = self._stats_calculator()
+        return summarize(_time_calls(lambda: calculator.calculate_player_general_stats(self.game_id), self.repeat))
+
+    def bench_setter_attacker_efficiency(self) -> Dict[str, Any]:
+        calculator = self._stats_calculator()
+        return summarize(_time_calls(lambda: calculator.calculate_setter_attacker_efficiency(self.game_id), self.repeat))
+
+    def bench_setting_distribution(self) -> Dict[str, Any]:
+        calculator = self._stats_calculator()
+        return summarize(_time_calls(lambda: calculator.calculate_setting_distribution(self.game_id), self.repeat))
+
+    def bench_export_to_pdf(self) -> Dict[str, Any]:
+        calculator = self._stats_calculator()
+        pdf_path = os.path.join(self.work_dir, "bench.pdf")
+        with self._quiet():
+            samples = _time_calls(lambda: calculator.export_to_pdf(self.game_id, pdf_path), max(3, self.repeat // 4))
+        return summarize(samples)
+
+    def bench_admin_view_lists(self, extra_teams: int = 300, players_per_team: int = 12) -> Dict[str, Any]:
+        """
+        Neuaufbau der Spieler- und Teamliste der AdminView (load_team_list + load_player_list)
+        auf einer Kopie mit zusätzlich extra_teams Teams (jeder Gegner ist eine Team-Zeile).
+        Ohne Display werden nur die Datenbank-Aufrufe der beiden Loader gemessen (mode='data').
+        """
+        db_manager = self._db_manager(self._copy_db("admin_view.db"))
+        with self._quiet():
+            for t in range(extra_teams):
+                team_id = db_manager.insert_team(f"Vereinsteam {t + 1}")
+                db_manager.execute_many("INSERT INTO players (name, jersey_number, team_id) VALUES (?, ?, ?)",
+                                        [(f"Spieler {t + 1}-{p + 1}", p + 1, team_id) for p in range(players_per_team)])
+        try:
+            import customtkinter as ctk
+            from ..gui.admin_view import AdminView
+            root = ctk.CTk()
+            root.withdraw()
+        except Exception:
+            root = None
+
+        if root is None:
+            def load_lists():
+                db_manager.get_all_teams()
+                db_manager.get_team_rosters()
+                db_manager.get_all_players_details()
+                db_manager.get_all_players_details()
+                db_manager.get_all_teams()
+            result = summarize(_time_calls(load_lists, self.repeat))
+            result["mode"] = "data"
+        else:
+            try:
+                with self._quiet():
+                    view = AdminView(root, _AppStub(db_manager))
+
+                    def load_lists():
+                        view.load_team_list()
+                        view.load_player_list()
+                        root.update_idletasks()
+                    samples = _time_calls(load_lists, max(3, self.repeat // 4))
+            finally:
+                root.destroy()
+            result = summarize(samples)
+            result["mode"] = "gui"
+        result["teams"] = len(db_manager.get_all_teams())
+        result["players"] = len(db_manager.get_all_players_details())
+        return result
+
+    def bench_db_fixture_in_memory(self) -> Dict[str, Any]:
+        """Anlegen + Freigeben einer isolierten In-Memory-DB mit Schema (Test-/Benchmark-Fixture)."""
+        def create_and_dispose():
+            DBManager.in_memory(query_stats=QueryStats(enabled=False)).dispose()
+        with self._quiet():
+            create_and_dispose() # Schema-Vorlage aufbauen
+            samples = _time_calls(create_and_dispose, self.repeat * 50)
+        result = summarize(samples)
+        result["databases_per_sec"] = round(len(samples) / (sum(samples) / 1000), 1)
+        return result
+
+    def bench_roster_import(self, teams: int = 20, players: int = 14) -> Dict[str, Any]:
+        """Liga-Setup per Kader-Import (CSV lesen + import_rosters) in eine frische In-Memory-DB."""
+        import csv
+        from ..data.roster_import import read_roster_file
+        path = os.path.join(self.work_dir, "roster_import.csv")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(["team", "name", "jersey_number", "position"])
+            for t in range(teams):
+                for p in range(players):
+                    writer.writerow([f"Liga Team {t + 1}", f"Spieler {t + 1}-{p + 1}", p + 1, "Außenangriff"])
+
+        summaries = []
+        def import_league():
+            db_manager = DBManager.in_memory(query_stats=QueryStats(enabled=False))
+            summaries.append(db_manager.import_rosters(read_roster_file(path)))
+            # Zweiter Import derselben Datei: alles Updates, nichts doppelt
+            summaries.append(db_manager.import_rosters(read_roster_file(path)))
+            db_manager.dispose()
+
+        with self._quiet():
+            samples = _time_calls(import_league, max(3, self.repeat // 2))
+        first, second = summaries[0], summaries[1]
+        assert not first["errors"] and first["inserted"] == teams * players, first
+        assert second["inserted"] == 0 and second["updated"] == teams * players, second
+        result = summarize(samples)
+        result["players"] = teams * players
+        return result
+
+    def bench_team_assignment(self, players: int = 200) -> Dict[str, Any]:
+        """
+        Zuweisung eines 200-Spieler-Vereins an ein anderes Team (AdminView "Zuweisung speichern"):
+        apply_team_assignment in einer Transaktion; legacy_median_ms = ein update_player_team pro Spieler.
+        """
+        db_manager = self._db_manager(self._copy_db("team_assignment.db"))
+        with self._quiet():
+            club_a, club_b = db_manager.insert_team("Verein A"), db_manager.insert_team("Verein B")
+            db_manager.execute_many("INSERT INTO players (name, jersey_number, team_id) VALUES (?, ?, ?)",
+                                    [(f"Vereinsspieler {i}", i, club_a) for i in range(players)])
+        player_ids = [row[0] for row in db_manager.get_team_players(club_a)]
+        targets = [club_b, club_a]
+
+        def reassign():
+            target = targets[len(samples_done) % 2]
+            samples_done.append(db_manager.apply_team_assignment(target, player_ids, []))
+
+        def reassign_legacy():
+            target = targets[len(samples_done) % 2]
+            for player_id in player_ids:
+                db_manager.update_player_team(player_id, target)
+            samples_done.append(len(player_ids))
+
+        samples_done: List[Optional[int]] = []
+        result = summarize(_time_calls(reassign, max(4, self.repeat)))
+        assert all(changed == players for changed in samples_done), samples_done
+        samples_done = []
+        result["legacy_median_ms"] = summarize(_time_calls(reassign_legacy, max(2, self.repeat // 4)))["median_ms"]
+        result["players"] = players
+        return result
+
+    def bench_player_search(self, extra_teams: int = 300, players_per_team: int = 12) -> Dict[str, Any]:
+        """
+        Suche im Suchindex (Präfix, Akzente, Tippfehler, Trikotnummer) über einen großen Verein
+        und die Eindeutigkeitsprüfung pro Team. legacy_uniqueness_ms = alte globale SQL-Prüfung.
+        """
+        db_manager = self._db_manager(self._copy_db("player_search.db"))
+        with self._quiet():
+            for t in range(extra_teams):
+                team_id = db_manager.insert_team(f"Vereinsteam {t + 1}")
+                db_manager.execute_many("INSERT INTO players (name, jersey_number, team_id) VALUES (?, ?, ?)",
+                                        [(f"Spieler{t + 1} Müller{p + 1}", p + 1, team_id) for p in range(players_per_team)])
+        started = time.perf_counter()
+        index = db_manager.get_search_index()
+        build_ms = (time.perf_counter() - started) * 1000
+        queries = ["spieler12", "mull", "muller7 spieler3", "#7", "mueller", "vereinsteam 2"]
+        assert db_manager.search_players("Spieler12 Müller3"), "Suche findet exakten Namen nicht"
+
+        def search():
+            for query in queries:
+                db_manager.search_players(query, limit=50)
+        result = summarize(_time_calls(search, self.repeat * 5))
+        result["queries"] = len(queries)
+        result["index_build_ms"] = round(build_ms, 2)
+        result["players"] = len(index.players)
+
+        team_id = next(iter(index.teams))
+        result["uniqueness_ms"] = summarize(_time_calls(
+            lambda: db_manager.check_player_uniqueness("Neuer Spieler", 99, team_id=team_id), self.repeat * 5))["median_ms"]
+        legacy = "SELECT COUNT(*) FROM players WHERE (name = ? OR jersey_number = ?) AND player_id != ?"
+        result["legacy_uniqueness_ms"] = summarize(_time_calls(
+            lambda: db_manager.execute_query_fetch_one(legacy, ("Neuer Spieler", 99, -1)), self.repeat * 5))["median_ms"]
+        return result
+
+    def bench_export_actions(self, fmt: str, chunk_size: int = 5000) -> Dict[str, Any]:
+        """
+        Streaming-Export der ganzen Saison (export_actions) in kleinen Blöcken.
+        peak_mb = höchster Python-Speicher während eines Exports (tracemalloc), unabhängig von der Saisongröße.
+        """
+        import importlib.util
+        import tracemalloc
+        from ..data.action_export import export_actions
+        if fmt != "csv" and importlib.util.find_spec("pyarrow") is None:
+            return {"skipped": "pyarrow nicht installiert"}
+        db_manager = self._db_manager(profile=ANALYTICS_DB_PROFILE)
+        path = os.path.join(self.work_dir, f"export.{fmt}")
+        summaries = []
+        samples = _time_calls(lambda: summaries.append(export_actions(db_manager, path, chunk_size=chunk_size)),
+                              max(3, self.repeat // 4))
+        tracemalloc.start()
+        try:
+            export_actions(db_manager, path, chunk_size=chunk_size)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        db_manager.close()
+        result = summarize(samples)
+        result["rows"] = summaries[-1]["rows"]
+        result["rows_per_sec"] = round(result["rows"] / (result["median_ms"] / 1000), 1)
+        result["file_mb"] = round(os.path.getsize(path) / 1e6, 2)
+        result["peak_mb"] = round(peak / 1e6, 2)
+        return result
+
+    def bench_season_analysis(self, chunk_rows: int = 2000) -> Dict[str, Any]:
+        """
+        Saison-Auswertung im Streaming-Modus (calculate_season_stats) über die halbe und die ganze Saison.
+        peak_mb_* = höchster Python-Speicher (tracemalloc); bleibt gleich, während die Saison wächst.
+        in_memory_peak_mb = zum Vergleich die ganze Saison als ein DataFrame (read_sql_query).
+        """
+        import tracemalloc
+        calculator = self._stats_calculator(profile=ANALYTICS_DB_PROFILE)
+        game_ids = [row[0] for row in calculator.db_manager.execute_query_fetch_all(
+            "SELECT game_id FROM games ORDER BY game_id")]
+        # Die halbe Saison muss mehrere Blöcke füllen, sonst misst peak_growth nur die Datenmenge
+        total_rows = calculator.db_manager.execute_query_fetch_one("SELECT COUNT(*) FROM actions")[0]
+        chunk_rows = max(100, min(chunk_rows, total_rows // 8))
+
+        def peak_mb(func) -> float:
+            tracemalloc.start()
+            try:
+                func()
+                return round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+            finally:
+                tracemalloc.stop()
+
+        summaries = []
+        samples = _time_calls(lambda: summaries.append(calculator.calculate_season_stats(chunk_rows=chunk_rows)),
+                              max(3, self.repeat // 4))
+        result = summarize(samples)
+        result["rows"] = summaries[-1]["rows"]
+        result["chunks"] = summaries[-1]["chunks"]
+        result["rows_per_sec"] = round(result["rows"] / (result["median_ms"] / 1000), 1)
+        half = game_ids[:max(1, len(game_ids) // 2)]
+        result["peak_mb_half_season"] = peak_mb(lambda: calculator.calculate_season_stats(half, chunk_rows=chunk_rows))
+        result["peak_mb_full_season"] = peak_mb(lambda: calculator.calculate_season_stats(chunk_rows=chunk_rows))
+        result["peak_growth"] = round(result["peak_mb_full_season"] / max(result["peak_mb_half_season"], 0.01), 2)
+        # Streaming: doppelt so viele Spiele dürfen den Speicher nicht mitwachsen lassen (siehe tests/test_season_analysis.py)
+        assert result["peak_growth"] <= 1.25, result
+        result["in_memory_peak_mb"] = peak_mb(lambda: calculator.db_manager.read_sql_query(
+            "SELECT s.game_id, a.* FROM actions a JOIN sets s ON a.set_id = s.set_id ORDER BY s.game_id, a.set_id, a.timestamp"))
+        # Gemessener Speicher pro Zeile eines Blocks (Grundlage für ANALYSIS_ROW_BYTES)
+        result["bytes_per_chunk_row"] = round(result["peak_mb_full_season"] * 1e6 / min(chunk_rows, result["rows"] or 1))
+        return result
+
+    def bench_season_archive(self) -> Dict[str, Any]:
+        """
+        Saison-Auswertung, nachdem alle Spiele ins Spaltenarchiv verschoben wurden (Memory-Mapping statt SQLite).
+        sqlite_ms = dieselbe Auswertung auf der unveränderten Datenbank; dazu Größen vor/nach der Archivierung.
+        """
+        from ..logic.statistic_calculator import StatisticCalculator
+        path = self._copy_db("archive.db")
+        db_bytes_before = os.path.getsize(path)
+        with self._quiet():
+            db_manager = self._db_manager(path)
+            archive = db_manager.get_action_archive()
+            started = time.perf_counter()
+            summary = archive.archive_games(older_than_days=0)
+            archive_ms = (time.perf_counter() - started) * 1000
+            db_manager.execute_query("VACUUM")
+        db_manager.close()
+
+        archived = StatisticCalculator(self._db_manager(path, profile=ANALYTICS_DB_PROFILE))
+        live = self._stats_calculator(profile=ANALYTICS_DB_PROFILE)
+        repeat = max(3, self.repeat // 4)
+        result = summarize(_time_calls(archived.calculate_season_stats, repeat))
+        result["sqlite_ms"] = summarize(_time_calls(live.calculate_season_stats, repeat))["median_ms"]
+        result["fetch_game_ms"] = summarize(_time_calls(
+            lambda: archived.fetch_all_actions_for_game(self.game_id), self.repeat))["median_ms"]
+        result["fetch_game_sqlite_ms"] = summarize(_time_calls(
+            lambda: live.fetch_all_actions_for_game(self.game_id), self.repeat))["median_ms"]
+        result["archived_actions"] = summary["actions"]
+        result["archive_ms"] = round(archive_ms, 1)
+        result["db_mb_before"] = round(db_bytes_before / 1e6, 2)
+        result["db_mb_after"] = round(os.path.getsize(path) / 1e6, 2)
+        result["archive_mb"] = round(sum(os.path.getsize(os.path.join(root, name))
+                                         for root, _, files in os.walk(archive.folder) for name in files) / 1e6, 2)
+        return result
+
+    def bench_game_package(self) -> Dict[str, Any]:
+        """
+        Export aller Spiele als Pakete und Import der ganzen Liga in eine leere Datenbank (eine Transaktion).
+        Gemessen wird der Import; reimport_ms = zweiter Import derselben Pakete (alle übersprungen).
+        """
+        from ..data.game_package import export_game_package, import_game_packages
+        source = self._db_manager()
+        folder = os.path.join(self.work_dir, "packages")
+        game_ids = [row[0] for row in source.execute_query_fetch_all("SELECT game_id FROM games ORDER BY game_id")]
+        started = time.perf_counter()
+        exports = [export_game_package(source, game_id, os.path.join(folder, f"spiel_{game_id}.vgp"))
+                   for game_id in game_ids]
+        export_ms = (time.perf_counter() - started) * 1000
+        source.close()
+        paths = [export["path"] for export in exports]
+
+        summaries = []
+
+        def import_league():
+            target = DBManager.temp_file(directory=self.work_dir, query_stats=QueryStats(enabled=False))
+            try:
+                summaries.append(import_game_packages(target, paths))
+            finally:
+                target.dispose()
+        samples = _time_calls(import_league, max(3, self.repeat // 4))
+        result = summarize(samples)
+        target = DBManager.temp_file(directory=self.work_dir, query_stats=QueryStats(enabled=False))
+        try:
+            import_game_packages(target, paths)
+            result["reimport_ms"] = summarize(_time_calls(lambda: import_game_packages(target, paths), 3))["median_ms"]
+        finally:
+            target.dispose()
+        result["games"] = len(paths)
+        result["actions"] = summaries[-1]["actions"]
+        result["export_ms"] = round(export_ms, 1)
+        result["package_kb"] = round(sum(export["bytes"] for export in exports) / 1000, 1)
+        result["bytes_per_action"] = round(sum(export["bytes"] for export in exports) / max(1, result["actions"]), 1)
+        return result
+
+    def bench_delta_sync(self, transport: str) -> Dict[str, Any]:
+        """
+        Abgleich eines Geräts mit einer leeren Zentrale (lokal Datei zu Datei oder per HTTP über einen
+        SyncServer auf localhost). initial_* = erster, vollständiger Abgleich; gemessen wird danach je
+        ein Abgleich nach einem Ballwechsel (5 neue Aktionen) - Zeit und Bytes hängen nur an den neuen Daten.
+        """
+        from ..data.models import Action
+        from ..data.sync import DeltaSync, HttpTransport, LocalTransport, SyncServer
+        device = self._db_manager(self._copy_db(f"sync_{transport}.db"))
+        sync = DeltaSync(device)
+        sync.enable()
+        central = DBManager.temp_file(directory=self.work_dir, query_stats=QueryStats(enabled=False))
+        server = SyncServer(central, port=0).start() if transport == "http" else None
+        try:
+            channel = HttpTransport(server.url) if server else LocalTransport(central)
+            started = time.perf_counter()
+            initial = sync.push(channel)
+            initial_ms = (time.perf_counter() - started) * 1000
+
+            set_id = device.execute_query_fetch_one("SELECT MAX(set_id) FROM sets")[0]
+            executor_id = self.generator.roster[0][0]
+            samples, sent = [], []
+            for _ in range(max(5, self.repeat)):
+                for _ in range(5):
+                    device.insert_action(Action(set_id=set_id, action_type="Angriff", executor_player_id=executor_id,
+                                                result_type="Kill", timestamp=datetime.datetime.now()))
+                started = time.perf_counter()
+                response = sync.push(channel)
+                samples.append((time.perf_counter() - started) * 1000)
+                sent.append(response["bytes_sent"])
+        finally:
+            if server:
+                server.stop()
+            central.dispose()
+            device.close()
+        result = summarize(samples)
+        result["initial_ms"] = round(initial_ms, 1)
+        result["initial_rows"] = initial["inserted"]
+        result["initial_kb"] = round(initial["bytes_sent"] / 1000, 1)
+        result["incremental_bytes"] = int(statistics.median(sent))
+        return result
+
+    def bench_commit_latency(self, profile: str, sync: bool = False) -> Dict[str, Any]:
+        """
+        Einzelner insert_action inkl. Commit (= ein Tap) unter dem angegebenen PRAGMA-Profil.
+        sync=True: mit Änderungsprotokoll (Trigger aus sync.py), zeigt dessen Kosten pro Tap.
+        """
+        from ..data.models import Action
+        db_manager = self._db_manager(self._copy_db(f"commit_{profile}{'_sync' if sync else ''}.db"), profile=profile)
+        if sync:
+            from ..data.sync import DeltaSync
+            DeltaSync(db_manager).enable()
+        set_id = db_manager.execute_query_fetch_one("SELECT MAX(set_id) FROM sets")[0]
+        executor_id = self.generator.roster[0][0]
+        action = Action(set_id=set_id, action_type="Zuspiel", executor_player_id=executor_id, result_type="Gut")
+        samples = _time_calls(lambda: db_manager.insert_action(action), self.repeat * 10)
+        result = summarize(samples)
+        result["commits_per_sec"] = round(len(samples) / (sum(samples) / 1000), 1)
+        return result
+
+    def bench_analysis(self, profile: str) -> Dict[str, Any]:
+        """Analyse-Durchsatz (Spielerstatistik + Zuspielverteilung) unter dem angegebenen PRAGMA-Profil."""
+        calculator = self._stats_calculator(profile=profile)
+        game_ids = [row[0] for row in calculator.db_manager.execute_query_fetch_all("SELECT game_id FROM games LIMIT 10")]
+
+        def analyse():
+            for game_id in game_ids:
+                calculator.calculate_player_general_stats(game_id)
+                calculator.calculate_setting_distribution(game_id)
+        samples = _time_calls(analyse, max(3, self.repeat // 2))
+        result = summarize(samples)
+        result["games_per_sec"] = round(len(samples) * len(game_ids) / (sum(samples) / 1000), 1)
+        return result
+
+
+# --- ERGEBNISSE & VERGLEICH ---
+
+def save_results(results: Dict[str, Any], path: str):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = BENCHMARK_REGRESSION_THRESHOLD,
+                    min_delta_ms: float = BENCHMARK_MIN_DELTA_MS) -> List[Dict[str, Any]]:
+    """
+    Vergleicht die Mediane zweier Ergebnis-Dokumente.
+    Status: 'regression' (langsamer als threshold), 'improvement', 'ok',
+    'new' (nicht in der Baseline), 'missing' (nur in der Baseline) oder
+    'skipped' (unterschiedlicher Messmodus, z.B. GUI vs. reine Daten, oder auf einer Seite
+    nicht gemessen, z.B. Parquet-Export ohne pyarrow).
+    """
+    rows = []
+    current_benchmarks = current.get("benchmarks", {})
+    baseline_benchmarks = baseline.get("benchmarks", {})
+
+    for name in list(current_benchmarks) + [n for n in baseline_benchmarks if n not in current_benchmarks]:
+        cur, base = current_benchmarks.get(name), baseline_benchmarks.get(name)
+        row = {"benchmark": name,
+               "baseline_ms": base.get("median_ms") if base else None,
+               "current_ms": cur.get("median_ms") if cur else None,
+               "change": None}
+        if base is None:
+            row["status"] = "new"
+        elif cur is None:
+            row["status"] = "missing"
+        elif "skipped" in cur or "skipped" in base or cur.get("mode") != base.get("mode"):
+            row["status"] = "skipped"
+        else:
+            delta = cur["median_ms"] - base["median_ms"]
+            row["change"] = round(delta / base["median_ms"], 4) if base["median_ms"] else None
+            if abs(delta) < min_delta_ms or row["change"] is None:
+                row["status"] = "ok"
+            elif row["change"] > threshold:
+                row["status"] = "regression"
+            elif row["change"] < -threshold:
+                row["status"] = "improvement"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """Tabellarische Textausgabe von compare_results()."""
+    def fmt(value):
+        return "-" if value is None else f"{value:.3f}"
+
+    lines = [f"{'Benchmark':<40} {'Baseline ms':>12} {'Aktuell ms':>12} {'Änderung':>10}  Status"]
+    for row in rows:
+        change = "-" if row["change"] is None else f"{row['change'] * 100:+.1f}%"
+        lines.append(f"{row['benchmark']:<40} {fmt(row['baseline_ms']):>12} {fmt(row['current_ms']):>12} {change:>10}  {row['status']}")
+    return "\n".join(lines)
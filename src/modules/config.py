@@ -15,6 +15,84 @@ else:
 DB_FOLDER = os.path.join(os.path.dirname(os.path.dirname(BASE_DIR)), 'resources', 'db')
 DB_PATH = os.path.join(DB_FOLDER, 'stats.db')
 
+# --- Latenz-Tracing (siehe modules/tracing.py) ---
+# Einschalten per Umgebungsvariable: VOLLEY_TRACE=1
+TRACING_ENABLED = os.environ.get('VOLLEY_TRACE', '0') == '1'
+TRACE_BUFFER_SIZE = 5000 # Anzahl Spans/Interaktionen im Ringpuffer
+TRACE_EXPORT_FOLDER = os.path.join(os.path.dirname(DB_FOLDER), 'traces')
+
+# --- SQLite PRAGMA-Profile (werden von DBManager auf jede neue Verbindung angewendet) ---
+DB_PRAGMA_PROFILES = {
+    # SQLite-Standard: Rollback-Journal, synchronous=FULL
+    'default': {},
+    # Live-Erfassung: WAL (Lesen blockiert das Schreiben nicht), günstigere Commits pro Tap
+    'live': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000, # ms warten statt sofort 'database is locked'
+    },
+    # Auswertung/Export: großer Cache, Memory-Mapping, reine Lese-Verbindung
+    'analytics': {
+        'cache_size': -65536, # negativ = KiB, also 64 MiB
+        'mmap_size': 268435456, # 256 MiB
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'query_only': 'ON',
+    },
+}
+DB_PROFILE = 'live' # Profil der Haupt-Datenbankverbindung (Erfassung + Verwaltung)
+ANALYTICS_DB_PROFILE = 'analytics' # Profil für StatisticCalculator (Analyse + PDF-Export)
+
+# --- Journal des laufenden Spiels (siehe modules/data/game_journal.py) ---
+JOURNAL_PATH = os.path.join(DB_FOLDER, 'active_game.journal')
+JOURNAL_FSYNC = True # Jeden Eintrag mit fdatasync auf die Platte bringen (False nur für Tests/Benchmarks)
+
+# --- Spieler-/Team-Suche (siehe modules/data/search_index.py) ---
+SEARCH_FUZZY_CUTOFF = 0.8 # Mindest-Ähnlichkeit (difflib) für Tippfehler-Treffer
+SEARCH_FTS5_ENABLED = False # Zusätzlich eine FTS5-Tabelle per Trigger pflegen (nur wenn SQLite FTS5 unterstützt)
+
+# --- Query-Instrumentierung (siehe modules/data/query_stats.py) ---
+QUERY_STATS_ENABLED = True
+SLOW_QUERY_THRESHOLD_MS = 25 # Queries ab dieser Dauer landen mit Query-Plan im Slow-Query-Log
+
+# --- Benchmarks (siehe modules/benchmarks/suite.py und run_benchmarks.py) ---
+BENCHMARK_FOLDER = os.path.join(os.path.dirname(DB_FOLDER), 'benchmarks')
+BENCHMARK_BASELINE_PATH = os.path.join(BENCHMARK_FOLDER, 'baseline.json')
+BENCHMARK_REGRESSION_THRESHOLD = 0.20 # Median mehr als 20 % langsamer als die Baseline = Regression
+BENCHMARK_MIN_DELTA_MS = 0.05 # Kleinere absolute Abweichungen gelten als Messrauschen
+
+# --- Daten-Export (siehe modules/data/action_export.py und export_actions.py) ---
+EXPORT_FOLDER = os.path.join(os.path.dirname(DB_FOLDER), 'exports')
+EXPORT_CHUNK_ROWS = 50000 # Zeilen pro Lese-Block (= eine Parquet-Row-Group); begrenzt den Speicherbedarf
+
+# --- Saison-Auswertung im Streaming-Modus (siehe StatisticCalculator.calculate_season_stats) ---
+ANALYSIS_MEMORY_LIMIT_MB = 32 # Obergrenze für den Python-Speicher eines Aktions-Blocks; bestimmt die Blockgröße
+ANALYSIS_ROW_BYTES = 400 # Python-Speicher pro Aktionszeile im Block (gemessen ~330 B, siehe Benchmark season_analysis)
+
+# --- Archiv abgeschlossener Spiele (siehe modules/data/action_archive.py und archive_games.py) ---
+ARCHIVE_AFTER_DAYS = 60 # Aktionen von Spielen, die älter sind, wandern aus der Tabelle actions ins Archiv
+ARCHIVE_SEASON_START_MONTH = 8 # Erster Monat einer Saison (August: 2025-08 bis 2026-07 = Saison "2025-26")
+
+# --- Spiel-Pakete für den Austausch zwischen Vereinen (siehe modules/data/game_package.py und share_games.py) ---
+PACKAGE_FOLDER = os.path.join(os.path.dirname(DB_FOLDER), 'packages')
+PACKAGE_COMPRESSION_LEVEL = 9 # zlib-Stufe; Pakete sind klein, das Packen kostet nur Millisekunden
+
+# --- Abgleich mehrerer Erfassungsgeräte mit einer zentralen Datenbank (siehe modules/data/sync.py und sync_devices.py) ---
+SYNC_ENABLED = False # Änderungsprotokoll (Trigger auf games/sets/actions) beim Start von setup_database einrichten
+SYNC_HOST = '127.0.0.1'
+SYNC_PORT = 8765
+SYNC_CONFLICT_POLICY = 'newest' # Bei Änderungen auf beiden Seiten: 'newest' (jüngere gewinnt), 'central' oder 'device'
+SYNC_TIMEOUT_SECONDS = 30
+
+# --- Stats-API für Handys/Tablets der Trainer (siehe modules/logic/stats_api.py und serve_stats.py) ---
+STATS_API_ENABLED = False # Beim Start der App mitstarten (eigene Lese-Verbindungen, blockiert die Erfassung nicht)
+STATS_API_HOST = '0.0.0.0' # Im Hallen-WLAN erreichbar; die API ist nur lesend
+STATS_API_PORT = 8766
+STATS_API_WORKERS = 8 # Feste Anzahl Worker-Threads (= Lese-Verbindungen), egal wie viele Geräte abfragen
+STATS_API_CACHE_GAMES = 32 # So viele Spiele bleiben mit fertigen Antworten im Cache
+STATS_API_MIN_RECOMPUTE_SECONDS = 1.0 # Laufendes Spiel: höchstens so oft neu rechnen, dazwischen letzter Stand
+STATS_API_GZIP_MIN_BYTES = 1024 # Kleinere Antworten werden nicht komprimiert
+
 # --- Allgemeine Konstanten ---
 
 # Rollen und Aktionen (für GUI und Validierung)
@@ -0,0 +1,412 @@
+# src/modules/data/action_archive.py
+
+import datetime
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from ..config import ARCHIVE_AFTER_DAYS, ARCHIVE_SEASON_START_MONTH
+
+ARCHIVE_VERSION = 1
+
+# Spalten einer Saison-Datei: (Name, NumPy-Typ). Codes der Lookup-Tabellen beginnen bei 1,
+# daher steht 0 für NULL; bei Spieler-/Satz-IDs steht -1 für NULL.
+ARCHIVE_COLUMNS: List[Tuple[str, str]] = [
+    ('action_id', 'int64'),
+    ('game_id', 'int32'),
+    ('set_id', 'int32'),
+    ('action_type', 'int16'),
+    ('result_type', 'int16'),
+    ('executor_player_id', 'int32'),
+    ('target_player_id', 'int32'),
+    ('point_for', 'int16'),
+    ('point_detail_type', 'int16'),
+    ('timestamp', 'datetime64[us]'),
+]
+_CODE_COLUMNS = {'action_type', 'result_type', 'point_for', 'point_detail_type'}
+
+# Gleiche Reihenfolge wie ARCHIVE_COLUMNS; Sortierung wie fetch_all_actions_for_game (pro Spiel)
+_SELECT_ACTIONS = """
+    SELECT a.action_id, s.game_id, a.set_id, a.action_type_id, a.result_type_id, a.executor_player_id,
+           a.target_player_id, a.point_for_id, a.point_detail_type_id, a.timestamp
+    FROM actions a
+    JOIN sets s ON s.set_id = a.set_id
+    WHERE s.game_id IN ({placeholders})
+    ORDER BY s.game_id, a.set_id, a.timestamp, a.action_id
+"""
+
+
+def archive_folder_for(db_path: str) -> Optional[str]:
+    """Archiv-Ordner neben der Datenbank (stats.db -> stats_archive/); None für In-Memory-Datenbanken."""
+    if not db_path or db_path == ":memory:":
+        return None
+    return os.path.splitext(os.path.abspath(db_path))[0] + "_archive"
+
+
+def season_of(date_time: str) -> str:
+    """Saison eines Spiels, z.B. '2025-26' für alle Spiele ab ARCHIVE_SEASON_START_MONTH 2025."""
+    date = datetime.datetime.fromisoformat(str(date_time))
+    start = date.year if date.month >= ARCHIVE_SEASON_START_MONTH else date.year - 1
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+class ActionArchive:
+    """
+    Spaltenarchiv der Aktionen abgeschlossener Spiele.
+
+    archive_games() verschiebt die Aktionen alter Spiele aus der Tabelle actions in eine Datei pro
+    Spalte und Saison (NumPy .npy, schmale Integer-Typen, Zeitstempel als datetime64[us]). Die Zeilen
+    sind nach Spiel sortiert; das Manifest in SQLite (archived_games, archive_seasons) kennt für
+    jedes Spiel Saison, Startzeile und Anzahl. Spiele, Sätze und Aufstellungen bleiben in SQLite.
+
+    Gelesen wird per Memory-Mapping: load_game() liefert Slices der gemappten Spalten ohne Kopie.
+    Eine Saison wird nie an Ort und Stelle geändert, sondern als neue Generation geschrieben und
+    im selben Commit, der die Aktionen löscht, im Manifest umgestellt. Laufende Leser behalten
+    so ihre alte, vollständige Generation; gelöscht werden ältere Generationen erst beim nächsten
+    Archivieren bzw. Zurückholen (siehe prune_generations).
+    """
+
+    def __init__(self, db_manager, folder: Optional[str] = None):
+        self.db_manager = db_manager
+        self.folder = folder or archive_folder_for(db_manager.db_path)
+        self._lock = threading.Lock()
+        self._mapped: Dict[Tuple[str, int], Dict[str, np.ndarray]] = {}
+
+    # --- LESEN ---
+
+    def location(self, game_id: int) -> Optional[Tuple[str, int, int, int]]:
+        """(Saison, Generation, Startzeile, Anzahl) eines archivierten Spiels oder None."""
+        return self.db_manager.execute_query_fetch_one("""
+            SELECT g.season, s.generation, g.row_start, g.row_count
+            FROM archived_games g JOIN archive_seasons s ON s.season = g.season
+            WHERE g.game_id = ?
+        """, (game_id,))
+
+    def archived_game_ids(self) -> List[int]:
+        return [row[0] for row in self.db_manager.execute_query_fetch_all(
+            "SELECT game_id FROM archived_games ORDER BY game_id")]
+
+    def seasons(self) -> List[Tuple[str, int, int]]:
+        """(Saison, Generation, Zeilen) aller archivierten Saisons."""
+        return self.db_manager.execute_query_fetch_all(
+            "SELECT season, generation, row_count FROM archive_seasons ORDER BY season")
+
+    def load_game(self, game_id: int) -> Optional[Dict[str, np.ndarray]]:
+        """Spalten eines archivierten Spiels als Slices der gemappten Dateien (None = nicht archiviert)."""
+        location = self.location(game_id)
+        if location is None:
+            return None
+        season, generation, start, count = location
+        columns = self.season_columns(season, generation)
+        return {name: values[start:start + count] for name, values in columns.items()}
+
+    def load_game_rows(self, game_id: int) -> List[tuple]:
+        """
+        Aktionen eines archivierten Spiels als Zeilen wie in der Tabelle actions: (action_id, set_id,
+        action_type_id, result_type_id, executor_player_id, target_player_id, point_for_id,
+        point_detail_type_id, timestamp). Leer, wenn das Spiel nicht archiviert ist.
+        """
+        columns = self.load_game(game_id)
+        return _columns_to_rows(columns) if columns is not None else []
+
+    def load_action_rows(self, action_ids: Sequence[int]) -> List[tuple]:
+        """Archivierte Aktionen mit diesen IDs als Zeilen wie load_game_rows (nicht archivierte fehlen)."""
+        wanted = np.asarray(sorted(set(action_ids)), dtype='int64')
+        rows = []
+        for season, generation, _ in self.seasons():
+            if not len(wanted):
+                break
+            columns = self.season_columns(season, generation)
+            mask = np.isin(columns['action_id'], wanted)
+            if mask.any():
+                rows += _columns_to_rows({name: values[mask] for name, values in columns.items()})
+        return rows
+
+    def max_action_id(self) -> int:
+        """Höchste archivierte action_id (0 = leeres Archiv); Untergrenze für neue IDs in actions."""
+        highest = 0
+        for season, generation, row_count in self.seasons():
+            if row_count:
+                highest = max(highest, int(self.season_columns(season, generation)['action_id'].max()))
+        return highest
+
+    def season_columns(self, season: str, generation: int) -> Dict[str, np.ndarray]:
+        """Alle Spalten einer Saison-Generation, read-only gemappt (pro Generation einmal geöffnet)."""
+        key = (season, generation)
+        with self._lock:
+            columns = self._mapped.get(key)
+            if columns is None:
+                directory = self._generation_dir(season, generation)
+                columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r')
+                           for name, _ in ARCHIVE_COLUMNS}
+                # Ältere Generationen derselben Saison werden nicht mehr gebraucht
+                for old_key in [k for k in self._mapped if k[0] == season]:
+                    del self._mapped[old_key]
+                self._mapped[key] = columns
+            return columns
+
+    # --- ARCHIVIEREN ---
+
+    def find_candidates(self, older_than_days: int = ARCHIVE_AFTER_DAYS,
+                        exclude_game_ids: Sequence[int] = ()) -> List[Tuple[int, str]]:
+        """(game_id, date_time) der Spiele, die älter als older_than_days und noch nicht archiviert sind."""
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=older_than_days)).strftime("%Y-%m-%d %H:%M:%S")
+        rows = self.db_manager.execute_query_fetch_all("""
+            SELECT g.game_id, g.date_time FROM games g
+            WHERE g.date_time < ? AND g.game_id NOT IN (SELECT game_id FROM archived_games)
+            ORDER BY g.game_id
+        """, (cutoff,))
+        excluded = set(exclude_game_ids)
+        return [row for row in rows if row[0] not in excluded]
+
+    def archive_games(self, older_than_days: int = ARCHIVE_AFTER_DAYS, exclude_game_ids: Sequence[int] = (),
+                      game_ids: Optional[Sequence[int]] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Verschiebt die Aktionen abgeschlossener Spiele ins Archiv (eine neue Generation je betroffener
+        Saison). Ohne game_ids werden alle Spiele archiviert, die älter als older_than_days sind;
+        exclude_game_ids (z.B. das laufende Spiel) bleiben unangetastet.
+        Gibt {'games', 'actions', 'seasons', 'skipped'} zurück.
+        """
+        if not self.folder:
+            raise RuntimeError("Für eine In-Memory-Datenbank gibt es kein Archiv.")
+        if not dry_run:
+            self.prune_generations()
+        if game_ids is None:
+            candidates = self.find_candidates(older_than_days, exclude_game_ids)
+        else:
+            archived = set(self.archived_game_ids())
+            placeholders = ", ".join("?" * len(game_ids)) or "NULL"
+            candidates = [row for row in self.db_manager.execute_query_fetch_all(
+                f"SELECT game_id, date_time FROM games WHERE game_id IN ({placeholders}) ORDER BY game_id",
+                tuple(game_ids)) if row[0] not in archived and row[0] not in set(exclude_game_ids)]
+
+        by_season: Dict[str, List[int]] = {}
+        skipped: List[int] = []
+        for game_id, date_time in candidates:
+            try:
+                by_season.setdefault(season_of(date_time), []).append(game_id)
+            except ValueError:
+                skipped.append(game_id)
+
+        summary = {'games': 0, 'actions': 0, 'seasons': sorted(by_season), 'skipped': skipped}
+        for season, season_game_ids in sorted(by_season.items()):
+            archived_games, archived_actions, season_skipped = self._archive_season(season, season_game_ids, dry_run)
+            summary['games'] += archived_games
+            summary['actions'] += archived_actions
+            skipped.extend(season_skipped)
+        return summary
+
+    def _archive_season(self, season: str, game_ids: List[int], dry_run: bool) -> Tuple[int, int, List[int]]:
+        rows = self.db_manager.execute_query_fetch_all(
+            _SELECT_ACTIONS.format(placeholders=", ".join("?" * len(game_ids))), tuple(game_ids))
+        new_columns, skipped = _rows_to_columns(rows)
+        game_ids = [game_id for game_id in game_ids if game_id not in set(skipped)]
+        if not game_ids or dry_run:
+            return len(game_ids), len(new_columns['action_id']), skipped
+
+        current = self.db_manager.execute_query_fetch_one(
+            "SELECT generation FROM archive_seasons WHERE season = ?", (season,))
+        old_generation = current[0] if current else None
+        columns = new_columns
+        if old_generation is not None:
+            old_columns = self.season_columns(season, old_generation)
+            columns = {name: np.concatenate([np.asarray(old_columns[name]), new_columns[name]])
+                       for name, _ in ARCHIVE_COLUMNS}
+            # Stabil nach Spiel sortieren: die Reihenfolge innerhalb eines Spiels bleibt erhalten
+            order = np.argsort(columns['game_id'], kind='stable')
+            columns = {name: values[order] for name, values in columns.items()}
+
+        generation = (old_generation or 0) + 1
+        directory = self._write_generation(season, generation, columns)
+        archived_ids = new_columns['action_id'].tolist()
+        try:
+            self._commit_season(season, generation, columns, game_ids, archived_ids)
+        except Exception:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        if old_generation is not None:
+            # Die alte Generation bleibt für laufende Leser liegen (prune_generations beim nächsten Mal)
+            with self._lock:
+                self._mapped.pop((season, old_generation), None)
+        return len(game_ids), len(archived_ids), skipped
+
+    def _commit_season(self, season: str, generation: int, columns: Dict[str, np.ndarray],
+                       new_game_ids: List[int], archived_action_ids: List[int]):
+        """Manifest umstellen und die archivierten Aktionen löschen - in EINER Transaktion."""
+        game_column = columns['game_id']
+        season_games, starts, counts = np.unique(game_column, return_index=True, return_counts=True)
+        manifest = [(int(g), season, int(s), int(c)) for g, s, c in zip(season_games, starts, counts)]
+        # Spiele ohne Aktionen bekommen einen leeren Eintrag, damit sie nicht erneut Kandidaten sind
+        present = set(season_games.tolist())
+        manifest += [(game_id, season, 0, 0) for game_id in new_game_ids if game_id not in present]
+        placeholders = ", ".join("?" * len(new_game_ids))
+        archived_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        with self.db_manager.transaction(immediate=True) as transaction:
+            transaction.run("""
+                INSERT INTO archive_seasons (season, generation, row_count) VALUES (?, ?, ?)
+                ON CONFLICT (season) DO UPDATE SET generation = excluded.generation, row_count = excluded.row_count
+            """, (season, generation, len(game_column)))
+            transaction.run("DELETE FROM archived_games WHERE season = ?", (season,))
+            transaction.run("""
+                INSERT INTO archived_games (game_id, season, row_start, row_count, archived_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, [row + (archived_at,) for row in manifest], many=True)
+            _, cursor = transaction.run("DELETE FROM actions WHERE action_id = ?",
+                                        [(action_id,) for action_id in archived_action_ids], many=True)
+            deleted = cursor.rowcount
+            remaining = transaction.run(f"""
+                SELECT COUNT(*) FROM actions a JOIN sets s ON s.set_id = a.set_id
+                WHERE s.game_id IN ({placeholders})
+            """, tuple(new_game_ids), fetch='one')[0][0]
+            # Wurde zwischen Lesen und Löschen weiter erfasst, bleibt alles beim Alten
+            if deleted != len(archived_action_ids) or remaining:
+                raise RuntimeError(f"Aktionen der Saison {season} haben sich während der Archivierung geändert.")
+
+    def _write_generation(self, season: str, generation: int, columns: Dict[str, np.ndarray]) -> str:
+        directory = self._generation_dir(season, generation)
+        tmp_directory = directory + ".tmp"
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        os.makedirs(tmp_directory)
+        for name, dtype in ARCHIVE_COLUMNS:
+            np.save(os.path.join(tmp_directory, f"{name}.npy"), np.ascontiguousarray(columns[name], dtype=dtype))
+        meta = {'version': ARCHIVE_VERSION, 'season': season, 'generation': generation,
+                'rows': int(len(columns['action_id'])), 'columns': dict(ARCHIVE_COLUMNS)}
+        with open(os.path.join(tmp_directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_directory, directory)
+        return directory
+
+    def _generation_dir(self, season: str, generation: int) -> str:
+        return os.path.join(self.folder, season, f"g{generation}")
+
+    def prune_generations(self) -> int:
+        """
+        Löscht Generationen, die älter als die aktuelle ihrer Saison sind. Läuft erst beim nächsten
+        Archivieren/Zurückholen, damit Leser (auch anderer Prozesse) die vorige Generation zu Ende
+        lesen können. Was sich nicht löschen lässt (unter Windows z.B. noch gemappte Dateien),
+        bleibt bis zum nächsten Versuch liegen. Gibt die Anzahl gelöschter Generationen zurück.
+        """
+        removed = 0
+        for season, generation, _ in self.seasons():
+            season_dir = os.path.join(self.folder, season)
+            if not os.path.isdir(season_dir):
+                continue
+            for name in os.listdir(season_dir):
+                if not (name.startswith("g") and name[1:].isdigit()) or int(name[1:]) >= generation:
+                    continue
+                with self._lock:
+                    self._mapped.pop((season, int(name[1:])), None)
+                path = os.path.join(season_dir, name)
+                shutil.rmtree(path, ignore_errors=True)
+                if not os.path.exists(path):
+                    removed += 1
+        return removed
+
+    # --- ZURÜCKHOLEN ---
+
+    def restore_games(self, game_ids: Sequence[int]) -> int:
+        """
+        Holt die Aktionen archivierter Spiele (mit ihren ursprünglichen IDs) zurück in die Tabelle
+        actions, z.B. um sie nachträglich zu bearbeiten. Gibt die Anzahl der Aktionen zurück.
+        Wirft RuntimeError, wenn eine der IDs inzwischen in actions vergeben ist (dann ändert sich nichts).
+        """
+        self.prune_generations()
+        restored = 0
+        by_season: Dict[str, List[int]] = {}
+        for game_id in game_ids:
+            location = self.location(game_id)
+            if location is not None:
+                by_season.setdefault(location[0], []).append(game_id)
+
+        for season, season_game_ids in by_season.items():
+            generation = self.db_manager.execute_query_fetch_one(
+                "SELECT generation FROM archive_seasons WHERE season = ?", (season,))[0]
+            columns = self.season_columns(season, generation)
+            keep = ~np.isin(columns['game_id'], season_game_ids)
+            rows = _columns_to_rows({name: values[~keep] for name, values in columns.items()})
+            self._check_free_ids(season, [row[0] for row in rows])
+            remaining = {name: np.asarray(values[keep]) for name, values in columns.items()}
+
+            new_generation = generation + 1
+            directory = self._write_generation(season, new_generation, remaining)
+            try:
+                self._commit_restore(season, new_generation, remaining, season_game_ids, rows)
+            except Exception:
+                shutil.rmtree(directory, ignore_errors=True)
+                raise
+            with self._lock:
+                self._mapped.pop((season, generation), None)
+            restored += len(rows)
+        return restored
+
+    def _check_free_ids(self, season: str, action_ids: List[int]):
+        """Vor dem Schreiben einer neuen Generation: keine der zurückzuholenden IDs darf in actions stehen."""
+        taken: List[int] = []
+        for start in range(0, len(action_ids), 500):
+            batch = action_ids[start:start + 500]
+            taken += [row[0] for row in self.db_manager.execute_query_fetch_all(
+                f"SELECT action_id FROM actions WHERE action_id IN ({', '.join('?' * len(batch))})", tuple(batch))]
+        if taken:
+            raise RuntimeError(f"Aktionen der Saison {season} können nicht zurückgeholt werden: "
+                               f"{len(taken)} IDs sind in actions neu vergeben (z.B. {sorted(taken)[:5]}).")
+
+    def _commit_restore(self, season: str, generation: int, remaining: Dict[str, np.ndarray],
+                        game_ids: List[int], rows: List[tuple]):
+        season_games, starts, counts = np.unique(remaining['game_id'], return_index=True, return_counts=True)
+        with self.db_manager.transaction(immediate=True) as transaction:
+            transaction.run("""
+                INSERT INTO actions (action_id, set_id, action_type_id, result_type_id, executor_player_id,
+                                     target_player_id, point_for_id, point_detail_type_id, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows, many=True)
+            transaction.run("UPDATE archive_seasons SET generation = ?, row_count = ? WHERE season = ?",
+                            (generation, len(remaining['game_id']), season))
+            transaction.run("DELETE FROM archived_games WHERE game_id = ?",
+                            [(game_id,) for game_id in game_ids], many=True)
+            transaction.run("UPDATE archived_games SET row_start = ?, row_count = ? WHERE game_id = ?",
+                            [(int(s), int(c), int(g)) for g, s, c in zip(season_games, starts, counts)], many=True)
+
+
+def _rows_to_columns(rows: List[tuple]) -> Tuple[Dict[str, np.ndarray], List[int]]:
+    """
+    SQLite-Zeilen -> Spalten-Arrays. Spiele mit Zeitstempeln, die sich nicht verlustfrei als
+    datetime64 speichern lassen (anderes Textformat), werden übersprungen und bleiben in SQLite.
+    """
+    skipped = set()
+    timestamps = []
+    for row in rows:
+        value = row[-1]
+        try:
+            parsed = datetime.datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            parsed = None
+        if parsed is None or str(parsed) != value:
+            skipped.add(row[1])
+        timestamps.append(parsed)
+    if skipped:
+        keep = [idx for idx, row in enumerate(rows) if row[1] not in skipped]
+        rows = [rows[idx] for idx in keep]
+        timestamps = [timestamps[idx] for idx in keep]
+
+    columns: Dict[str, np.ndarray] = {}
+    for idx, (name, dtype) in enumerate(ARCHIVE_COLUMNS[:-1]):
+        null = 0 if name in _CODE_COLUMNS else -1
+        columns[name] = np.array([null if row[idx] is None else row[idx] for row in rows], dtype=dtype)
+    columns['timestamp'] = np.array(timestamps, dtype='datetime64[us]')
+    return columns, sorted(skipped)
+
+
+def _columns_to_rows(columns: Dict[str, np.ndarray]) -> List[tuple]:
+    """Spalten-Arrays -> Zeilen für INSERT INTO actions (Reihenfolge wie in restore_games)."""
+    def nullable(name: str) -> List[Optional[int]]:
+        null = 0 if name in _CODE_COLUMNS else -1
+        return [None if value == null else value for value in columns[name].tolist()]
+
+    timestamps = [str(value) for value in columns['timestamp'].astype(datetime.datetime).tolist()]
+    return list(zip(columns['action_id'].tolist(), nullable('set_id'), columns['action_type'].tolist(),
+                    nullable('result_type'), nullable('executor_player_id'), nullable('target_player_id'),
+                    nullable('point_for'), nullable('point_detail_type'), timestamps))
@@ -0,0 +1,269 @@
+# src/modules/data/action_export.py
+
+import csv
+import datetime
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from ..config import EXPORT_CHUNK_ROWS
+
+# Ausgabeformate und die Dateiendungen, aus denen sie abgeleitet werden
+FORMATS = {
+    'parquet': ('.parquet', '.pq'),
+    'arrow': ('.arrow', '.feather', '.ipc'),
+    'csv': ('.csv',),
+}
+
+# Spalten des Exports: (Name, SQL-Ausdruck, Arrow-Typ). Eine Zeile pro Aktion, denormalisiert
+# mit Spiel, Satz, Teams und Spielern, damit Analysten ohne Joins arbeiten können.
+# Arrow-Typen: 'int' (int64), 'str', 'dict' (dictionary-kodierter String), 'timestamp' (Sekunden)
+EXPORT_COLUMNS: List[Tuple[str, str, str]] = [
+    ('action_id', 'a.action_id', 'int'),
+    ('game_id', 's.game_id', 'int'),
+    ('game_date', 'g.date_time', 'timestamp'),
+    ('home_team', 'ht.name', 'dict'),
+    ('guest_team', 'gt.name', 'dict'),
+    ('set_number', 's.set_number', 'int'),
+    ('action_type', 'at.name', 'dict'),
+    ('result_type', 'rt.name', 'dict'),
+    ('point_for', 'pf.name', 'dict'),
+    ('point_detail_type', 'pd.name', 'dict'),
+    ('executor_player_id', 'a.executor_player_id', 'int'),
+    ('executor_name', 'ep.name', 'dict'),
+    ('executor_jersey', 'ep.jersey_number', 'int'),
+    ('target_player_id', 'a.target_player_id', 'int'),
+    ('target_name', 'tp.name', 'dict'),
+    ('timestamp', 'a.timestamp', 'timestamp'),
+]
+
+
+def build_export_query(game_ids: Optional[Sequence[int]] = None, team_id: Optional[int] = None,
+                       date_from: Optional[str] = None, date_to: Optional[str] = None) -> Tuple[str, tuple]:
+    """
+    SELECT für den Export mit optionalen Filtern: Spiele, Team (Heim oder Gast) und
+    Datumsbereich (YYYY-MM-DD, beide Grenzen inklusive). Sortiert nach action_id,
+    damit SQLite ohne temporäre Sortierung direkt streamen kann.
+    """
+    select = ",\n               ".join(f"{expr} AS {name}" for name, expr, _ in EXPORT_COLUMNS)
+    where, params = _filter_clause(game_ids, team_id, date_from, date_to)
+    query = f"""
+        SELECT {select}
+        FROM actions a
+        JOIN sets s ON s.set_id = a.set_id
+        JOIN games g ON g.game_id = s.game_id
+        LEFT JOIN teams ht ON ht.team_id = g.home_team_id
+        LEFT JOIN teams gt ON gt.team_id = g.guest_team_id
+        JOIN action_types at ON at.id = a.action_type_id
+        LEFT JOIN result_types rt ON rt.id = a.result_type_id
+        LEFT JOIN point_for_types pf ON pf.id = a.point_for_id
+        LEFT JOIN point_detail_types pd ON pd.id = a.point_detail_type_id
+        LEFT JOIN players ep ON ep.player_id = a.executor_player_id
+        LEFT JOIN players tp ON tp.player_id = a.target_player_id
+        {where}
+        ORDER BY a.action_id
+    """
+    return query, params
+
+
+def _filter_clause(game_ids: Optional[Sequence[int]], team_id: Optional[int], date_from: Optional[str],
+                   date_to: Optional[str]) -> Tuple[str, tuple]:
+    """WHERE-Klausel der Exportfilter über games g (für Tabelle und Archiv)."""
+    conditions: List[str] = []
+    params: List[Any] = []
+    if game_ids:
+        conditions.append(f"g.game_id IN ({', '.join('?' * len(game_ids))})")
+        params.extend(game_ids)
+    if team_id is not None:
+        conditions.append("(g.home_team_id = ? OR g.guest_team_id = ?)")
+        params.extend([team_id, team_id])
+    if date_from:
+        conditions.append("g.date_time >= ?")
+        params.append(date_from)
+    if date_to:
+        conditions.append("g.date_time < date(?, '+1 day')")
+        params.append(date_to)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, tuple(params)
+
+
+def iter_archived_rows(db_manager, game_ids: Optional[Sequence[int]] = None, team_id: Optional[int] = None,
+                       date_from: Optional[str] = None, date_to: Optional[str] = None,
+                       chunk_size: int = EXPORT_CHUNK_ROWS) -> Iterator[List[tuple]]:
+    """
+    Export-Zeilen (Spalten wie EXPORT_COLUMNS) der archivierten Spiele, die zu den Filtern passen,
+    blockweise. Die Aktionen kommen Spiel für Spiel aus dem Spaltenarchiv (action_archive.py);
+    Spiel, Sätze, Teams und Spieler stehen weiter in SQLite.
+    """
+    where, params = _filter_clause(game_ids, team_id, date_from, date_to)
+    games = db_manager.execute_query_fetch_all(f"""
+        SELECT g.game_id, g.date_time, ht.name, gt.name
+        FROM games g
+        JOIN archived_games ag ON ag.game_id = g.game_id
+        LEFT JOIN teams ht ON ht.team_id = g.home_team_id
+        LEFT JOIN teams gt ON gt.team_id = g.guest_team_id
+        {where}
+        ORDER BY g.game_id
+    """, params)
+    if not games:
+        return
+    archive = db_manager.get_action_archive()
+    decode = db_manager.codes.decode
+    players: Dict[int, Tuple[str, Optional[int]]] = {}
+    rows: List[tuple] = []
+    for game_id, game_date, home_team, guest_team in games:
+        actions = archive.load_game_rows(game_id)
+        set_numbers = dict(db_manager.execute_query_fetch_all(
+            "SELECT set_id, set_number FROM sets WHERE game_id = ?", (game_id,)))
+        unknown = sorted({pid for row in actions for pid in (row[4], row[5]) if pid is not None and pid not in players})
+        if unknown:
+            players.update((player_id, (name, jersey)) for player_id, name, jersey in db_manager.execute_query_fetch_all(
+                f"SELECT player_id, name, jersey_number FROM players WHERE player_id IN ({', '.join('?' * len(unknown))})",
+                tuple(unknown)))
+        for (action_id, set_id, action_type, result_type, executor_id, target_id, point_for, detail,
+             timestamp) in actions:
+            if set_id not in set_numbers:
+                continue # wie der JOIN auf sets in build_export_query
+            executor_name, executor_jersey = players.get(executor_id, (None, None))
+            rows.append((action_id, game_id, game_date, home_team, guest_team, set_numbers[set_id],
+                         decode('action_type', action_type), decode('result_type', result_type),
+                         decode('point_for', point_for), decode('point_detail_type', detail),
+                         executor_id, executor_name, executor_jersey,
+                         target_id, players.get(target_id, (None, None))[0], timestamp))
+        while len(rows) >= chunk_size:
+            yield rows[:chunk_size]
+            rows = rows[chunk_size:]
+    if rows:
+        yield rows
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt:
+        if fmt not in FORMATS:
+            raise ValueError(f"Unbekanntes Exportformat '{fmt}' (verfügbar: {', '.join(FORMATS)}).")
+        return fmt
+    extension = os.path.splitext(path)[1].lower()
+    for name, extensions in FORMATS.items():
+        if extension in extensions:
+            return name
+    raise ValueError(f"Exportformat für '{path}' nicht erkennbar (Endung .parquet, .arrow oder .csv).")
+
+
+def _require_pyarrow():
+    # pyarrow ist optional: nur Parquet/Arrow brauchen es, der CSV-Export nicht
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("Für Parquet/Arrow wird pyarrow benötigt (pip install pyarrow); CSV geht ohne.")
+
+
+class _CsvSink:
+    def __init__(self, path: str, columns: List[str]):
+        self._file = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows: List[tuple]):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class _ArrowSink:
+    """Schreibt jeden Block als RecordBatch (Parquet: eine Row-Group pro Block)."""
+
+    def __init__(self, path: str, columns: List[str], fmt: str):
+        pa = _require_pyarrow()
+        self._pa = pa
+        types = {'int': pa.int64(), 'str': pa.string(), 'dict': pa.dictionary(pa.int32(), pa.string()),
+                 'timestamp': pa.timestamp('s')}
+        kinds = {name: kind for name, _, kind in EXPORT_COLUMNS}
+        self._kinds = [kinds.get(name, 'str') for name in columns]
+        self.schema = pa.schema([(name, types[kind]) for name, kind in zip(columns, self._kinds)])
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+        else:
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+
+    def write(self, rows: List[tuple]):
+        pa = self._pa
+        arrays = []
+        for idx, (kind, field) in enumerate(zip(self._kinds, self.schema)):
+            values = [row[idx] for row in rows]
+            if kind == 'timestamp':
+                values = [_parse_timestamp(value) for value in values]
+                arrays.append(pa.array(values, type=field.type))
+            elif kind == 'dict':
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+        sink = getattr(self, '_sink', None)
+        if sink is not None:
+            sink.close()
+
+
+def _parse_timestamp(value) -> Optional[datetime.datetime]:
+    if value is None:
+        return None
+    # Spiele speichern teils Sekundenbruchteile/ISO mit 'T' - fromisoformat versteht beides
+    return datetime.datetime.fromisoformat(str(value))
+
+
+def export_actions(db_manager, path: str, fmt: Optional[str] = None, game_ids: Optional[Sequence[int]] = None,
+                   team_id: Optional[int] = None, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                   chunk_size: int = EXPORT_CHUNK_ROWS) -> Dict[str, Any]:
+    """
+    Exportiert Aktionen blockweise (chunk_size Zeilen) nach Parquet, Arrow IPC oder CSV, ohne die
+    Saison im Speicher zu halten. Archivierte Spiele gehören dazu und stehen am Anfang (aus dem
+    Spaltenarchiv), danach die Tabelle actions nach action_id. Wird in eine temporäre Datei
+    geschrieben und erst am Ende umbenannt, sodass ein abgebrochener Export keine halbe Datei hinterlässt.
+    Gibt {'path', 'format', 'rows', 'archived_rows', 'chunks', 'seconds'} zurück.
+    """
+    fmt = detect_format(path, fmt)
+    if fmt != 'csv':
+        _require_pyarrow()
+    query, params = build_export_query(game_ids, team_id, date_from, date_to)
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = path + '.tmp'
+
+    started = time.perf_counter()
+    rows_written = archived_rows = chunks = 0
+    chunk_iter = db_manager.iter_query_chunks(query, params, chunk_size=chunk_size)
+    sink = None
+    try:
+        columns = next(chunk_iter)
+        sink = _CsvSink(tmp_path, columns) if fmt == 'csv' else _ArrowSink(tmp_path, columns, fmt)
+        for rows in iter_archived_rows(db_manager, game_ids, team_id, date_from, date_to, chunk_size):
+            sink.write(rows)
+            archived_rows += len(rows)
+            chunks += 1
+        for rows in chunk_iter:
+            sink.write(rows)
+            rows_written += len(rows)
+            chunks += 1
+        sink.close()
+        sink = None
+        os.replace(tmp_path, path)
+    finally:
+        chunk_iter.close()
+        if sink is not None:
+            sink.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return {
+        'path': path,
+        'format': fmt,
+        'rows': rows_written + archived_rows,
+        'archived_rows': archived_rows,
+        'chunks': chunks,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
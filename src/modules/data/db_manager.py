@@ -1,64 +1,408 @@
 # src/modules/data/db_manager.py
 
+import contextlib
 import sqlite3
 import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from .models import Player, Team, Game, Set, Action # Importiere die Modelle
-from ..config import DB_PATH # Wird später in config.py definiert
+from .query_stats import QueryStats
+from .lookup_codes import LookupCodes, LOOKUP_TABLES, seed_values
+from .search_index import SearchIndex, PLAYER, TEAM, player_name_key, tokenize
+from ..config import (DB_PATH, DB_PRAGMA_PROFILES, DB_PROFILE, QUERY_STATS_ENABLED, SLOW_QUERY_THRESHOLD_MS,
+                      SEARCH_FTS5_ENABLED, SYNC_ENABLED)
+from ..tracing import tracer
+
+# Pfad für eine reine In-Memory-Datenbank (lebt so lange wie der DBManager)
+MEMORY_DB_PATH = ":memory:"
+
+# Aktionen speichern Aktionstyp, Ergebnis, Punkt für und Punkt-Detail als Integer-Codes
+# (Lookup-Tabellen, siehe lookup_codes.py). actions_decoded liefert die Text-Werte.
+ACTIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        action_id INTEGER PRIMARY KEY AUTOINCREMENT, -- IDs archivierter Aktionen werden nie neu vergeben
+        set_id INTEGER,
+        action_type_id INTEGER NOT NULL,
+        executor_player_id INTEGER,
+        result_type_id INTEGER,
+        target_player_id INTEGER,
+        point_for_id INTEGER,
+        point_detail_type_id INTEGER,
+        timestamp TEXT NOT NULL,
+        FOREIGN KEY (set_id) REFERENCES sets (set_id),
+        FOREIGN KEY (action_type_id) REFERENCES action_types (id),
+        FOREIGN KEY (executor_player_id) REFERENCES players (player_id),
+        FOREIGN KEY (result_type_id) REFERENCES result_types (id),
+        FOREIGN KEY (target_player_id) REFERENCES players (player_id),
+        FOREIGN KEY (point_for_id) REFERENCES point_for_types (id),
+        FOREIGN KEY (point_detail_type_id) REFERENCES point_detail_types (id)
+    );
+"""
+INSERT_ACTION_SQL = """
+    INSERT INTO actions (set_id, action_type_id, executor_player_id, result_type_id,
+                         target_player_id, point_for_id, point_detail_type_id, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+ACTIONS_SCHEMA_EXTRAS = [
+    "CREATE INDEX IF NOT EXISTS idx_actions_set ON actions (set_id, action_type_id)",
+    # Satz-Lookups pro Spiel (letzter Satz im Spielkontext, nächste Satznummer)
+    "CREATE INDEX IF NOT EXISTS idx_sets_game ON sets (game_id, set_number)",
+    """
+    CREATE VIEW IF NOT EXISTS actions_decoded AS
+    SELECT a.action_id, a.set_id, at.name AS action_type, a.executor_player_id, rt.name AS result_type,
+           a.target_player_id, pf.name AS point_for, pd.name AS point_detail_type, a.timestamp
+    FROM actions a
+    JOIN action_types at ON at.id = a.action_type_id
+    LEFT JOIN result_types rt ON rt.id = a.result_type_id
+    LEFT JOIN point_for_types pf ON pf.id = a.point_for_id
+    LEFT JOIN point_detail_types pd ON pd.id = a.point_detail_type_id
+    """,
+]
+
+# Revisionszähler pro Spiel (z.B. Änderungs-Token der Stats-API): jede Änderung an Aktionen, Sätzen,
+# Aufstellung oder Spiel erhöht den Zähler des Spiels; Zeile 0 zählt Änderungen an Spielern und Teams
+# (Namen erscheinen in allen Spielen). Die Trigger laufen in der schreibenden Transaktion mit.
+STATS_REVISION_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS stats_revisions (
+        game_id INTEGER PRIMARY KEY, -- 0 = Spieler und Teams
+        revision INTEGER NOT NULL
+    );
+"""
+_BUMP_REVISION = "INSERT INTO stats_revisions (game_id, revision) {select} ON CONFLICT (game_id) DO UPDATE SET revision = revision + 1;"
+_GAMES_OF_SETS = "SELECT game_id, 1 FROM sets WHERE set_id IN ({ids})"
+_GAMES = "SELECT game_id, 1 FROM games WHERE game_id IN ({ids})"
+_ROSTER = "SELECT 0, 1 WHERE true"
+
+
+def _revision_triggers() -> List[str]:
+    events = [
+        ('actions', 'INSERT', _GAMES_OF_SETS, "NEW.set_id"),
+        ('actions', 'UPDATE', _GAMES_OF_SETS, "OLD.set_id, NEW.set_id"),
+        ('actions', 'DELETE', _GAMES_OF_SETS, "OLD.set_id"),
+        ('sets', 'INSERT', _GAMES, "NEW.game_id"),
+        ('sets', 'UPDATE', _GAMES, "OLD.game_id, NEW.game_id"),
+        ('sets', 'DELETE', _GAMES, "OLD.game_id"),
+        ('game_players', 'INSERT', _GAMES, "NEW.game_id"),
+        ('game_players', 'UPDATE', _GAMES, "OLD.game_id, NEW.game_id"),
+        ('game_players', 'DELETE', _GAMES, "OLD.game_id"),
+        ('games', 'UPDATE', _GAMES, "NEW.game_id"),
+        ('players', 'INSERT', _ROSTER, ""),
+        ('players', 'UPDATE', _ROSTER, ""),
+        ('players', 'DELETE', _ROSTER, ""),
+        ('teams', 'UPDATE', _ROSTER, ""),
+    ]
+    # Upserts wie in get_or_create_team aendern nichts, duerfen also nicht alle Antworten der API verwerfen
+    conditions = {
+        ('players', 'UPDATE'): _changed("name", "jersey_number", "team_id", "position"),
+        ('teams', 'UPDATE'): _changed("name"),
+    }
+    queries = []
+    for table, event, select, ids in events:
+        name = f"stats_revision_{table}_{event.lower()}"
+        when = conditions.get((table, event))
+        # Neu anlegen, damit geaenderte Definitionen auch in bestehenden Datenbanken ankommen
+        queries.append(f"DROP TRIGGER IF EXISTS {name}")
+        queries.append(f"CREATE TRIGGER {name} AFTER {event} ON {table} "
+                       f"{f'WHEN {when} ' if when else ''}"
+                       f"BEGIN {_BUMP_REVISION.format(select=select.format(ids=ids))} END")
+    return queries
+
+
+def _changed(*columns: str) -> str:
+    return " OR ".join(f"OLD.{column} IS NOT NEW.{column}" for column in columns)
+
+def normalize_team_name(name: str) -> str:
+    """Vergleichsschlüssel eines Teamnamens: Groß-/Kleinschreibung und Mehrfach-Leerzeichen zählen nicht."""
+    return " ".join(name.split()).casefold()
+
+
+class Transaction:
+    """
+    Offene Schreib-Transaktion aus DBManager.transaction(). Alle Statements laufen über den
+    instrumentierten Ausführungspfad des Managers (Query-Statistik, Tracing).
+    """
+
+    def __init__(self, db_manager: "DBManager", connection: sqlite3.Connection):
+        self._db = db_manager
+        self._connection = connection
+        self.discarded = False
+
+    def run(self, query: str, params: Any = (), fetch: Optional[str] = None,
+            many: bool = False) -> Tuple[Any, sqlite3.Cursor]:
+        """Wie DBManager._run: fetch None/'one'/'all', many=True für executemany. Gibt (Ergebnis, Cursor) zurück."""
+        return self._db._run(self._connection, query, params, fetch=fetch, many=many)
+
+    def discard(self):
+        """Am Ende zurückrollen statt speichern (z.B. Probelauf mit dry_run)."""
+        self.discarded = True
+
 
 class DBManager:
     """
     Verwaltet die Verbindung zur SQLite-Datenbank und führt alle
     datenbankspezifischen Operationen aus.
     """
+
+    # Fertig aufgesetztes Schema (In-Memory), Vorlage für in_memory()/temp_file()
+    _schema_template: Optional[sqlite3.Connection] = None
+    _schema_template_lock = threading.Lock()
     
-    def __init__(self, db_path: str = DB_PATH):
-        """Initialisiert den DBManager und stellt die Verbindung her."""
+    def __init__(self, db_path: str = DB_PATH, query_stats: Optional[QueryStats] = None, profile: str = DB_PROFILE):
+        """
+        Initialisiert den DBManager. Verbindungen werden erst bei Bedarf geöffnet:
+        EINE Schreibverbindung (alle Schreibzugriffe serialisiert über _write_lock)
+        und pro Thread eine eigene Leseverbindung. Unter WAL liest jede Leseverbindung
+        einen konsistenten Snapshot, ohne den Schreiber zu blockieren.
+        """
         self.db_path = db_path
-        self._connection = None
-        self._cursor = None
+        if profile not in DB_PRAGMA_PROFILES:
+            raise ValueError(f"Unbekanntes PRAGMA-Profil: {profile} (verfügbar: {', '.join(DB_PRAGMA_PROFILES)})")
+        self.profile = profile
+        # journal_mode ist in der Datei gespeichert und muss nur einmal gesetzt werden
+        self._journal_mode_applied = False
+        self._temp_path: Optional[str] = None # Von temp_file() angelegte Datei (wird in dispose() gelöscht)
         
-        # Stelle sicher, dass der Ordner existiert
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # Instrumentierung aller Queries (Anzahl, Latenz, Zeilen, Slow-Query-Log)
+        self.query_stats = query_stats or QueryStats(
+            slow_query_threshold_ms=SLOW_QUERY_THRESHOLD_MS, enabled=QUERY_STATS_ENABLED
+        )
+
+        # Text <-> Integer-Codes der Aktions-Spalten
+        self.codes = LookupCodes(self)
+        # Team-Cache: normalisierter Name -> team_id (wiederkehrende Gegner ohne DB-Zugriff)
+        self._team_ids: Dict[str, int] = {}
+        # Suchindex über Spieler und Teams (wird beim ersten Zugriff aufgebaut, danach bei jedem Schreiben gepflegt)
+        self._search_index: Optional[SearchIndex] = None
+        # Spaltenarchiv alter Spiele (siehe get_action_archive)
+        self._action_archive = None
+
+        self._write_lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._readers = threading.local() # .connection = Leseverbindung des aktuellen Threads
+        self._all_readers: List[sqlite3.Connection] = [] # Für close()
+        self._readers_lock = threading.Lock()
+
+        if db_path == MEMORY_DB_PATH:
+            # Eine In-Memory-DB existiert nur innerhalb EINER Verbindung:
+            # Schreiber und Leser teilen sich die (dauerhaft offene) Schreibverbindung.
+            self._writer = self._open_connection(is_writer=True)
+        elif os.path.dirname(self.db_path):
+            # Stelle sicher, dass der Ordner existiert
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
 
-    def connect(self):
-        """Stellt die Verbindung zur Datenbank her."""
+    @classmethod
+    def in_memory(cls, query_stats: Optional[QueryStats] = None, profile: str = DB_PROFILE) -> "DBManager":
+        """
+        Neue, isolierte In-Memory-Datenbank mit fertigem Schema (für Tests und Benchmarks).
+        Das Schema wird nur einmal pro Prozess aufgebaut und danach per Backup-API kopiert.
+        """
+        db = cls(MEMORY_DB_PATH, query_stats=query_stats, profile=profile)
+        cls._copy_schema_template(db._writer)
+        return db
+
+    @classmethod
+    def temp_file(cls, directory: Optional[str] = None, query_stats: Optional[QueryStats] = None,
+                  profile: str = DB_PROFILE) -> "DBManager":
+        """Neue Datenbank in einer temporären Datei mit fertigem Schema (wird in dispose() gelöscht)."""
+        fd, path = tempfile.mkstemp(prefix="volley_", suffix=".db", dir=directory)
+        os.close(fd)
+        connection = sqlite3.connect(path)
+        try:
+            cls._copy_schema_template(connection)
+        finally:
+            connection.close()
+        db = cls(path, query_stats=query_stats, profile=profile)
+        db._temp_path = path
+        return db
+
+    @classmethod
+    def _copy_schema_template(cls, target: sqlite3.Connection):
+        with cls._schema_template_lock:
+            if cls._schema_template is None:
+                template = cls(MEMORY_DB_PATH, query_stats=QueryStats(enabled=False), profile='default')
+                template.setup_database()
+                cls._schema_template = template._writer
+            cls._schema_template.backup(target)
+
+    # --- VERBINDUNGEN ---
+
+    def _open_connection(self, is_writer: bool) -> sqlite3.Connection:
+        """Öffnet eine Verbindung mit dem PRAGMA-Profil des Managers."""
         try:
-            self._connection = sqlite3.connect(self.db_path)
-            self._cursor = self._connection.cursor()
+            # check_same_thread=False: die Schreibverbindung wird (serialisiert) aus mehreren
+            # Threads benutzt; Leseverbindungen bleiben über threading.local an ihren Thread gebunden.
+            connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._apply_pragmas(connection, is_writer)
+            # Derselbe Namensvergleich wie im Suchindex, auch in SQL (COLLATE NOCASE kennt nur ASCII)
+            connection.create_function('player_name_key', 1, player_name_key, deterministic=True)
+            return connection
         except sqlite3.Error as e:
             print(f"Datenbankverbindungsfehler: {e}")
             raise
 
+    def _apply_pragmas(self, connection: sqlite3.Connection, is_writer: bool = True):
+        """Wendet das PRAGMA-Profil (config.DB_PRAGMA_PROFILES) auf eine neue Verbindung an."""
+        for pragma, value in DB_PRAGMA_PROFILES[self.profile].items():
+            if pragma == 'journal_mode':
+                # Der Wechsel des Journal-Modus ist ein Schreibvorgang -> nur der Schreiber, nur einmal
+                if not is_writer or self._journal_mode_applied:
+                    continue
+                self._journal_mode_applied = True
+            connection.execute(f"PRAGMA {pragma} = {value}")
+
+    @contextlib.contextmanager
+    def _write_connection(self):
+        """Exklusiver Zugriff auf die einzige Schreibverbindung (serialisierter Writer)."""
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open_connection(is_writer=True)
+            yield self._writer
+
+    @contextlib.contextmanager
+    def _read_connection(self):
+        """Leseverbindung des aktuellen Threads (wird beim ersten Zugriff geöffnet)."""
+        if self.db_path == MEMORY_DB_PATH:
+            with self._write_connection() as connection:
+                yield connection
+            return
+
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            connection = self._open_connection(is_writer=False)
+            self._readers.connection = connection
+            with self._readers_lock:
+                self._all_readers.append(connection)
+        yield connection
+
+    @contextlib.contextmanager
+    def transaction(self, immediate: bool = False):
+        """
+        Schreib-Transaktion auf der Schreibverbindung: BEGIN (bzw. BEGIN IMMEDIATE, wenn die
+        Schreibsperre sofort gebraucht wird), am Ende COMMIT, bei jeder Ausnahme ROLLBACK und
+        Weiterreichen. Liefert ein Transaction-Objekt; transaction.discard() rollt am Ende zurück.
+        """
+        with self._write_connection() as connection:
+            self._run(connection, "BEGIN IMMEDIATE" if immediate else "BEGIN")
+            transaction = Transaction(self, connection)
+            try:
+                yield transaction
+                if transaction.discarded:
+                    connection.rollback()
+                else:
+                    connection.commit()
+            except BaseException:
+                connection.rollback()
+                raise
+
+    def invalidate_roster_caches(self):
+        """Nach Änderungen an Teams/Spielern an der API vorbei: Team-IDs und Suchindex neu laden."""
+        self._team_ids.clear()
+        self._search_index = None
+
     def close(self):
-        """Schließt die Verbindung zur Datenbank."""
-        if self._connection:
-            self._connection.close()
-            self._connection = None
-            self._cursor = None
+        """Schließt alle Lese- und die Schreibverbindung (eine In-Memory-Verbindung bleibt offen)."""
+        with self._readers_lock:
+            readers, self._all_readers = self._all_readers, []
+            self._readers = threading.local()
+        for connection in readers:
+            connection.close()
+        if self.db_path != MEMORY_DB_PATH:
+            with self._write_lock:
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+
+    def dispose(self):
+        """Gibt eine In-Memory-Datenbank frei bzw. löscht die Datei einer temp_file()-Datenbank."""
+        self.close()
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        if self._temp_path:
+            for path in (self._temp_path, self._temp_path + "-wal", self._temp_path + "-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._temp_path = None
+
+    # --- AUSFÜHRUNG ---
+
+    def _run(self, connection: sqlite3.Connection, query: str, params: Any = (),
+             fetch: Optional[str] = None, many: bool = False) -> Tuple[Any, sqlite3.Cursor]:
+        """
+        Zentraler, instrumentierter Ausführungspfad für ALLE Statements.
+        fetch: None, 'one' oder 'all'. Bei many=True ist params eine Folge von
+        Parameter-Tupeln (executemany). Gibt (Ergebnis, Cursor) zurück.
+        """
+        start = time.perf_counter()
+        cursor = connection.cursor()
+        try:
+            with tracer.span("db.query", cat="db", sql=query):
+                if many:
+                    cursor.executemany(query, params)
+                    params = () # Für den Query-Plan reicht das Statement ohne Werte
+                else:
+                    cursor.execute(query, params)
+                if fetch == 'all':
+                    result = cursor.fetchall()
+                    rows = len(result)
+                elif fetch == 'one':
+                    result = cursor.fetchone()
+                    rows = 0 if result is None else 1
+                else:
+                    result = None
+                    rows = max(cursor.rowcount, 0) # Betroffene Zeilen bei INSERT/UPDATE/DELETE
+        except sqlite3.Error:
+            self.query_stats.record_error(query)
+            raise
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        self.query_stats.record(query, params, duration_ms, rows,
+                                explain=lambda: self._explain_query_plan(connection, query, params))
+        return result, cursor
+
+    def _explain_query_plan(self, connection: sqlite3.Connection, query: str, params: Any = ()) -> List[Tuple]:
+        """Liefert EXPLAIN QUERY PLAN für DML-Statements (für das Slow-Query-Log)."""
+        if not params and "?" in query:
+            return [] # executemany: ohne Parameter nicht planbar
+        if not query.lstrip().upper().startswith(("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")):
+            return []
+        return connection.execute("EXPLAIN QUERY PLAN " + query, params).fetchall()
 
     def execute_query(self, query: str, params: tuple = (), fetch_id: bool = False):
         """
-        Führt einen beliebigen SQL-Query aus.
+        Führt einen beliebigen SQL-Query über die Schreibverbindung aus (eine Transaktion).
         Gibt bei fetch_id=True die ID des zuletzt eingefügten Datensatzes zurück.
         """
-        try:
-            self.connect()
-            self._cursor.execute(query, params)
-            
-            if fetch_id:
+        with self._write_connection() as connection:
+            try:
+                _, cursor = self._run(connection, query, params)
                 # KRITISCHER SCHRITT: Speichere die ID vor dem Commit
-                last_id = self._cursor.lastrowid 
-                self._connection.commit()
-                return last_id # Gebe die ID zurück
-            else:
-                self._connection.commit()
-                return True
-                
-        except sqlite3.Error as e:
-            print(f"SQL-Fehler bei Query: '{query}' mit Params {params}: {e}")
-            return False if not fetch_id else None # Gebe None zurück, falls ID erwartet wird und Fehler auftritt
-        finally:
-            self.close()
+                last_id = cursor.lastrowid
+                connection.commit()
+                return last_id if fetch_id else True
+            except sqlite3.Error as e:
+                print(f"SQL-Fehler bei Query: '{query}' mit Params {params}: {e}")
+                connection.rollback()
+                return False if not fetch_id else None # Gebe None zurück, falls ID erwartet wird und Fehler auftritt
+
+    def execute_many(self, query: str, seq_of_params) -> int:
+        """
+        Führt ein Statement für viele Parameter-Tupel in EINER Transaktion aus (executemany).
+        Gibt die Anzahl der betroffenen Zeilen zurück, bei Fehler 0 (Rollback).
+        """
+        with self._write_connection() as connection:
+            try:
+                _, cursor = self._run(connection, query, seq_of_params, many=True)
+                rows = max(cursor.rowcount, 0)
+                connection.commit()
+                return rows
+            except sqlite3.Error as e:
+                print(f"SQL-Fehler bei executemany: '{query}': {e}")
+                connection.rollback()
+                return 0
 
     def setup_database(self):
         """Erstellt alle notwendigen Tabellen und führt eine einmalige Migration durch."""
@@ -91,7 +435,8 @@ class DBManager:
             """
             CREATE TABLE IF NOT EXISTS teams (
                 team_id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL UNIQUE
+                name TEXT NOT NULL UNIQUE,
+                name_key TEXT -- normalize_team_name(name), eindeutig über idx_teams_name_key
             );
             """,
             """
@@ -124,40 +469,250 @@ class DBManager:
                 FOREIGN KEY (game_id) REFERENCES games (game_id)
             );
             """,
+            # Aufstellung eines Spiels (im StartGameDialog gewählt); slot = Reihenfolge der Auswahl
+            """
+            CREATE TABLE IF NOT EXISTS game_players (
+                game_id INTEGER NOT NULL,
+                player_id INTEGER NOT NULL,
+                slot INTEGER NOT NULL,
+                PRIMARY KEY (game_id, player_id),
+                FOREIGN KEY (game_id) REFERENCES games (game_id),
+                FOREIGN KEY (player_id) REFERENCES players (player_id)
+            ) WITHOUT ROWID;
+            """,
+            # Manifest des Spaltenarchivs (siehe action_archive.py): aktuelle Generation je Saison
+            # und Lage der Aktionen jedes archivierten Spiels in den Saison-Dateien
+            """
+            CREATE TABLE IF NOT EXISTS archive_seasons (
+                season TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL,
+                row_count INTEGER NOT NULL
+            );
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS archived_games (
+                game_id INTEGER PRIMARY KEY,
+                season TEXT NOT NULL,
+                row_start INTEGER NOT NULL,
+                row_count INTEGER NOT NULL,
+                archived_at TEXT NOT NULL,
+                FOREIGN KEY (game_id) REFERENCES games (game_id),
+                FOREIGN KEY (season) REFERENCES archive_seasons (season)
+            );
+            """,
+            # Importierte Spiel-Pakete (siehe game_package.py): derselbe Inhalt wird nur einmal importiert
             """
-            CREATE TABLE IF NOT EXISTS actions (
-                action_id INTEGER PRIMARY KEY,
-                set_id INTEGER,
-                action_type TEXT NOT NULL,
-                executor_player_id INTEGER,
-                result_type TEXT,
-                target_player_id INTEGER,
-                point_for TEXT,
-                point_detail_type TEXT, -- <<< NEUE SPALTE HIER ENTHALTEN
-                timestamp TEXT NOT NULL,
-                FOREIGN KEY (set_id) REFERENCES sets (set_id),
-                FOREIGN KEY (executor_player_id) REFERENCES players (player_id),
-                FOREIGN KEY (target_player_id) REFERENCES players (player_id)
+            CREATE TABLE IF NOT EXISTS imported_packages (
+                package_id TEXT PRIMARY KEY,
+                game_id INTEGER NOT NULL,
+                imported_at TEXT NOT NULL,
+                FOREIGN KEY (game_id) REFERENCES games (game_id)
+            );
+            """,
+        ]
+        # Lookup-Tabellen für die kodierten Spalten der Aktionen (siehe lookup_codes.py)
+        queries += [
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
             );
             """
+            for table in LOOKUP_TABLES.values()
         ]
         
         # Führt die CREATE TABLE IF NOT EXISTS Abfragen aus
         for query in queries:
             self.execute_query(query)
+        self._migrate_team_name_keys()
+        if SEARCH_FTS5_ENABLED:
+            self._setup_search_fts()
+
+        # Startwerte der Lookup-Tabellen (Reihenfolge aus config.py = Codes einer neuen DB)
+        for kind, names in seed_values().items():
+            self.execute_many(f"INSERT OR IGNORE INTO {LOOKUP_TABLES[kind]} (name) VALUES (?)", [(n,) for n in names])
+
+        columns = [row[1] for row in self.execute_query_fetch_all("PRAGMA table_info(actions)")]
+        if 'action_type' in columns:
+            self._migrate_actions_to_codes()
+        else:
+            self.execute_query(ACTIONS_TABLE_SQL.format(table="actions"))
+        actions_rebuilt = self._migrate_actions_autoincrement()
+        for query in ACTIONS_SCHEMA_EXTRAS + [STATS_REVISION_TABLE_SQL] + _revision_triggers():
+            self.execute_query(query)
+        self.codes.reset()
+        # Nach dem Umbau von actions fehlen die Trigger eines schon eingerichteten Abgleichs
+        sync_installed = actions_rebuilt and self.execute_query_fetch_one(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sync_state'") is not None
+        if SYNC_ENABLED or sync_installed:
+            from .sync import DeltaSync # Trigger brauchen die fertige Tabelle actions
+            DeltaSync(self).enable()
+
+    def _migrate_team_name_keys(self):
+        """
+        Ergänzt name_key in bestehenden Datenbanken und legt den eindeutigen Index an.
+        Kollidieren zwei alte Namen nach der Normalisierung, behält das ältere Team den Schlüssel
+        (das jüngere bleibt ohne Schlüssel und wird nicht mehr als Gegner wiederverwendet).
+        """
+        columns = [row[1] for row in self.execute_query_fetch_all("PRAGMA table_info(teams)")]
+        if 'name_key' not in columns:
+            self.execute_query("ALTER TABLE teams ADD COLUMN name_key TEXT")
+        missing = self.execute_query_fetch_all("SELECT team_id, name FROM teams WHERE name_key IS NULL ORDER BY team_id")
+        if missing:
+            taken = {row[0] for row in self.execute_query_fetch_all("SELECT name_key FROM teams WHERE name_key IS NOT NULL")}
+            updates = []
+            for team_id, name in missing:
+                key = normalize_team_name(name)
+                if key not in taken:
+                    taken.add(key)
+                    updates.append((key, team_id))
+            self.execute_many("UPDATE teams SET name_key = ? WHERE team_id = ?", updates)
+        self.execute_query("CREATE UNIQUE INDEX IF NOT EXISTS idx_teams_name_key ON teams (name_key)")
+        # Auswertungen pro Gegner
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_games_guest ON games (guest_team_id)")
+        # Kader pro Team (Import-Abgleich, Trikotnummern)
+        self.execute_query("CREATE INDEX IF NOT EXISTS idx_players_team ON players (team_id, jersey_number)")
+        self._team_ids.clear()
+
+    def _migrate_actions_to_codes(self):
+        """
+        Einmalige Migration: Text-Spalten der Aktionen -> Integer-Codes der Lookup-Tabellen.
+        Läuft in EINER Transaktion; die Datenbank wird danach per VACUUM verkleinert.
+        """
+        print("Migriere Aktionen auf kodierte Spalten...")
+        with self._write_connection() as connection:
+            try:
+                self._run(connection, "BEGIN")
+                for kind, table in LOOKUP_TABLES.items():
+                    self._run(connection, f"INSERT OR IGNORE INTO {table} (name) "
+                                          f"SELECT DISTINCT {kind} FROM actions WHERE {kind} IS NOT NULL")
+                self._run(connection, "ALTER TABLE actions RENAME TO actions_legacy")
+                self._run(connection, ACTIONS_TABLE_SQL.format(table="actions"))
+                self._run(connection, """
+                    INSERT INTO actions (action_id, set_id, action_type_id, executor_player_id, result_type_id,
+                                         target_player_id, point_for_id, point_detail_type_id, timestamp)
+                    SELECT l.action_id, l.set_id, at.id, l.executor_player_id, rt.id,
+                           l.target_player_id, pf.id, pd.id, l.timestamp
+                    FROM actions_legacy l
+                    JOIN action_types at ON at.name = l.action_type
+                    LEFT JOIN result_types rt ON rt.name = l.result_type
+                    LEFT JOIN point_for_types pf ON pf.name = l.point_for
+                    LEFT JOIN point_detail_types pd ON pd.name = l.point_detail_type
+                """)
+                self._run(connection, "DROP TABLE actions_legacy")
+                connection.commit()
+            except sqlite3.Error as e:
+                connection.rollback()
+                print(f"Migrationsfehler (Aktionen bleiben unverändert): {e}")
+                raise
+            self._run(connection, "VACUUM")
+
+    def _migrate_actions_autoincrement(self) -> bool:
+        """
+        Einmalige Migration: action_id mit AUTOINCREMENT. Ohne vergibt SQLite nach dem Archivieren
+        (die Aktionen sind aus actions gelöscht) wieder IDs, die im Archiv stecken, und das
+        Zurückholen scheitert. Der Zähler (sqlite_sequence) beginnt hinter der höchsten ID in
+        actions und im Archiv. Gibt True zurück, wenn die Tabelle umgebaut wurde.
+        """
+        row = self.execute_query_fetch_one("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'actions'")
+        if row is None or 'AUTOINCREMENT' in row[0].upper():
+            return False
+        print("Migriere Aktionen auf fortlaufende IDs (AUTOINCREMENT)...")
+        archived_max = 0
+        if self.execute_query_fetch_one("SELECT 1 FROM archive_seasons WHERE row_count > 0 LIMIT 1"):
+            archived_max = self.get_action_archive().max_action_id()
+        columns = ("action_id, set_id, action_type_id, executor_player_id, result_type_id, target_player_id, "
+                   "point_for_id, point_detail_type_id, timestamp")
+        with self.transaction() as transaction:
+            # View, Indizes und Trigger hängen an der alten Tabelle und werden danach neu angelegt
+            transaction.run("DROP VIEW IF EXISTS actions_decoded")
+            transaction.run(ACTIONS_TABLE_SQL.format(table="actions_autoincrement"))
+            transaction.run(f"INSERT INTO actions_autoincrement ({columns}) SELECT {columns} FROM actions ORDER BY action_id")
+            transaction.run("DROP TABLE actions")
+            transaction.run("ALTER TABLE actions_autoincrement RENAME TO actions")
+            transaction.run("INSERT INTO sqlite_sequence (name, seq) SELECT 'actions', 0 "
+                            "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'actions')")
+            transaction.run("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'actions'", (archived_max,))
+        return True
 
     def execute_query_fetch_all(self, query: str, params: tuple = ()) -> List[Tuple]:
-        """Führt einen Query aus und holt alle Ergebnisse."""
+        """Führt einen Query auf der Leseverbindung des Threads aus und holt alle Ergebnisse."""
         try:
-            self.connect()
-            self._cursor.execute(query, params)
-            results = self._cursor.fetchall()
-            return results
+            with self._read_connection() as connection:
+                return self._run(connection, query, params, fetch='all')[0]
         except sqlite3.Error as e:
             print(f"SQL-Fehler beim Fetchen: {e}")
             return []
+
+    def execute_query_fetch_one(self, query: str, params: tuple = ()) -> Optional[Tuple]:
+        """Führt einen Query auf der Leseverbindung des Threads aus und holt die erste Ergebniszeile (oder None)."""
+        try:
+            with self._read_connection() as connection:
+                return self._run(connection, query, params, fetch='one')[0]
+        except sqlite3.Error as e:
+            print(f"SQL-Fehler beim Fetchen: {e}")
+            return None
+
+    def iter_query_chunks(self, query: str, params: tuple = (), chunk_size: int = 10000):
+        """
+        Führt einen Query auf der Leseverbindung aus und liefert das Ergebnis stückweise:
+        zuerst die Spaltennamen, danach Listen von höchstens chunk_size Zeilen (fetchmany).
+        So bleibt der Speicherbedarf auch bei ganzen Saisons konstant. Unter WAL sieht der
+        Generator einen konsistenten Snapshot, blockiert die Erfassung aber nicht.
+        """
+        with self._read_connection() as connection:
+            _, cursor = self._run(connection, query, params)
+            try:
+                yield [desc[0] for desc in cursor.description]
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
+
+    def read_sql_query(self, query: str, params: tuple = (), categorical: Optional[Dict[str, str]] = None):
+        """
+        Führt einen Query aus und gibt das Ergebnis als pandas DataFrame zurück.
+        Läuft über denselben instrumentierten Pfad wie alle anderen Queries.
+        categorical: {Spalte: Lookup-Art} - diese Spalten enthalten Integer-Codes und
+        werden ohne String-Umweg direkt zu pandas Categoricals.
+        """
+        import pandas as pd # Nur die Statistik braucht pandas
+
+        try:
+            with self._read_connection() as connection:
+                rows, cursor = self._run(connection, query, params, fetch='all')
+            columns = [desc[0] for desc in cursor.description]
+            return self._frame_from_rows(rows, columns, categorical)
+        except sqlite3.Error as e:
+            print(f"SQL-Fehler beim Laden des DataFrames: {e}")
+            return pd.DataFrame()
+
+    def read_sql_chunks(self, query: str, params: tuple = (), chunk_size: int = 10000,
+                        categorical: Optional[Dict[str, str]] = None):
+        """
+        Wie read_sql_query, liefert das Ergebnis aber als Folge von DataFrames mit höchstens
+        chunk_size Zeilen (über iter_query_chunks). Für Auswertungen über ganze Saisons,
+        die Block für Block zusammengefasst werden können.
+        """
+        chunk_iter = self.iter_query_chunks(query, params, chunk_size=chunk_size)
+        try:
+            columns = next(chunk_iter)
+            for rows in chunk_iter:
+                yield self._frame_from_rows(rows, columns, categorical)
         finally:
-            self.close()
+            chunk_iter.close()
+
+    def _frame_from_rows(self, rows: List[tuple], columns: List[str], categorical: Optional[Dict[str, str]] = None):
+        import pandas as pd
+
+        df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+        for column, kind in (categorical or {}).items():
+            codes = df[column].fillna(0).astype("int64") - 1 # Code 1 -> Position 0, NULL -> -1 (NaN)
+            df[column] = pd.Categorical.from_codes(codes, categories=self.codes.categories(kind))
+        return df
 
     # --- Beispiel CRUD-Methode (Weitere folgen nach Bedarf) ---
     # src/modules/data/db_manager.py (Auszug)
@@ -172,75 +727,150 @@ class DBManager:
         
         Die point_for und point_detail_type werden direkt aus dem Action-Objekt geholt.
         """
-        # NEU: 'point_detail_type' ist nun in der SQL-Abfrage enthalten.
-        query = """
-        INSERT INTO actions (set_id, action_type, executor_player_id, result_type, 
-                             target_player_id, point_for, point_detail_type, timestamp) 
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """
-        params = (
+        return self.execute_query(INSERT_ACTION_SQL, self._action_params(action), fetch_id=fetch_id)
+
+    def insert_actions(self, actions: List[Action]) -> int:
+        """Fügt viele Aktionen in EINER Transaktion ein (executemany). Gibt die Anzahl zurück."""
+        return self.execute_many(INSERT_ACTION_SQL, [self._action_params(a) for a in actions])
+
+    def _action_params(self, action: Action) -> Tuple:
+        encode = self.codes.encode
+        return (
             action.set_id, 
-            action.action_type, 
+            encode('action_type', action.action_type), 
             action.executor_player_id, 
-            action.result_type,
+            encode('result_type', action.result_type),
             action.target_player_id, 
-            action.point_for, 
-            action.point_detail_type, # NEU: Übergabe des Detail-Typs
+            encode('point_for', action.point_for), 
+            encode('point_detail_type', action.point_detail_type),
             action.timestamp.strftime("%Y-%m-%d %H:%M:%S")
         )
-        # fetch_id wird korrekt an execute_query weitergeleitet
-        return self.execute_query(query, params, fetch_id=fetch_id)
     
     def get_player_details_by_team(self, team_id: int) -> Dict[int, str]:
         """Holt Spielerdetails nur für ein bestimmtes Team."""
         query = "SELECT player_id, name FROM players WHERE team_id = ?"
-        try:
-            self.connect()
-            self._cursor.execute(query, (team_id,))
-            results = self._cursor.fetchall()
-            self.close()
-            return {row[0]: row[1] for row in results}
-        except:
-            return {}
+        results = self.execute_query_fetch_all(query, (team_id,))
+        return {row[0]: row[1] for row in results}
         
     def insert_team(self, name: str) -> int:
-        """Fügt ein neues Team ein und gibt dessen ID zurück."""
-        query = "INSERT INTO teams (name) VALUES (?)"
-        return self.execute_query(query, (name,), fetch_id=True) # fetch_id muss im execute_query implementiert sein
+        """Fügt ein neues Team ein und gibt dessen ID zurück (Fehler, wenn der Name schon existiert)."""
+        query = "INSERT INTO teams (name, name_key) VALUES (?, ?)"
+        team_id = self.execute_query(query, (name, normalize_team_name(name)), fetch_id=True) # fetch_id muss im execute_query implementiert sein
+        if team_id:
+            self._team_ids[normalize_team_name(name)] = team_id
+            if self._search_index is not None:
+                self._search_index.add_team(team_id, name)
+        return team_id
+
+    def get_or_create_team(self, name: str) -> Optional[int]:
+        """
+        Gibt die ID des Teams mit diesem (normalisierten) Namen zurück und legt es bei Bedarf an.
+        Wiederkehrende Gegner kommen aus dem Cache; sonst löst EIN Upsert-Statement
+        (INSERT ... ON CONFLICT ... RETURNING) Anlegen und Nachschlagen gemeinsam.
+        """
+        key = normalize_team_name(name)
+        if not key:
+            print("Fehler: Teamname darf nicht leer sein.")
+            return None
+        team_id = self._team_ids.get(key)
+        if team_id is not None:
+            return team_id
+        display_name = " ".join(name.split())
+
+        query = """
+            INSERT INTO teams (name, name_key) VALUES (?, ?)
+            ON CONFLICT (name_key) DO UPDATE SET name_key = excluded.name_key
+            RETURNING team_id
+        """
+        with self._write_connection() as connection:
+            try:
+                row, _ = self._run(connection, query, (display_name, key), fetch='one')
+                connection.commit()
+            except sqlite3.Error as e:
+                # z.B. exakter Name eines alten Teams ohne Schlüssel (siehe _migrate_team_name_keys)
+                connection.rollback()
+                row, _ = self._run(connection, "SELECT team_id FROM teams WHERE name = ?", (display_name,), fetch='one')
+                if row is None:
+                    print(f"SQL-Fehler beim Anlegen des Teams '{name}': {e}")
+                    return None
+        self._team_ids[key] = row[0]
+        if self._search_index is not None and row[0] not in self._search_index.teams:
+            self._search_index.add_team(row[0], display_name)
+        return row[0]
+
+    def find_team_id(self, name: str) -> Optional[int]:
+        """ID des Teams mit diesem (normalisierten) Namen oder None - legt im Gegensatz zu get_or_create_team nichts an."""
+        key = normalize_team_name(name)
+        team_id = self._team_ids.get(key)
+        if team_id is None:
+            row = self.execute_query_fetch_one("SELECT team_id FROM teams WHERE name_key = ?", (key,))
+            team_id = row[0] if row else None
+        return team_id
 
     def get_all_teams(self) -> Dict[int, str]:
         """Holt alle Teams {id: name} aus der Datenbank."""
         query = "SELECT team_id, name FROM teams"
-        try:
-            self.connect()
-            self._cursor.execute(query)
-            results = self._cursor.fetchall()
-            self.close()
-            return {row[0]: row[1] for row in results}
-        except:
-            return {}
+        results = self.execute_query_fetch_all(query)
+        return {row[0]: row[1] for row in results}
 
     def get_team_players(self, team_id: int) -> List[Tuple[int, str, Optional[int]]]:
         """Holt alle Spieler eines bestimmten Teams (ID, Name, Trikotnummer)."""
         # KRITISCH: Trikotnummer zur Abfrage hinzugefügt
         query = "SELECT player_id, name, jersey_number FROM players WHERE team_id = ?"
-        try:
-            self.connect()
-            self._cursor.execute(query, (team_id,))
-            results = self._cursor.fetchall()
-            self.close()
-            # Das zurückgegebene Tupel hat jetzt 3 Elemente: (ID, Name, Jersey_Number)
-            return results
-        except Exception as e:
-            # Fehlerbehandlung
-            print(f"Fehler beim Abrufen der Teamspieler: {e}")
-            return []
+        # Das zurückgegebene Tupel hat jetzt 3 Elemente: (ID, Name, Jersey_Number)
+        return self.execute_query_fetch_all(query, (team_id,))
+
+    def get_team_rosters(self) -> Dict[int, List[Tuple[int, str, Optional[int]]]]:
+        """
+        Spieler aller Teams mit EINER Abfrage: {team_id: [(ID, Name, Trikotnummer), ...]}.
+        Teams ohne Spieler sind mit leerer Liste enthalten.
+        """
+        query = """
+            SELECT t.team_id, p.player_id, p.name, p.jersey_number
+            FROM teams t
+            LEFT JOIN players p ON p.team_id = t.team_id
+            ORDER BY t.team_id, p.player_id
+        """
+        rosters: Dict[int, List[Tuple[int, str, Optional[int]]]] = {}
+        for team_id, player_id, name, jersey_number in self.execute_query_fetch_all(query):
+            roster = rosters.setdefault(team_id, [])
+            if player_id is not None:
+                roster.append((player_id, name, jersey_number))
+        return rosters
 
     def update_player_team(self, player_id: int, team_id: int):
         """Weist einem Spieler ein Team zu."""
         query = "UPDATE players SET team_id = ? WHERE player_id = ?"
-        self.execute_query(query, (team_id, player_id))
-        
+        if self.execute_query(query, (team_id, player_id)) and self._search_index is not None:
+            self._search_index.set_player_team(player_id, team_id)
+
+    def apply_team_assignment(self, team_id: int, assign_ids: List[int], unassign_ids: List[int]) -> Optional[int]:
+        """
+        Übernimmt die geänderte Zuweisung eines Teams in EINER Transaktion: assign_ids kommen in das Team,
+        unassign_ids werden teamlos (nur falls sie noch in diesem Team sind).
+        Gibt die Anzahl der geänderten Spieler zurück, None bei Fehler (dann bleibt alles unverändert).
+        """
+        if not assign_ids and not unassign_ids:
+            return 0
+        with self._write_connection() as connection:
+            try:
+                _, assigned = self._run(connection, "UPDATE players SET team_id = ? WHERE player_id = ? AND team_id IS NOT ?",
+                                        [(team_id, player_id, team_id) for player_id in assign_ids], many=True)
+                _, unassigned = self._run(connection, "UPDATE players SET team_id = NULL WHERE player_id = ? AND team_id = ?",
+                                          [(player_id, team_id) for player_id in unassign_ids], many=True)
+                connection.commit()
+            except sqlite3.Error as e:
+                print(f"SQL-Fehler beim Speichern der Zuweisung für Team {team_id}: {e}")
+                connection.rollback()
+                return None
+        if self._search_index is not None:
+            for player_id in assign_ids:
+                self._search_index.set_player_team(player_id, team_id)
+            for player_id in unassign_ids:
+                if self._search_index.players.get(player_id, (None, None, None))[2] == team_id:
+                    self._search_index.set_player_team(player_id, None)
+        return max(assigned.rowcount, 0) + max(unassigned.rowcount, 0)
+
     def get_all_players_details(self) -> List[Tuple[int, str, Optional[int], Optional[str], int]]:
         """
         Holt ALLE Spielerdetails (ID, Name, Nr., Pos., Team-ID) für die Verwaltung.
@@ -256,14 +886,8 @@ class DBManager:
     def get_player_name_by_id(self, player_id: int) -> str:
         """Gibt den Namen eines Spielers basierend auf der ID zurück."""
         query = "SELECT name FROM players WHERE player_id = ?"
-        try:
-            self.connect()
-            self._cursor.execute(query, (player_id,))
-            result = self._cursor.fetchone()
-            self.close()
-            return result[0] if result else "Unbekannt"
-        except:
-            return "Unbekannt"
+        result = self.execute_query_fetch_one(query, (player_id,))
+        return result[0] if result else "Unbekannt"
 
     def fetch_setting_actions(self, game_id: int) -> List[Tuple]:
         """
@@ -278,10 +902,54 @@ class DBManager:
         JOIN sets s ON a.set_id = s.set_id
         WHERE 
             s.game_id = ? AND 
-            a.action_type = 'Zuspiel'
+            a.action_type_id = ?
+        """
+        # Wir verwenden die ID des Spiels und den Code von 'Zuspiel' als Parameter
+        return self.execute_query_fetch_all(query, (game_id, self.codes.encode('action_type', 'Zuspiel')))
+
+    def save_game_players(self, game_id: int, player_ids: List[int]) -> bool:
+        """Speichert die Aufstellung eines Spiels (ersetzt eine vorhandene) in EINER Transaktion."""
+        with self._write_connection() as connection:
+            try:
+                self._run(connection, "DELETE FROM game_players WHERE game_id = ?", (game_id,))
+                self._run(connection, "INSERT INTO game_players (game_id, player_id, slot) VALUES (?, ?, ?)",
+                          [(game_id, player_id, slot) for slot, player_id in enumerate(player_ids)], many=True)
+                connection.commit()
+                return True
+            except sqlite3.Error as e:
+                print(f"SQL-Fehler beim Speichern der Aufstellung von Spiel {game_id}: {e}")
+                connection.rollback()
+                return False
+
+    def get_game_context(self, game_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Lädt Spiel, letzten Satz und Aufstellung (mit Namen) in EINER Abfrage.
+        Spiele ohne gespeicherte Aufstellung (vor game_players) liefern den ganzen Heim-Kader.
+        Gibt None zurück, wenn das Spiel nicht existiert.
+        """
+        query = """
+        SELECT g.home_team_id, s.set_id, s.set_number, s.score_own, s.score_opponent,
+               p.player_id, p.name, gp.slot
+        FROM games g
+        LEFT JOIN sets s ON s.set_id = (
+            SELECT set_id FROM sets WHERE game_id = g.game_id ORDER BY set_number DESC LIMIT 1)
+        LEFT JOIN game_players gp ON gp.game_id = g.game_id
+        LEFT JOIN players p ON p.player_id = gp.player_id
+                            OR (gp.player_id IS NULL AND p.team_id = g.home_team_id)
+        WHERE g.game_id = ?
+        ORDER BY gp.slot, p.player_id
         """
-        # Wir verwenden die ID des Spiels als Parameter
-        return self.execute_query_fetch_all(query, (game_id,))
+        rows = self.execute_query_fetch_all(query, (game_id,))
+        if not rows:
+            return None
+        home_team_id, set_id, set_number, score_own, score_opponent = rows[0][:5]
+        return {
+            'game_id': game_id,
+            'home_team_id': home_team_id,
+            'latest_set': (set_id, set_number, score_own, score_opponent) if set_id is not None else None,
+            'lineup': [(player_id, name) for *_, player_id, name, _slot in rows if player_id is not None],
+            'lineup_saved': rows[0][7] is not None,
+        }
 
     def get_all_games(self) -> List[Tuple[int, str, str]]:
         """Holt alle Spiele (ID, Datum/Zeit, Heim-Team-Name, Gast-Team-Name) ab."""
@@ -296,41 +964,102 @@ class DBManager:
         JOIN teams tg ON g.guest_team_id = tg.team_id
         ORDER BY g.date_time DESC
         """
-        try:
-            self.connect()
-            self._cursor.execute(query)
-            results = self._cursor.fetchall()
-            self.close()
-            # Das Ergebnis ist eine Liste von Tupeln: (ID, Datum, Heimname, Gastname)
-            return results
-        except Exception as e:
-            print(f"Fehler beim Laden aller Spiele: {e}")
-            return []
+        # Das Ergebnis ist eine Liste von Tupeln: (ID, Datum, Heimname, Gastname)
+        return self.execute_query_fetch_all(query)
         
-    def check_player_uniqueness(self, name: str, jersey_number: int, player_id: Optional[int] = None) -> bool:
+    def check_player_uniqueness(self, name: str, jersey_number: Optional[int], player_id: Optional[int] = None,
+                                team_id: Optional[int] = None) -> bool:
         """
-        Prüft, ob ein Spieler mit demselben Namen ODER derselben Trikotnummer bereits existiert.
-        Schließt optional den aktuellen player_id beim Bearbeiten aus.
+        Prüft, ob im Team bereits ein anderer Spieler denselben Namen ODER dieselbe Trikotnummer hat.
+        Ohne team_id gilt beim Bearbeiten das aktuelle Team des Spielers (player_id wird ausgeschlossen).
+        Spieler ohne Team sind immer eindeutig. Läuft über den Suchindex, ohne Datenbankzugriff.
         Gibt True zurück, wenn die Kombination eindeutig ist.
         """
-        query = """
-            SELECT COUNT(*) FROM players 
-            WHERE (name = ? OR jersey_number = ?) 
-            AND player_id != ?
+        index = self.get_search_index()
+        if team_id is None and player_id is not None:
+            team_id = index.players.get(player_id, (None, None, None))[2]
+        return (index.name_owner(team_id, name, player_id) is None
+                and index.jersey_owner(team_id, jersey_number, player_id) is None)
+
+    # --- ARCHIV ---
+
+    def get_action_archive(self):
+        """Spaltenarchiv der Aktionen abgeschlossener Spiele (Ordner neben der Datenbankdatei)."""
+        if self._action_archive is None:
+            from .action_archive import ActionArchive # Nur Archiv und Statistik brauchen NumPy
+            self._action_archive = ActionArchive(self)
+        return self._action_archive
+
+    # --- SUCHE ---
+
+    def get_search_index(self) -> SearchIndex:
+        """Suchindex über Spieler und Teams (beim ersten Aufruf mit zwei Abfragen aufgebaut)."""
+        if self._search_index is None:
+            players = self.execute_query_fetch_all("SELECT player_id, name, jersey_number, team_id FROM players")
+            teams = self.execute_query_fetch_all("SELECT team_id, name FROM teams")
+            self._search_index = SearchIndex.build(players, teams)
+        return self._search_index
+
+    def search_players(self, query: str, team_id: Optional[int] = None, limit: Optional[int] = None) -> List[int]:
+        """Spieler-IDs zu einer Sucheingabe (Präfixe, ohne Akzente, tippfehlertolerant; '#7' = Trikotnummer)."""
+        return self.get_search_index().search(query, PLAYER, team_id=team_id, limit=limit)
+
+    def search_teams(self, query: str, limit: Optional[int] = None) -> List[int]:
+        return self.get_search_index().search(query, TEAM, limit=limit)
+
+    def _setup_search_fts(self):
+        """
+        Optionale FTS5-Tabelle über Spieler- und Teamnamen, per Trigger synchron gehalten
+        (SEARCH_FTS5_ENABLED). Fehlt FTS5 im SQLite-Build, bleibt es beim In-Memory-Index.
         """
-        # Wenn player_id None ist (beim Hinzufügen), verwenden wir -1, was nie eine gültige ID sein sollte.
-        exclude_id = player_id if player_id is not None else -1 
-        
         try:
-            self.connect()
-            self._cursor.execute(query, (name, jersey_number, exclude_id))
-            count = self._cursor.fetchone()[0]
-            self.close()
-            
-            return count == 0 # True, wenn keine Duplikate gefunden wurden
-        except Exception as e:
-            print(f"Fehler bei Eindeutigkeitsprüfung: {e}")
-            return False # Im Zweifelsfall Fehler melden
+            self._run_script_queries([
+                """CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+                       kind UNINDEXED, ref_id UNINDEXED, name,
+                       tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')""",
+                """CREATE TRIGGER IF NOT EXISTS players_fts_insert AFTER INSERT ON players BEGIN
+                       INSERT INTO search_fts (kind, ref_id, name) VALUES ('player', new.player_id, new.name); END""",
+                """CREATE TRIGGER IF NOT EXISTS players_fts_update AFTER UPDATE OF name ON players BEGIN
+                       UPDATE search_fts SET name = new.name WHERE kind = 'player' AND ref_id = new.player_id; END""",
+                """CREATE TRIGGER IF NOT EXISTS players_fts_delete AFTER DELETE ON players BEGIN
+                       DELETE FROM search_fts WHERE kind = 'player' AND ref_id = old.player_id; END""",
+                """CREATE TRIGGER IF NOT EXISTS teams_fts_insert AFTER INSERT ON teams BEGIN
+                       INSERT INTO search_fts (kind, ref_id, name) VALUES ('team', new.team_id, new.name); END""",
+                """CREATE TRIGGER IF NOT EXISTS teams_fts_update AFTER UPDATE OF name ON teams BEGIN
+                       UPDATE search_fts SET name = new.name WHERE kind = 'team' AND ref_id = new.team_id; END""",
+                """CREATE TRIGGER IF NOT EXISTS teams_fts_delete AFTER DELETE ON teams BEGIN
+                       DELETE FROM search_fts WHERE kind = 'team' AND ref_id = old.team_id; END""",
+            ])
+            # Erstbefüllung bestehender Datenbanken
+            if self.execute_query_fetch_one("SELECT 1 FROM search_fts LIMIT 1") is None:
+                self._run_script_queries([
+                    "INSERT INTO search_fts (kind, ref_id, name) SELECT 'player', player_id, name FROM players",
+                    "INSERT INTO search_fts (kind, ref_id, name) SELECT 'team', team_id, name FROM teams",
+                ])
+        except sqlite3.Error as e:
+            print(f"FTS5-Suche nicht verfügbar, nutze nur den In-Memory-Index: {e}")
+
+    def _run_script_queries(self, queries: List[str]):
+        """Führt mehrere Statements in EINER Transaktion aus (Fehler -> Rollback und Weiterreichen)."""
+        with self._write_connection() as connection:
+            try:
+                for query in queries:
+                    self._run(connection, query)
+                connection.commit()
+            except sqlite3.Error:
+                connection.rollback()
+                raise
+
+    def search_fts(self, query: str, kind: str = PLAYER, limit: int = 50) -> List[int]:
+        """Suche über die FTS5-Tabelle (nur mit SEARCH_FTS5_ENABLED), Präfix-Treffer nach Relevanz."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        match = " ".join(f'"{token}"*' for token in tokens)
+        rows = self.execute_query_fetch_all(
+            "SELECT ref_id FROM search_fts WHERE search_fts MATCH ? AND kind = ? ORDER BY rank LIMIT ?",
+            (match, kind, limit))
+        return [row[0] for row in rows]
         
     def insert_player(self, player, team_id: Optional[int] = None) -> Optional[int]:
         """
@@ -354,7 +1083,110 @@ class DBManager:
             team_id # team_id kann NULL sein, wenn None übergeben wird
         )
         # Verwende die zentrale execute_query-Methode und fordere die ID an
-        return self.execute_query(query, params, fetch_id=True)
+        player_id = self.execute_query(query, params, fetch_id=True)
+        if player_id and self._search_index is not None:
+            self._search_index.add_player(player_id, player.name, player.jersey_number, team_id)
+        return player_id
+
+    def import_rosters(self, rows: List[Dict[str, Any]], dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Importiert Kader mehrerer Teams (Zeilen aus roster_import.read_roster_file) in EINER Transaktion.
+
+        Teams werden über den normalisierten Namen gefunden oder angelegt. Ein Spieler gilt als
+        vorhanden, wenn im selben Team ein Spieler mit gleichem Namen existiert (dann werden
+        Trikotnummer und Position aktualisiert), sonst wird er neu angelegt. Trikotnummern müssen
+        pro Team eindeutig sein; geprüft wird die ganze Datei mit einer mengenbasierten Abfrage.
+        Bei Fehlern (oder dry_run=True) wird nichts gespeichert.
+        Gibt {'teams', 'teams_created', 'inserted', 'updated', 'errors'} zurück.
+        """
+        summary: Dict[str, Any] = {'teams': 0, 'teams_created': 0, 'inserted': 0, 'updated': 0, 'errors': []}
+        errors = summary['errors']
+
+        # 1. Dubletten innerhalb der Datei
+        seen_names: Dict[Tuple[str, str], int] = {}
+        seen_jerseys: Dict[Tuple[str, int], int] = {}
+        for row_no, row in enumerate(rows):
+            team_key = normalize_team_name(row['team'])
+            name_key = (team_key, player_name_key(row['name']))
+            if name_key in seen_names:
+                errors.append(f"Eintrag {row_no + 1}: '{row['name']}' doppelt für Team '{row['team']}' (siehe Eintrag {seen_names[name_key] + 1}).")
+            seen_names.setdefault(name_key, row_no)
+            if row['jersey_number'] is not None:
+                jersey_key = (team_key, row['jersey_number'])
+                if jersey_key in seen_jerseys:
+                    errors.append(f"Eintrag {row_no + 1}: Trikotnummer {row['jersey_number']} doppelt für Team '{row['team']}' (siehe Eintrag {seen_jerseys[jersey_key] + 1}).")
+                seen_jerseys.setdefault(jersey_key, row_no)
+        if errors:
+            return summary
+
+        team_names: Dict[str, str] = {}
+        for row in rows:
+            # Neue Teams bekommen die erste Schreibweise aus der Datei
+            team_names.setdefault(normalize_team_name(row['team']), row['team'])
+        summary['teams'] = len(team_names)
+        try:
+            with self.transaction() as transaction:
+                # 2. Teams anlegen, die es noch nicht gibt
+                _, cursor = transaction.run("INSERT INTO teams (name, name_key) VALUES (?, ?) ON CONFLICT DO NOTHING",
+                                            [(name, key) for key, name in team_names.items()], many=True)
+                summary['teams_created'] = max(cursor.rowcount, 0)
+
+                # 3. Import-Zeilen in eine temporäre Tabelle, Prüfung und Abgleich mengenbasiert
+                transaction.run("""
+                    CREATE TEMP TABLE IF NOT EXISTS roster_import (
+                        row_no INTEGER PRIMARY KEY, team_key TEXT, name_key TEXT, jersey_number INTEGER)
+                """)
+                transaction.run("DELETE FROM roster_import")
+                transaction.run("INSERT INTO roster_import VALUES (?, ?, ?, ?)",
+                                [(row_no, normalize_team_name(row['team']), player_name_key(row['name']), row['jersey_number'])
+                                 for row_no, row in enumerate(rows)], many=True)
+
+                matches, _ = transaction.run("""
+                    SELECT i.row_no, t.team_id, MIN(existing.player_id), MIN(clash.name)
+                    FROM roster_import i
+                    LEFT JOIN teams t ON t.name_key = i.team_key
+                    LEFT JOIN players existing ON existing.team_id = t.team_id
+                                              AND player_name_key(existing.name) = i.name_key
+                    LEFT JOIN players clash ON clash.team_id = t.team_id AND clash.jersey_number = i.jersey_number
+                                           AND player_name_key(clash.name) <> i.name_key
+                                           AND player_name_key(clash.name) NOT IN (
+                                               SELECT j.name_key FROM roster_import j WHERE j.team_key = i.team_key)
+                    GROUP BY i.row_no
+                    ORDER BY i.row_no
+                """, fetch='all')
+
+                inserts, updates = [], []
+                for row_no, team_id, player_id, clash_name in matches:
+                    row = rows[row_no]
+                    if team_id is None:
+                        # Team ohne name_key (Namenskollision bei _migrate_team_name_keys) -> nicht zuordenbar
+                        errors.append(f"Eintrag {row_no + 1}: Team '{row['team']}' kann nicht eindeutig zugeordnet werden (Teamname ohne Schlüssel).")
+                    elif clash_name is not None:
+                        errors.append(f"Eintrag {row_no + 1}: Trikotnummer {row['jersey_number']} ist in Team '{row['team']}' bereits an '{clash_name}' vergeben.")
+                    elif player_id is None:
+                        inserts.append((row['name'], row['jersey_number'], row['position'], team_id))
+                    else:
+                        updates.append((row['jersey_number'], row['position'], player_id))
+
+                # 4. Schreiben
+                if errors or dry_run:
+                    transaction.discard()
+                else:
+                    if inserts:
+                        transaction.run("INSERT INTO players (name, jersey_number, position, team_id) VALUES (?, ?, ?, ?)",
+                                        inserts, many=True)
+                    if updates:
+                        transaction.run("UPDATE players SET jersey_number = ?, position = ? WHERE player_id = ?",
+                                        updates, many=True)
+                summary['inserted'], summary['updated'] = len(inserts), len(updates)
+        except sqlite3.Error as e:
+            errors.append(f"SQL-Fehler beim Kader-Import: {e}")
+        if errors:
+            summary['inserted'] = summary['updated'] = summary['teams_created'] = 0
+        elif not dry_run:
+            # IDs der neuen Spieler sind hier nicht bekannt -> Index beim nächsten Zugriff neu aufbauen
+            self.invalidate_roster_caches()
+        return summary
 
     def update_player(self, player_id: int, name: str, jersey_number: int, position: str) -> bool:
         """Aktualisiert die Details eines bestehenden Spielers."""
@@ -366,37 +1198,27 @@ class DBManager:
         params = (name, jersey_number, position, player_id)
 
         # RUFEN SIE HIER execute_query auf (anstelle der direkten connect/commit-Logik)
-        return self.execute_query(query, params)
+        success = self.execute_query(query, params)
+        if success and self._search_index is not None and player_id in self._search_index.players:
+            team_id = self._search_index.players[player_id][2]
+            self._search_index.add_player(player_id, name, jersey_number, team_id)
+        return success
         
     def get_action_data_by_id(self, action_id: int) -> Optional[Dict[str, Any]]:
         """
         Holt alle Spalten einer Aktion basierend auf der action_id für den Bearbeitungsdialog.
         """
-        query = """
-        SELECT action_id, set_id, action_type, executor_player_id, 
-               result_type, target_player_id, point_for, timestamp
-        FROM actions 
-        WHERE action_id = ?
-        """
-        try:
-            self.connect()
-            self._cursor.execute(query, (action_id,))
-            result = self._cursor.fetchone()
-            
-            if not result:
-                self.close()
-                return None
-            
-            # Ordne die Werte den Spaltennamen zu (Wichtig für Dictionary-Rückgabe)
-            columns = [desc[0] for desc in self._cursor.description]
-            data = dict(zip(columns, result))
-            self.close()
-            return data
-            
-        except Exception as e:
-            print(f"Fehler beim Holen der Aktionsdetails: {e}")
-            self.close()
-            return None    
+        columns = ['action_id', 'set_id', 'action_type', 'executor_player_id',
+                   'result_type', 'target_player_id', 'point_for', 'timestamp']
+        query = f"SELECT {', '.join(columns)} FROM actions_decoded WHERE action_id = ?"
+        result = self.execute_query_fetch_one(query, (action_id,))
+        
+        if not result:
+            return None
+        
+        # Ordne die Werte den Spaltennamen zu (Wichtig für Dictionary-Rückgabe)
+        return dict(zip(columns, result))
+
     # src/modules/data/db_manager.py (Zusätzlich zur bestehenden Klasse)
 
     def update_action_data(self, action_id: int, executor_id: int, result_type: str, target_id: Optional[int]) -> bool:
@@ -405,13 +1227,13 @@ class DBManager:
         """
         query = """
             UPDATE actions 
-            SET executor_player_id = ?, result_type = ?, target_player_id = ? 
+            SET executor_player_id = ?, result_type_id = ?, target_player_id = ? 
             WHERE action_id = ?
         """
         # target_id muss NULL sein, wenn None
         target_id_db = target_id if target_id is not None else None
         
-        return self.execute_query(query, (executor_id, result_type, target_id_db, action_id))
+        return self.execute_query(query, (executor_id, self.codes.encode('result_type', result_type), target_id_db, action_id))
 
     def delete_action_data(self, action_id: int) -> bool:
         """
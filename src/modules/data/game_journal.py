@@ -0,0 +1,146 @@
+# src/modules/data/game_journal.py
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+from ..config import JOURNAL_FSYNC
+from ..tracing import tracer
+
+JOURNAL_VERSION = 1
+
+
+class GameJournal:
+    """
+    Append-only Journal der Controller-Ereignisse des laufenden Spiels (eine JSON-Zeile pro Ereignis:
+    snapshot, lineup, action, edit, delete).
+
+    Jeder Eintrag wird sofort geschrieben und mit fdatasync gesichert – bei kleinen Anhängen an
+    eine offene Datei kostet das nur einen Bruchteil eines SQLite-Commits. Bei Spielbeginn und jedem
+    neuen Satz wird das Journal auf einen Snapshot verdichtet (temporäre Datei + os.replace, also atomar);
+    der Snapshot ist damit auch der Eintrag für den Satzbeginn.
+    Eine beim Absturz halb geschriebene letzte Zeile wird beim Lesen verworfen.
+    """
+
+    def __init__(self, path: str, fsync: bool = JOURNAL_FSYNC):
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'ab', buffering=0)
+        return self._file
+
+    def _sync(self, fd: int):
+        if self.fsync:
+            # fdatasync spart das Metadaten-Update (nicht überall verfügbar, z.B. Windows/macOS)
+            (getattr(os, 'fdatasync', None) or os.fsync)(fd)
+
+    @tracer.traced(cat="journal")
+    def append(self, record: Dict[str, Any]):
+        """Hängt ein Ereignis an und sichert es auf die Platte."""
+        line = (json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            f = self._open()
+            f.write(line)
+            self._sync(f.fileno())
+
+    @tracer.traced(cat="journal")
+    def compact(self, snapshot: Dict[str, Any]):
+        """Ersetzt das Journal atomar durch einen einzigen Snapshot-Eintrag."""
+        record = dict(snapshot, op='snapshot', version=JOURNAL_VERSION)
+        tmp_path = self.path + '.tmp'
+        with self._lock:
+            self._close_file()
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write((json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n').encode('utf-8'))
+                f.flush()
+                self._sync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._sync_directory(directory)
+
+    def _sync_directory(self, directory: str):
+        # Damit das Umbenennen selbst den Absturz überlebt (nur POSIX)
+        if not self.fsync or os.name != 'posix':
+            return
+        fd = os.open(directory or '.', os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def read(self) -> List[Dict[str, Any]]:
+        """
+        Liest alle vollständigen Einträge. Ab der ersten unlesbaren Zeile (abgebrochener Schreibvorgang)
+        wird das Journal abgeschnitten, damit neue Einträge nicht hinter Datenmüll landen.
+        """
+        with self._lock:
+            if not os.path.exists(self.path):
+                return []
+            records: List[Dict[str, Any]] = []
+            valid_bytes = 0
+            with open(self.path, 'rb') as f:
+                for raw in f:
+                    if not raw.endswith(b'\n'):
+                        break
+                    try:
+                        records.append(json.loads(raw))
+                    except ValueError:
+                        break
+                    valid_bytes += len(raw)
+                size = f.tell()
+            if valid_bytes < size:
+                print(f"Journal: {size - valid_bytes} Bytes unvollständiger Daten am Ende verworfen.")
+                self._close_file()
+                with open(self.path, 'r+b') as f:
+                    f.truncate(valid_bytes)
+            return records
+
+    def clear(self):
+        """Entfernt das Journal (Spiel regulär beendet oder abgewählt)."""
+        with self._lock:
+            self._close_file()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def replay_journal(records: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Fasst den letzten Snapshot und die danach angehängten Ereignisse zusammen:
+    {'game_id', 'lineup', 'log_state', 'events'} oder None, wenn kein Spiel offen ist.
+    Das Anwenden der Aktions-Ereignisse übernimmt der GameController (er besitzt das ActionLog).
+    """
+    state: Optional[Dict[str, Any]] = None
+    for record in records:
+        op = record.get('op')
+        if op == 'snapshot':
+            if record.get('version') != JOURNAL_VERSION:
+                print(f"Journal: Unbekannte Version {record.get('version')}, Snapshot ignoriert.")
+                state = None
+                continue
+            state = {'game_id': record['game_id'], 'lineup': record.get('lineup', []),
+                     'log_state': record.get('log'), 'events': []}
+        elif state is None:
+            continue
+        elif op == 'lineup':
+            state['lineup'] = record['player_ids']
+        elif op in ('action', 'edit', 'delete'):
+            state['events'].append(record)
+    return state
@@ -0,0 +1,391 @@
+# src/modules/data/game_package.py
+
+import datetime
+import hashlib
+import json
+import os
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .db_manager import INSERT_ACTION_SQL, normalize_team_name
+from .search_index import player_name_key
+from ..config import PACKAGE_COMPRESSION_LEVEL
+
+# Dateiformat eines Spiel-Pakets (.vgp):
+#   MAGIC | Version (uint16) | Länge Meta (uint32) | Meta (JSON) | zlib(Inhalt)
+# Inhalt: Länge (uint32) | Spiel als JSON (Teams, Spieler, Aufstellung, Sätze, Lookup-Namen)
+#         | Anzahl Aktionen (uint32) | je Spalte aus ACTION_FIELDS ein gepackter Block
+# Die Paket-ID ist der SHA-256 des unkomprimierten Inhalts: dasselbe Spiel ergibt dieselbe ID,
+# egal wann es exportiert wurde - darüber ist der Import idempotent.
+PACKAGE_MAGIC = b"VGP1"
+PACKAGE_VERSION = 1
+PACKAGE_EXTENSION = ".vgp"
+
+_HEADER = struct.Struct("<4sHI")
+_LENGTH = struct.Struct("<I")
+NO_REF = 0xFFFF # Spieler-Referenz für NULL (0 = Team-Aktion, wie executor_player_id = 0)
+
+# Spalten der Aktionen: (Name, struct-Code). Lookup-Spalten sind Indizes in die Namenslisten
+# des Pakets (+1, 0 = NULL), Spieler-Spalten Referenzen in die Spielerliste (+1), Zeitstempel
+# Mikrosekunden seit der ersten Aktion.
+ACTION_FIELDS: List[Tuple[str, str]] = [
+    ('set', 'B'),
+    ('action_type', 'B'),
+    ('result_type', 'B'),
+    ('executor', 'H'),
+    ('target', 'H'),
+    ('point_for', 'B'),
+    ('point_detail_type', 'B'),
+    ('timestamp', 'q'),
+]
+_LOOKUP_FIELDS = ['action_type', 'result_type', 'point_for', 'point_detail_type']
+
+
+# --- EXPORT ---
+
+def export_game_package(db_manager, game_id: int, path: str) -> Dict[str, Any]:
+    """
+    Schreibt ein Spiel (Teams, Spieler, Aufstellung, Sätze, Aktionen) als Paket nach path.
+    Archivierte Aktionen (siehe action_archive.py) werden mit exportiert.
+    Gibt {'path', 'package_id', 'actions', 'bytes'} zurück.
+    """
+    game = db_manager.execute_query_fetch_one("""
+        SELECT g.date_time, g.home_team_id, ht.name, g.guest_team_id, gt.name
+        FROM games g
+        LEFT JOIN teams ht ON ht.team_id = g.home_team_id
+        LEFT JOIN teams gt ON gt.team_id = g.guest_team_id
+        WHERE g.game_id = ?
+    """, (game_id,))
+    if game is None:
+        raise ValueError(f"Spiel {game_id} nicht gefunden.")
+    date_time, home_id, home_name, guest_id, guest_name = game
+
+    sets = db_manager.execute_query_fetch_all(
+        "SELECT set_id, set_number, score_own, score_opponent FROM sets WHERE game_id = ? ORDER BY set_number",
+        (game_id,))
+    set_index = {set_id: idx for idx, (set_id, _, _, _) in enumerate(sets)}
+    lineup = [row[0] for row in db_manager.execute_query_fetch_all(
+        "SELECT player_id FROM game_players WHERE game_id = ? ORDER BY slot", (game_id,))]
+    actions = db_manager.execute_query_fetch_all("""
+        SELECT a.action_id, a.set_id, a.action_type_id, a.result_type_id, a.executor_player_id,
+               a.target_player_id, a.point_for_id, a.point_detail_type_id, a.timestamp
+        FROM actions a JOIN sets s ON s.set_id = a.set_id
+        WHERE s.game_id = ?
+    """, (game_id,))
+    actions += db_manager.get_action_archive().load_game_rows(game_id)
+    actions.sort(key=lambda row: (set_index.get(row[1], -1), str(row[8]), row[0]))
+    if len(sets) > 255:
+        raise ValueError(f"Spiel {game_id} hat mehr Sätze, als das Paketformat erlaubt.")
+    if any(row[1] not in set_index for row in actions):
+        raise ValueError(f"Spiel {game_id} enthält Aktionen ohne gültigen Satz.")
+
+    # Spieler: Aufstellung zuerst, danach alle in Aktionen genannten (außer 0 = Team)
+    player_ids = list(dict.fromkeys(lineup + [pid for row in actions for pid in (row[4], row[5]) if pid]))
+    players = fetch_players(db_manager, player_ids)
+    teams = [home_name, guest_name]
+    team_refs = {home_id: 0, guest_id: 1}
+    for player in players:
+        team_id, team_name = player.pop('team_id'), player.pop('team_name')
+        if team_id is not None and team_id not in team_refs:
+            team_refs[team_id] = len(teams)
+            teams.append(team_name)
+        player['team'] = team_refs.get(team_id)
+    player_refs = {player_id: idx + 1 for idx, player_id in enumerate(player_ids)}
+
+    lookups: Dict[str, List[str]] = {kind: [] for kind in _LOOKUP_FIELDS}
+    lookup_refs: Dict[str, Dict[int, int]] = {kind: {} for kind in _LOOKUP_FIELDS}
+
+    def lookup_ref(kind: str, code: Optional[int]) -> int:
+        if code is None:
+            return 0
+        ref = lookup_refs[kind].get(code)
+        if ref is None:
+            lookups[kind].append(db_manager.codes.decode(kind, code))
+            ref = lookup_refs[kind][code] = len(lookups[kind])
+        return ref
+
+    def player_ref(player_id: Optional[int]) -> int:
+        return NO_REF if player_id is None else player_refs.get(player_id, 0)
+
+    parsed = [_parse_timestamp(row[8]) for row in actions]
+    first = min(parsed) if parsed else None
+    columns = {
+        'set': [set_index[row[1]] for row in actions],
+        'action_type': [lookup_ref('action_type', row[2]) for row in actions],
+        'result_type': [lookup_ref('result_type', row[3]) for row in actions],
+        'executor': [player_ref(row[4]) for row in actions],
+        'target': [player_ref(row[5]) for row in actions],
+        'point_for': [lookup_ref('point_for', row[6]) for row in actions],
+        'point_detail_type': [lookup_ref('point_detail_type', row[7]) for row in actions],
+        'timestamp': [(value - first) // datetime.timedelta(microseconds=1) for value in parsed],
+    }
+    content = {
+        'game': {'date_time': str(date_time), 'home': 0, 'guest': 1},
+        'teams': teams,
+        'players': players,
+        'lineup': [player_refs[player_id] for player_id in lineup],
+        'sets': [[number, own, opponent] for _, number, own, opponent in sets],
+        'lookups': lookups,
+        'first_action': str(first) if first else None,
+    }
+    body = _pack_body(content, columns, len(actions))
+    package_id = hashlib.sha256(body).hexdigest()
+    meta = {
+        'package_id': package_id,
+        'exported_at': datetime.datetime.now().isoformat(timespec='seconds'),
+        'source_game_id': game_id,
+        'summary': f"{home_name} - {guest_name}, {date_time}",
+    }
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+    data = (_HEADER.pack(PACKAGE_MAGIC, PACKAGE_VERSION, len(meta_bytes)) + meta_bytes
+            + zlib.compress(body, PACKAGE_COMPRESSION_LEVEL))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return {'path': path, 'package_id': package_id, 'actions': len(actions), 'bytes': len(data)}
+
+
+def fetch_players(db_manager, player_ids: List[int]) -> List[Dict[str, Any]]:
+    """Name, Trikotnummer, Position und Team der Spieler (Reihenfolge wie player_ids), für RosterResolver."""
+    found: Dict[int, Dict[str, Any]] = {}
+    for start in range(0, len(player_ids), 500):
+        batch = player_ids[start:start + 500]
+        rows = db_manager.execute_query_fetch_all(f"""
+            SELECT p.player_id, p.name, p.jersey_number, p.position, p.team_id, t.name
+            FROM players p LEFT JOIN teams t ON t.team_id = p.team_id
+            WHERE p.player_id IN ({', '.join('?' * len(batch))})
+        """, tuple(batch))
+        for player_id, name, jersey, position, team_id, team_name in rows:
+            found[player_id] = {'name': name, 'jersey': jersey, 'position': position,
+                                'team_id': team_id, 'team_name': team_name}
+    # Aktionen mit gelöschten Spielern behalten einen Platzhalter statt zu verschwinden
+    return [found.get(player_id) or {'name': f"Spieler {player_id}", 'jersey': None, 'position': None,
+                                     'team_id': None, 'team_name': None}
+            for player_id in player_ids]
+
+
+def _parse_timestamp(value) -> datetime.datetime:
+    try:
+        return datetime.datetime.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f"Ungültiger Zeitstempel '{value}' in den Aktionen.")
+
+
+def _pack_body(content: Dict[str, Any], columns: Dict[str, List[int]], count: int) -> bytes:
+    content_bytes = json.dumps(content, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    parts = [_LENGTH.pack(len(content_bytes)), content_bytes, _LENGTH.pack(count)]
+    for name, code in ACTION_FIELDS:
+        parts.append(struct.pack(f"<{count}{code}", *columns[name]))
+    return b"".join(parts)
+
+
+# --- LESEN ---
+
+def read_game_package(path: str) -> Dict[str, Any]:
+    """
+    Liest und prüft ein Paket. Gibt {'package_id', 'meta', 'content', 'actions'} zurück,
+    actions als Spalten (Listen) wie in ACTION_FIELDS. Wirft ValueError bei ungültigen Dateien.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"'{path}' ist kein Spiel-Paket (zu kurz).")
+    magic, version, meta_length = _HEADER.unpack_from(data)
+    if magic != PACKAGE_MAGIC:
+        raise ValueError(f"'{path}' ist kein Spiel-Paket.")
+    if version > PACKAGE_VERSION:
+        raise ValueError(f"'{path}' hat Format-Version {version}; unterstützt wird bis {PACKAGE_VERSION}.")
+    offset = _HEADER.size
+    try:
+        meta = json.loads(data[offset:offset + meta_length].decode('utf-8'))
+        body = zlib.decompress(data[offset + meta_length:])
+    except (ValueError, zlib.error) as e:
+        raise ValueError(f"'{path}' ist beschädigt: {e}")
+    package_id = hashlib.sha256(body).hexdigest()
+    if meta.get('package_id') != package_id:
+        raise ValueError(f"'{path}' ist beschädigt (Prüfsumme stimmt nicht).")
+
+    try:
+        (content_length,) = _LENGTH.unpack_from(body)
+        offset = _LENGTH.size
+        content = json.loads(body[offset:offset + content_length].decode('utf-8'))
+        offset += content_length
+        (count,) = _LENGTH.unpack_from(body, offset)
+        offset += _LENGTH.size
+        actions = {}
+        for name, code in ACTION_FIELDS:
+            fmt = struct.Struct(f"<{count}{code}")
+            actions[name] = list(fmt.unpack_from(body, offset))
+            offset += fmt.size
+    except (struct.error, ValueError) as e:
+        raise ValueError(f"'{path}' ist beschädigt: {e}")
+    return {'package_id': package_id, 'meta': meta, 'content': content, 'actions': actions, 'count': count}
+
+
+# --- IMPORT ---
+
+def import_game_packages(db_manager, paths: Sequence[str], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Importiert Spiel-Pakete in EINER Transaktion. Teams werden über den normalisierten Namen,
+    Spieler pro Team über Name (und, falls vorhanden, Trikotnummer) wiederverwendet, sonst angelegt.
+    Bereits importierte Pakete (gleiche Paket-ID) werden übersprungen - ein zweiter Import
+    derselben Dateien ändert nichts.
+    Gibt {'packages', 'imported', 'already_imported', 'game_ids', 'teams_created',
+    'players_created', 'actions', 'errors'} zurück.
+    """
+    summary: Dict[str, Any] = {'packages': len(paths), 'imported': 0, 'already_imported': 0, 'game_ids': [],
+                               'teams_created': 0, 'players_created': 0, 'actions': 0, 'errors': []}
+    packages = []
+    seen = set()
+    known = {row[0] for row in db_manager.execute_query_fetch_all("SELECT package_id FROM imported_packages")}
+    for path in paths:
+        try:
+            package = read_game_package(path)
+        except (OSError, ValueError) as e:
+            summary['errors'].append(str(e))
+            continue
+        if package['package_id'] in known or package['package_id'] in seen:
+            summary['already_imported'] += 1
+            continue
+        seen.add(package['package_id'])
+        packages.append(package)
+    if not packages:
+        return summary
+
+    names = {kind: {} for kind in _LOOKUP_FIELDS}
+    for package in packages:
+        for kind, values in package['content']['lookups'].items():
+            names[kind].update(dict.fromkeys(values))
+
+    roster = RosterResolver(db_manager)
+    imported_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        with db_manager.transaction() as transaction:
+            # Fehlende Lookup-Namen in der Transaktion anlegen: ein Probelauf (dry_run) schreibt nichts
+            codes = {kind: db_manager.codes.encode_all(transaction, kind, values) for kind, values in names.items()}
+            importer = _Importer(roster.bind(transaction), codes, summary)
+            for package in packages:
+                game_id = importer.import_package(package)
+                transaction.run("INSERT INTO imported_packages (package_id, game_id, imported_at) VALUES (?, ?, ?)",
+                                (package['package_id'], game_id, imported_at))
+                summary['game_ids'].append(game_id)
+                summary['imported'] += 1
+            summary.update(teams_created=roster.teams_created, players_created=roster.players_created)
+            if dry_run:
+                transaction.discard()
+    except Exception as e:
+        summary['errors'].append(f"Import abgebrochen, nichts gespeichert: {e}")
+        summary.update(imported=0, game_ids=[], teams_created=0, players_created=0, actions=0)
+        return summary
+
+    if not dry_run:
+        # Neue Teams/Spieler: Suchindex und Team-Cache beim nächsten Zugriff neu aufbauen
+        db_manager.invalidate_roster_caches()
+    return summary
+
+
+class RosterResolver:
+    """
+    Ordnet Teams und Spieler aus fremden Datenbanken (Pakete, Sync) den eigenen zu:
+    Teams über den normalisierten Namen, Spieler pro Team über den Namen (bei mehreren
+    gleichnamigen bevorzugt der mit gleicher Trikotnummer). Unbekannte werden angelegt.
+    Die Zuordnungen werden vor der Transaktion einmal geladen; bind() setzt die laufende
+    Transaktion (DBManager.transaction()), in der neue Teams/Spieler eingefügt werden.
+    """
+
+    def __init__(self, db_manager):
+        self.transaction = None
+        self.teams_created = 0
+        self.players_created = 0
+        self.teams: Dict[str, int] = {key: team_id for key, team_id in db_manager.execute_query_fetch_all(
+            "SELECT name_key, team_id FROM teams WHERE name_key IS NOT NULL")}
+        self.players: Dict[Tuple[Optional[int], str], List[Tuple[int, Optional[int]]]] = {}
+        for player_id, team_id, name, jersey in db_manager.execute_query_fetch_all(
+                "SELECT player_id, team_id, name, jersey_number FROM players"):
+            self.players.setdefault((team_id, player_name_key(name)), []).append((player_id, jersey))
+
+    def bind(self, transaction) -> 'RosterResolver':
+        self.transaction = transaction
+        return self
+
+    def _insert(self, query: str, params: tuple) -> int:
+        _, cursor = self.transaction.run(query, params)
+        return cursor.lastrowid
+
+    def team_id(self, name: Optional[str]) -> Optional[int]:
+        if not name:
+            return None
+        key = normalize_team_name(name)
+        team_id = self.teams.get(key)
+        if team_id is None:
+            team_id = self._insert("INSERT INTO teams (name, name_key) VALUES (?, ?)", (" ".join(name.split()), key))
+            self.teams[key] = team_id
+            self.teams_created += 1
+        return team_id
+
+    def player_id(self, player: Dict[str, Any], team_id: Optional[int]) -> int:
+        """player: {'name', 'jersey', 'position'}"""
+        candidates = self.players.get((team_id, player_name_key(player['name'])), [])
+        for player_id, jersey in candidates:
+            if jersey == player['jersey']:
+                return player_id
+        if candidates:
+            return candidates[0][0]
+        player_id = self._insert("INSERT INTO players (team_id, name, jersey_number, position) VALUES (?, ?, ?, ?)",
+                                 (team_id, player['name'], player['jersey'], player['position']))
+        self.players.setdefault((team_id, player_name_key(player['name'])), []).append((player_id, player['jersey']))
+        self.players_created += 1
+        return player_id
+
+
+class _Importer:
+    """Legt die Datensätze eines Pakets innerhalb der laufenden Import-Transaktion an."""
+
+    def __init__(self, roster: RosterResolver, codes: Dict[str, Dict[str, int]], summary: Dict[str, Any]):
+        self.transaction = roster.transaction
+        self.roster = roster
+        self.codes = codes
+        self.summary = summary
+
+    def _insert(self, query: str, params: tuple) -> int:
+        _, cursor = self.transaction.run(query, params)
+        return cursor.lastrowid
+
+    def import_package(self, package: Dict[str, Any]) -> int:
+        content, actions = package['content'], package['actions']
+        team_ids = [self.roster.team_id(name) for name in content['teams']]
+        player_ids = [self.roster.player_id(player, team_ids[player['team']] if player['team'] is not None else None)
+                      for player in content['players']]
+        game = content['game']
+        game_id = self._insert("INSERT INTO games (date_time, home_team_id, guest_team_id) VALUES (?, ?, ?)",
+                               (game['date_time'], team_ids[game['home']], team_ids[game['guest']]))
+        set_ids = [self._insert("INSERT INTO sets (game_id, set_number, score_own, score_opponent) VALUES (?, ?, ?, ?)",
+                                (game_id, number, own, opponent)) for number, own, opponent in content['sets']]
+        self.transaction.run("INSERT INTO game_players (game_id, player_id, slot) VALUES (?, ?, ?)",
+                             [(game_id, player_ids[ref - 1], slot) for slot, ref in enumerate(content['lineup'])], many=True)
+
+        lookups = {kind: [self.codes[kind][name] for name in content['lookups'][kind]] for kind in _LOOKUP_FIELDS}
+
+        def code(kind: str, ref: int) -> Optional[int]:
+            return lookups[kind][ref - 1] if ref else None
+
+        def player(ref: int) -> Optional[int]:
+            if ref == NO_REF:
+                return None
+            return player_ids[ref - 1] if ref else 0
+
+        first = datetime.datetime.fromisoformat(content['first_action']) if content['first_action'] else None
+        rows = [
+            (set_ids[set_idx], code('action_type', action_type), player(executor), code('result_type', result_type),
+             player(target), code('point_for', point_for), code('point_detail_type', detail),
+             first + datetime.timedelta(microseconds=offset))
+            for set_idx, action_type, result_type, executor, target, point_for, detail, offset
+            in zip(*(actions[name] for name, _ in ACTION_FIELDS))
+        ]
+        self.transaction.run(INSERT_ACTION_SQL, rows, many=True)
+        self.summary['actions'] += len(rows)
+        return game_id
@@ -0,0 +1,111 @@
+# src/modules/data/lookup_codes.py
+
+import threading
+from typing import Dict, Iterable, List, Optional
+from ..config import ACTION_TYPES, POINT_FOR, POINT_DETAIL_OUTCOMES, POINT_DETAIL_CODE_MAPPING
+
+# Kodierte Spalte der Tabelle 'actions' -> (Lookup-Tabelle, Spalte in 'actions')
+LOOKUP_TABLES: Dict[str, str] = {
+    'action_type': 'action_types',
+    'result_type': 'result_types',
+    'point_for': 'point_for_types',
+    'point_detail_type': 'point_detail_types',
+}
+
+# Aktionstypen der Direkt-Buttons, die nicht in ACTION_TYPES stehen
+DIRECT_ACTION_TYPES = ['Unser Punkt', 'Gegner Punkt']
+
+
+def _unique(values) -> List[str]:
+    return list(dict.fromkeys(v for v in values if v is not None))
+
+
+def seed_values() -> Dict[str, List[str]]:
+    """
+    Startwerte der Lookup-Tabellen aus config.py. Die Reihenfolge bestimmt die Codes
+    einer neuen Datenbank (1, 2, 3, ...). Unbekannte Werte werden später angehängt.
+    """
+    return {
+        'action_type': _unique(list(ACTION_TYPES) + DIRECT_ACTION_TYPES),
+        'result_type': _unique(r for results in ACTION_TYPES.values() for r in results),
+        'point_for': _unique(POINT_FOR.values()),
+        'point_detail_type': _unique(list(POINT_DETAIL_OUTCOMES.values()) + list(POINT_DETAIL_CODE_MAPPING)),
+    }
+
+
+class LookupCodes:
+    """
+    Übersetzt die Text-Werte der Aktionen (Aktionstyp, Ergebnis, Punkt für, Punkt-Detail)
+    in die kleinen Integer-Codes der Lookup-Tabellen und zurück. Die Tabellen werden
+    einmal geladen; unbekannte Werte werden beim Kodieren angelegt (get-or-create),
+    unbekannte Codes beim Dekodieren nachgeladen (z.B. von einem anderen DBManager angelegt).
+    """
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self._lock = threading.Lock()
+        self._codes: Dict[str, Dict[str, int]] = {}
+        self._names: Dict[str, Dict[int, str]] = {}
+
+    def _load(self, kind: str):
+        rows = self.db_manager.execute_query_fetch_all(f"SELECT id, name FROM {LOOKUP_TABLES[kind]}")
+        self._codes[kind] = {name: code for code, name in rows}
+        self._names[kind] = {code: name for code, name in rows}
+
+    def encode(self, kind: str, name: Optional[str]) -> Optional[int]:
+        """Code eines Text-Werts (None bleibt None)."""
+        if name is None:
+            return None
+        with self._lock:
+            if kind not in self._codes:
+                self._load(kind)
+            code = self._codes[kind].get(name)
+            if code is None:
+                self.db_manager.execute_query(f"INSERT OR IGNORE INTO {LOOKUP_TABLES[kind]} (name) VALUES (?)", (name,))
+                self._load(kind)
+                code = self._codes[kind][name]
+            return code
+
+    def encode_all(self, transaction, kind: str, names: Iterable[str]) -> Dict[str, int]:
+        """
+        Codes mehrerer Text-Werte innerhalb einer laufenden Transaktion (DBManager.transaction()).
+        Fehlende Namen werden in der Transaktion angelegt und bei einem Rollback (z.B. dry_run)
+        mit verworfen; der Cache übernimmt sie erst beim nächsten Nachladen.
+        """
+        table = LOOKUP_TABLES[kind]
+        with self._lock:
+            if kind not in self._codes:
+                self._load(kind)
+            known = dict(self._codes[kind])
+        codes = {}
+        for name in names:
+            code = known.get(name)
+            if code is None:
+                transaction.run(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+                (code,), _ = transaction.run(f"SELECT id FROM {table} WHERE name = ?", (name,), fetch='one')
+            codes[name] = code
+        return codes
+
+    def decode(self, kind: str, code: Optional[int]) -> Optional[str]:
+        """Text-Wert eines Codes (None bleibt None)."""
+        if code is None:
+            return None
+        with self._lock:
+            if code not in self._names.get(kind, {}):
+                self._load(kind)
+            return self._names[kind].get(code)
+
+    def categories(self, kind: str) -> List[str]:
+        """
+        Alle Text-Werte, Position = Code - 1 (für pandas.Categorical.from_codes).
+        Lücken in den Codes werden mit Platzhaltern aufgefüllt.
+        """
+        with self._lock:
+            self._load(kind)
+            names = self._names[kind]
+            return [names.get(code, f"#{code}") for code in range(1, max(names, default=0) + 1)]
+
+    def reset(self):
+        with self._lock:
+            self._codes.clear()
+            self._names.clear()
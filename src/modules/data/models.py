@@ -4,7 +4,9 @@ from dataclasses import dataclass, field
 from typing import Optional, List
 import datetime
 
-@dataclass
+# slots=True: keine __dict__-Instanzen, damit viele Aktionen/Sätze wenig Speicher belegen
+
+@dataclass(slots=True)
 class Player:
     """Definiert einen einzelnen Spieler."""
     name: str
@@ -12,13 +14,13 @@ class Player:
     player_id: Optional[int] = None 
     position: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Team:
     """Definiert ein Team (eigen oder gegnerisch)."""
     name: str
     team_id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class Game:
     """Definiert ein einzelnes Spiel."""
     date_time: datetime.datetime
@@ -26,7 +28,7 @@ class Game:
     guest_team_id: int
     game_id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class Set:
     """Definiert einen Satz innerhalb eines Spiels."""
     game_id: int
@@ -35,7 +37,7 @@ class Set:
     score_opponent: int = 0
     set_id: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     """
     Definiert eine einzelne Aktion/Statistik-Eingabe.
@@ -0,0 +1,152 @@
+# src/modules/data/query_stats.py
+
+import re
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from ..tracing import tracer
+
+# Obergrenzen der Latenz-Buckets in ms (letzter Bucket: alles darüber)
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(query: str) -> str:
+    """Fasst Whitespace zusammen, damit gleiche Statements denselben Schlüssel bekommen."""
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class StatementStats:
+    """Aggregierte Kennzahlen eines einzelnen (normalisierten) SQL-Statements."""
+    __slots__ = ("statement", "count", "total_ms", "max_ms", "rows", "errors", "histogram")
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, duration_ms: float, rows: int):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.rows += rows
+        if duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+        for idx, upper in enumerate(LATENCY_BUCKETS_MS):
+            if duration_ms <= upper:
+                self.histogram[idx] += 1
+                return
+        self.histogram[-1] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "errors": self.errors,
+            "histogram": {label: n for label, n in zip(labels, self.histogram) if n},
+        }
+
+
+class QueryStats:
+    """
+    Sammelt pro SQL-Statement Anzahl, Latenz-Histogramm und gelieferte Zeilen.
+    Queries über dem Schwellwert landen mitsamt EXPLAIN QUERY PLAN im Slow-Query-Log.
+    Jede Query erhöht außerdem den Zähler 'db_queries' der aktuellen UI-Interaktion
+    im Tracer, woraus queries_per_action() die Queries pro UI-Aktion ableitet.
+    """
+
+    def __init__(self, slow_query_threshold_ms: float = 25.0, enabled: bool = True, slow_log_size: int = 200):
+        self.enabled = enabled
+        self.slow_query_threshold_ms = slow_query_threshold_ms
+        self._statements: Dict[str, StatementStats] = {}
+        self.slow_queries: Deque[Dict[str, Any]] = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def record(self, query: str, params: Any, duration_ms: float, rows: int,
+               explain: Optional[Callable[[], List[Tuple]]] = None):
+        """Verbucht eine ausgeführte Query. explain liefert bei Bedarf den Query-Plan."""
+        if not self.enabled:
+            return
+        statement = normalize_statement(query)
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None:
+                stats = self._statements[statement] = StatementStats(statement)
+            stats.add(duration_ms, rows)
+        tracer.count("db_queries")
+
+        if duration_ms >= self.slow_query_threshold_ms:
+            self._log_slow_query(statement, params, duration_ms, rows, explain)
+
+    def record_error(self, query: str):
+        """Zählt eine fehlgeschlagene Query."""
+        if not self.enabled:
+            return
+        statement = normalize_statement(query)
+        with self._lock:
+            stats = self._statements.get(statement)
+            if stats is None:
+                stats = self._statements[statement] = StatementStats(statement)
+            stats.errors += 1
+
+    def _log_slow_query(self, statement: str, params: Any, duration_ms: float, rows: int,
+                        explain: Optional[Callable[[], List[Tuple]]]):
+        plan: List[str] = []
+        if explain is not None:
+            try:
+                # Zeilen von EXPLAIN QUERY PLAN: (id, parent, notused, detail)
+                plan = [row[-1] for row in explain()]
+            except Exception as e:
+                plan = [f"Plan nicht verfügbar: {e}"]
+        entry = {
+            "statement": statement,
+            "params": repr(params),
+            "duration_ms": round(duration_ms, 3),
+            "rows": rows,
+            "plan": plan,
+        }
+        self.slow_queries.append(entry)
+        print(f"Langsame Query ({duration_ms:.1f} ms, {rows} Zeilen): {statement} | Plan: {'; '.join(plan)}")
+
+    # --- AUSWERTUNG ---
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Alle Statements, sortiert nach Gesamtzeit (teuerste zuerst)."""
+        with self._lock:
+            entries = [s.to_dict() for s in self._statements.values()]
+        return sorted(entries, key=lambda e: e["total_ms"], reverse=True)
+
+    def total_queries(self) -> int:
+        with self._lock:
+            return sum(s.count for s in self._statements.values())
+
+    def queries_per_action(self) -> Dict[str, Dict[str, float]]:
+        """
+        Anzahl Queries pro UI-Interaktion (benötigt aktiviertes Tracing).
+        Ein steigender Wert für dieselbe Aktion deutet auf ein N+1-Muster hin.
+        """
+        per_action: Dict[str, List[int]] = {}
+        for interaction in tracer.interactions():
+            action = (interaction.args or {}).get("action")
+            key = f"{interaction.name}:{action}" if action else interaction.name
+            per_action.setdefault(key, []).append(interaction.counters.get("db_queries", 0))
+        return {
+            key: {"interactions": len(counts),
+                  "mean": round(sum(counts) / len(counts), 2),
+                  "max": max(counts)}
+            for key, counts in per_action.items()
+        }
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self.slow_queries.clear()
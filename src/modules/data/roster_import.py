@@ -0,0 +1,91 @@
+# src/modules/data/roster_import.py
+
+import csv
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+# Spaltennamen der Import-Dateien (CSV-Kopfzeile bzw. JSON-Schlüssel) und akzeptierte Alternativen
+FIELD_ALIASES = {
+    'team': ('team', 'team_name', 'mannschaft'),
+    'name': ('name', 'player', 'spieler'),
+    'jersey_number': ('jersey_number', 'jersey', 'nummer', 'nr'),
+    'position': ('position', 'pos'),
+}
+
+
+def _pick(row: Dict[str, Any], field: str) -> Any:
+    for key in FIELD_ALIASES[field]:
+        if key in row and row[key] not in (None, ''):
+            return row[key]
+    return None
+
+
+def _jersey(value: Any, source: str) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(str(value).strip().lstrip('#'))
+    except ValueError:
+        raise ValueError(f"{source}: Ungültige Trikotnummer '{value}'.")
+
+
+def normalize_roster_row(row: Dict[str, Any], source: str, team: Optional[str] = None) -> Dict[str, Any]:
+    """Bringt eine Zeile auf die Form {team, name, jersey_number, position} und prüft Pflichtfelder."""
+    row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+    team_name = team or _pick(row, 'team')
+    name = _pick(row, 'name')
+    if not team_name or not str(team_name).strip():
+        raise ValueError(f"{source}: Team fehlt.")
+    if not name or not str(name).strip():
+        raise ValueError(f"{source}: Spielername fehlt.")
+    position = _pick(row, 'position')
+    return {
+        'team': " ".join(str(team_name).split()),
+        'name': " ".join(str(name).split()),
+        'jersey_number': _jersey(_pick(row, 'jersey_number'), source),
+        'position': str(position).strip() if position is not None else None,
+    }
+
+
+def read_roster_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Liest einen Kader-Import aus CSV oder JSON.
+
+    CSV: Kopfzeile mit team, name, jersey_number, position (Trennzeichen ',' oder ';').
+    JSON: Liste solcher Zeilen oder {"teams": [{"name": ..., "players": [{name, jersey_number, position}]}]}.
+    Wirft ValueError mit Datei und Zeile bei ungültigen Einträgen.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    name = os.path.basename(path)
+    if extension == '.json':
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and 'teams' in data:
+            return [normalize_roster_row(player, f"{name} Team {t_idx + 1} Spieler {p_idx + 1}", team=team.get('name'))
+                    for t_idx, team in enumerate(data['teams'])
+                    for p_idx, player in enumerate(team.get('players', []))]
+        if isinstance(data, list):
+            return [normalize_roster_row(row, f"{name} Eintrag {idx + 1}") for idx, row in enumerate(data)]
+        raise ValueError(f"{name}: Unbekanntes JSON-Format (Liste oder {{'teams': [...]}} erwartet).")
+
+    if extension in ('.csv', '.txt'):
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            sample = f.read(4096)
+            f.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            reader = csv.DictReader(f, dialect=dialect)
+            # Zeile 1 ist die Kopfzeile
+            return [normalize_roster_row(row, f"{name} Zeile {idx + 2}") for idx, row in enumerate(reader)]
+
+    raise ValueError(f"{name}: Nicht unterstütztes Dateiformat '{extension}' (CSV oder JSON).")
+
+
+def read_roster_files(paths: List[str]) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for path in paths:
+        rows.extend(read_roster_file(path))
+    return rows
@@ -0,0 +1,243 @@
+# src/modules/data/search_index.py
+
+import difflib
+import heapq
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from ..config import SEARCH_FUZZY_CUTOFF
+
+PLAYER = 'player'
+TEAM = 'team'
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def fold_text(text: str) -> str:
+    """Vergleichsform für die Suche: ohne Akzente/Umlaut-Punkte, casefold (ß -> ss)."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(fold_text(text))
+
+
+class _Node:
+    __slots__ = ('children', 'refs')
+
+    def __init__(self):
+        self.children: Dict[str, '_Node'] = {}
+        # Alle Einträge, deren Token mit dem Präfix bis hierher beginnt
+        self.refs: Set[int] = set()
+
+
+class SearchIndex:
+    """
+    In-Memory-Suchindex über Spieler und Teams.
+
+    Namen werden in Token zerlegt und normalisiert (fold_text); jedes Token wird in einen
+    Präfix-Baum eingetragen, dessen Knoten die Einträge aller darunterliegenden Token kennen.
+    Eine Präfix-Suche kostet damit O(Länge der Eingabe) plus die Schnittmenge der Token.
+    Findet ein Token keinen Präfix, wird unscharf über die Token mit gleichem Anfangsbuchstaben
+    gesucht (Tippfehler).
+
+    Zusätzlich werden Trikotnummern und Namen pro Team geführt, damit die
+    Eindeutigkeitsprüfung beim Anlegen/Bearbeiten ohne Datenbankzugriff auskommt.
+    Der DBManager hält den Index bei seinen Schreibzugriffen aktuell.
+    """
+
+    def __init__(self):
+        # Je Art ein eigener Präfix-Baum, damit Treffer nicht nach Art gefiltert werden müssen
+        self._roots: Dict[str, _Node] = {PLAYER: _Node(), TEAM: _Node()}
+        # Vokabular für die Tippfehler-Suche: Anfangsbuchstabe -> {Token: Anzahl Einträge}
+        self._vocab: Dict[str, Dict[str, Dict[str, int]]] = {PLAYER: {}, TEAM: {}}
+        # Sortierschlüssel (gefalteter Name) je Eintrag, einmal beim Einfügen berechnet
+        self._sort_keys: Dict[str, Dict[int, str]] = {PLAYER: {}, TEAM: {}}
+        self.players: Dict[int, Tuple[str, Optional[int], Optional[int]]] = {}  # ID -> (Name, Nr., Team-ID)
+        self.teams: Dict[int, str] = {}
+        self._jerseys: Dict[Tuple[int, int], Set[int]] = {}   # (Team-ID, Nr.) -> Spieler-IDs
+        self._names: Dict[Tuple[int, str], Set[int]] = {}     # (Team-ID, Name gefaltet) -> Spieler-IDs
+        self._by_jersey: Dict[int, Set[int]] = {}             # Nr. -> Spieler-IDs (Suche nach "#7")
+
+    @classmethod
+    def build(cls, players: Iterable[Tuple[int, str, Optional[int], Optional[int]]],
+              teams: Iterable[Tuple[int, str]]) -> 'SearchIndex':
+        """players: (ID, Name, Nr., Team-ID), teams: (ID, Name)."""
+        index = cls()
+        for team_id, name in teams:
+            index.add_team(team_id, name)
+        for player_id, name, jersey_number, team_id in players:
+            index.add_player(player_id, name, jersey_number, team_id)
+        return index
+
+    # --- PFLEGE ---
+
+    def add_player(self, player_id: int, name: str, jersey_number: Optional[int], team_id: Optional[int]):
+        if player_id in self.players:
+            self.remove_player(player_id)
+        self.players[player_id] = (name, jersey_number, team_id)
+        self._insert_tokens(PLAYER, player_id, name)
+        if jersey_number is not None:
+            self._by_jersey.setdefault(jersey_number, set()).add(player_id)
+        self._add_team_keys(player_id, name, jersey_number, team_id)
+
+    def remove_player(self, player_id: int):
+        entry = self.players.pop(player_id, None)
+        if entry is None:
+            return
+        name, jersey_number, team_id = entry
+        self._remove_tokens(PLAYER, player_id, name)
+        if jersey_number is not None:
+            _discard(self._by_jersey, jersey_number, player_id)
+        self._remove_team_keys(player_id, name, jersey_number, team_id)
+
+    def set_player_team(self, player_id: int, team_id: Optional[int]):
+        """Teamwechsel: nur die Team-Schlüssel ändern sich, die Namens-Token bleiben."""
+        entry = self.players.get(player_id)
+        if entry is None or entry[2] == team_id:
+            return
+        name, jersey_number, old_team_id = entry
+        self._remove_team_keys(player_id, name, jersey_number, old_team_id)
+        self.players[player_id] = (name, jersey_number, team_id)
+        self._add_team_keys(player_id, name, jersey_number, team_id)
+
+    def add_team(self, team_id: int, name: str):
+        if team_id in self.teams:
+            self.remove_team(team_id)
+        self.teams[team_id] = name
+        self._insert_tokens(TEAM, team_id, name)
+
+    def remove_team(self, team_id: int):
+        name = self.teams.pop(team_id, None)
+        if name is not None:
+            self._remove_tokens(TEAM, team_id, name)
+
+    # --- SUCHE ---
+
+    def search(self, query: str, kind: str = PLAYER, team_id: Optional[int] = None,
+               limit: Optional[int] = None) -> List[int]:
+        """
+        IDs der Einträge (kind = 'player' oder 'team'), deren Token mit ALLEN Such-Token beginnen,
+        sortiert nach Name. Bei Spielern trifft eine Zahl (auch '#7') zusätzlich die Trikotnummer.
+        Leere Eingabe liefert alle Einträge.
+        """
+        sort_keys = self._sort_keys[kind]
+        tokens = tokenize(query)
+        if not tokens:
+            ids: Set[int] = set(sort_keys)
+        else:
+            ids = None
+            for token in tokens:
+                matches = self._token_matches(kind, token)
+                ids = matches if ids is None else ids & matches
+                if not ids:
+                    break
+        if kind == PLAYER and team_id is not None:
+            ids = {player_id for player_id in ids if self.players[player_id][2] == team_id}
+        key = lambda ref_id: (sort_keys[ref_id], ref_id)
+        if limit is not None and limit < len(ids):
+            return heapq.nsmallest(limit, ids, key=key)
+        return sorted(ids, key=key)
+
+    def jersey_owner(self, team_id: Optional[int], jersey_number: Optional[int],
+                     exclude_player_id: Optional[int] = None) -> Optional[int]:
+        """ID eines anderen Spielers im Team mit dieser Trikotnummer (oder None)."""
+        if team_id is None or jersey_number is None:
+            return None
+        return _other(self._jerseys.get((team_id, jersey_number)), exclude_player_id)
+
+    def name_owner(self, team_id: Optional[int], name: str, exclude_player_id: Optional[int] = None) -> Optional[int]:
+        """ID eines anderen Spielers im Team mit gleichem (normalisiertem) Namen (oder None)."""
+        if team_id is None:
+            return None
+        return _other(self._names.get((team_id, player_name_key(name))), exclude_player_id)
+
+    # --- INTERN ---
+
+    def _token_matches(self, kind: str, token: str) -> Set[int]:
+        ids = self._prefix(kind, token)
+        if kind == PLAYER and token.isdigit():
+            ids |= self._by_jersey.get(int(token), set())
+        if ids:
+            return ids
+        # Kein Präfix-Treffer: Tippfehler über ähnliche Token des Vokabulars auffangen
+        candidates = self._vocab[kind].get(token[0], {})
+        for close in difflib.get_close_matches(token, candidates, n=5, cutoff=SEARCH_FUZZY_CUTOFF):
+            ids |= self._prefix(kind, close)
+        return ids
+
+    def _prefix(self, kind: str, prefix: str) -> Set[int]:
+        node = self._roots[kind]
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return set(node.refs)
+
+    def _insert_tokens(self, kind: str, ref_id: int, name: str):
+        self._sort_keys[kind][ref_id] = fold_text(name)
+        for token in set(tokenize(name)):
+            vocab = self._vocab[kind].setdefault(token[0], {})
+            vocab[token] = vocab.get(token, 0) + 1
+            node = self._roots[kind]
+            for char in token:
+                node = node.children.setdefault(char, _Node())
+                node.refs.add(ref_id)
+
+    def _remove_tokens(self, kind: str, ref_id: int, name: str):
+        self._sort_keys[kind].pop(ref_id, None)
+        for token in set(tokenize(name)):
+            vocab = self._vocab[kind].get(token[0], {})
+            if vocab.get(token, 0) <= 1:
+                vocab.pop(token, None)
+                if not vocab:
+                    self._vocab[kind].pop(token[0], None)
+            else:
+                vocab[token] -= 1
+            path = [self._roots[kind]]
+            for char in token:
+                node = path[-1].children.get(char)
+                if node is None:
+                    break
+                node.refs.discard(ref_id)
+                path.append(node)
+            # Leere Äste abschneiden
+            for depth in range(len(path) - 1, 0, -1):
+                if path[depth].refs:
+                    break
+                del path[depth - 1].children[token[depth - 1]]
+
+    def _add_team_keys(self, player_id: int, name: str, jersey_number: Optional[int], team_id: Optional[int]):
+        if team_id is None:
+            return
+        self._names.setdefault((team_id, player_name_key(name)), set()).add(player_id)
+        if jersey_number is not None:
+            self._jerseys.setdefault((team_id, jersey_number), set()).add(player_id)
+
+    def _remove_team_keys(self, player_id: int, name: str, jersey_number: Optional[int], team_id: Optional[int]):
+        if team_id is None:
+            return
+        _discard(self._names, (team_id, player_name_key(name)), player_id)
+        if jersey_number is not None:
+            _discard(self._jerseys, (team_id, jersey_number), player_id)
+
+
+def player_name_key(name: str) -> str:
+    """Vergleichsschlüssel eines Spielernamens (Dubletten-Prüfung, Kader-Import; in SQL als player_name_key())."""
+    return " ".join(tokenize(name))
+
+
+def _discard(mapping: Dict, key, value):
+    values = mapping.get(key)
+    if values is not None:
+        values.discard(value)
+        if not values:
+            del mapping[key]
+
+
+def _other(ids: Optional[Set[int]], exclude: Optional[int]) -> Optional[int]:
+    for ref_id in ids or ():
+        if ref_id != exclude:
+            return ref_id
+    return None
@@ -0,0 +1,734 @@
+# src/modules/data/sync.py
+
+import datetime
+import gzip
+import json
+import threading
+import urllib.error
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .game_package import RosterResolver, fetch_players
+from ..config import SYNC_CONFLICT_POLICY, SYNC_HOST, SYNC_PORT, SYNC_TIMEOUT_SECONDS
+
+# Abgleich mehrerer Erfassungsgeräte (Laptop, Tablet, ...) mit einer zentralen Datenbank.
+#
+# Jede Datenbank protokolliert per Trigger, welche Spiele, Sätze und Aktionen sich geändert haben
+# (sync_changes, fortlaufende seq). Ein Gerät sendet der Zentrale nur die Zeilen, die sich seit der
+# zuletzt quittierten seq geändert haben (Delta) - der Aufwand hängt an den neuen Daten, nicht an
+# der Größe der Datenbank. Zeilen werden geräteübergreifend über eine globale ID angesprochen
+# ("<device_id>-<lokale ID>"); die Zentrale merkt sich in sync_ids, welche eigene Zeile dazu gehört.
+# Spieler und Teams werden wie bei den Spiel-Paketen über Name/Trikotnummer zugeordnet.
+#
+# Der Abgleich läuft nur in eine Richtung (Geräte -> Zentrale). Ändern Zentrale und Gerät dieselbe
+# Zeile, entscheidet SYNC_CONFLICT_POLICY; jeder Konflikt landet zur Kontrolle in sync_conflicts.
+
+SYNC_VERSION = 1
+DEFAULT_PEER = 'central'
+_BATCH = 500 # Höchstzahl Platzhalter pro IN (...)
+
+# Synchronisierte Tabellen mit Primärschlüssel, Reihenfolge = Anlegen (gelöscht wird umgekehrt)
+SYNC_TABLES: List[Tuple[str, str]] = [('games', 'game_id'), ('sets', 'set_id'), ('actions', 'action_id')]
+
+# Lookup-Spalten der Aktionen: Position in der Delta-Zeile -> Art in lookup_codes.py
+_ACTION_LOOKUPS = {3: 'action_type', 4: 'result_type', 7: 'point_for', 8: 'point_detail_type'}
+
+SYNC_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    # Änderungsprotokoll: welche Zeile sich wann geändert hat (der Inhalt steht in der Tabelle selbst)
+    """
+    CREATE TABLE IF NOT EXISTS sync_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        tbl TEXT NOT NULL,
+        local_id INTEGER NOT NULL,
+        changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_sync_changes_row ON sync_changes (tbl, local_id, seq)",
+    # Globale ID der Zeilen, die von einem anderen Gerät stammen; merged_seq = Stand des eigenen
+    # Protokolls beim letzten Einspielen (spätere eigene Änderungen sind ein Konflikt)
+    """
+    CREATE TABLE IF NOT EXISTS sync_ids (
+        tbl TEXT NOT NULL,
+        local_id INTEGER NOT NULL,
+        gid TEXT NOT NULL,
+        merged_seq INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (tbl, local_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_sync_ids_gid ON sync_ids (tbl, gid)",
+    # Ziele, an die diese Datenbank sendet (last_seq = von dort quittierter Stand des eigenen Protokolls)
+    "CREATE TABLE IF NOT EXISTS sync_peers (peer_id TEXT PRIMARY KEY, last_seq INTEGER NOT NULL, synced_at TEXT NOT NULL)",
+    # Geräte, die an diese Datenbank senden (last_seq = eingespielter Stand des Geräte-Protokolls)
+    "CREATE TABLE IF NOT EXISTS sync_devices (device_id TEXT PRIMARY KEY, last_seq INTEGER NOT NULL, synced_at TEXT NOT NULL)",
+    """
+    CREATE TABLE IF NOT EXISTS sync_conflicts (
+        conflict_id INTEGER PRIMARY KEY,
+        device_id TEXT NOT NULL,
+        tbl TEXT NOT NULL,
+        gid TEXT NOT NULL,
+        kind TEXT NOT NULL, -- 'update', 'delete' oder 'missing_parent'
+        winner TEXT NOT NULL, -- 'device' oder 'central'
+        device_changed_at TEXT,
+        central_changed_at TEXT,
+        detected_at TEXT NOT NULL
+    )
+    """,
+]
+
+
+def _trigger_sql() -> List[str]:
+    # Archivieren/Zurückholen (action_archive.py) verschiebt Aktionen nur und wird nicht protokolliert:
+    # archived_games ist dabei schon eingetragen (Löschen) bzw. noch eingetragen (Zurückholen)
+    not_archived = ("NOT EXISTS (SELECT 1 FROM sets s JOIN archived_games ag ON ag.game_id = s.game_id "
+                    "WHERE s.set_id = {row}.set_id)")
+    queries = []
+    for table, key in SYNC_TABLES:
+        for event, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            when = f" WHEN {not_archived.format(row=row)}" if table == 'actions' and event != 'UPDATE' else ""
+            queries.append(f"""
+                CREATE TRIGGER IF NOT EXISTS sync_{table}_{event.lower()} AFTER {event} ON {table}{when} BEGIN
+                    INSERT INTO sync_changes (tbl, local_id) VALUES ('{table}', {row}.{key}); END""")
+    # Eine geänderte Aufstellung gilt als Änderung des Spiels
+    for event, row in (('INSERT', 'NEW'), ('DELETE', 'OLD')):
+        queries.append(f"""
+            CREATE TRIGGER IF NOT EXISTS sync_game_players_{event.lower()} AFTER {event} ON game_players BEGIN
+                INSERT INTO sync_changes (tbl, local_id) VALUES ('games', {row}.game_id); END""")
+    return queries
+
+
+def _batches(values: Sequence) -> List[Sequence]:
+    return [values[start:start + _BATCH] for start in range(0, len(values), _BATCH)]
+
+
+def _placeholders(values: Sequence) -> str:
+    return ", ".join("?" * len(values))
+
+
+def _now() -> str:
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class DeltaSync:
+    """
+    Änderungsprotokoll und Abgleich einer Datenbank. Jede Datenbank kann Gerät (export_delta, push)
+    und Zentrale (apply_delta) sein. enable() muss einmal gelaufen sein (setup_database mit SYNC_ENABLED
+    oder sync_devices.py).
+    """
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+        self._device_id: Optional[str] = None
+
+    # --- EINRICHTUNG ---
+
+    def enable(self) -> bool:
+        """
+        Legt Protokoll-Tabellen und Trigger an (idempotent). Beim ersten Mal werden alle vorhandenen
+        Spiele, Sätze und Aktionen (auch archivierte) ins Protokoll eingetragen, damit der erste Abgleich
+        sie vollständig überträgt. Gibt True zurück, wenn das Protokoll neu eingerichtet wurde.
+        """
+        existing = self.db.execute_query_fetch_one(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sync_state'")
+        first = existing is None or self.db.execute_query_fetch_one(
+            "SELECT 1 FROM sync_state WHERE key = 'device_id'") is None
+        archived_ids = self._archived_action_ids() if first else []
+
+        with self.db.transaction(immediate=True) as transaction:
+            for query in SYNC_SCHEMA + _trigger_sql():
+                transaction.run(query)
+            if first:
+                for table, key in SYNC_TABLES:
+                    transaction.run(f"INSERT INTO sync_changes (tbl, local_id) SELECT '{table}', {key} "
+                                    f"FROM {table} ORDER BY {key}")
+                transaction.run("INSERT INTO sync_changes (tbl, local_id) VALUES ('actions', ?)",
+                                [(action_id,) for action_id in archived_ids], many=True)
+                transaction.run("INSERT INTO sync_state (key, value) VALUES ('device_id', ?)", (uuid.uuid4().hex,))
+        return first
+
+    def _archived_action_ids(self) -> List[int]:
+        if self.db.execute_query_fetch_one(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'archive_seasons'") is None:
+            return []
+        archive = self.db.get_action_archive()
+        ids = []
+        for season, generation, _ in archive.seasons():
+            ids += archive.season_columns(season, generation)['action_id'].tolist()
+        return ids
+
+    @property
+    def device_id(self) -> str:
+        if self._device_id is None:
+            row = self.db.execute_query_fetch_one("SELECT value FROM sync_state WHERE key = 'device_id'")
+            if row is None:
+                raise RuntimeError("Abgleich ist für diese Datenbank nicht eingerichtet (DeltaSync.enable()).")
+            self._device_id = row[0]
+        return self._device_id
+
+    # --- GERÄT: DELTA ERZEUGEN UND SENDEN ---
+
+    def peer_seq(self, peer_id: str = DEFAULT_PEER) -> int:
+        row = self.db.execute_query_fetch_one("SELECT last_seq FROM sync_peers WHERE peer_id = ?", (peer_id,))
+        return row[0] if row else 0
+
+    def export_delta(self, since_seq: int, from_seq: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Alle seit since_seq geänderten Zeilen, je Zeile einmal im aktuellen Zustand (bzw. als
+        Löschung, wenn es sie nicht mehr gibt). Eltern (Spiel eines Satzes, Satz einer Aktion) stehen
+        als globale ID, Spieler als Verweis in delta['players'], Lookup-Werte als Namen.
+        from_seq: Stand, auf dem das Delta beim Empfänger aufsetzt (Standard since_seq; nach _reseed kleiner).
+        """
+        changes = self.db.execute_query_fetch_all("""
+            SELECT tbl, local_id, MAX(seq), MAX(changed_at) FROM sync_changes
+            WHERE seq > ? GROUP BY tbl, local_id
+        """, (since_seq,))
+        delta: Dict[str, Any] = {
+            'version': SYNC_VERSION, 'device_id': self.device_id,
+            'from_seq': since_seq if from_seq is None else from_seq,
+            'to_seq': max([row[2] for row in changes], default=since_seq), 'players': {},
+            'upserts': {table: [] for table, _ in SYNC_TABLES}, 'deletes': {table: [] for table, _ in SYNC_TABLES},
+        }
+        changed_at = {table: {} for table, _ in SYNC_TABLES}
+        for table, local_id, _, changed in changes:
+            if table in changed_at:
+                changed_at[table][local_id] = changed
+        player_ids = set()
+
+        games = self._fetch_rows("""
+            SELECT g.game_id, g.date_time, ht.name, gt.name FROM games g
+            LEFT JOIN teams ht ON ht.team_id = g.home_team_id
+            LEFT JOIN teams gt ON gt.team_id = g.guest_team_id
+            WHERE g.game_id IN ({placeholders})
+        """, list(changed_at['games']))
+        lineups: Dict[int, List[int]] = {}
+        for batch in _batches(list(games)):
+            for game_id, player_id in self.db.execute_query_fetch_all(
+                    f"SELECT game_id, player_id FROM game_players WHERE game_id IN ({_placeholders(batch)}) "
+                    f"ORDER BY game_id, slot", tuple(batch)):
+                lineups.setdefault(game_id, []).append(player_id)
+                player_ids.add(player_id)
+        sets = self._fetch_rows(
+            "SELECT set_id, game_id, set_number, score_own, score_opponent FROM sets WHERE set_id IN ({placeholders})",
+            list(changed_at['sets']))
+        actions = self._fetch_rows("""
+            SELECT action_id, set_id, action_type_id, result_type_id, executor_player_id, target_player_id,
+                   point_for_id, point_detail_type_id, timestamp
+            FROM actions WHERE action_id IN ({placeholders})
+        """, list(changed_at['actions']))
+        missing = [action_id for action_id in changed_at['actions'] if action_id not in actions]
+        if missing and self.db.get_action_archive().seasons():
+            # Geändert und vor dem Abgleich archiviert: der Inhalt steht im Spaltenarchiv
+            actions.update({row[0]: row for row in self.db.get_action_archive().load_action_rows(missing)})
+
+        game_gids = self._global_ids('games', set(changed_at['games']) | {row[1] for row in sets.values()})
+        set_gids = self._global_ids('sets', set(changed_at['sets']) | {row[1] for row in actions.values()})
+        action_gids = self._global_ids('actions', set(changed_at['actions']))
+        decode = _Decoder(self.db.codes)
+
+        for game_id, changed in changed_at['games'].items():
+            row = games.get(game_id)
+            if row is None:
+                delta['deletes']['games'].append([game_gids[game_id], changed])
+                continue
+            delta['upserts']['games'].append([game_gids[game_id], changed, str(row[1]), row[2], row[3],
+                                              [str(p) for p in lineups.get(game_id, [])]])
+        for set_id, changed in changed_at['sets'].items():
+            row = sets.get(set_id)
+            if row is None:
+                delta['deletes']['sets'].append([set_gids[set_id], changed])
+                continue
+            delta['upserts']['sets'].append([set_gids[set_id], changed, game_gids.get(row[1]), row[2], row[3], row[4]])
+        for action_id, changed in changed_at['actions'].items():
+            row = actions.get(action_id)
+            if row is None:
+                delta['deletes']['actions'].append([action_gids[action_id], changed])
+                continue
+            _, set_id, action_type, result_type, executor, target, point_for, detail, timestamp = row
+            player_ids.update(p for p in (executor, target) if p)
+            delta['upserts']['actions'].append([
+                action_gids[action_id], changed, set_gids.get(set_id),
+                decode('action_type', action_type), decode('result_type', result_type),
+                _player_ref(executor), _player_ref(target),
+                decode('point_for', point_for), decode('point_detail_type', detail), str(timestamp)])
+
+        ordered = sorted(player_ids)
+        for player_id, player in zip(ordered, fetch_players(self.db, ordered)):
+            delta['players'][str(player_id)] = [player['name'], player['jersey'], player['position'],
+                                                player['team_name']]
+        return delta
+
+    def _fetch_rows(self, query: str, ids: List[int]) -> Dict[int, tuple]:
+        rows = {}
+        for batch in _batches(ids):
+            for row in self.db.execute_query_fetch_all(query.format(placeholders=_placeholders(batch)), tuple(batch)):
+                rows[row[0]] = row
+        return rows
+
+    def _global_ids(self, table: str, local_ids) -> Dict[int, str]:
+        """Globale IDs: übernommene Zeilen behalten die ID ihres Ursprungsgeräts."""
+        ids = sorted(i for i in local_ids if i is not None)
+        mapped = {}
+        for batch in _batches(ids):
+            mapped.update(self.db.execute_query_fetch_all(
+                f"SELECT local_id, gid FROM sync_ids WHERE tbl = ? AND local_id IN ({_placeholders(batch)})",
+                (table,) + tuple(batch)))
+        return {local_id: mapped.get(local_id) or f"{self.device_id}-{local_id}" for local_id in ids}
+
+    def push(self, transport, peer_id: str = DEFAULT_PEER) -> Dict[str, Any]:
+        """
+        Sendet das Delta seit dem letzten quittierten Stand über transport (LocalTransport oder
+        HttpTransport) und merkt sich den neuen Stand. Ohne Änderungen wird nichts gesendet.
+        """
+        since = self.peer_seq(peer_id)
+        known = self.db.execute_query_fetch_one("SELECT 1 FROM sync_peers WHERE peer_id = ?", (peer_id,))
+        if known is None and self.db.execute_query_fetch_one("SELECT 1 FROM sync_peers LIMIT 1"):
+            # Neues Ziel, das Protokoll ist für die bisherigen Ziele aber schon gekürzt: alles neu eintragen
+            delta = self.export_delta(self._reseed(), from_seq=0)
+        else:
+            delta = self.export_delta(since)
+        if delta['to_seq'] == since:
+            return {'status': 'up_to_date', 'last_seq': since, 'bytes_sent': 0}
+        response = transport.send(delta)
+        if response.get('status') == 'gap':
+            # Das Ziel kennt weniger, als hier quittiert ist (z.B. aus einer Sicherung zurückgespielt):
+            # alles erneut protokollieren und senden - bereits vorhandene Zeilen ändern sich dort nicht
+            delta = self.export_delta(self._reseed(), from_seq=response['last_seq'])
+            response = transport.send(delta)
+        if response.get('status') != 'ok':
+            raise RuntimeError(f"Abgleich mit '{peer_id}' fehlgeschlagen: {response.get('error', response)}")
+        self._acknowledge(peer_id, response['last_seq'])
+        response['bytes_sent'] = transport.last_bytes_sent
+        return response
+
+    def _reseed(self) -> int:
+        """
+        Trägt alle Zeilen neu ins Protokoll ein; gibt die seq davor zurück. Ziele, die bis dahin alles
+        quittiert haben, brauchen die neuen Einträge nicht und werden über sie hinweg gesetzt.
+        """
+        start = self.db.execute_query_fetch_one("SELECT COALESCE(MAX(seq), 0) FROM sync_changes")[0]
+        archived_ids = self._archived_action_ids()
+        with self.db.transaction(immediate=True) as transaction:
+            for table, key in SYNC_TABLES:
+                transaction.run(f"INSERT INTO sync_changes (tbl, local_id) SELECT '{table}', {key} "
+                                f"FROM {table} ORDER BY {key}")
+            transaction.run("INSERT INTO sync_changes (tbl, local_id) VALUES ('actions', ?)",
+                            [(action_id,) for action_id in archived_ids], many=True)
+            transaction.run("UPDATE sync_peers SET last_seq = (SELECT MAX(seq) FROM sync_changes) WHERE last_seq >= ?",
+                            (start,))
+        return start
+
+    def _acknowledge(self, peer_id: str, last_seq: int):
+        """Quittierten Stand speichern; was alle Ziele haben, wird aus dem Protokoll entfernt."""
+        with self.db.transaction() as transaction:
+            transaction.run("""
+                INSERT INTO sync_peers (peer_id, last_seq, synced_at) VALUES (?, ?, ?)
+                ON CONFLICT (peer_id) DO UPDATE SET last_seq = excluded.last_seq, synced_at = excluded.synced_at
+            """, (peer_id, last_seq, _now()))
+            transaction.run("DELETE FROM sync_changes WHERE seq <= (SELECT MIN(last_seq) FROM sync_peers)")
+
+    # --- ZENTRALE: DELTA EINSPIELEN ---
+
+    def device_seq(self, device_id: str) -> int:
+        row = self.db.execute_query_fetch_one("SELECT last_seq FROM sync_devices WHERE device_id = ?", (device_id,))
+        return row[0] if row else 0
+
+    def apply_delta(self, delta: Dict[str, Any], policy: str = SYNC_CONFLICT_POLICY) -> Dict[str, Any]:
+        """
+        Spielt das Delta eines Geräts in EINER Transaktion ein. Gibt {'status', 'last_seq', 'inserted',
+        'updated', 'deleted', 'conflicts', 'skipped'} zurück. status 'gap': dem Delta fehlt der Anfang
+        (last_seq = bisher eingespielter Stand). Ein bereits eingespieltes Delta (Wiederholung nach
+        verlorener Antwort) wird nur quittiert. Wirft ValueError bei ungültigen Deltas.
+        """
+        if delta.get('version') != SYNC_VERSION:
+            raise ValueError(f"Delta-Version {delta.get('version')} wird nicht unterstützt (erwartet {SYNC_VERSION}).")
+        if policy not in ('newest', 'central', 'device'):
+            raise ValueError(f"Unbekannte Konfliktregel '{policy}'.")
+        device_id = delta['device_id']
+        if device_id == self.device_id:
+            raise ValueError("Ein Delta kann nicht in die eigene Datenbank eingespielt werden.")
+
+        # Lookup-Codes vor der Transaktion auflösen (encode legt fehlende Namen mit eigenem Commit an)
+        codes = {kind: {} for kind in _ACTION_LOOKUPS.values()}
+        for row in delta['upserts']['actions']:
+            for position, kind in _ACTION_LOOKUPS.items():
+                name = row[position]
+                if name is not None and name not in codes[kind]:
+                    codes[kind][name] = self.db.codes.encode(kind, name)
+
+        roster = RosterResolver(self.db)
+        result = {'status': 'ok', 'inserted': 0, 'updated': 0, 'deleted': 0, 'conflicts': 0, 'skipped': 0}
+        with self.db.transaction(immediate=True) as transaction:
+            (recorded,) = transaction.run("SELECT last_seq FROM sync_devices WHERE device_id = ?",
+                                          (device_id,), fetch='one')[0] or (0,)
+            result['last_seq'] = recorded
+            if delta['from_seq'] > recorded:
+                result['status'] = 'gap'
+            elif delta['to_seq'] > recorded:
+                _Merge(roster.bind(transaction), codes, device_id, policy, result).run(delta)
+                transaction.run("""
+                    INSERT INTO sync_devices (device_id, last_seq, synced_at) VALUES (?, ?, ?)
+                    ON CONFLICT (device_id) DO UPDATE SET last_seq = excluded.last_seq, synced_at = excluded.synced_at
+                """, (device_id, delta['to_seq'], _now()))
+                result['last_seq'] = delta['to_seq']
+
+        if roster.teams_created or roster.players_created:
+            # Neue Teams/Spieler: Suchindex und Team-Cache beim nächsten Zugriff neu aufbauen
+            self.db.invalidate_roster_caches()
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        pending = self.db.execute_query_fetch_one("""
+            SELECT COUNT(*) FROM sync_changes WHERE seq > COALESCE((SELECT MIN(last_seq) FROM sync_peers), 0)
+        """)[0]
+        return {
+            'device_id': self.device_id,
+            'pending_changes': pending,
+            'peers': {peer: {'last_seq': seq, 'synced_at': at} for peer, seq, at in self.db.execute_query_fetch_all(
+                "SELECT peer_id, last_seq, synced_at FROM sync_peers ORDER BY peer_id")},
+            'devices': {device: {'last_seq': seq, 'synced_at': at} for device, seq, at in self.db.execute_query_fetch_all(
+                "SELECT device_id, last_seq, synced_at FROM sync_devices ORDER BY device_id")},
+            'conflicts': self.db.execute_query_fetch_one("SELECT COUNT(*) FROM sync_conflicts")[0],
+        }
+
+
+def _player_ref(player_id: Optional[int]) -> Optional[str]:
+    # 0 = Team-Aktion (wie executor_player_id = 0), None = kein Spieler
+    return str(player_id) if player_id else player_id
+
+
+class _Decoder:
+    """Lookup-Code -> Name mit eigenem Cache (ein Delta dekodiert dieselben Codes tausendfach)."""
+
+    def __init__(self, codes):
+        self.codes = codes
+        self.names: Dict[Tuple[str, Optional[int]], Optional[str]] = {}
+
+    def __call__(self, kind: str, code: Optional[int]) -> Optional[str]:
+        key = (kind, code)
+        if key not in self.names:
+            self.names[key] = self.codes.decode(kind, code)
+        return self.names[key]
+
+
+class _Merge:
+    """Spielt ein Delta innerhalb der laufenden Transaktion der Zentrale ein (siehe apply_delta)."""
+
+    def __init__(self, roster: RosterResolver, codes: Dict[str, Dict[str, int]], device_id: str, policy: str,
+                 result: Dict[str, Any]):
+        self.transaction = roster.transaction
+        self.roster = roster
+        self.codes = codes
+        self.device_id = device_id
+        self.policy = policy
+        self.result = result
+        self.ids: Dict[str, Dict[str, int]] = {} # Tabelle -> {gid: lokale ID}
+        self.central_changes: Dict[str, Dict[str, str]] = {} # Tabelle -> {gid: letzte eigene Änderung}
+        self.new_ids: List[Tuple[str, int, str]] = []
+        self.touched: List[Tuple[str, int]] = []
+        self.players: Dict[str, int] = {}
+        self.detected_at = _now()
+
+    def _query(self, query: str, params: Any = ()) -> List[tuple]:
+        return self.transaction.run(query, params, fetch='all')[0]
+
+    def _execute(self, query: str, seq_of_params: List[tuple]) -> int:
+        if not seq_of_params:
+            return 0
+        _, cursor = self.transaction.run(query, seq_of_params, many=True)
+        return max(cursor.rowcount, 0)
+
+    def run(self, delta: Dict[str, Any]):
+        upserts, deletes = delta['upserts'], delta['deletes']
+        gids = {table: {row[0] for row in upserts[table]} | {row[0] for row in deletes[table]}
+                for table, _ in SYNC_TABLES}
+        gids['games'] |= {row[2] for row in upserts['sets'] if row[2]}
+        gids['sets'] |= {row[2] for row in upserts['actions'] if row[2]}
+        for table, _ in SYNC_TABLES:
+            self._load_ids(table, sorted(gids[table]))
+        self.player_refs = delta['players']
+
+        self._upsert_games(upserts['games'])
+        self._upsert_sets(upserts['sets'])
+        self._upsert_actions(upserts['actions'])
+        for table, key in reversed(SYNC_TABLES):
+            self._delete(table, key, deletes[table])
+        self._finish()
+
+    def _load_ids(self, table: str, gids: List[str]):
+        """Zuordnung gid -> lokale ID und die eigenen Änderungen seit dem letzten Einspielen (vor allen Schreibzugriffen)."""
+        self.ids[table], self.central_changes[table] = {}, {}
+        for batch in _batches(gids):
+            placeholders = _placeholders(batch)
+            self.ids[table].update(self._query(
+                f"SELECT gid, local_id FROM sync_ids WHERE tbl = ? AND gid IN ({placeholders})", (table,) + tuple(batch)))
+            self.central_changes[table].update(self._query(f"""
+                SELECT i.gid, MAX(c.changed_at) FROM sync_ids i
+                JOIN sync_changes c ON c.tbl = i.tbl AND c.local_id = i.local_id AND c.seq > i.merged_seq
+                WHERE i.tbl = ? AND i.gid IN ({placeholders})
+                GROUP BY i.gid
+            """, (table,) + tuple(batch)))
+
+    def _device_wins(self, table: str, gid: str, device_changed_at: str, kind: str) -> bool:
+        central_changed_at = self.central_changes[table].get(gid)
+        if central_changed_at is None:
+            return True
+        if self.policy == 'newest':
+            wins = device_changed_at > central_changed_at
+        else:
+            wins = self.policy == 'device'
+        self._conflict(table, gid, kind, 'device' if wins else 'central', device_changed_at, central_changed_at)
+        return wins
+
+    def _conflict(self, table: str, gid: str, kind: str, winner: str, device_changed_at: Optional[str],
+                  central_changed_at: Optional[str] = None):
+        self.transaction.run("""
+            INSERT INTO sync_conflicts (device_id, tbl, gid, kind, winner, device_changed_at, central_changed_at, detected_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (self.device_id, table, gid, kind, winner, device_changed_at, central_changed_at, self.detected_at))
+        self.result['conflicts'] += 1
+
+    def _target_ids(self, table: str, key: str, rows: List[list], parent: Optional[str] = None) -> List[Tuple[int, list]]:
+        """
+        Lokale IDs der anzuwendenden Zeilen: bekannte gids behalten ihre Zeile, neue bekommen
+        fortlaufende IDs. Zeilen, bei denen die Zentrale gewinnt oder der Elternteil fehlt, entfallen.
+        """
+        existing = set()
+        known = [self.ids[table][row[0]] for row in rows if row[0] in self.ids[table]]
+        for batch in _batches(known):
+            existing.update(row[0] for row in self._query(
+                f"SELECT {key} FROM {table} WHERE {key} IN ({_placeholders(batch)})", tuple(batch)))
+        # Bei actions auch hinter dem AUTOINCREMENT-Zähler: archivierte IDs fehlen in der Tabelle
+        next_id = self._query(f"""
+            SELECT MAX(COALESCE((SELECT MAX({key}) FROM {table}), 0),
+                       COALESCE((SELECT seq FROM sqlite_sequence WHERE name = ?), 0)) + 1
+        """, (table,))[0][0]
+
+        targets = []
+        for row in rows:
+            gid, changed_at = row[0], row[1]
+            if parent and row[2] not in self.ids[parent]:
+                self._conflict(table, gid, 'missing_parent', 'central', changed_at)
+                self.result['skipped'] += 1
+                continue
+            local_id = self.ids[table].get(gid)
+            if local_id is not None:
+                if not self._device_wins(table, gid, changed_at, 'update'):
+                    self.result['skipped'] += 1
+                    continue
+                self.result['updated' if local_id in existing else 'inserted'] += 1
+            else:
+                local_id = next_id
+                next_id += 1
+                self.ids[table][gid] = local_id
+                self.new_ids.append((table, local_id, gid))
+                self.result['inserted'] += 1
+            self.touched.append((table, local_id))
+            targets.append((local_id, row))
+        return targets
+
+    def _player_id(self, ref: Optional[str]) -> Optional[int]:
+        if not ref:
+            return ref # None oder 0 (Team-Aktion)
+        if ref not in self.players:
+            name, jersey, position, team_name = self.player_refs[ref]
+            self.players[ref] = self.roster.player_id({'name': name, 'jersey': jersey, 'position': position},
+                                                      self.roster.team_id(team_name))
+        return self.players[ref]
+
+    def _upsert_games(self, rows: List[list]):
+        targets = self._target_ids('games', 'game_id', rows)
+        self._execute("""
+            INSERT INTO games (game_id, date_time, home_team_id, guest_team_id) VALUES (?, ?, ?, ?)
+            ON CONFLICT (game_id) DO UPDATE SET date_time = excluded.date_time,
+                home_team_id = excluded.home_team_id, guest_team_id = excluded.guest_team_id
+        """, [(game_id, row[2], self.roster.team_id(row[3]), self.roster.team_id(row[4])) for game_id, row in targets])
+        self._execute("DELETE FROM game_players WHERE game_id = ?", [(game_id,) for game_id, _ in targets])
+        self._execute("INSERT OR IGNORE INTO game_players (game_id, player_id, slot) VALUES (?, ?, ?)",
+                      [(game_id, self._player_id(ref), slot) for game_id, row in targets
+                       for slot, ref in enumerate(row[5])])
+
+    def _upsert_sets(self, rows: List[list]):
+        targets = self._target_ids('sets', 'set_id', rows, parent='games')
+        self._execute("""
+            INSERT INTO sets (set_id, game_id, set_number, score_own, score_opponent) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (set_id) DO UPDATE SET game_id = excluded.game_id, set_number = excluded.set_number,
+                score_own = excluded.score_own, score_opponent = excluded.score_opponent
+        """, [(set_id, self.ids['games'][row[2]], row[3], row[4], row[5]) for set_id, row in targets])
+
+    def _upsert_actions(self, rows: List[list]):
+        targets = self._target_ids('actions', 'action_id', rows, parent='sets')
+        codes = self.codes
+        self._execute("""
+            INSERT INTO actions (action_id, set_id, action_type_id, result_type_id, executor_player_id,
+                                 target_player_id, point_for_id, point_detail_type_id, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (action_id) DO UPDATE SET set_id = excluded.set_id, action_type_id = excluded.action_type_id,
+                result_type_id = excluded.result_type_id, executor_player_id = excluded.executor_player_id,
+                target_player_id = excluded.target_player_id, point_for_id = excluded.point_for_id,
+                point_detail_type_id = excluded.point_detail_type_id, timestamp = excluded.timestamp
+        """, [(action_id, self.ids['sets'][row[2]], codes['action_type'][row[3]],
+               codes['result_type'].get(row[4]), self._player_id(row[5]), self._player_id(row[6]),
+               codes['point_for'].get(row[7]), codes['point_detail_type'].get(row[8]), row[9])
+              for action_id, row in targets])
+
+    def _delete(self, table: str, key: str, rows: List[list]):
+        local_ids = []
+        for gid, changed_at in rows:
+            local_id = self.ids[table].get(gid)
+            # Nie angekommen (z.B. auf dem Gerät angelegt und wieder gelöscht): nichts zu tun
+            if local_id is None or not self._device_wins(table, gid, changed_at, 'delete'):
+                continue
+            local_ids.append((local_id,))
+            self.touched.append((table, local_id))
+        if table == 'games':
+            self._execute("DELETE FROM game_players WHERE game_id = ?", local_ids)
+        self.result['deleted'] += self._execute(f"DELETE FROM {table} WHERE {key} = ?", local_ids)
+
+    def _finish(self):
+        """
+        Zuordnungen speichern und merged_seq auf den Stand nach dem Einspielen setzen: die eben
+        geschriebenen Zeilen zählen nicht als eigene Änderung. Sendet diese Datenbank selbst an
+        kein Ziel weiter, werden die Protokolleinträge dieser Zeilen gleich entfernt.
+        """
+        (max_seq,) = self._query("SELECT COALESCE(MAX(seq), 0) FROM sync_changes")[0]
+        self._execute("INSERT INTO sync_ids (tbl, local_id, gid, merged_seq) VALUES (?, ?, ?, ?)",
+                      [(table, local_id, gid, max_seq) for table, local_id, gid in self.new_ids])
+        self._execute("UPDATE sync_ids SET merged_seq = ? WHERE tbl = ? AND local_id = ?",
+                      [(max_seq, table, local_id) for table, local_id in self.touched])
+        if not self._query("SELECT 1 FROM sync_peers LIMIT 1"):
+            self._execute("DELETE FROM sync_changes WHERE tbl = ? AND local_id = ? AND seq <= ?",
+                          [(table, local_id, max_seq) for table, local_id in self.touched])
+
+
+# --- ÜBERTRAGUNG ---
+
+def encode_delta(payload: Dict[str, Any]) -> bytes:
+    return gzip.compress(json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 6)
+
+
+def decode_delta(data: bytes) -> Dict[str, Any]:
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return json.loads(data.decode('utf-8'))
+
+
+class LocalTransport:
+    """Abgleich Datei zu Datei ohne Netzwerk (z.B. Gerät per USB-Stick an den Vereinsrechner)."""
+
+    def __init__(self, central_db_manager, policy: str = SYNC_CONFLICT_POLICY):
+        self.central = DeltaSync(central_db_manager)
+        self.central.enable()
+        self.policy = policy
+        self.last_bytes_sent = 0
+
+    def send(self, delta: Dict[str, Any]) -> Dict[str, Any]:
+        # Über dieselbe Kodierung wie per HTTP, damit beide Wege exakt dasselbe übertragen
+        data = encode_delta(delta)
+        self.last_bytes_sent = len(data)
+        return self.central.apply_delta(decode_delta(data), policy=self.policy)
+
+
+class HttpTransport:
+    """Sendet Deltas per POST (gzip-JSON) an einen SyncServer."""
+
+    def __init__(self, url: str, timeout: float = SYNC_TIMEOUT_SECONDS):
+        self.url = url
+        self.timeout = timeout
+        self.last_bytes_sent = 0
+
+    def send(self, delta: Dict[str, Any]) -> Dict[str, Any]:
+        data = encode_delta(delta)
+        self.last_bytes_sent = len(data)
+        request = urllib.request.Request(self.url, data=data, method='POST', headers={
+            'Content-Type': 'application/json', 'Content-Encoding': 'gzip', 'Accept-Encoding': 'gzip'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return decode_delta(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                return decode_delta(e.read())
+            except ValueError:
+                return {'status': 'error', 'error': f"HTTP {e.code}"}
+        except (urllib.error.URLError, OSError) as e:
+            return {'status': 'error', 'error': str(e)}
+
+
+class SyncServer(ThreadingHTTPServer):
+    """
+    Lokaler Endpunkt der Zentrale: POST /sync spielt ein Delta ein, GET /sync/status liefert den
+    Stand je Gerät. Einspielen ist über die Schreibverbindung des DBManagers serialisiert.
+    """
+    daemon_threads = True
+
+    def __init__(self, db_manager, host: str = SYNC_HOST, port: int = SYNC_PORT,
+                 policy: str = SYNC_CONFLICT_POLICY, verbose: bool = False):
+        self.sync = DeltaSync(db_manager)
+        self.sync.enable()
+        self.policy = policy
+        self.verbose = verbose
+        self._thread: Optional[threading.Thread] = None
+        super().__init__((host, port), _SyncHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/sync"
+
+    def start(self) -> 'SyncServer':
+        """Bedient Anfragen in einem Hintergrund-Thread (für Tests und Benchmarks)."""
+        self._thread = threading.Thread(target=self.serve_forever, name="sync-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class _SyncHandler(BaseHTTPRequestHandler):
+    server: SyncServer
+
+    def _reply(self, code: int, payload: Dict[str, Any]):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            data = gzip.compress(data)
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != '/sync/status':
+            self._reply(404, {'status': 'error', 'error': f"Unbekannter Pfad {self.path}"})
+            return
+        self._reply(200, self.server.sync.status())
+
+    def do_POST(self):
+        if self.path != '/sync':
+            self._reply(404, {'status': 'error', 'error': f"Unbekannter Pfad {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            delta = decode_delta(self.rfile.read(length))
+            result = self.server.sync.apply_delta(delta, policy=self.server.policy)
+        except (ValueError, KeyError, TypeError, IndexError, OSError) as e:
+            self._reply(400, {'status': 'error', 'error': f"Ungültiges Delta: {e}"})
+            return
+        except Exception as e:
+            print(f"Fehler beim Einspielen eines Deltas: {e}")
+            self._reply(500, {'status': 'error', 'error': str(e)})
+            return
+        if self.server.verbose:
+            print(f"Delta von {delta.get('device_id')}: {result}")
+        self._reply(200, result)
+
+    def log_message(self, format: str, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
@@ -1,80 +1,101 @@
 # src/modules/gui/action_dialog.py
 
 import customtkinter as ctk
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 # Importieren von Konstanten aus der Konfigurationsdatei
-from ..config import ACTION_TYPES 
+from ..config import ACTION_TYPES
+from .pooled_dialog import PooledDialog
 
-class ActionDialog(ctk.CTkToplevel):
+class ActionDialog(PooledDialog):
     """
     Pop-up-Fenster zur Erfassung von Details (Result_Type und Target_Player)
     für komplexe Aktionen wie Angriff, Aufschlag und Zuspiel.
+    Wird vom DialogManager wiederverwendet (siehe reconfigure()).
     """
+    NO_TARGET = "-- Kein Ziel --"
+
     def __init__(self, master, executor_id: int, action_name: str, players: Dict[int, str], callback):
-        super().__init__(master)
-        
-        self.title(f"Aktion: {action_name}")
-        self.geometry("300x350")
-        self.transient(master)  # Hält den Dialog über dem Hauptfenster
-        self.grab_set()         # Blockiert Interaktion mit dem Hauptfenster
-        
+        super().__init__(master, title=f"Aktion: {action_name}", geometry="300x350")
+
         self.executor_id = executor_id
         self.action_name = action_name
         self.players = players
+        self._target_menu_players: Optional[Dict[int, str]] = None # Spieler, mit denen das Ziel-Dropdown befüllt ist
         self.callback = callback # Funktion in InputView, die die Daten verarbeitet
         self.result_data = None
-        
+
         # UI-Elemente
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
-        ctk.CTkLabel(self, text=f"Spieler: {self.players.get(executor_id)}", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, columnspan=2, padx=20, pady=10)
-        
+        self.executor_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(weight="bold"))
+        self.executor_label.grid(row=0, column=0, columnspan=2, padx=20, pady=10)
+
         self._setup_result_selection()
         self._setup_target_selection()
-        
+
         # Bestätigungsbutton
         ctk.CTkButton(self, text="Speichern", command=self.on_submit).grid(row=5, column=0, columnspan=2, pady=20)
 
+        self.reconfigure(executor_id, action_name, players, callback)
+
     def _setup_result_selection(self):
         """Erstellt die Auswahl für den Ergebnis-Typ (z.B. Kill, Fehler, Halbes)."""
-        
-        # Holen der Optionen aus config.py
-        result_options = ACTION_TYPES.get(self.action_name, ["Gut", "Fehler"]) 
-        
         ctk.CTkLabel(self, text="Ergebnis-Typ:").grid(row=1, column=0, sticky="w", padx=20, pady=5)
-        
-        self.result_var = ctk.StringVar(value=result_options[0])
-        self.result_menu = ctk.CTkOptionMenu(self, values=result_options, variable=self.result_var)
+
+        self.result_var = ctk.StringVar(value="")
+        self.result_menu = ctk.CTkOptionMenu(self, values=[""], variable=self.result_var)
         self.result_menu.grid(row=1, column=1, sticky="ew", padx=20, pady=5)
 
     def _setup_target_selection(self):
-        """Erstellt die Auswahl für den Zielspieler ('Zuspiel zu')."""
-        
-        # Das Zielfeld ist nur für 'Zuspiel' relevant
-        if self.action_name != "Zuspiel":
-            self.target_id_var = None
-            return
-
-        ctk.CTkLabel(self, text="Zuspiel zu:").grid(row=2, column=0, sticky="w", padx=20, pady=5)
-        
-        # Füge alle Spielernamen zur Dropdown-Liste hinzu
-        player_names = ["-- Kein Ziel --"] + list(self.players.values())
-        
-        self.target_name_var = ctk.StringVar(value=player_names[0])
-        self.target_menu = ctk.CTkOptionMenu(self, values=player_names, variable=self.target_name_var)
+        """Erstellt die Auswahl für den Zielspieler ('Zuspiel zu'). Sichtbar nur bei 'Zuspiel'."""
+        self.target_label = ctk.CTkLabel(self, text="Zuspiel zu:")
+        self.target_label.grid(row=2, column=0, sticky="w", padx=20, pady=5)
+
+        self.target_name_var = ctk.StringVar(value=self.NO_TARGET)
+        self.target_menu = ctk.CTkOptionMenu(self, values=[self.NO_TARGET], variable=self.target_name_var)
         self.target_menu.grid(row=2, column=1, sticky="ew", padx=20, pady=5)
 
+    def reconfigure(self, executor_id: int, action_name: str, players: Dict[int, str], callback):
+        """Setzt Ausführenden, Ergebnis-Optionen und Zielliste für die nächste Anzeige."""
+        self.executor_id = executor_id
+        self.action_name = action_name
+        self.callback = callback
+        self.result_data = None
+
+        self.title(f"Aktion: {action_name}")
+        self.executor_label.configure(text=f"Spieler: {players.get(executor_id)}")
+
+        # Holen der Optionen aus config.py
+        result_options = ACTION_TYPES.get(action_name, ["Gut", "Fehler"])
+        self.result_menu.configure(values=result_options)
+        self.result_var.set(result_options[0])
+
+        # Das Zielfeld ist nur für 'Zuspiel' relevant
+        if action_name == "Zuspiel":
+            # Die Zielliste nur neu aufbauen, wenn sich die Spieler geändert haben
+            if players is not self._target_menu_players:
+                self.target_menu.configure(values=[self.NO_TARGET] + list(players.values()))
+                self._target_menu_players = players
+            self.target_name_var.set(self.NO_TARGET)
+            self.target_label.grid()
+            self.target_menu.grid()
+        else:
+            self.target_label.grid_remove()
+            self.target_menu.grid_remove()
+
+        self.players = players
+
     def on_submit(self):
         """Sammelt die Daten und ruft den Callback in InputView auf."""
-        
+
         result_type = self.result_var.get()
         target_id: Optional[int] = None
 
         if self.action_name == "Zuspiel":
             # Finde die Spieler-ID basierend auf dem gewählten Namen
             target_name = self.target_name_var.get()
-            if target_name != "-- Kein Ziel --":
+            if target_name != self.NO_TARGET:
                 # Reverse lookup der ID
                 target_id = next((k for k, v in self.players.items() if v == target_name), None)
 
@@ -84,10 +105,7 @@ class ActionDialog(ctk.CTkToplevel):
             "result_type": result_type,
             "target_id": target_id
         }
-        
-        self.callback(self.result_data)
-        self.destroy() 
 
-    def on_close(self):
-        """Wird aufgerufen, wenn der Dialog geschlossen wird, ohne zu speichern."""
-        self.destroy()
\ No newline at end of file
+        # Erst verstecken, dann Callback: der Callback kann diesen Dialog direkt wieder öffnen
+        self.hide()
+        self.callback(self.result_data)
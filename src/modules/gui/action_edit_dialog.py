@@ -2,106 +2,126 @@
 
 import customtkinter as ctk
 from typing import Dict, Optional, Any, Tuple
-from ..config import ACTION_TYPES 
+from ..config import ACTION_TYPES
+from .pooled_dialog import PooledDialog
 
-class ActionEditDialog(ctk.CTkToplevel):
+class ActionEditDialog(PooledDialog):
     """
     Pop-up-Fenster zur Bearbeitung oder Löschung einer bestehenden Aktion.
     Verwendet den direkt übergebenen app_controller.
     """
+    NO_TARGET = "-- Kein Ziel --"
+
     def __init__(self, master, app_controller, action_id: int, details: Dict[str, Any], players: Dict[int, str], callback):
-        super().__init__(master)
-        
+        super().__init__(master, title=f"Aktion bearbeiten (ID: {action_id})", geometry="400x450")
+
         self.app_controller = app_controller # Speichere den Controller direkt
-        
-        self.title(f"Aktion bearbeiten (ID: {action_id})")
-        self.geometry("400x450")
-        self.transient(master)
-        self.grab_set()
-        
+
         self.action_id = action_id
         self.details = details # Enthält action_type, executor_id, result_type, target_id, set_id etc.
         self.players = players
-        self.callback = callback 
-        
+        self.callback = callback
+
         # UI-Elemente
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
-        
-        action_name = self.details.get('action_type', 'Unbekannt')
-        executor_id = self.details.get('executor_player_id')
-
-        ctk.CTkLabel(self, text=f"Typ: {action_name}", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, columnspan=2, padx=20, pady=10)
-        
-        self._setup_executor_selection(executor_id)
-        self._setup_result_selection(action_name)
-        self._setup_target_selection(action_name)
-        
+
+        self.type_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(weight="bold"))
+        self.type_label.grid(row=0, column=0, columnspan=2, padx=20, pady=10)
+
+        self._setup_executor_selection()
+        self._setup_result_selection()
+        self._setup_target_selection()
+
         # --- Bestätigungs- und Löschbuttons ---
         ctk.CTkButton(self, text="Änderung Speichern", command=self.on_submit, fg_color="green").grid(row=5, column=0, padx=5, pady=20)
         ctk.CTkButton(self, text="Aktion Löschen", command=self.on_delete, fg_color="red").grid(row=5, column=1, padx=5, pady=20)
 
-    def _setup_executor_selection(self, current_id: int):
-        """Erstellt die Auswahl für den ausführenden Spieler."""
-        player_names = list(self.players.values())
-        
-        try:
-            current_name = self.players[current_id]
-        except KeyError:
-             current_name = player_names[0] if player_names else "Fehler"
+        self.reconfigure(action_id, details, players, callback)
 
+    def _setup_executor_selection(self):
+        """Erstellt die Auswahl für den ausführenden Spieler."""
         ctk.CTkLabel(self, text="Spieler ändern:").grid(row=1, column=0, sticky="w", padx=20, pady=5)
-        
-        self.executor_var = ctk.StringVar(value=current_name)
-        self.executor_menu = ctk.CTkOptionMenu(self, values=player_names, variable=self.executor_var)
+
+        self.executor_var = ctk.StringVar(value="")
+        self.executor_menu = ctk.CTkOptionMenu(self, values=[""], variable=self.executor_var)
         self.executor_menu.grid(row=1, column=1, sticky="ew", padx=20, pady=5)
 
 
-    def _setup_result_selection(self, action_name: str):
+    def _setup_result_selection(self):
         """Erstellt die Auswahl für den Ergebnis-Typ (Result_Type)."""
-        
-        # Annahme: ACTION_TYPES ist ein Dict, z.B. {'Angriff': ['Kill', 'Fehler', 'Halbes']}
-        result_options = ACTION_TYPES.get(action_name, ["Gut", "Fehler"]) 
-        current_result = self.details.get('result_type')
-        
-        if not current_result or current_result not in result_options:
-            current_result = result_options[0] if result_options else ""
-
         ctk.CTkLabel(self, text="Ergebnis-Typ:").grid(row=2, column=0, sticky="w", padx=20, pady=5)
-        
-        self.result_var = ctk.StringVar(value=current_result)
-        self.result_menu = ctk.CTkOptionMenu(self, values=result_options, variable=self.result_var)
+
+        self.result_var = ctk.StringVar(value="")
+        self.result_menu = ctk.CTkOptionMenu(self, values=[""], variable=self.result_var)
         self.result_menu.grid(row=2, column=1, sticky="ew", padx=20, pady=5)
 
 
-    def _setup_target_selection(self, action_name: str):
-        """Erstellt die Auswahl für den Zielspieler (nur für 'Zuspiel' relevant)."""
-        
-        if action_name != "Zuspiel":
-            self.target_name_var = None
-            return
-
-        ctk.CTkLabel(self, text="Zielspieler (Zuspiel zu):").grid(row=3, column=0, sticky="w", padx=20, pady=5)
-        
-        player_names = ["-- Kein Ziel --"] + list(self.players.values())
-        current_target_id = self.details.get('target_player_id')
-        current_target_name = self.players.get(current_target_id, "-- Kein Ziel --")
-        
-        self.target_name_var = ctk.StringVar(value=current_target_name)
-        self.target_menu = ctk.CTkOptionMenu(self, values=player_names, variable=self.target_name_var)
+    def _setup_target_selection(self):
+        """Erstellt die Auswahl für den Zielspieler (nur für 'Zuspiel' sichtbar)."""
+        self.target_label = ctk.CTkLabel(self, text="Zielspieler (Zuspiel zu):")
+        self.target_label.grid(row=3, column=0, sticky="w", padx=20, pady=5)
+
+        self.target_var = ctk.StringVar(value=self.NO_TARGET)
+        self.target_menu = ctk.CTkOptionMenu(self, values=[self.NO_TARGET], variable=self.target_var)
         self.target_menu.grid(row=3, column=1, sticky="ew", padx=20, pady=5)
+        self.target_name_var: Optional[ctk.StringVar] = None
+
+
+    def reconfigure(self, action_id: int, details: Dict[str, Any], players: Dict[int, str], callback):
+        """Befüllt den Dialog mit den Daten der zu bearbeitenden Aktion."""
+        self.action_id = action_id
+        self.details = details
+        self.players = players
+        self.callback = callback
+
+        self.title(f"Aktion bearbeiten (ID: {action_id})")
+
+        action_name = self.details.get('action_type', 'Unbekannt')
+        self.type_label.configure(text=f"Typ: {action_name}")
+
+        # 1. Ausführender Spieler
+        player_names = list(self.players.values())
+        try:
+            current_name = self.players[self.details.get('executor_player_id')]
+        except KeyError:
+             current_name = player_names[0] if player_names else "Fehler"
+        self.executor_menu.configure(values=player_names if player_names else [current_name])
+        self.executor_var.set(current_name)
+
+        # 2. Ergebnis-Typ
+        # Annahme: ACTION_TYPES ist ein Dict, z.B. {'Angriff': ['Kill', 'Fehler', 'Halbes']}
+        result_options = ACTION_TYPES.get(action_name, ["Gut", "Fehler"])
+        current_result = self.details.get('result_type')
+        if not current_result or current_result not in result_options:
+            current_result = result_options[0] if result_options else ""
+        self.result_menu.configure(values=result_options)
+        self.result_var.set(current_result)
+
+        # 3. Zielspieler (nur für 'Zuspiel' relevant)
+        if action_name == "Zuspiel":
+            current_target_name = self.players.get(self.details.get('target_player_id'), self.NO_TARGET)
+            self.target_menu.configure(values=[self.NO_TARGET] + player_names)
+            self.target_var.set(current_target_name)
+            self.target_name_var = self.target_var
+            self.target_label.grid()
+            self.target_menu.grid()
+        else:
+            self.target_name_var = None
+            self.target_label.grid_remove()
+            self.target_menu.grid_remove()
 
 
     def on_submit(self):
         """Sammelt die geänderten Daten und ruft den GameController zur Aktualisierung auf."""
-        
+
         new_executor_name = self.executor_var.get()
         new_executor_id = next((k for k, v in self.players.items() if v == new_executor_name), None)
-        
+
         new_target_id: Optional[int] = None
         if self.target_name_var:
             target_name = self.target_name_var.get()
-            if target_name != "-- Kein Ziel --":
+            if target_name != self.NO_TARGET:
                 new_target_id = next((k for k, v in self.players.items() if v == target_name), None)
 
         updated_data = {
@@ -110,22 +130,18 @@ class ActionEditDialog(ctk.CTkToplevel):
             "result_type": self.result_var.get(),
             "target_id": new_target_id
         }
-        
+
         # NEU: Zugriff über den gespeicherten Controller
         success = self.app_controller.get_game_controller().update_action(updated_data)
-        
+
+        self.hide()
         self.callback(success)
-        self.destroy()
 
     def on_delete(self):
         """Löscht die aktuelle Aktion."""
-        
+
         # NEU: Zugriff über den gespeicherten Controller
         success = self.app_controller.get_game_controller().delete_action(self.action_id)
 
+        self.hide()
         self.callback(success)
-        self.destroy()
-
-    def on_close(self):
-        """Wird aufgerufen, wenn der Dialog geschlossen wird, ohne zu speichern."""
-        self.destroy()
\ No newline at end of file
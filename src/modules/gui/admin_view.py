@@ -1,7 +1,10 @@
 import customtkinter as ctk
+from tkinter import filedialog
 from typing import Dict, List, Tuple, Optional
 from ..config import VOLLEYBALL_POSITIONS
 from ..data.models import Player # Für die Erstellung neuer Spieler
+from ..data.roster_import import read_roster_files
+from .virtual_list import VirtualList
 
 class AdminView(ctk.CTkFrame):
     """
@@ -15,7 +18,10 @@ class AdminView(ctk.CTkFrame):
         
         # Datenspeicher für Teams und Spieler
         self.teams: Dict[int, str] = {}
-        self.all_player_details: List[Tuple[int, str, Optional[int], Optional[str], Optional[int]]] = []
+        # Spielerdetails nach ID: {player_id: (ID, Name, Nr., Pos., Team-ID)}
+        self.player_details: Dict[int, Tuple[int, str, Optional[int], Optional[str], Optional[int]]] = {}
+        # Spieler je Team: {team_id: [(ID, Name, Nr.), ...]} für die Team-Liste
+        self.team_rosters: Dict[int, List[Tuple[int, str, Optional[int]]]] = {}
         
         # Grid Konfiguration (2 Spalten für Spieler und Teams)
         self.grid_columnconfigure(0, weight=1) 
@@ -96,51 +102,55 @@ class AdminView(ctk.CTkFrame):
         list_frame.grid_rowconfigure(0, weight=1)
         list_frame.grid_columnconfigure(0, weight=1)
 
-        self.player_list_container = ctk.CTkScrollableFrame(list_frame, label_text="Alle Spieler")
-        self.player_list_container.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
-        self.player_list_container.grid_columnconfigure(0, weight=1)
-        self.player_list_container.grid_columnconfigure(1, weight=0) # Für den Bearbeiten-Button
-
+        # Virtualisiert: nur die sichtbaren Zeilen existieren als Widgets
+        self.player_list = VirtualList(list_frame, label_text="Alle Spieler",
+                                       create_row=self._create_player_row, render_row=self._render_player_row,
+                                       filter_text=self._player_label_text,
+                                       search=self.db_manager.search_players, row_height=60)
+        self.player_list.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+
+    def _create_player_row(self, master):
+        """Zeile der Spielerliste (Beschriftung + Bearbeiten-Button), wird beim Scrollen wiederverwendet."""
+        row = ctk.CTkFrame(master, fg_color="transparent")
+        row.grid_columnconfigure(0, weight=1)
+        row.label = ctk.CTkLabel(row, text="", anchor="w", justify="left", wraplength=300)
+        row.label.grid(row=0, column=0, sticky="ew", padx=5, pady=3)
+        row.player_id = None
+        row.edit_button = ctk.CTkButton(row, text="Bearbeiten", width=100,
+                                        command=lambda: self.select_player_for_edit(row.player_id))
+        row.edit_button.grid(row=0, column=1, padx=5, pady=3)
+        return row
+
+    def _render_player_row(self, row, player_id: int):
+        row.player_id = player_id
+        row.label.configure(text=self._player_label_text(player_id))
+
+
+    def _load_player_details(self):
+        """Lädt alle Spielerdetails in das nach ID indizierte Modell."""
+        self.player_details = {row[0]: row for row in self.db_manager.get_all_players_details()}
+
+    def _player_label_text(self, player_id: int) -> str:
+        _, name, jersey_number, position, team_id = self.player_details[player_id]
+        team_name = self.teams.get(team_id, "Kein Team")
+        jersey_display = f"#{jersey_number}" if jersey_number else "N/A"
+        position_display = position if position else "Unbekannt"
+        return (f"[{player_id}] **{name}** ({jersey_display} / {position_display})\n"
+                f"Team: {team_name}")
 
     def load_player_list(self):
         """Lädt Spielerdetails aus der DB und aktualisiert die Liste mit allen Attributen."""
-        # Lösche alte Widgets
-        for widget in self.player_list_container.winfo_children():
-            widget.destroy()
-            
-        # Lade Daten neu
-        self.all_player_details = self.db_manager.get_all_players_details() 
+        self._load_player_details()
         self.teams = self.db_manager.get_all_teams()
-        
-        for idx, (player_id, name, jersey_number, position, team_id) in enumerate(self.all_player_details):
-            
-            team_name = self.teams.get(team_id, "Kein Team") 
-            jersey_display = f"#{jersey_number}" if jersey_number else "N/A"
-            position_display = position if position else "Unbekannt"
-            
-            label_text = (f"[{player_id}] **{name}** ({jersey_display} / {position_display})\n"
-                          f"Team: {team_name}")
-            
-            ctk.CTkLabel(self.player_list_container, 
-                         text=label_text, 
-                         anchor="w",
-                         justify="left",
-                         wraplength=300
-                         ).grid(row=idx, column=0, sticky="ew", padx=5, pady=5)
-                         
-            # Bearbeiten Button
-            edit_button = ctk.CTkButton(self.player_list_container, 
-                                        text="Bearbeiten", 
-                                        command=lambda pid=player_id: self.select_player_for_edit(pid),
-                                        width=100)
-            edit_button.grid(row=idx, column=1, padx=5, pady=5)
+        # Die Zeilen-Widgets bleiben bestehen und werden nur neu beschriftet
+        self.player_list.set_items(list(self.player_details))
 
 
     def select_player_for_edit(self, player_id: int):
         """Lädt die Daten des ausgewählten Spielers in die Eingabefelder."""
         
-        # Daten des Spielers aus der Liste der geladenen Details finden
-        player_data = next((p for p in self.all_player_details if p[0] == player_id), None)
+        # Daten des Spielers aus den geladenen Details
+        player_data = self.player_details.get(player_id)
         
         if not player_data:
             print(f"Fehler: Spieler-ID {player_id} nicht in Details gefunden.")
@@ -200,9 +210,12 @@ class AdminView(ctk.CTkFrame):
             print("Fehler: Trikotnummer muss eine ganze Zahl sein.")
             return
 
-        # Validierung 3: Eindeutigkeitsprüfung
-        if not self.db_manager.check_player_uniqueness(name, jersey_number, self.edit_player_id):
-            print("Fehler: Ein Spieler mit diesem Namen ODER dieser Trikotnummer existiert bereits!")
+        # Annahme: Neue Spieler kommen in Team 1 (dies müsste später wählbar sein)
+        team_id = None if self.edit_player_id else 1
+
+        # Validierung 3: Eindeutigkeitsprüfung im Team (beim Bearbeiten: aktuelles Team des Spielers)
+        if not self.db_manager.check_player_uniqueness(name, jersey_number, self.edit_player_id, team_id=team_id):
+            print("Fehler: Ein Spieler mit diesem Namen ODER dieser Trikotnummer existiert im Team bereits!")
             return
             
         
@@ -211,15 +224,12 @@ class AdminView(ctk.CTkFrame):
             success = self.db_manager.update_player(self.edit_player_id, name, jersey_number, position)
             if success:
                 print(f"Spieler ID {self.edit_player_id} erfolgreich aktualisiert.")
+                self.app_controller.get_game_controller().invalidate_player_names()
                 self.cancel_editing() # UI zurücksetzen
             else:
                 print("FEHLER beim Aktualisieren des Spielers.")
         else:
             # HINZUFÜGEN-MODUS
-            
-            # Annahme: Wir fügen den Spieler zu Team 1 hinzu (dies müsste später wählbar sein)
-            team_id = 1 
-            
             new_player = Player(name=name, jersey_number=jersey_number, position=position)
             
             # Die Methode insert_player() muss das Player-Objekt und die team_id unterstützen
@@ -260,14 +270,17 @@ class AdminView(ctk.CTkFrame):
         
         self.team_to_edit_menu.configure(command=self.display_team_players_for_edit)
         ctk.CTkButton(add_frame, text="Zuweisung speichern", command=self.save_team_player_assignment).grid(row=5, column=0, columnspan=2, padx=10, pady=10)
+        ctk.CTkButton(add_frame, text="Kader importieren...", command=self.import_rosters).grid(row=6, column=0, columnspan=2, padx=10, pady=(0, 10))
 
 
     def _create_team_list_section(self, master, row, col):
         """Erstellt den Bereich zur Anzeige der Team-Liste."""
-        self.team_list_frame = ctk.CTkScrollableFrame(master, label_text="Alle Teams")
-        self.team_list_frame.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-        self.team_list_frame.grid_columnconfigure(0, weight=1)
-        self.team_list_widgets = []
+        self.team_list = VirtualList(master, label_text="Alle Teams",
+                                     create_row=lambda parent: ctk.CTkLabel(parent, text="", anchor="w", justify="left", wraplength=350),
+                                     render_row=lambda label, team_id: label.configure(text=self._team_label_text(team_id)),
+                                     filter_text=self._team_label_text,
+                                     search=self.db_manager.search_teams, row_height=50)
+        self.team_list.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
 
     def add_team(self):
         """Erstellt ein neues Team in der DB."""
@@ -284,6 +297,29 @@ class AdminView(ctk.CTkFrame):
             self.team_to_edit_var.set(name) # Wähle das neue Team direkt aus
             self.display_team_players_for_edit(name)
 
+    def import_rosters(self):
+        """Importiert Teams und Spieler aus CSV-/JSON-Dateien (alles oder nichts)."""
+        paths = filedialog.askopenfilenames(title="Kader importieren",
+                                            filetypes=[("Kader", "*.csv *.json"), ("Alle Dateien", "*.*")])
+        if not paths:
+            return
+        try:
+            rows = read_roster_files(list(paths))
+        except (OSError, ValueError) as e:
+            print(f"Fehler beim Lesen der Kader-Datei: {e}")
+            return
+
+        summary = self.db_manager.import_rosters(rows)
+        if summary['errors']:
+            print(f"Kader-Import abgebrochen, nichts gespeichert ({len(summary['errors'])} Fehler):")
+            for error in summary['errors']:
+                print(f"  - {error}")
+            return
+        print(f"Kader importiert: {summary['teams']} Teams ({summary['teams_created']} neu), "
+              f"{summary['inserted']} Spieler neu, {summary['updated']} aktualisiert.")
+        self.load_team_list()
+        self.load_player_list()
+
     def load_team_list(self):
         """Lädt alle Teams und aktualisiert die Anzeige und das Bearbeitungs-Dropdown."""
         # Teams für das Dropdown laden
@@ -293,28 +329,27 @@ class AdminView(ctk.CTkFrame):
         if not team_names:
             self.team_to_edit_var.set("-- Kein Team --")
             
-        # Anzeige der Liste (Frame leeren)
-        for widget in self.team_list_widgets:
-            widget.destroy()
-        self.team_list_widgets = []
-        
-        row = 0
-        for team_id, name in self.teams.items():
-            # KRITISCHE KORREKTUR: Spieler-Tupel haben jetzt 3 Elemente (ID, Name, Nr.)
-            players = self.db_manager.get_team_players(team_id) 
-            
-            # Jetzt kann p[2] für die Trikotnummer verwendet werden
-            player_names = ", ".join([f"{p[1]} (#{p[2]})" if p[2] else p[1] for p in players])
-            
-            label_text = f"[{team_id}] {name} ({len(players)} Spieler): {player_names}"
-            # ... (Rest der Logik bleibt gleich)
-            label = ctk.CTkLabel(self.team_list_frame, text=label_text, justify="left", wraplength=350)
-            label.grid(row=row, column=0, padx=5, pady=2, sticky="w")
-            self.team_list_widgets.append(label)
-            row += 1
+        # Spieler aller Teams mit einer Abfrage statt einer pro Team
+        self.team_rosters = self.db_manager.get_team_rosters()
+        self.team_list.set_items(list(self.teams))
             
         # Lade alle Spieler, die für die Checkboxen benötigt werden
-        self.all_player_details: List[Tuple[int, str, Optional[int], Optional[str], Optional[int]]] = self.db_manager.get_all_players_details()
+        self._load_player_details()
+
+    def _team_label_text(self, team_id: int) -> str:
+        # Spieler-Tupel: (ID, Name, Nr.)
+        players = self.team_rosters.get(team_id, [])
+        player_names = ", ".join([f"{p[1]} (#{p[2]})" if p[2] else p[1] for p in players])
+        return f"[{team_id}] {self.teams[team_id]} ({len(players)} Spieler): {player_names}"
+
+    def _rebuild_team_rosters(self, team_ids):
+        """Baut die Kader der angegebenen Teams aus dem Spieler-Modell neu auf (ohne DB-Zugriff)."""
+        team_ids = {team_id for team_id in team_ids if team_id in self.teams}
+        rosters: Dict[int, List[Tuple[int, str, Optional[int]]]] = {team_id: [] for team_id in team_ids}
+        for player_id, name, jersey_number, _, team_id in self.player_details.values():
+            if team_id in rosters:
+                rosters[team_id].append((player_id, name, jersey_number))
+        self.team_rosters.update(rosters)
 
 
     def display_team_players_for_edit(self, team_name):
@@ -336,7 +371,7 @@ class AdminView(ctk.CTkFrame):
         col_idx = 0
         
         # Die 5 Werte werden korrekt entpackt: (player_id, player_name, jersey_number, position, current_team_id)
-        for player_id, player_name, jersey_number, position, current_team_id in self.all_player_details:
+        for player_id, player_name, jersey_number, position, current_team_id in self.player_details.values():
             
             # Prüfen, ob der Spieler bereits im ausgewählten Team ist
             is_checked = (current_team_id == selected_team_id)
@@ -366,31 +401,34 @@ class AdminView(ctk.CTkFrame):
 
         players_to_assign = []
         players_to_unassign = []
+        affected_teams = {selected_team_id}
 
-        # Durchlaufen aller Spieler und prüfen, ob sie zugeordnet werden sollen
+        # Diff gegen das Modell: nur geänderte Spieler werden geschrieben
         for player_id, var in self.team_player_checkboxes.items():
+            current_team_id = self.player_details[player_id][4]
             is_checked = var.get()
-            
-            # Finde den aktuellen Team-Zustand des Spielers in self.all_player_details
-            current_player_team_id = next((p[4] for p in self.all_player_details if p[0] == player_id), None)
-            
-            if is_checked and current_player_team_id != selected_team_id:
-                # Spieler wurde ausgewählt, muss zugewiesen werden
+            if is_checked and current_team_id != selected_team_id:
                 players_to_assign.append(player_id)
-            elif not is_checked and current_player_team_id == selected_team_id:
-                # Spieler wurde abgewählt, muss von diesem Team entfernt werden (Team ID auf NULL/0 setzen)
+                affected_teams.add(current_team_id)
+            elif not is_checked and current_team_id == selected_team_id:
+                # Abgewählte Spieler sind danach teamlos (NULL in der DB)
                 players_to_unassign.append(player_id)
 
+        if not players_to_assign and not players_to_unassign:
+            print(f"Keine Änderungen für Team '{team_name}'.")
+            return
+
+        changed = self.db_manager.apply_team_assignment(selected_team_id, players_to_assign, players_to_unassign)
+        if changed is None:
+            print("FEHLER beim Speichern der Zuweisungen.")
+            return
 
-        # Zuweisungs-Aktionen durchführen
-        for player_id in players_to_assign:
-            self.db_manager.update_player_team(player_id, selected_team_id)
-            
-        # Spieler, die abgewählt wurden, auf 'Kein Team' (NULL in der DB) setzen
-        for player_id in players_to_unassign:
-            # Annahme: update_player_team(id, None) setzt die Team-ID auf NULL
-            self.db_manager.update_player_team(player_id, None) 
+        # Modell und nur die betroffenen Einträge aktualisieren statt beide Listen neu aufzubauen
+        for player_id, new_team_id in [(pid, selected_team_id) for pid in players_to_assign] + \
+                                      [(pid, None) for pid in players_to_unassign]:
+            self.player_details[player_id] = self.player_details[player_id][:4] + (new_team_id,)
+        self.player_list.update_items(players_to_assign + players_to_unassign)
+        self._rebuild_team_rosters(affected_teams)
+        self.team_list.update_items(affected_teams)
 
-        print(f"Zuweisungen für Team '{team_name}' gespeichert.")
-        self.load_player_list()
-        self.load_team_list()
\ No newline at end of file
+        print(f"Zuweisungen für Team '{team_name}' gespeichert ({changed} Spieler geändert).")
@@ -0,0 +1,97 @@
+# src/modules/gui/dialog_manager.py
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Any
+from .pooled_dialog import PooledDialog
+from .action_dialog import ActionDialog
+from .point_detail_dialog import PointDetailDialog
+from .confirmation_dialog import ConfirmationDialog
+from .action_edit_dialog import ActionEditDialog
+from ..tracing import tracer
+
+class DialogManager:
+    """
+    Hält von jedem Eingabe-Dialog genau eine (versteckte) Instanz vor.
+    Statt bei jeder Aktion ein neues CTkToplevel samt Widgets zu bauen,
+    wird die vorhandene Instanz per reconfigure() umgestellt und angezeigt.
+    Die Callback-Signaturen entsprechen denen der Dialog-Konstruktoren.
+    """
+    # Anzahl der gespeicherten Latenz-Messwerte pro Dialog und Modus
+    LATENCY_SAMPLES = 200
+
+    def __init__(self, master, app_controller):
+        self.master = master
+        self.app_controller = app_controller
+        self._dialogs: Dict[type, PooledDialog] = {}
+
+        # Open-to-visible Latenz in ms, getrennt nach 'cold' (Dialog neu gebaut)
+        # und 'warm' (wiederverwendete Instanz): {Dialogname: {Modus: deque}}
+        self.open_latencies: Dict[str, Dict[str, Deque[float]]] = {}
+
+    # --- ÖFFENTLICHE SCHNITTSTELLE (gleicher Callback-Vertrag wie die Dialoge) ---
+
+    def show_action_dialog(self, executor_id: int, action_name: str, players: Dict[int, str], callback):
+        """Öffnet den ActionDialog (Ergebnis-Typ / Zielspieler)."""
+        self._show(ActionDialog, dict(executor_id=executor_id, action_name=action_name,
+                                      players=players, callback=callback))
+
+    def show_point_detail_dialog(self, action_type: str, callback: Callable[[str], None]):
+        """Öffnet den PointDetailDialog."""
+        self._show(PointDetailDialog, dict(action_type=action_type, callback=callback))
+
+    def show_confirmation_dialog(self, message: str, callback: Callable[[bool], None]):
+        """Öffnet den Ja/Nein-Bestätigungsdialog."""
+        self._show(ConfirmationDialog, dict(message=message, callback=callback))
+
+    def show_action_edit_dialog(self, action_id: int, details: Dict[str, Any], players: Dict[int, str], callback: Callable[[bool], None]):
+        """Öffnet den Bearbeitungsdialog für eine bestehende Aktion."""
+        self._show(ActionEditDialog, dict(action_id=action_id, details=details,
+                                          players=players, callback=callback),
+                   app_controller=self.app_controller)
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Gibt Anzahl, Mittelwert und Maximum der Öffnungslatenz (ms) pro Dialog und Modus zurück."""
+        stats = {}
+        for dialog_name, modes in self.open_latencies.items():
+            stats[dialog_name] = {
+                mode: {
+                    "count": len(samples),
+                    "mean_ms": round(sum(samples) / len(samples), 2),
+                    "max_ms": round(max(samples), 2),
+                }
+                for mode, samples in modes.items() if samples
+            }
+        return stats
+
+    def destroy_all(self):
+        """Zerstört alle gepoolten Dialoge (z.B. beim Beenden der Anwendung)."""
+        for dialog in self._dialogs.values():
+            if dialog.winfo_exists():
+                dialog.destroy()
+        self._dialogs = {}
+
+    # --- INTERN ---
+
+    def _show(self, dialog_cls: type, config: Dict[str, Any], **static_kwargs):
+        """Holt die gepoolte Instanz (oder baut sie beim ersten Mal) und zeigt sie an."""
+        started = time.perf_counter()
+        dialog: Optional[PooledDialog] = self._dialogs.get(dialog_cls)
+
+        if dialog is not None and dialog.winfo_exists():
+            mode = "warm"
+            dialog.reconfigure(**config)
+        else:
+            mode = "cold"
+            dialog = dialog_cls(self.master, **static_kwargs, **config)
+            self._dialogs[dialog_cls] = dialog
+
+        dialog.present(on_visible=lambda: self._record_latency(dialog_cls.__name__, mode, started))
+
+    def _record_latency(self, dialog_name: str, mode: str, started: float):
+        """Speichert die Zeit vom Öffnen-Aufruf bis zum <Map>-Event des Dialogs."""
+        elapsed = time.perf_counter() - started
+        tracer.record(f"dialog.open.{dialog_name}", started, elapsed, cat="gui", args={"mode": mode})
+        elapsed_ms = elapsed * 1000
+        modes = self.open_latencies.setdefault(dialog_name, {})
+        modes.setdefault(mode, deque(maxlen=self.LATENCY_SAMPLES)).append(elapsed_ms)
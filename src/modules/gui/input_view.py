@@ -3,12 +3,10 @@
 import customtkinter as ctk
 from typing import List, Dict, Optional, Any, Tuple
 from ..logic.game_controller import GameController 
-from .action_dialog import ActionDialog 
-from .confirmation_dialog import ConfirmationDialog
-from .action_edit_dialog import ActionEditDialog 
-# NEUE IMPORTE FÜR PUNKTDETAILS
-from .point_detail_dialog import PointDetailDialog 
+# Alle Eingabe-Dialoge werden gepoolt über den DialogManager geöffnet
+from .dialog_manager import DialogManager
 from ..config import POINT_DETAIL_OUTCOMES 
+from ..tracing import tracer
 
 
 class InputView(ctk.CTkFrame):
@@ -28,6 +26,9 @@ class InputView(ctk.CTkFrame):
         self.game_controller: GameController = self.app_controller.get_game_controller() 
         self.db_manager = self.app_controller.get_db_manager() 
         
+        # Wiederverwendbare Dialoge (werden einmal gebaut und danach nur versteckt/angezeigt)
+        self.dialogs = DialogManager(master=self.master.master, app_controller=self.app_controller)
+        
         self.players: Dict[int, str] = {}
         self.player_ids: List[int] = []
         self.game_options: Dict[str, int] = {}
@@ -102,6 +103,12 @@ class InputView(ctk.CTkFrame):
         self._history_frame.grid(row=2, column=0, sticky="nsew", padx=10, pady=(0, 10))
         self._history_frame.grid_columnconfigure(0, weight=1) 
 
+        # Live-Statistik unter der Historie (Labels werden pro Spieler einmal angelegt, danach nur neu beschriftet)
+        self._live_stats_frame = ctk.CTkFrame(self._history_container)
+        self._live_stats_frame.grid(row=3, column=0, sticky="ew", padx=10, pady=(0, 10))
+        self._live_stats_frame.grid_columnconfigure(0, weight=1)
+        self._live_stats_labels: Dict[int, ctk.CTkLabel] = {}
+
         # Buttons außerhalb des Frames (Row 3, 4)
         self._setup_fixed_buttons()
 
@@ -134,8 +141,7 @@ class InputView(ctk.CTkFrame):
             self._pending_action_data = result_data
             
             # Öffne den neuen Detail-Dialog
-            PointDetailDialog(
-                master=self.master.master, 
+            self.dialogs.show_point_detail_dialog(
                 action_type=action_type,
                 callback=self.on_point_details_received
             )
@@ -220,8 +226,7 @@ class InputView(ctk.CTkFrame):
             self.game_controller.load_game_context(game_id)
             self.load_game_data() 
         elif selection == "--- Spiel wählen ---":
-             self.game_controller._current_game_id = None
-             self.game_controller._current_set = None
+             self.game_controller.close_game()
              self.load_game_data()
 
 
@@ -234,6 +239,9 @@ class InputView(ctk.CTkFrame):
             self._clear_dynamic_widgets()
             self._clear_history_widgets() 
             self._create_header_and_actions(empty=True) 
+            self.players = {}
+            self.player_ids = []
+            self._create_live_stats_panel()
             self.update_score_display()
             
             # Set-Filter zurücksetzen, wenn kein Spiel aktiv
@@ -253,6 +261,7 @@ class InputView(ctk.CTkFrame):
             
             self._clear_dynamic_widgets()
             self._create_header_and_actions() 
+            self._create_live_stats_panel()
             
         
         # 3. Satzdaten laden und Filter setzen
@@ -270,8 +279,9 @@ class InputView(ctk.CTkFrame):
         # Setze das Dropdown. Dies löst den Callback _on_set_filter_change aus.
         self.set_filter_var.set(default_set_name) 
 
-        # 4. Score laden
+        # 4. Score und Live-Statistik laden
         self.update_score_display()
+        self.update_live_stats()
 
 
     def _clear_dynamic_widgets(self):
@@ -418,6 +428,33 @@ class InputView(ctk.CTkFrame):
                 command=lambda a_id=action_id: self.show_edit_dialog(a_id)
             ).grid(row=0, column=1, sticky="e", padx=(5, 0))
 
+    def _create_live_stats_panel(self):
+        """Legt die Zeilen der Live-Statistik für die aktiven Spieler an."""
+        for widget in self._live_stats_frame.winfo_children():
+            widget.destroy()
+        self._live_stats_labels = {}
+
+        ctk.CTkLabel(self._live_stats_frame, text="Live-Statistik", font=ctk.CTkFont(weight="bold")).grid(row=0, column=0, padx=5, pady=(5, 0), sticky="w")
+        mono = ctk.CTkFont(family="Courier", size=12)
+        ctk.CTkLabel(self._live_stats_frame, text=f"{'Spieler':<12} K-F/Ang  Quote  Ass Blk  Pkt", font=mono, anchor="w").grid(row=1, column=0, padx=5, sticky="ew")
+
+        for idx, player_id in enumerate(self.player_ids):
+            label = ctk.CTkLabel(self._live_stats_frame, text="", font=mono, anchor="w")
+            label.grid(row=idx + 2, column=0, padx=5, sticky="ew")
+            self._live_stats_labels[player_id] = label
+
+    def update_live_stats(self):
+        """Beschriftet die Live-Statistik neu (Zähler kommen ohne DB-Zugriff aus dem GameController)."""
+        stats = self.game_controller.get_live_player_stats()
+        for player_id, label in self._live_stats_labels.items():
+            s = stats.get(player_id)
+            name = self.players.get(player_id, str(player_id))[:12]
+            if not s:
+                label.configure(text=f"{name:<12} {'-':>7}  {'-':>5}  {'-':>3} {'-':>3} {'-':>4}")
+                continue
+            attack = f"{s['Kills']}-{s['Angriffsfehler']}/{s['Angriffe_Gesamt']}"
+            label.configure(text=f"{name:<12} {attack:>7}  {s['Angriffsquote']:>5.2f}  {s['Asse']:>3} {s['Blocks']:>3} {s['Gesamtpunkte']:>4g}")
+
     def update_score_display(self):
         """
         Aktualisiert die Anzeige des aktuellen Spielstands im score_label. 
@@ -439,9 +476,8 @@ class InputView(ctk.CTkFrame):
             print(f"Fehler: Details für Aktion ID {action_id} nicht gefunden.")
             return
 
-        ActionEditDialog(
-            master=self.master.master, 
-            app_controller=self.app_controller, 
+        tracer.begin_interaction("edit", action_id=action_id)
+        self.dialogs.show_action_edit_dialog(
             action_id=action_id,
             details=action_details, 
             players=self.players, 
@@ -452,12 +488,15 @@ class InputView(ctk.CTkFrame):
         """Callback nach Bearbeitung oder Löschung einer Aktion."""
         if success:
             print("Aktion erfolgreich bearbeitet/gelöscht. Daten neu laden.")
-            self.load_game_data() 
+            with tracer.span("input.redraw", cat="gui"):
+                self.load_game_data() 
+            self._end_interaction_after_redraw()
+        else:
+            tracer.end_interaction(status="failed")
 
     def end_game_confirmation(self):
         """Zeigt einen Bestätigungsdialog vor dem Beenden des Spiels."""
-        ConfirmationDialog(
-            master=self.master.master, 
+        self.dialogs.show_confirmation_dialog(
             message="Möchten Sie das aktuelle Spiel wirklich beenden? Die Daten werden gespeichert.",
             callback=self.end_game_action
         )
@@ -474,6 +513,13 @@ class InputView(ctk.CTkFrame):
         """
         Sendet Aktionen entweder direkt oder über einen Dialog an den GameController.
         """
+        # Tap-to-Commit-Messung: endet erst nach dem Neuzeichnen in process_final_action
+        tracer.begin_interaction("tap", action=action_name)
+        with tracer.span("input.handle_action", cat="gui", action=action_name):
+            self._dispatch_action(executor_id, action_name)
+
+    def _dispatch_action(self, executor_id: int, action_name: str):
+        """Leitet die Aktion an den passenden Dialog bzw. direkt an process_final_action weiter."""
         
         # --- 1. DIREKTE AKTIONEN, die den Detail-Dialog auslösen ---
         if action_name == "Kill":
@@ -502,22 +548,7 @@ class InputView(ctk.CTkFrame):
 
     def show_result_dialog(self, executor_id: int, action_name: str):
         """Öffnet einen Dialog, um das Ergebnis einer Aktion abzufragen."""
-        from .action_dialog import ActionDialog 
-        
-        ActionDialog(
-            master=self.master.master, 
-            executor_id=executor_id,
-            action_name=action_name,
-            players=self.players,
-            callback=self.on_action_details_received # <--- Stellt sicher, dass dies die neue Kette auslöst
-        )
-
-    def show_result_dialog(self, executor_id: int, action_name: str):
-        """Öffnet einen Dialog, um das Ergebnis einer Aktion abzufragen."""
-        from .action_dialog import ActionDialog 
-        
-        ActionDialog(
-            master=self.master.master, 
+        self.dialogs.show_action_dialog(
             executor_id=executor_id,
             action_name=action_name,
             players=self.players,
@@ -547,26 +578,44 @@ class InputView(ctk.CTkFrame):
             point_detail_type = data.get('point_detail_type') # NEU
         
         # 2. Aktion speichern und den Satzende-Status abfangen
-        success, is_set_over = self.game_controller.process_action(
-            executor_id=executor_id, 
-            action_type=action_type, 
-            result_type=result_type,
-            target_id=target_id,
-            point_detail_type=point_detail_type # NEU
-        )
+        with tracer.span("input.process_final_action", cat="gui", action=action_type):
+            success, is_set_over = self.game_controller.process_action(
+                executor_id=executor_id, 
+                action_type=action_type, 
+                result_type=result_type,
+                target_id=target_id,
+                point_detail_type=point_detail_type # NEU
+            )
         
-        if success:
+        if not success:
+            tracer.end_interaction(status="failed")
+            return
+
+        with tracer.span("input.redraw", cat="gui"):
             self.update_score_display()
             self.load_action_history() 
-            
-            # 3. PRÜFUNG AUF SATZENDE
-            if is_set_over:
-                self.after(50, self.confirm_set_end)
-                return
+            self.update_live_stats()
+        self._end_interaction_after_redraw()
+        
+        # 3. PRÜFUNG AUF SATZENDE
+        if is_set_over:
+            self.after(50, self.confirm_set_end)
+            return
+
+        # 4. PRÜFUNG AUF FOLGE-AKTION (Angriff nach Zuspiel)
+        if action_type == "Zuspiel" and target_id is not None:
+            self.after(10, lambda: self.show_follow_up_attack_dialog(target_id))
+
+    def _end_interaction_after_redraw(self):
+        """Die Interaktion endet, sobald Tk die anstehenden Zeichenaufträge abgearbeitet hat."""
+        interaction = tracer.current_interaction()
+        if interaction is not None:
+            self.after_idle(lambda: tracer.end_interaction(interaction=interaction))
 
-            # 4. PRÜFUNG AUF FOLGE-AKTION (Angriff nach Zuspiel)
-            if action_type == "Zuspiel" and target_id is not None:
-                self.after(10, lambda: self.show_result_dialog(executor_id=target_id, action_name="Angriff"))
+    def show_follow_up_attack_dialog(self, attacker_id: int):
+        """Öffnet nach einem Zuspiel direkt den Angriffs-Dialog für den Zielspieler."""
+        tracer.begin_interaction("tap", action="Angriff", follow_up=True)
+        self.show_result_dialog(executor_id=attacker_id, action_name="Angriff")
 
     # --- SATZENDE LOGIK ---
 
@@ -580,8 +629,7 @@ class InputView(ctk.CTkFrame):
         if not self.game_controller.check_set_end_condition():
              return
 
-        ConfirmationDialog(
-            master=self.master.master, 
+        self.dialogs.show_confirmation_dialog(
             message=f"Satz {set_num} ist beendet (Score: {score_own}:{score_opp}). Wollen Sie den nächsten Satz starten?",
             callback=self.handle_set_end_action
         )
@@ -3,19 +3,15 @@
 import customtkinter as ctk
 from typing import Dict, Callable
 from ..config import POINT_DETAIL_OUTCOMES
+from .pooled_dialog import PooledDialog
 
-class PointDetailDialog(ctk.CTkToplevel):
+class PointDetailDialog(PooledDialog):
     """
     Pop-up-Fenster zur Erfassung von Punkt-Detailinformationen, 
     wie vom Benutzer gewünscht (Boden, Sicherung etc.).
     """
     def __init__(self, master, action_type: str, callback: Callable[[str], None]):
-        super().__init__(master)
-        
-        self.title("Punktdetails erfassen")
-        self.geometry("300x350")
-        self.transient(master)  
-        self.grab_set()         
+        super().__init__(master, title="Punktdetails erfassen", geometry="300x350")
         
         self.callback = callback 
         
@@ -23,7 +19,8 @@ class PointDetailDialog(ctk.CTkToplevel):
         self.grid_columnconfigure(0, weight=1)
 
         # Titel
-        ctk.CTkLabel(self, text=f"Detail für: {action_type}", font=ctk.CTkFont(size=14, weight="bold")).grid(row=0, column=0, padx=20, pady=(10, 5))
+        self.title_label = ctk.CTkLabel(self, text="", font=ctk.CTkFont(size=14, weight="bold"))
+        self.title_label.grid(row=0, column=0, padx=20, pady=(10, 5))
         ctk.CTkLabel(self, text="Punkt-Detail auswählen:").grid(row=1, column=0, sticky="w", padx=20, pady=5)
         
         # Optionen vorbereiten
@@ -36,11 +33,19 @@ class PointDetailDialog(ctk.CTkToplevel):
         # Submit Button
         ctk.CTkButton(self, text="Speichern", command=self.on_submit).grid(row=3, column=0, padx=20, pady=20)
 
+        self.reconfigure(action_type, callback)
+
+    def reconfigure(self, action_type: str, callback: Callable[[str], None]):
+        """Setzt Aktionstyp und Callback für die nächste Anzeige."""
+        self.callback = callback
+        self.title_label.configure(text=f"Detail für: {action_type}")
+        self.detail_var.set(self.options[0])
+
     def on_submit(self):
         """Sammelt die Daten und ruft den Callback auf."""
         selected_key = self.detail_var.get()
         # Hole den Code (z.B. P_OPP_FLOOR_ERR)
         detail_code = POINT_DETAIL_OUTCOMES.get(selected_key, "UNKNOWN")
         
+        self.hide()
         self.callback(detail_code)
-        self.destroy()
\ No newline at end of file
@@ -0,0 +1,83 @@
+# src/modules/gui/pooled_dialog.py
+
+import tkinter
+import customtkinter as ctk
+from typing import Callable, Optional
+
+GRAB_RETRY_MS = 10
+GRAB_MAX_ATTEMPTS = 50 # ~0,5 s; danach bleibt der Dialog ohne Grab bedienbar
+
+class PooledDialog(ctk.CTkToplevel):
+    """
+    Basisklasse für Dialoge, die vom DialogManager einmal erstellt und danach
+    nur noch versteckt (withdraw) und wieder angezeigt (deiconify) werden.
+    Die Widgets werden einmalig im Konstruktor aufgebaut, die variablen Inhalte
+    setzt die Unterklasse in reconfigure().
+    """
+    def __init__(self, master, title: str, geometry: str):
+        super().__init__(master)
+
+        self.title(title)
+        self.geometry(geometry)
+        self.transient(master)  # Hält den Dialog über dem Hauptfenster
+
+        # Schließen über das Fenster-X versteckt den Dialog nur
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Wird vom DialogManager gesetzt, um die Sichtbarkeit zu messen
+        self._on_visible: Optional[Callable[[], None]] = None
+        self.bind("<Map>", self._handle_map, add="+")
+
+        self._shown = False
+        self._grab_job: Optional[str] = None
+
+        self.withdraw()
+
+    def present(self, on_visible: Optional[Callable[[], None]] = None):
+        """Zeigt den (versteckten) Dialog an und blockiert das Hauptfenster."""
+        self._on_visible = on_visible
+        self._shown = True
+        self.deiconify()
+        self.lift()
+        self.focus_force()
+        self._cancel_grab()
+        self._grab()
+
+    def hide(self):
+        """Versteckt den Dialog, ohne ihn zu zerstören."""
+        self._shown = False
+        self._cancel_grab()
+        try:
+            self.grab_release()
+        except tkinter.TclError:
+            pass
+        self.withdraw()
+
+    def on_close(self):
+        """Wird aufgerufen, wenn der Dialog geschlossen wird, ohne zu speichern."""
+        self.hide()
+
+    def _grab(self, attempt: int = 1):
+        """
+        grab_set() schlägt fehl, solange das Fenster noch nicht sichtbar ist -> kurz erneut versuchen.
+        Schluss, sobald der Dialog wieder versteckt ist oder nach GRAB_MAX_ATTEMPTS Versuchen.
+        """
+        self._grab_job = None
+        if not self._shown:
+            return
+        try:
+            self.grab_set()  # Blockiert Interaktion mit dem Hauptfenster
+        except tkinter.TclError:
+            if attempt < GRAB_MAX_ATTEMPTS:
+                self._grab_job = self.after(GRAB_RETRY_MS, lambda: self._grab(attempt + 1))
+
+    def _cancel_grab(self):
+        if self._grab_job is not None:
+            self.after_cancel(self._grab_job)
+            self._grab_job = None
+
+    def _handle_map(self, event):
+        """<Map> feuert für jedes Kind-Widget; nur das Toplevel selbst zählt."""
+        if event.widget is self and self._on_visible:
+            callback, self._on_visible = self._on_visible, None
+            callback()
@@ -17,6 +17,7 @@ class StartGameDialog(ctk.CTkToplevel):
         
         self.app_controller = app_controller
         self.game_controller = app_controller.get_game_controller()
+        self.db_manager = app_controller.get_db_manager()
         self.callback = callback
         
         self.teams = teams 
@@ -65,12 +66,18 @@ class StartGameDialog(ctk.CTkToplevel):
         self.opponent_entry.grid(row=1, column=1, sticky="ew", padx=20, pady=5)
 
     def _setup_player_selection(self):
-        ctk.CTkLabel(self, text="3. Spieler auswählen (im Spiel):", font=ctk.CTkFont(weight="bold")).grid(row=2, column=0, columnspan=2, sticky="w", padx=20, pady=10)
+        ctk.CTkLabel(self, text="3. Spieler auswählen (im Spiel):", font=ctk.CTkFont(weight="bold")).grid(row=2, column=0, sticky="w", padx=20, pady=10)
+
+        # Suche im Kader (Name, Teil des Namens ohne Akzente oder Trikotnummer)
+        self.player_search_entry = ctk.CTkEntry(self, placeholder_text="Spieler suchen (Name oder #Nr.)")
+        self.player_search_entry.grid(row=2, column=1, sticky="ew", padx=20, pady=10)
+        self.player_search_entry.bind("<KeyRelease>", lambda event: self.filter_player_checkboxes())
         
         self.player_frame = ctk.CTkScrollableFrame(self, label_text="Verfügbare Spieler")
         self.player_frame.grid(row=3, column=0, columnspan=2, sticky="nsew", padx=20, pady=10)
         
         self.checkboxes: Dict[int, ctk.CTkCheckBox] = {}
+        self.selected_team_id = None
 
 
     def update_player_selection_based_on_team(self, team_name):
@@ -87,6 +94,7 @@ class StartGameDialog(ctk.CTkToplevel):
         # 2. Gewählte Team-ID ermitteln
         selected_team_id = next((k for k, v in self.teams.items() if v == team_name), None)
         
+        self.selected_team_id = selected_team_id
         if not selected_team_id:
             ctk.CTkLabel(self.player_frame, text="Bitte Team wählen oder in Verwaltung anlegen.").grid(row=0, column=0, padx=10, pady=10)
             return
@@ -122,6 +130,23 @@ class StartGameDialog(ctk.CTkToplevel):
                 col_idx = 0
                 row_idx += 1
 
+        if self.player_search_entry.get().strip():
+            self.filter_player_checkboxes()
+
+    def filter_player_checkboxes(self):
+        """Zeigt nur die Spieler des Teams, die zur Sucheingabe passen (Auswahl bleibt erhalten)."""
+        if not self.checkboxes:
+            return
+        query = self.player_search_entry.get().strip()
+        matches = set(self.db_manager.search_players(query, team_id=self.selected_team_id)) if query else None
+        slot = 0
+        for player_id, cb in self.checkboxes.items():
+            if matches is None or player_id in matches:
+                cb.grid(row=slot // 3, column=slot % 3, padx=10, pady=5, sticky="w")
+                slot += 1
+            else:
+                cb.grid_remove()
+
     def start_game_and_save(self):
         """Verarbeitet die Eingaben und startet das Spiel."""
         
@@ -132,11 +157,16 @@ class StartGameDialog(ctk.CTkToplevel):
             print("Fehler: Gegnername darf nicht leer sein.")
             return
         
-        if not self.checkboxes:
+        # 1. Ausgewählte Spieler erfassen (vor dem Anlegen des Spiels, damit kein leeres Spiel entsteht)
+        self.selected_player_ids = [
+            p_id for p_id, cb in self.checkboxes.items() if cb.get()
+        ]
+        
+        if not self.selected_player_ids:
             print("Fehler: Bitte wählen Sie mindestens einen Spieler aus dem Team.")
             return
 
-        # 1. Gewähltes Team und Gegner vorbereiten
+        # 2. Gewähltes Team und Gegner vorbereiten
         own_team_id = next((k for k, v in self.teams.items() if v == own_team_name), None)
         
         game_id = self.game_controller.start_new_game(
@@ -144,12 +174,7 @@ class StartGameDialog(ctk.CTkToplevel):
             opponent_name=opponent_name
         )
         
-        # 2. Ausgewählte Spieler erfassen
-        self.selected_player_ids = [
-            p_id for p_id, cb in self.checkboxes.items() if cb.get()
-        ]
-        
-        # 3. Spieler zum Spiel hinzufügen
+        # 3. Aufstellung setzen und in game_players speichern (lädt load_game_context später in einer Abfrage)
         self.game_controller.add_players_to_active_game(self.selected_player_ids)
         
         # 4. Callback aufrufen und Dialog schließen
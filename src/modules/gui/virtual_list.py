@@ -0,0 +1,179 @@
+# src/modules/gui/virtual_list.py
+
+import customtkinter as ctk
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence
+
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Scrollbare Liste mit Textfilter, die nur so viele Zeilen-Widgets besitzt, wie sichtbar sind.
+
+    Die Einträge sind reine Schlüssel (z.B. Spieler- oder Team-IDs); beim Scrollen oder Filtern
+    werden die vorhandenen Zeilen-Widgets über render_row neu beschriftet statt zerstört und
+    neu angelegt. Hunderte Teams oder tausende Spieler kosten so nur eine Handvoll Widgets.
+
+    create_row(master) -> Widget   legt ein (leeres) Zeilen-Widget an
+    render_row(widget, key)        beschriftet es für einen Eintrag
+    filter_text(key) -> str        Suchtext eines Eintrags (für den Filter)
+    search(text) -> keys           optional: Treffer aus einem Suchindex statt Teilstring-Filter
+    """
+
+    def __init__(self, master, label_text: str, create_row: Callable[[Any], Any],
+                 render_row: Callable[[Any, Hashable], None], filter_text: Callable[[Hashable], str],
+                 search: Optional[Callable[[str], Iterable[Hashable]]] = None,
+                 row_height: int = 40, min_rows: int = 5, **kwargs):
+        super().__init__(master, **kwargs)
+        self._create_row = create_row
+        self._render_row = render_row
+        self._filter_text = filter_text
+        self._search = search
+        self.row_height = row_height
+
+        self._keys: List[Hashable] = []           # Alle Einträge
+        self._haystacks: List[str] = []           # Suchtext je Eintrag (casefold, einmal berechnet)
+        self._index: Dict[Hashable, int] = {}     # Schlüssel -> Position in _keys
+        self._visible: List[Hashable] = []        # Einträge nach dem Filter
+        self._filter = ""
+        self._filter_raw = ""
+        self._first = 0                           # Index des obersten angezeigten Eintrags
+        self._rows: List[Any] = []                # Pool der Zeilen-Widgets
+        self._row_count = min_rows                # Anzahl der aktuell genutzten Zeilen
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+
+        self._title = ctk.CTkLabel(self, text=label_text, font=ctk.CTkFont(weight="bold"))
+        self._title.grid(row=0, column=0, columnspan=2, padx=10, pady=(5, 0), sticky="w")
+        self._label_text = label_text
+
+        self.filter_entry = ctk.CTkEntry(self, placeholder_text="Suchen..." if search else "Filtern...")
+        self.filter_entry.grid(row=1, column=0, columnspan=2, padx=10, pady=5, sticky="ew")
+        self.filter_entry.bind("<KeyRelease>", lambda event: self.set_filter(self.filter_entry.get()))
+
+        self._body = ctk.CTkFrame(self, fg_color="transparent")
+        self._body.grid(row=2, column=0, padx=(10, 0), pady=(0, 10), sticky="nsew")
+        self._body.grid_columnconfigure(0, weight=1)
+        self._body.bind("<Configure>", self._on_resize)
+
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.grid(row=2, column=1, padx=(0, 5), pady=(0, 10), sticky="ns")
+
+        self._bind_wheel(self._body)
+        self._ensure_rows(min_rows)
+
+    # --- DATEN ---
+
+    def set_items(self, keys: Sequence[Hashable]):
+        """Setzt alle Einträge neu (Filter und, soweit möglich, Scroll-Position bleiben erhalten)."""
+        self._keys = list(keys)
+        self._index = {key: idx for idx, key in enumerate(self._keys)}
+        self._haystacks = [self._filter_text(key).casefold() for key in self._keys]
+        self._apply_filter()
+
+    def update_item(self, key: Hashable):
+        """Ein Eintrag hat sich geändert (siehe update_items)."""
+        self.update_items([key])
+
+    def update_items(self, keys: Iterable[Hashable]):
+        """
+        Einträge haben sich geändert: Suchtexte auffrischen und den Filter EINMAL neu anwenden
+        (ein geänderter Eintrag kann dadurch aus der gefilterten Ansicht fallen oder hineinkommen).
+        Unbekannte Schlüssel werden ignoriert.
+        """
+        changed = False
+        for key in keys:
+            idx = self._index.get(key)
+            if idx is not None:
+                self._haystacks[idx] = self._filter_text(key).casefold()
+                changed = True
+        if changed:
+            self._apply_filter()
+
+    def set_filter(self, text: str):
+        self._filter_raw = text.strip()
+        text = self._filter_raw.casefold()
+        if text == self._filter:
+            return
+        self._filter = text
+        self._first = 0
+        self._apply_filter()
+
+    def refresh(self):
+        """Beschriftet die sichtbaren Zeilen neu (z.B. nach Änderungen am Modell der View)."""
+        last = max(0, len(self._visible) - self._row_count)
+        self._first = max(0, min(self._first, last))
+        for slot, row in enumerate(self._rows):
+            idx = self._first + slot
+            if slot < self._row_count and idx < len(self._visible):
+                self._render_row(row, self._visible[idx])
+                row.grid(row=slot, column=0, sticky="ew", padx=5, pady=2)
+            else:
+                row.grid_remove()
+        self._update_scrollbar()
+
+    def visible_keys(self) -> List[Hashable]:
+        """Einträge, die gerade angezeigt werden."""
+        return self._visible[self._first:self._first + self._row_count]
+
+    # --- INTERN ---
+
+    def _apply_filter(self):
+        if self._filter and self._search is not None:
+            # Reihenfolge der Liste bleibt erhalten, der Index liefert nur die Treffermenge
+            matches = set(self._search(self._filter_raw))
+            self._visible = [key for key in self._keys if key in matches]
+        elif self._filter:
+            self._visible = [key for key, text in zip(self._keys, self._haystacks) if self._filter in text]
+        else:
+            self._visible = list(self._keys)
+        shown = f"{len(self._visible)}/{len(self._keys)}" if self._filter else str(len(self._keys))
+        self._title.configure(text=f"{self._label_text} ({shown})")
+        self.refresh()
+
+    def _ensure_rows(self, count: int):
+        while len(self._rows) < count:
+            row = self._create_row(self._body)
+            self._bind_wheel(row)
+            self._rows.append(row)
+
+    def _on_resize(self, event):
+        rows = max(1, event.height // self.row_height)
+        if rows != self._row_count:
+            self._ensure_rows(rows)
+            self._row_count = rows
+            self.refresh()
+
+    def _scroll_to(self, first: int):
+        last = max(0, len(self._visible) - self._row_count)
+        first = max(0, min(first, last))
+        if first != self._first:
+            self._first = first
+            self.refresh()
+
+    def _on_scrollbar(self, action: str, *args):
+        if action == "moveto":
+            self._scroll_to(int(round(float(args[0]) * len(self._visible))))
+        elif action == "scroll":
+            step = self._row_count if args[1] == "pages" else 1
+            self._scroll_to(self._first + int(args[0]) * step)
+
+    def _on_wheel(self, event) -> Optional[str]:
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self._scroll_to(self._first - 3)
+        else:
+            self._scroll_to(self._first + 3)
+        return "break"
+
+    def _bind_wheel(self, widget):
+        # Auch auf die Kinder, sonst fängt z.B. ein Label das Mausrad ab
+        for target in [widget] + list(widget.winfo_children()):
+            target.bind("<MouseWheel>", self._on_wheel, add="+")
+            target.bind("<Button-4>", self._on_wheel, add="+")
+            target.bind("<Button-5>", self._on_wheel, add="+")
+
+    def _update_scrollbar(self):
+        total = len(self._visible)
+        if total <= self._row_count:
+            self._scrollbar.set(0.0, 1.0)
+        else:
+            self._scrollbar.set(self._first / total, (self._first + self._row_count) / total)
@@ -0,0 +1,222 @@
+# src/modules/logic/action_log.py
+
+import base64
+import datetime
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Kodierung von point_for im Log (statt des Lookup-Codes, damit der Score ohne Dekodieren zählbar ist)
+POINT_OWN = 1
+POINT_OPP = -1
+POINT_NONE = 0
+_POINT_CODES = {'OWN': POINT_OWN, 'OPP': POINT_OPP}
+
+# Platzhalter für fehlende Werte (Lookup-Codes beginnen bei 1, Spieler-IDs sind >= 0)
+NO_CODE = 0
+NO_PLAYER = -1
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class ActionLog:
+    """
+    Append-only Aktions-Log des aktuellen Spiels als Struct-of-Arrays.
+
+    Jede Spalte ist ein array.array mit festem Typ; Aktionstyp, Ergebnis und Punkt-Detail
+    werden als Lookup-Codes (siehe LookupCodes) gespeichert, die Zeit als Sekunden seit
+    dem ersten Zeitstempel. Pro Aktion werden so 24 Bytes belegt – ein Fünf-Satz-Spiel
+    mit ~1500 Aktionen braucht weniger als 40 KB.
+
+    Die Aktionen liegen nach action_id sortiert vor (AUTOINCREMENT), Lookups per ID
+    laufen daher über Binärsuche. Bearbeiten und Löschen sind selten und dürfen O(n) sein.
+    """
+
+    __slots__ = ('action_ids', 'set_numbers', 'action_types', 'executors', 'results', 'targets',
+                 'points', 'details', 'seconds', '_base_time', '_set_ids', '_scores')
+
+    COLUMNS = ('action_ids', 'set_numbers', 'action_types', 'executors', 'results', 'targets',
+               'points', 'details', 'seconds')
+
+    def __init__(self):
+        self.action_ids = array('I')     # 4 Bytes
+        self.set_numbers = array('B')    # 1 Byte
+        self.action_types = array('H')   # 2 Bytes (Lookup-Code)
+        self.executors = array('i')      # 4 Bytes (NO_PLAYER = keiner)
+        self.results = array('H')        # 2 Bytes (Lookup-Code, NO_CODE = keiner)
+        self.targets = array('i')        # 4 Bytes (NO_PLAYER = keiner)
+        self.points = array('b')         # 1 Byte (POINT_OWN / POINT_OPP / POINT_NONE)
+        self.details = array('H')        # 2 Bytes (Lookup-Code, NO_CODE = keiner)
+        self.seconds = array('i')        # 4 Bytes (Sekunden seit _base_time)
+        self._base_time: Optional[datetime.datetime] = None
+        # Satznummer -> Set-ID und Satznummer -> [Punkte eigen, Punkte Gegner]
+        self._set_ids: Dict[int, int] = {}
+        self._scores: Dict[int, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.action_ids)
+
+    # --- AUFBAU ---
+
+    @classmethod
+    def load(cls, db_manager, game_id: int) -> 'ActionLog':
+        """Lädt alle Sätze und Aktionen eines Spiels mit je einer Abfrage."""
+        log = cls()
+        sets = db_manager.execute_query_fetch_all(
+            "SELECT set_number, set_id FROM sets WHERE game_id = ? ORDER BY set_number ASC", (game_id,))
+        for set_number, set_id in sets:
+            log.add_set(set_number, set_id)
+
+        query = """
+            SELECT a.action_id, s.set_number, a.action_type_id, a.executor_player_id, a.result_type_id,
+                   a.target_player_id, pf.name, a.point_detail_type_id, a.timestamp
+            FROM actions a
+            JOIN sets s ON a.set_id = s.set_id
+            LEFT JOIN point_for_types pf ON a.point_for_id = pf.id
+            WHERE s.game_id = ?
+            ORDER BY a.action_id ASC
+        """
+        for row in db_manager.execute_query_fetch_all(query, (game_id,)):
+            action_id, set_number, type_code, executor, result_code, target, point_for, detail_code, timestamp = row
+            log.append(action_id, set_number, type_code, executor, result_code, target, point_for, detail_code,
+                       _parse_timestamp(timestamp))
+        return log
+
+    def add_set(self, set_number: int, set_id: int):
+        """Registriert einen (neuen) Satz des Spiels."""
+        self._set_ids[set_number] = set_id
+        self._scores.setdefault(set_number, [0, 0])
+
+    def append(self, action_id: int, set_number: int, action_type_code: int, executor_id: Optional[int],
+               result_code: Optional[int], target_id: Optional[int], point_for: Optional[str],
+               detail_code: Optional[int], timestamp: datetime.datetime):
+        """Hängt eine gespeicherte Aktion an (action_id muss größer als alle bisherigen sein)."""
+        if self.action_ids and action_id <= self.action_ids[-1]:
+            raise ValueError(f"Aktion {action_id} ist nicht neuer als {self.action_ids[-1]} (Log ist append-only).")
+        # Sekundengenau wie in der Datenbank (TIMESTAMP_FORMAT)
+        timestamp = timestamp.replace(microsecond=0)
+        if self._base_time is None:
+            self._base_time = timestamp
+
+        point = _POINT_CODES.get(point_for, POINT_NONE)
+        self.action_ids.append(action_id)
+        self.set_numbers.append(set_number)
+        self.action_types.append(action_type_code)
+        self.executors.append(NO_PLAYER if executor_id is None else executor_id)
+        self.results.append(result_code or NO_CODE)
+        self.targets.append(NO_PLAYER if target_id is None else target_id)
+        self.points.append(point)
+        self.details.append(detail_code or NO_CODE)
+        self.seconds.append(int((timestamp - self._base_time).total_seconds()))
+        self._count_point(set_number, point, +1)
+
+    # --- KORREKTUREN ---
+
+    def index_of(self, action_id: int) -> Optional[int]:
+        """Position einer Aktion im Log (Binärsuche) oder None."""
+        idx = bisect_left(self.action_ids, action_id)
+        if idx < len(self.action_ids) and self.action_ids[idx] == action_id:
+            return idx
+        return None
+
+    def update(self, action_id: int, executor_id: Optional[int], result_code: Optional[int],
+               target_id: Optional[int]) -> bool:
+        """Übernimmt eine Bearbeitung (Ausführender, Ergebnis, Ziel – punktneutral wie update_action_data)."""
+        idx = self.index_of(action_id)
+        if idx is None:
+            return False
+        self.executors[idx] = NO_PLAYER if executor_id is None else executor_id
+        self.results[idx] = result_code or NO_CODE
+        self.targets[idx] = NO_PLAYER if target_id is None else target_id
+        return True
+
+    def remove(self, action_id: int) -> bool:
+        """Entfernt eine gelöschte Aktion und korrigiert den Satz-Score."""
+        idx = self.index_of(action_id)
+        if idx is None:
+            return False
+        self._count_point(self.set_numbers[idx], self.points[idx], -1)
+        for name in self.COLUMNS:
+            del getattr(self, name)[idx]
+        return True
+
+    # --- LESEN ---
+
+    def set_id(self, set_number: int) -> Optional[int]:
+        return self._set_ids.get(set_number)
+
+    def sets(self) -> List[Tuple[int, int]]:
+        """(Satznummer, Set-ID) aller Sätze, aufsteigend."""
+        return sorted(self._set_ids.items())
+
+    def last_set_number(self) -> Optional[int]:
+        return max(self._set_ids, default=None)
+
+    def set_number_of(self, set_id: int) -> Optional[int]:
+        for set_number, known_id in self._set_ids.items():
+            if known_id == set_id:
+                return set_number
+        return None
+
+    def score(self, set_number: int) -> Tuple[int, int]:
+        """Punktestand (eigen, Gegner) eines Satzes aus dem Log."""
+        own, opp = self._scores.get(set_number, (0, 0))
+        return own, opp
+
+    def timestamp(self, idx: int) -> datetime.datetime:
+        return self._base_time + datetime.timedelta(seconds=self.seconds[idx])
+
+    def latest(self, limit: int, set_number: Optional[int] = None) -> Iterator[int]:
+        """Positionen der neuesten Aktionen (neueste zuerst), optional nur eines Satzes."""
+        found = 0
+        for idx in range(len(self.action_ids) - 1, -1, -1):
+            if found >= limit:
+                return
+            if set_number is None or self.set_numbers[idx] == set_number:
+                found += 1
+                yield idx
+
+    def memory_bytes(self) -> int:
+        """Belegter Speicher der Spalten (ohne Überallokation der Arrays)."""
+        return sum(getattr(self, name).itemsize * len(self) for name in self.COLUMNS)
+
+    # --- SNAPSHOT (für das Journal) ---
+
+    def to_state(self) -> Dict:
+        """JSON-fähiger Zustand; die Spalten werden als Rohbytes (Base64) abgelegt."""
+        return {
+            'columns': {name: base64.b64encode(getattr(self, name).tobytes()).decode('ascii') for name in self.COLUMNS},
+            'base_time': self._base_time.strftime(TIMESTAMP_FORMAT) if self._base_time else None,
+            'sets': [[set_number, set_id] for set_number, set_id in self._set_ids.items()],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'ActionLog':
+        log = cls()
+        for name in cls.COLUMNS:
+            getattr(log, name).frombytes(base64.b64decode(state['columns'][name]))
+        if state.get('base_time'):
+            log._base_time = _parse_timestamp(state['base_time'])
+        for set_number, set_id in state.get('sets', []):
+            log.add_set(set_number, set_id)
+        for set_number, point in zip(log.set_numbers, log.points):
+            log._count_point(set_number, point, +1)
+        return log
+
+    def last_action_id(self) -> Optional[int]:
+        return self.action_ids[-1] if self.action_ids else None
+
+    # --- INTERN ---
+
+    def _count_point(self, set_number: int, point: int, delta: int):
+        if point == POINT_NONE:
+            return
+        score = self._scores.setdefault(set_number, [0, 0])
+        score[0 if point == POINT_OWN else 1] += delta
+
+
+def _parse_timestamp(value) -> datetime.datetime:
+    if isinstance(value, datetime.datetime):
+        return value
+    # fromisoformat versteht "YYYY-MM-DD HH:MM:SS" und ist um ein Vielfaches schneller als strptime
+    return datetime.datetime.fromisoformat(str(value))
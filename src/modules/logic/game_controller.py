@@ -1,10 +1,37 @@
 # src/modules/logic/game_controller.py
 
-from typing import Optional, List, Dict, Tuple, Any
+from typing import Optional, List, Dict, Tuple, Any, Callable
 import datetime
 from ..data.db_manager import DBManager
 from ..data.models import Action, Set
+from ..data.game_journal import GameJournal, replay_journal
+from .action_log import ActionLog, NO_PLAYER, TIMESTAMP_FORMAT, _parse_timestamp
+from .live_stats import LiveStats
 from ..config import POINT_FOR, POINT_MAPPING, ACTION_TYPES, POINT_DETAIL_CODE_MAPPING
+from ..tracing import tracer
+
+
+def resolve_point_for(action_type: str, result_type: Optional[str] = None, point_detail_type: Optional[str] = None) -> Optional[str]:
+    """
+    Bestimmt, wem eine Aktion den Punkt bringt ('OWN', 'OPP' oder None).
+    Gleiche Regeln wie bei der Live-Erfassung; wird auch von Generator und Replay genutzt.
+    """
+    # 1. PRIORITY: PUNKTZUWEISUNG BASIEREND AUF DETAIL CODE (vom Dialog)
+    if point_detail_type:
+        # Holt die eindeutige Zuweisung (OWN oder OPP) aus dem Mapping
+        return POINT_DETAIL_CODE_MAPPING.get(point_detail_type)
+
+    # 2. FALLBACK: DIREKTE BUTTON-AKTIONEN (die den Dialog umgehen)
+    if action_type == "Unser Punkt":
+        return 'OWN'
+    if action_type == "Gegner Punkt": 
+        return 'OPP'
+        
+    # 3. FALLBACK: ORIGINAL LOGIC (für result_type, falls keine der oberen Logiken zutrifft)
+    if result_type and action_type in ACTION_TYPES.keys():
+        return POINT_MAPPING.get((result_type, action_type))
+    return None
+
 
 class GameController:
     """
@@ -12,11 +39,20 @@ class GameController:
     und verarbeitet die eingehenden Statistik-Aktionen.
     """
     
-    def __init__(self, db_manager: DBManager):
+    def __init__(self, db_manager: DBManager, clock: Optional[Callable[[], datetime.datetime]] = None,
+                 journal: Optional[GameJournal] = None):
         self.db_manager = db_manager
+        # Absturzsicheres Journal des laufenden Spiels (None = kein Journal, z.B. Generator und Replay)
+        self._journal = journal
+        # Zeitquelle für Zeitstempel (austauschbar für Generator und Replay)
+        self._clock = clock or datetime.datetime.now
         self._current_game_id: Optional[int] = None
         self._current_set: Optional[Set] = None
         self._active_player_ids: List[int] = [] # Speichert die IDs der im Spiel aktiven Spieler
+        # Aktions-Log des aktuellen Spiels (Historie, Live-Statistik und Satzende lesen daraus)
+        self._action_log: ActionLog = ActionLog()
+        self._live_stats: LiveStats = LiveStats()
+        self._player_names: Dict[int, str] = {}
 
     # --- HILFSMETHODEN ---
 
@@ -24,27 +60,46 @@ class GameController:
         """Ermittelt die nächste Satznummer für das gegebene Spiel."""
         query = "SELECT MAX(set_number) FROM sets WHERE game_id = ?"
         
+        result = self.db_manager.execute_query_fetch_one(query, (game_id,))
+        if result is None:
+            print("Fehler bei Satznummer-Abruf.")
+            return 1
+        
+        return (result[0] or 0) + 1 
+
+    def _journal_append(self, record: Dict[str, Any]):
+        """Schreibt ein Ereignis ins Journal (Fehler beim Schreiben stoppen die Erfassung nicht)."""
+        if self._journal is None:
+            return
         try:
-            self.db_manager.connect()
-            self.db_manager._cursor.execute(query, (game_id,))
-            max_num = self.db_manager._cursor.fetchone()[0]
-            self.db_manager.close()
-            
-            return (max_num or 0) + 1 
-        except Exception as e:
-            print(f"Fehler bei Satznummer-Abruf: {e}")
-            return 1 
+            self._journal.append(record)
+        except OSError as e:
+            print(f"Fehler beim Schreiben des Journals: {e}")
+
+    def _write_snapshot(self):
+        """Verdichtet das Journal auf den aktuellen Zustand (bei Spielbeginn und nach jedem Satz)."""
+        if self._journal is None or self._current_game_id is None:
+            return
+        try:
+            self._journal.compact({
+                'game_id': self._current_game_id,
+                'lineup': list(self._active_player_ids),
+                'log': self._action_log.to_state(),
+            })
+        except OSError as e:
+            print(f"Fehler beim Verdichten des Journals: {e}")
 
     # --- SPIEL- UND SATZVERWALTUNG ---
     
     def start_new_game(self, own_team_id: int, opponent_name: str) -> int:
-        """Erstellt Gegner-Team, startet Spiel und den ersten Satz. Gibt die ECHTE Game ID zurück."""
+        """Sucht/erstellt das Gegner-Team, startet Spiel und den ersten Satz. Gibt die ECHTE Game ID zurück."""
         
-        opponent_team_id = self.db_manager.insert_team(opponent_name)
+        # Wiederkehrende Gegner werden über den normalisierten Namen wiederverwendet
+        opponent_team_id = self.db_manager.get_or_create_team(opponent_name)
         if not opponent_team_id:
-            opponent_team_id = 99 
+            raise Exception(f"Fehler: Gegner-Team '{opponent_name}' konnte nicht angelegt werden.")
         
-        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        now = self._clock().strftime("%Y-%m-%d %H:%M:%S")
         query = "INSERT INTO games (date_time, home_team_id, guest_team_id) VALUES (?, ?, ?)"
         
         game_id = self.db_manager.execute_query(
@@ -57,6 +112,8 @@ class GameController:
             raise Exception("Fehler: Konnte keine Game ID von der Datenbank erhalten.")
             
         self._current_game_id = game_id 
+        self._action_log = ActionLog()
+        self._live_stats = LiveStats()
 
         self.start_new_set(self._current_game_id) 
         
@@ -64,6 +121,7 @@ class GameController:
         return game_id
 
 
+    @tracer.traced(cat="controller")
     def start_new_set(self, game_id: int): 
         """Erstellt einen neuen Satz in der Datenbank mit korrekter fortlaufender Nummer."""
         
@@ -85,6 +143,9 @@ class GameController:
         new_set.set_id = set_id
         
         self._current_set = new_set
+        if game_id == self._current_game_id:
+            self._action_log.add_set(set_number, set_id)
+            self._write_snapshot()
         print(f"Satz {set_number} gestartet (Set ID: {self._current_set.set_id})")
 
     def end_active_game(self):
@@ -94,9 +155,19 @@ class GameController:
             return
         
         print(f"Spiel {self._current_game_id} beendet. Kontext zurückgesetzt.")
+        self.close_game()
 
+    def close_game(self):
+        """Setzt den Spielkontext zurück (z.B. Abwahl im Dropdown) und leert das Journal - danach ist kein Spiel mehr offen."""
         self._current_game_id = None
         self._current_set = None
+        self._action_log = ActionLog()
+        self._live_stats = LiveStats()
+        if self._journal is not None:
+            try:
+                self._journal.clear()
+            except OSError as e:
+                print(f"Fehler beim Leeren des Journals: {e}")
 
     def update_score(self, point_for: str):
         """DEPRECATED: Direkter Score-Update jetzt in process_action integriert."""
@@ -120,8 +191,7 @@ class GameController:
         if not self._current_set:
             return False
             
-        score_own = self._current_set.score_own
-        score_opponent = self._current_set.score_opponent
+        score_own, score_opponent = self._action_log.score(self._current_set.set_number)
         
         # Mindestens ein Team muss 25 Punkte erreicht haben
         if score_own >= 25 or score_opponent >= 25:
@@ -137,6 +207,7 @@ class GameController:
 
     # src/modules/logic/game_controller.py (INNERHALB DER KLASSE GameController)
 
+    @tracer.traced(cat="controller")
     def process_action(self, executor_id: int, action_type: str, result_type: Optional[str] = None, target_id: Optional[int] = None, point_detail_type: Optional[str] = None) -> Tuple[bool, bool]:
         """
         Verarbeitet eine Aktion, speichert sie und aktualisiert den Spielstand.
@@ -145,22 +216,7 @@ class GameController:
             print("Fehler: Kein aktiver Satz oder Spiel gefunden.")
             return False, False
 
-        point_for = None
-        
-        # 1. PRIORITY: PUNKTZUWEISUNG BASIEREND AUF DETAIL CODE (vom Dialog)
-        if point_detail_type:
-            # Holt die eindeutige Zuweisung (OWN oder OPP) aus dem Mapping
-            point_for = POINT_DETAIL_CODE_MAPPING.get(point_detail_type)
-
-        # 2. FALLBACK: DIREKTE BUTTON-AKTIONEN (die den Dialog umgehen)
-        elif action_type == "Unser Punkt":
-            point_for = 'OWN'
-        elif action_type == "Gegner Punkt": 
-            point_for = 'OPP'
-            
-        # 3. FALLBACK: ORIGINAL LOGIC (für result_type, falls keine der oberen Logiken zutrifft)
-        elif result_type and action_type in ACTION_TYPES.keys():
-            point_for = POINT_MAPPING.get((result_type, action_type))
+        point_for = resolve_point_for(action_type, result_type, point_detail_type)
         
         # 1. Internen Score-Zähler aktualisieren
         if point_for == 'OWN':
@@ -176,12 +232,26 @@ class GameController:
             result_type=result_type,
             target_player_id=target_id,
             point_for=point_for, # Wird jetzt korrekt gesetzt
-            point_detail_type=point_detail_type 
+            point_detail_type=point_detail_type,
+            timestamp=self._clock()
         )
         
         action_id = self.db_manager.insert_action(action_data, fetch_id=True) 
         
         if action_id:
+            encode = self.db_manager.codes.encode
+            type_code, result_code = encode('action_type', action_type), encode('result_type', result_type)
+            detail_code = encode('point_detail_type', point_detail_type)
+            self._action_log.append(
+                action_id, self._current_set.set_number, type_code, executor_id,
+                result_code, target_id, point_for, detail_code, action_data.timestamp
+            )
+            self._journal_append({
+                'op': 'action', 'id': action_id, 'set': self._current_set.set_number, 'type': type_code,
+                'exec': executor_id, 'res': result_code, 'tgt': target_id, 'pf': point_for, 'det': detail_code,
+                'ts': action_data.timestamp.strftime(TIMESTAMP_FORMAT),
+            })
+            self._live_stats.add(executor_id, action_type, result_type)
             self.db_manager.update_set_scores(self._current_set.set_id, self._current_set.score_own, self._current_set.score_opponent)
             is_set_over = self.check_set_end_condition()
             return True, is_set_over
@@ -189,51 +259,42 @@ class GameController:
         return False, False
 
     def add_players_to_active_game(self, player_ids: List[int]):
-        """Speichert die Spieler-IDs, die am aktuellen Spiel teilnehmen (für Filterung der InputView)."""
-        self._active_player_ids = player_ids 
+        """
+        Speichert die Spieler-IDs, die am aktuellen Spiel teilnehmen (für Filterung der InputView),
+        und persistiert die Aufstellung in game_players.
+        """
+        self._active_player_ids = list(player_ids)
+        if self._current_game_id is not None:
+            self.db_manager.save_game_players(self._current_game_id, self._active_player_ids)
+        self._journal_append({'op': 'lineup', 'player_ids': list(player_ids)})
         print(f"Spieler {player_ids} sind im aktiven Spiel (ID: {self._current_game_id}) registriert.")
         
+    @tracer.traced(cat="controller")
     def get_all_sets_for_current_game(self) -> Dict[str, int]:
         """Gibt eine Zuordnung von Satznummer (str) zu Set-ID (int) zurück."""
         if self._current_game_id is None:
             return {}
 
-        query = "SELECT set_number, set_id FROM sets WHERE game_id = ? ORDER BY set_number ASC"
-        
-        try:
-            raw_data = self.db_manager.execute_query_fetch_all(query, (self._current_game_id,))
-            
-            set_options = {f"Satz {row[0]}": row[1] for row in raw_data if row[0] is not None} 
-            set_options["Alle Sätze"] = -1
-            return set_options
-        except Exception as e:
-            print(f"Fehler beim Holen der Satzdaten: {e}")
-            return {}
-
+        # Die Sätze des Spiels kennt das Aktions-Log (ohne DB-Zugriff)
+        set_options = {f"Satz {set_number}": set_id for set_number, set_id in self._action_log.sets()}
+        set_options["Alle Sätze"] = -1
+        return set_options
 
+    @tracer.traced(cat="controller")
     def get_all_players(self) -> Dict[int, str]:
         """
-        Holt ALLE Spieler aus der Datenbank und filtert nach den im Spiel aktiven IDs.
-        Gibt {player_id: name} zurück.
+        Gibt die Spieler der Aufstellung des aktuellen Spiels zurück ({player_id: name}).
+        Die Namen kommen aus dem beim Laden gefüllten Cache; nur unbekannte IDs werden abgefragt.
         """
         if not self._current_game_id or not self._active_player_ids:
             return {} 
 
-        # Nutzt die gespeicherten aktiven IDs zur Abfrage
-        placeholders = ', '.join(['?' for _ in self._active_player_ids])
-        query = f"SELECT player_id, name FROM players WHERE player_id IN ({placeholders})"
-        
-        try:
-            self.db_manager.connect()
-            self.db_manager._cursor.execute(query, tuple(self._active_player_ids))
-            results = self.db_manager._cursor.fetchall()
-            self.db_manager.close()
-            
-            return {row[0]: row[1] for row in results}
-            
-        except Exception as e:
-            print(f"Fehler beim Laden der aktiven Spieler: {e}")
-            return {}
+        names = self._get_player_names(self._active_player_ids)
+        return {player_id: names[player_id] for player_id in self._active_player_ids if player_id in names}
+
+    def invalidate_player_names(self):
+        """Verwirft den Namens-Cache (nach Änderungen in der Spielerverwaltung)."""
+        self._player_names = {}
             
     # --- GETTER FÜR GUI ---
     
@@ -261,22 +322,23 @@ class GameController:
         """Gibt die ID des aktuellen Spiels zurück."""
         return self._current_game_id
     
+    @tracer.traced(cat="controller")
     def load_game_context(self, game_id: int):
         """
         Lädt den Kontext des letzten Satzes und die aktiven Spieler 
         für ein bestehendes Spiel aus der DB neu.
         """
-        from ..data.models import Set 
+        # 1. Spiel, letzter Satz und Aufstellung (mit Namen) in einer Abfrage
+        context = self.db_manager.get_game_context(game_id)
+        if context is None:
+            print(f"Fehler: Spiel {game_id} nicht gefunden.")
+            return
 
-        # 1. Letzten Satz laden
-        set_query = "SELECT set_id, set_number, score_own, score_opponent FROM sets WHERE game_id = ? ORDER BY set_number DESC LIMIT 1"
-        latest_set_data = self.db_manager.execute_query_fetch_all(set_query, (game_id,))
-        
-        if not latest_set_data:
+        if context['latest_set'] is None:
             print(f"Spiel {game_id} geladen, aber kein Satz gefunden. Starte Satz 1.")
             self.start_new_set(game_id) 
         else:
-            set_id, set_number, score_own, score_opponent = latest_set_data[0]
+            set_id, set_number, score_own, score_opponent = context['latest_set']
             self._current_set = Set(
                 game_id=game_id, 
                 set_number=set_number, 
@@ -286,22 +348,82 @@ class GameController:
             )
         
         self._current_game_id = game_id
+        self._action_log = ActionLog.load(self.db_manager, game_id)
+        self._live_stats = self._build_live_stats(self._action_log)
+
+        # 2. Aktive Spieler: gespeicherte Aufstellung (ältere Spiele ohne game_players: ganzer Heim-Kader)
+        self._active_player_ids = [player_id for player_id, _ in context['lineup']]
+        self._player_names = dict(context['lineup'])
+        if not context['lineup_saved']:
+            print(f"Spiel {game_id} hat keine gespeicherte Aufstellung, nutze alle Spieler des Heim-Teams.")
+        print(f"Spiel {game_id} Kontext geladen. Setz-Nr.: {self._current_set.set_number}, Spieler-IDs: {self._active_player_ids}")
+        self._write_snapshot()
+
+    def _read_journal_state(self) -> Optional[Dict[str, Any]]:
+        if self._journal is None:
+            return None
+        try:
+            return replay_journal(self._journal.read())
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Fehler beim Lesen des Journals: {e}")
+            return None
 
-        # 2. Aktive Spieler laden (Annahme: alle Spieler des Home Teams nehmen teil)
-        game_query = "SELECT home_team_id FROM games WHERE game_id = ?"
-        home_team_id_data = self.db_manager.execute_query_fetch_all(game_query, (game_id,))
-        
-        if home_team_id_data:
-            home_team_id = home_team_id_data[0][0]
-            
-            # Lade alle Spieler dieses Teams
-            players_data = self.db_manager.get_team_players(home_team_id)
-            
-            # Nur die IDs für das interne Tracking speichern
-            self._active_player_ids = [player[0] for player in players_data]
-            print(f"Spiel {game_id} Kontext geladen. Setz-Nr.: {self._current_set.set_number}, Spieler-IDs: {self._active_player_ids}")
-        else:
-            print(f"Fehler: Heim-Team für Spiel {game_id} nicht gefunden.")
+    @tracer.traced(cat="controller")
+    def resume_from_journal(self) -> Optional[int]:
+        """
+        Stellt nach einem Absturz das offene Spiel aus Snapshot + Journal wieder her
+        (Spiel, Aufstellung, Satz, Aktions-Log, Live-Statistik). Eine einzige Abfrage prüft,
+        ob das Journal zur Datenbank passt; sonst wird der Kontext aus der DB geladen.
+        Gibt die Game ID zurück oder None, wenn kein Spiel offen war.
+        """
+        state = self._read_journal_state()
+        if not state:
+            return None
+        game_id = state['game_id']
+
+        try:
+            log = ActionLog.from_state(state['log_state']) if state['log_state'] else ActionLog()
+            for event in state['events']:
+                op = event['op']
+                if op == 'action':
+                    log.append(event['id'], event['set'], event['type'], event['exec'], event['res'],
+                               event['tgt'], event['pf'], event['det'], _parse_timestamp(event['ts']))
+                elif op == 'edit':
+                    log.update(event['id'], event['exec'], event['res'], event['tgt'])
+                elif op == 'delete':
+                    log.remove(event['id'])
+        except (KeyError, ValueError) as e:
+            print(f"Journal für Spiel {game_id} nicht anwendbar ({e}). Lade Kontext aus der Datenbank.")
+            self.load_game_context(game_id)
+            return game_id
+
+        check_query = """
+            SELECT (SELECT MAX(set_number) FROM sets WHERE game_id = ?),
+                   COUNT(a.action_id), MAX(a.action_id)
+            FROM actions a JOIN sets s ON a.set_id = s.set_id
+            WHERE s.game_id = ?
+        """
+        db_state = self.db_manager.execute_query_fetch_one(check_query, (game_id, game_id))
+        set_number = log.last_set_number()
+        if db_state is None or db_state[0] is None:
+            print(f"Spiel {game_id} aus dem Journal existiert nicht in der Datenbank. Journal verworfen.")
+            self._journal.clear()
+            return None
+        if tuple(db_state) != (set_number, len(log), log.last_action_id()):
+            print(f"Journal und Datenbank für Spiel {game_id} weichen ab. Lade Kontext aus der Datenbank.")
+            self.load_game_context(game_id)
+            return game_id
+
+        score_own, score_opponent = log.score(set_number)
+        self._current_game_id = game_id
+        self._current_set = Set(game_id=game_id, set_number=set_number, score_own=score_own,
+                                score_opponent=score_opponent, set_id=log.set_id(set_number))
+        self._active_player_ids = list(state['lineup'])
+        self._action_log = log
+        self._live_stats = self._build_live_stats(log)
+        self._write_snapshot()
+        print(f"Spiel {game_id} aus dem Journal fortgesetzt: Satz {set_number}, {len(log)} Aktionen.")
+        return game_id
             
     # --- BEARBEITUNGS-METHODEN (Filterung) ---
     
@@ -311,6 +433,7 @@ class GameController:
 
     # src/modules/logic/game_controller.py (INNERHALB DER KLASSE GameController)
 
+    @tracer.traced(cat="controller")
     def get_latest_actions(self, limit: int = 50, set_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Ruft die letzten Aktionen (maximal 'limit') für das aktuelle Spiel ab,
@@ -319,49 +442,76 @@ class GameController:
         if self._current_game_id is None:
             return []
 
-        # KRITISCHE KORREKTUR: Verwende LEFT JOIN, um Aktionen mit executor_id=0 beizubehalten
-        query = """
-            SELECT 
-                a.action_id, a.action_type, a.result_type, a.executor_player_id, 
-                p.name AS executor_name, s.set_number, a.timestamp
-            FROM actions a
-            JOIN sets s ON a.set_id = s.set_id
-            LEFT JOIN players p ON a.executor_player_id = p.player_id 
-            WHERE s.game_id = ?
-        """
-        params = [self._current_game_id]
-        
-        # Filterung nach Satz, falls set_id angegeben wurde
+        log = self._action_log
+        set_number = None
         if set_id is not None:
-            query += " AND a.set_id = ?"
-            params.append(set_id)
-
-        query += " ORDER BY a.timestamp DESC LIMIT ?"
-        params.append(limit)
-        
-        try:
-            self.db_manager.connect()
-            result = self.db_manager._cursor.execute(query, params).fetchall()
-            self.db_manager.close()
-            
-            columns = ['action_id', 'action_type', 'result_type', 'executor_player_id', 'executor_name', 'set_number', 'timestamp']
-            
-            data = [dict(zip(columns, row)) for row in result]
-            return data
-            
-        except Exception as e:
-            print(f"Fehler beim Holen der Aktionshistorie: {e}")
-            self.db_manager.close()
-            return []
+            set_number = log.set_number_of(set_id)
+            if set_number is None:
+                return []
+
+        decode = self.db_manager.codes.decode
+        rows = []
+        for idx in log.latest(limit, set_number):
+            executor_id = log.executors[idx]
+            rows.append({
+                'action_id': log.action_ids[idx],
+                'action_type': decode('action_type', log.action_types[idx]),
+                'result_type': decode('result_type', log.results[idx] or None),
+                'executor_player_id': None if executor_id == NO_PLAYER else executor_id,
+                'executor_name': None,
+                'set_number': log.set_numbers[idx],
+                'timestamp': log.timestamp(idx).strftime(TIMESTAMP_FORMAT),
+            })
+
+        names = self._get_player_names({row['executor_player_id'] for row in rows})
+        for row in rows:
+            row['executor_name'] = names.get(row['executor_player_id'])
+        return rows
+
+    def get_live_player_stats(self) -> Dict[int, Dict[str, float]]:
+        """Laufende Spielerstatistik des aktuellen Spiels ({player_id: Kennzahlen}), ohne DB-Zugriff."""
+        return self._live_stats.all_stats()
+
+    def _build_live_stats(self, log: ActionLog) -> LiveStats:
+        """Baut die Live-Statistik einmalig aus dem geladenen Aktions-Log auf."""
+        decode = self.db_manager.codes.decode
+        # Die wenigen Codes einmal dekodieren statt pro Aktion
+        type_names = {code: decode('action_type', code) for code in set(log.action_types)}
+        result_names = {code: decode('result_type', code or None) for code in set(log.results)}
+        live_stats = LiveStats()
+        for executor_id, type_code, result_code in zip(log.executors, log.action_types, log.results):
+            live_stats.add(None if executor_id == NO_PLAYER else executor_id,
+                           type_names[type_code], result_names[result_code])
+        return live_stats
+
+    def _log_entry(self, action_id: int) -> Optional[Tuple[Optional[int], str, Optional[str]]]:
+        """(Ausführender, Aktionstyp, Ergebnis) einer Aktion des aktuellen Spiels aus dem Log."""
+        log = self._action_log
+        idx = log.index_of(action_id)
+        if idx is None:
+            return None
+        decode = self.db_manager.codes.decode
+        executor_id = log.executors[idx]
+        return (None if executor_id == NO_PLAYER else executor_id,
+                decode('action_type', log.action_types[idx]), decode('result_type', log.results[idx] or None))
+
+    def _get_player_names(self, player_ids) -> Dict[int, str]:
+        """Spielernamen aus dem Cache; fehlende werden mit einer Abfrage nachgeladen."""
+        missing = [pid for pid in player_ids if pid is not None and pid not in self._player_names]
+        if missing:
+            placeholders = ', '.join('?' for _ in missing)
+            query = f"SELECT player_id, name FROM players WHERE player_id IN ({placeholders})"
+            self._player_names.update(self.db_manager.execute_query_fetch_all(query, tuple(missing)))
+        return self._player_names
 
     def _recalculate_set_score(self, set_id: int) -> bool:
-        """BERECHNET den Punktestand eines Satzes neu."""
-        query = "SELECT point_for FROM actions WHERE set_id = ?"
-        points = self.db_manager.execute_query_fetch_all(query, (set_id,))
-        
-        if not points:
-            new_score_own, new_score_opp = 0, 0
+        """BERECHNET den Punktestand eines Satzes neu (aus dem Log, für fremde Spiele aus der DB)."""
+        set_number = self._action_log.set_number_of(set_id)
+        if set_number is not None:
+            new_score_own, new_score_opp = self._action_log.score(set_number)
         else:
+            query = "SELECT point_for FROM actions_decoded WHERE set_id = ?"
+            points = self.db_manager.execute_query_fetch_all(query, (set_id,))
             new_score_own = sum(1 for p in points if p[0] == 'OWN')
             new_score_opp = sum(1 for p in points if p[0] == 'OPP')
 
@@ -374,6 +524,7 @@ class GameController:
         print(f"Satz {set_id} Score neu berechnet: {new_score_own} - {new_score_opp}")
         return True
 
+    @tracer.traced(cat="controller")
     def update_action(self, updated_data: Dict[str, Any]) -> bool:
         """Aktualisiert eine bestehende Aktion und löst die Neuberechnung des Scores aus."""
         action_id = updated_data['action_id']
@@ -390,9 +541,18 @@ class GameController:
         )
         
         if success:
+            old_entry = self._log_entry(action_id)
+            if old_entry:
+                self._live_stats.remove(*old_entry)
+                self._live_stats.add(updated_data['executor_id'], old_entry[1], updated_data['result_type'])
+            result_code = self.db_manager.codes.encode('result_type', updated_data['result_type'])
+            self._action_log.update(action_id, updated_data['executor_id'], result_code, updated_data['target_id'])
+            self._journal_append({'op': 'edit', 'id': action_id, 'exec': updated_data['executor_id'],
+                                  'res': result_code, 'tgt': updated_data['target_id']})
             return self._recalculate_set_score(old_details['set_id'])
         return False
 
+    @tracer.traced(cat="controller")
     def delete_action(self, action_id: int) -> bool:
         """Löscht eine Aktion und löst die Neuberechnung des Scores aus."""
         old_details = self.get_action_details(action_id)
@@ -403,5 +563,10 @@ class GameController:
         success = self.db_manager.delete_action_data(action_id)
         
         if success:
+            old_entry = self._log_entry(action_id)
+            if old_entry:
+                self._live_stats.remove(*old_entry)
+            self._action_log.remove(action_id)
+            self._journal_append({'op': 'delete', 'id': action_id})
             return self._recalculate_set_score(old_details['set_id'])
         return False
\ No newline at end of file
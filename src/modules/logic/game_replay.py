@@ -0,0 +1,327 @@
+# src/modules/logic/game_replay.py
+
+import concurrent.futures
+import contextlib
+import datetime
+import json
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional, Set as TypingSet
+from ..data.db_manager import DBManager, MEMORY_DB_PATH
+from ..data.models import Player
+from ..data.query_stats import QueryStats
+from .game_controller import GameController
+from .live_stats import STAT_COLUMNS
+
+LOG_FORMAT = "volley-action-log"
+LOG_VERSION = 1
+
+# Spalten aus calculate_player_general_stats, die beim Replay verglichen werden
+COMPARED_PLAYER_STATS = ["Kills", "Angriffsfehler", "Blocks", "Asse", "Aufschlagfehler",
+                         "Angriffe_Gesamt", "Aufschläge_Gesamt", "Gesamtpunkte", "Gesamtfehler", "Gesamtquote"]
+
+
+# --- EXPORT ---
+
+def _stats_snapshot(db_manager: DBManager, game_id: int) -> Dict[str, Any]:
+    """Statistik-Kennzahlen eines Spiels, über Spielernamen verschlüsselt (IDs ändern sich beim Replay)."""
+    from .statistic_calculator import StatisticCalculator
+    calculator = StatisticCalculator(db_manager)
+    names = {pid: name for pid, name, *_ in db_manager.get_all_players_details()}
+
+    players: Dict[str, Dict[str, float]] = {}
+    general = calculator.calculate_player_general_stats(game_id)
+    for _, row in general.iterrows():
+        name = names.get(int(row["executor_player_id"]), str(int(row["executor_player_id"])))
+        players[name] = {col: round(float(row[col]), 4) for col in COMPARED_PLAYER_STATS}
+
+    combos: Dict[str, Dict[str, float]] = {}
+    efficiency = calculator.calculate_setter_attacker_efficiency(game_id)
+    for _, row in efficiency.iterrows():
+        combos[f"{row['Zuspieler']} -> {row['Angreifer']}"] = {"Total": int(row["Total"]),
+                                                             "Efficiency": float(row["Efficiency"])}
+    return {"players": players, "setter_attacker": combos}
+
+
+def _set_scores(db_manager: DBManager, game_id: int) -> List[List[int]]:
+    rows = db_manager.execute_query_fetch_all(
+        "SELECT score_own, score_opponent FROM sets WHERE game_id = ? ORDER BY set_number", (game_id,))
+    return [[own, opp] for own, opp in rows]
+
+
+def export_game_log(db_manager: DBManager, game_id: int) -> Dict[str, Any]:
+    """
+    Exportiert ein Spiel als Aktions-Log: Stammdaten, alle Aktionen in Erfassungsreihenfolge
+    (mit Satzwechseln) sowie die erwarteten Endstände und Statistiken.
+    """
+    game = db_manager.execute_query_fetch_one(
+        """SELECT g.date_time, g.home_team_id, h.name, o.name
+           FROM games g LEFT JOIN teams h ON g.home_team_id = h.team_id
+           LEFT JOIN teams o ON g.guest_team_id = o.team_id
+           WHERE g.game_id = ?""", (game_id,))
+    if game is None:
+        raise ValueError(f"Spiel {game_id} nicht gefunden.")
+    date_time, home_team_id, own_team, opponent = game
+
+    players = [{"id": pid, "name": name, "jersey_number": jersey, "position": position}
+               for pid, name, jersey, position, team_id in db_manager.get_all_players_details()
+               if team_id == home_team_id]
+
+    rows = db_manager.execute_query_fetch_all(
+        """SELECT s.set_number, a.action_type, a.executor_player_id, a.result_type,
+                  a.target_player_id, a.point_for, a.point_detail_type, a.timestamp
+           FROM actions_decoded a JOIN sets s ON a.set_id = s.set_id
+           WHERE s.game_id = ?
+           ORDER BY s.set_number, a.action_id""", (game_id,))
+
+    events: List[Dict[str, Any]] = []
+    current_set = None
+    for seq, (set_number, action_type, executor_id, result_type, target_id, point_for, detail, timestamp) in enumerate(rows):
+        if set_number != current_set:
+            events.append({"op": "set", "set_number": set_number})
+            current_set = set_number
+        events.append({"op": "action", "seq": seq, "action_type": action_type, "executor_id": executor_id,
+                       "result_type": result_type, "target_id": target_id, "point_detail_type": detail,
+                       "point_for": point_for, "timestamp": str(timestamp)})
+
+    return {
+        "format": LOG_FORMAT,
+        "version": LOG_VERSION,
+        "game": {"game_id": game_id, "date_time": date_time, "own_team": own_team or "Eigenes Team",
+                 "opponent": opponent or "Gegner"},
+        "players": players,
+        "events": events,
+        "expected": {"sets": _set_scores(db_manager, game_id), "stats": _stats_snapshot(db_manager, game_id)},
+    }
+
+
+def save_log(log: Dict[str, Any], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(log, f, ensure_ascii=False)
+
+
+def load_log(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        log = json.load(f)
+    if log.get("format") != LOG_FORMAT or log.get("version") != LOG_VERSION:
+        raise ValueError(f"{path}: unbekanntes Log-Format ({log.get('format')} v{log.get('version')}).")
+    return log
+
+
+def inject_corrections(log: Dict[str, Any], rate: float = 0.05, seed: int = 0) -> Dict[str, Any]:
+    """
+    Fügt ergebnisneutrale Korrekturen ein, wie sie bei der Live-Erfassung vorkommen:
+    eine versehentlich doppelt erfasste Aktion, die sofort wieder gelöscht wird, und
+    eine Bearbeitung ohne inhaltliche Änderung. Endstände und Statistiken bleiben gleich,
+    dafür laufen update_action und delete_action beim Replay mit.
+    """
+    rng = random.Random(seed)
+    next_seq = 1 + max((e["seq"] for e in log["events"] if e["op"] == "action"), default=-1)
+    events: List[Dict[str, Any]] = []
+    for event in log["events"]:
+        events.append(event)
+        if event["op"] != "action" or rng.random() >= rate:
+            continue
+        duplicate = dict(event, seq=next_seq)
+        events.append(duplicate)
+        events.append({"op": "delete", "ref": next_seq})
+        events.append({"op": "edit", "ref": event["seq"], "executor_id": event["executor_id"],
+                       "result_type": event["result_type"], "target_id": event["target_id"]})
+        next_seq += 1
+    return dict(log, events=events)
+
+
+# --- REPLAY ---
+
+class GameReplayer:
+    """
+    Spielt ein Aktions-Log ohne GUI über den GameController in eine leere Datenbank
+    (mit Schema) ein:
+    process_action, start_new_set, update_action und delete_action in Log-Reihenfolge.
+    Danach werden Satzstände, point_for jeder Aktion und die Statistik mit den
+    erwarteten Werten des Logs verglichen (Regressionstest für POINT_MAPPING und
+    POINT_DETAIL_CODE_MAPPING).
+    """
+
+    def __init__(self, db_manager: DBManager):
+        self.db_manager = db_manager
+        self._next_timestamp: Optional[datetime.datetime] = None
+        self.controller = GameController(db_manager, clock=self._clock)
+
+    def _clock(self) -> datetime.datetime:
+        # Zeitstempel kommen aus dem Log, damit Sortierung und Statistik identisch bleiben
+        return self._next_timestamp or datetime.datetime.now()
+
+    def replay(self, log: Dict[str, Any]) -> Dict[str, Any]:
+        """Spielt das Log ein und gibt Messwerte sowie gefundene Abweichungen zurück."""
+        own_team_id = self.db_manager.get_or_create_team(log["game"]["own_team"])
+        player_map = {0: 0} # Log-ID -> neue ID (0 = Team-Aktion ohne Spieler)
+        for p in log["players"]:
+            player_map[p["id"]] = self.db_manager.insert_player(
+                Player(name=p["name"], jersey_number=p["jersey_number"], position=p["position"]), own_team_id)
+
+        def mapped(player_id):
+            return None if player_id is None else player_map.get(player_id, player_id)
+
+        referenced: TypingSet[int] = {e["ref"] for e in log["events"] if e["op"] in ("edit", "delete")}
+        action_ids: Dict[int, int] = {}
+        point_for_by_seq: Dict[int, Optional[str]] = {}
+        errors: List[str] = []
+        action_count = 0
+
+        self._next_timestamp = datetime.datetime.fromisoformat(log["game"]["date_time"])
+        started = time.perf_counter()
+        game_id = self.controller.start_new_game(own_team_id=own_team_id, opponent_name=log["game"]["opponent"])
+        self.controller.add_players_to_active_game([pid for pid in player_map.values() if pid])
+
+        for event in log["events"]:
+            op = event["op"]
+            if op == "set":
+                if event["set_number"] > self.controller.get_set_number():
+                    self.controller.start_new_set(game_id)
+            elif op == "action":
+                self._next_timestamp = datetime.datetime.fromisoformat(event["timestamp"])
+                success, _ = self.controller.process_action(
+                    executor_id=mapped(event["executor_id"]), action_type=event["action_type"],
+                    result_type=event["result_type"], target_id=mapped(event["target_id"]),
+                    point_detail_type=event["point_detail_type"])
+                action_count += 1
+                if not success:
+                    errors.append(f"Aktion {event['seq']} konnte nicht gespeichert werden.")
+                elif event["seq"] in referenced:
+                    action_ids[event["seq"]] = self.db_manager.execute_query_fetch_one(
+                        "SELECT MAX(action_id) FROM actions")[0]
+                point_for_by_seq[event["seq"]] = event.get("point_for")
+            elif op == "edit":
+                ok = self.controller.update_action({"action_id": action_ids.get(event["ref"]),
+                                                    "executor_id": mapped(event["executor_id"]),
+                                                    "result_type": event["result_type"],
+                                                    "target_id": mapped(event["target_id"])})
+                if not ok:
+                    errors.append(f"Bearbeitung von Aktion {event['ref']} fehlgeschlagen.")
+            elif op == "delete":
+                if not self.controller.delete_action(action_ids.get(event["ref"])):
+                    errors.append(f"Löschen von Aktion {event['ref']} fehlgeschlagen.")
+                point_for_by_seq.pop(event["ref"], None)
+            else:
+                errors.append(f"Unbekannte Operation: {op}")
+        elapsed = time.perf_counter() - started
+
+        errors.extend(self._verify(log, game_id, point_for_by_seq))
+        return {
+            "game": log["game"].get("game_id"),
+            "events": len(log["events"]),
+            "actions": action_count,
+            "seconds": round(elapsed, 4),
+            "actions_per_sec": round(action_count / elapsed, 1) if elapsed else 0.0,
+            "ok": not errors,
+            "errors": errors,
+        }
+
+    def _verify(self, log: Dict[str, Any], game_id: int, expected_point_for: Dict[int, Optional[str]]) -> List[str]:
+        errors = []
+        expected = log.get("expected", {})
+
+        # 1. point_for jeder verbliebenen Aktion (Reihenfolge wie im Log)
+        replayed = [row[0] for row in self.db_manager.execute_query_fetch_all(
+            """SELECT a.point_for FROM actions_decoded a JOIN sets s ON a.set_id = s.set_id
+               WHERE s.game_id = ? ORDER BY s.set_number, a.action_id""", (game_id,))]
+        for (seq, want), got in zip(sorted(expected_point_for.items()), replayed):
+            if want != got:
+                errors.append(f"Aktion {seq}: point_for {got!r}, erwartet {want!r}")
+        if len(replayed) != len(expected_point_for):
+            errors.append(f"{len(replayed)} Aktionen gespeichert, erwartet {len(expected_point_for)}")
+
+        # 2. Satzstände (DB und interner Zustand des Controllers)
+        sets = _set_scores(self.db_manager, game_id)
+        if "sets" in expected and sets != expected["sets"]:
+            errors.append(f"Satzstände {sets}, erwartet {expected['sets']}")
+        if sets and [self.controller.get_current_score_own(), self.controller.get_current_score_opponent()] != sets[-1]:
+            errors.append("Interner Spielstand des Controllers weicht von der Datenbank ab.")
+
+        # 3. Statistiken
+        if "stats" in expected:
+            stats = _stats_snapshot(self.db_manager, game_id)
+            for section in ("players", "setter_attacker"):
+                want, got = expected["stats"].get(section, {}), stats.get(section, {})
+                for key in sorted(set(want) | set(got)):
+                    if want.get(key) != got.get(key):
+                        errors.append(f"Statistik {section}[{key}]: {got.get(key)}, erwartet {want.get(key)}")
+
+        # 4. Live-Statistik (laufend und nach load_game_context) gegen die pandas-Statistik
+        errors.extend(self._verify_live_stats(game_id))
+        return errors
+
+    def _verify_live_stats(self, game_id: int) -> List[str]:
+        from .statistic_calculator import StatisticCalculator
+        table = StatisticCalculator(self.db_manager).calculate_player_general_stats(game_id)
+        expected = {int(row['executor_player_id']): {col: row[col] for col in STAT_COLUMNS}
+                    for _, row in table.iterrows()}
+
+        reloaded = GameController(self.db_manager)
+        reloaded.load_game_context(game_id)
+        errors = []
+        for label, live in (("laufend", self.controller.get_live_player_stats()),
+                            ("geladen", reloaded.get_live_player_stats())):
+            if set(live) != set(expected):
+                errors.append(f"Live-Statistik ({label}): Spieler {sorted(live)}, erwartet {sorted(expected)}")
+                continue
+            for player_id, stats in live.items():
+                diff = [col for col in STAT_COLUMNS if stats[col] != expected[player_id][col]]
+                if diff:
+                    errors.append(f"Live-Statistik ({label}) Spieler {player_id}: Abweichung in {diff}")
+        return errors
+
+
+def replay_to_database(log: Dict[str, Any], db_path: str, quiet: bool = True) -> Dict[str, Any]:
+    """
+    Spielt ein Log in eine neue Datenbank unter db_path ein (eigene Datei pro Replay).
+    Mit db_path=MEMORY_DB_PATH läuft das Replay gegen eine isolierte In-Memory-Datenbank.
+    """
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+        if db_path == MEMORY_DB_PATH:
+            db_manager = DBManager.in_memory(query_stats=QueryStats(enabled=False))
+        else:
+            if os.path.exists(db_path):
+                os.remove(db_path)
+            db_manager = DBManager(db_path=db_path, query_stats=QueryStats(enabled=False))
+            db_manager.setup_database()
+        try:
+            return GameReplayer(db_manager).replay(log)
+        finally:
+            db_manager.dispose()
+
+
+def run_replays(logs: List[Dict[str, Any]], work_dir: str, workers: int = 4,
+                processes: bool = False, in_memory: bool = False) -> Dict[str, Any]:
+    """
+    Führt mehrere Replays parallel aus, jedes gegen eine eigene Datenbank in work_dir
+    (bzw. eine eigene In-Memory-Datenbank bei in_memory=True).
+    Mit processes=True laufen die Replays in getrennten Prozessen (echte Parallelität
+    auf den Schreibpfaden), sonst in Threads.
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    executor_cls = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        with executor_cls(max_workers=workers) as executor:
+            # Threads teilen sich sys.stdout (oben bereits umgeleitet), Prozesse nicht
+            futures = [executor.submit(replay_to_database, log,
+                                       MEMORY_DB_PATH if in_memory else os.path.join(work_dir, f"replay_{i}.db"),
+                                       processes)
+                       for i, log in enumerate(logs)]
+            results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - started
+
+    total_actions = sum(r["actions"] for r in results)
+    return {
+        "replays": len(results),
+        "failed": sum(1 for r in results if not r["ok"]),
+        "actions": total_actions,
+        "seconds": round(elapsed, 3),
+        "actions_per_sec": round(total_actions / elapsed, 1) if elapsed else 0.0,
+        "results": results,
+    }
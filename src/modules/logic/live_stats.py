@@ -0,0 +1,95 @@
+# src/modules/logic/live_stats.py
+
+from typing import Dict, List, Optional
+import numpy as np
+
+# Zähler pro Spieler in der Reihenfolge von StatisticCalculator.calculate_player_general_stats
+COUNTERS = ['Kills', 'Angriffsfehler', 'Blocks', 'Asse', 'Halbe_Asse', 'Aufschlagfehler',
+            'Angriffe_Gesamt', 'Aufschläge_Gesamt']
+_INDEX = {name: i for i, name in enumerate(COUNTERS)}
+_ACTIONS = len(COUNTERS)  # Letzter Slot: Anzahl aller Aktionen des Spielers (für die Zeilenauswahl)
+
+# (Aktionstyp, Ergebnis) -> Zähler; Aktionstyp allein -> Gesamt-Zähler
+RESULT_COUNTERS = {
+    ('Angriff', 'Kill'): _INDEX['Kills'],
+    ('Angriff', 'Fehler'): _INDEX['Angriffsfehler'],
+    ('Block', 'Punkt'): _INDEX['Blocks'],
+    ('Aufschlag', 'Ass'): _INDEX['Asse'],
+    ('Aufschlag', 'Halbes Ass'): _INDEX['Halbe_Asse'],
+    ('Aufschlag', 'Fehler'): _INDEX['Aufschlagfehler'],
+}
+TOTAL_COUNTERS = {
+    'Angriff': _INDEX['Angriffe_Gesamt'],
+    'Aufschlag': _INDEX['Aufschläge_Gesamt'],
+}
+
+STAT_COLUMNS = ['executor_player_id'] + COUNTERS + [
+    'Aufschlag_Punkte', 'Angriffsquote', 'Ins_Feld_Quote', 'Aufschlagsquote',
+    'Gesamtpunkte', 'Gesamtfehler', 'Gesamtversuche', 'Gesamtquote']
+
+
+def _ratio(numerator, denominator) -> float:
+    # np.round wie in der pandas-Variante, damit die Werte bitgleich sind
+    return float(np.round(numerator / denominator, 3)) if denominator > 0 else 0.0
+
+
+class LiveStats:
+    """
+    Laufende Spielerstatistik des aktuellen Spiels. Jede Aktion ändert nur die Zähler
+    ihres Ausführenden (O(1)); Quoten werden beim Lesen aus den Zählern abgeleitet.
+    Liefert dieselben Werte wie StatisticCalculator.calculate_player_general_stats.
+    """
+
+    __slots__ = ('_counters',)
+
+    def __init__(self):
+        self._counters: Dict[int, List[int]] = {}
+
+    def add(self, executor_id: Optional[int], action_type: str, result_type: Optional[str]):
+        self._apply(executor_id, action_type, result_type, 1)
+
+    def remove(self, executor_id: Optional[int], action_type: str, result_type: Optional[str]):
+        self._apply(executor_id, action_type, result_type, -1)
+
+    def _apply(self, executor_id: Optional[int], action_type: str, result_type: Optional[str], delta: int):
+        # Team-Aktionen (executor 0) zählen wie in der Statistik nicht
+        if not executor_id:
+            return
+        counters = self._counters.get(executor_id)
+        if counters is None:
+            counters = self._counters[executor_id] = [0] * (_ACTIONS + 1)
+        counters[_ACTIONS] += delta
+        total = TOTAL_COUNTERS.get(action_type)
+        if total is not None:
+            counters[total] += delta
+        if result_type:
+            counter = RESULT_COUNTERS.get((action_type, result_type))
+            if counter is not None:
+                counters[counter] += delta
+        if counters[_ACTIONS] == 0:
+            del self._counters[executor_id]
+
+    def player_ids(self) -> List[int]:
+        return list(self._counters)
+
+    def player_stats(self, player_id: int) -> Dict[str, float]:
+        """Zähler und abgeleitete Quoten eines Spielers (Spalten wie in der Statistik-Tabelle)."""
+        counters = self._counters.get(player_id, [0] * (_ACTIONS + 1))
+        stats: Dict[str, float] = {'executor_player_id': player_id}
+        stats.update(zip(COUNTERS, counters))
+
+        serve_points = float(stats['Asse']) + float(stats['Halbe_Asse']) * 0.5
+        attacks, serves = stats['Angriffe_Gesamt'], stats['Aufschläge_Gesamt']
+        stats['Aufschlag_Punkte'] = serve_points
+        stats['Angriffsquote'] = _ratio(stats['Kills'] - stats['Angriffsfehler'], attacks)
+        stats['Ins_Feld_Quote'] = _ratio(serves - stats['Aufschlagfehler'], serves)
+        stats['Aufschlagsquote'] = _ratio(serve_points - stats['Aufschlagfehler'], serves)
+
+        stats['Gesamtpunkte'] = stats['Kills'] + stats['Blocks'] + serve_points
+        stats['Gesamtfehler'] = stats['Angriffsfehler'] + stats['Aufschlagfehler']
+        stats['Gesamtversuche'] = attacks + serves
+        stats['Gesamtquote'] = _ratio(stats['Gesamtpunkte'] - stats['Gesamtfehler'], stats['Gesamtversuche'])
+        return stats
+
+    def all_stats(self) -> Dict[int, Dict[str, float]]:
+        return {player_id: self.player_stats(player_id) for player_id in self._counters}
@@ -0,0 +1,307 @@
+# src/modules/logic/season_generator.py
+
+import datetime
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from ..data.db_manager import DBManager
+from ..data.models import Action, Player
+from ..config import POINT_DETAIL_OUTCOMES
+from .game_controller import GameController, resolve_point_for
+
+# Ein generiertes Ereignis: (action_type, executor_id, result_type, target_id, point_detail_type)
+Event = Tuple[str, int, Optional[str], Optional[int], Optional[str]]
+
+FIRST_NAMES = ["Lena", "Jonas", "Mia", "Paul", "Emma", "Felix", "Hannah", "Lukas", "Sophie", "Leon",
+               "Marie", "Finn", "Lea", "Elias", "Anna", "Noah", "Laura", "Ben", "Julia", "Tim"]
+LAST_NAMES = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker",
+              "Schulz", "Hoffmann", "Koch", "Richter", "Klein", "Wolf", "Schröder", "Neumann"]
+TOWNS = ["Aachen", "Bamberg", "Celle", "Dessau", "Erfurt", "Fulda", "Gera", "Hameln", "Ingolstadt",
+         "Jena", "Kassel", "Lübeck", "Minden", "Neuss", "Offenburg", "Passau", "Rostock", "Siegen",
+         "Trier", "Ulm"]
+
+# Aufstellung eines Kaders: (Position, Anzahl)
+ROSTER_TEMPLATE = [("Zuspiel", 2), ("Außen", 4), ("Mitte", 3), ("Diagonal", 2), ("Libero", 1)]
+
+# Wahrscheinlichkeiten (relative Gewichte) der Ergebnis-Typen
+SERVE_RESULTS = {"Ass": 6, "Halbes": 5, "Ins Feld": 74, "Fehler": 15}
+SET_RESULTS = {"Gut": 55, "Mittel": 28, "Schlecht": 14, "Fehler": 3}
+ATTACK_RESULTS = {
+    # Angriffsqualität hängt von der Qualität des Zuspiels ab
+    "Gut": {"Kill": 40, "Halber": 8, "lob": 4, "smart": 4, "Gepritscht": 2, "Fehler": 10, "Blockiert": 9, "Abgewehrt": 15},
+    "Mittel": {"Kill": 30, "Halber": 10, "lob": 6, "smart": 5, "Gepritscht": 3, "Fehler": 13, "Blockiert": 11, "Abgewehrt": 16},
+    "Schlecht": {"Kill": 18, "Halber": 10, "lob": 10, "smart": 4, "Gepritscht": 8, "Fehler": 18, "Blockiert": 12, "Abgewehrt": 16},
+}
+BLOCK_RESULTS = {"Punkt": 25, "Touch": 35, "Soft Block": 25, "Fehler": 15}
+
+
+class SeasonGenerator:
+    """
+    Erzeugt reproduzierbare (per Seed) Testdaten: ein eigenes Team, Gegner-Teams
+    und komplette Spiele mit realistischen Ballwechseln (Aufschlag, Zuspiel->Angriff,
+    Block mit Punkt-Detailcode). Sätze gehen bis 25 (Tie-Break bis 15) mit
+    2 Punkten Vorsprung, gespielt wird auf 3 Gewinnsätze.
+
+    mode='controller' treibt den GameController wie die InputView an,
+    mode='bulk' berechnet die Aktionen vorab und schreibt sie mit executemany.
+    """
+
+    def __init__(self, db_manager: DBManager, seed: int = 42, own_strength: float = 0.3,
+                 start_date: datetime.datetime = datetime.datetime(2024, 9, 7, 19, 0)):
+        self.db_manager = db_manager
+        self.rng = random.Random(seed)
+        self.own_strength = own_strength # Wahrscheinlichkeit, dass ein offener Ballwechsel an uns geht
+        self._clock_time = start_date
+        self.own_team_id: Optional[int] = None
+        self.roster: List[Tuple[int, str]] = [] # (player_id, position)
+        self.opponent_names: List[str] = []
+
+    # --- STAMMDATEN ---
+
+    def create_own_team(self, name: str = "VC Eigenes Team") -> int:
+        """Legt das eigene Team inklusive Kader (12 Spieler, siehe ROSTER_TEMPLATE) an."""
+        self.own_team_id = self.db_manager.insert_team(name)
+        jersey = 1
+        for position, count in ROSTER_TEMPLATE:
+            for _ in range(count):
+                player_name = f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)} {jersey}"
+                player_id = self.db_manager.insert_player(
+                    Player(name=player_name, jersey_number=jersey, position=position), self.own_team_id
+                )
+                self.roster.append((player_id, position))
+                jersey += 1
+        return self.own_team_id
+
+    def create_league(self, team_count: int = 11) -> List[str]:
+        """Erzeugt die Namen der Gegner-Teams einer Liga."""
+        self.opponent_names = [f"TSV {TOWNS[i % len(TOWNS)]}" + (f" {i // len(TOWNS) + 1}" if i >= len(TOWNS) else "")
+                               for i in range(team_count)]
+        return self.opponent_names
+
+    # --- SPIELE ---
+
+    def generate_games(self, game_count: int, mode: str = "bulk") -> Dict[str, Any]:
+        """Erzeugt game_count komplette Spiele und gibt eine Zusammenfassung zurück."""
+        if self.own_team_id is None:
+            self.create_own_team()
+        if not self.opponent_names:
+            self.create_league()
+
+        started = time.perf_counter()
+        totals = {"games": 0, "sets": 0, "actions": 0}
+        existing_games = self.db_manager.execute_query_fetch_one("SELECT COUNT(*) FROM games")[0]
+        for game_no in range(existing_games, existing_games + game_count):
+            # Jeder Liga-Gegner ist ein Team; Hin- und Rückspiele verweisen auf dieselbe team_id
+            opponent_name = self.opponent_names[game_no % len(self.opponent_names)]
+            lineup = self._pick_lineup()
+            if mode == "controller":
+                sets, actions = self._play_game_with_controller(opponent_name, lineup)
+            elif mode == "bulk":
+                sets, actions = self._play_game_bulk(opponent_name, lineup)
+            else:
+                raise ValueError(f"Unbekannter Modus: {mode}")
+            totals["games"] += 1
+            totals["sets"] += sets
+            totals["actions"] += actions
+            # Nächster Spieltag eine Woche später
+            self._clock_time = self._clock_time.replace(hour=19, minute=0, second=0) + datetime.timedelta(days=7)
+
+        totals["seconds"] = round(time.perf_counter() - started, 3)
+        return totals
+
+    def _pick_lineup(self) -> List[int]:
+        """Wählt den Spieltagskader: beide Zuspieler, Libero und 6-8 Angreifer."""
+        setters = [pid for pid, pos in self.roster if pos == "Zuspiel"]
+        libero = [pid for pid, pos in self.roster if pos == "Libero"]
+        hitters = [pid for pid, pos in self.roster if pos not in ("Zuspiel", "Libero")]
+        hitters = self.rng.sample(hitters, k=min(len(hitters), self.rng.randint(6, 8)))
+
+        # Rollen für die Ballwechsel-Simulation dieses Spiels
+        positions = dict(self.roster)
+        self._setters = setters or hitters
+        self._hitters = hitters
+        self._blockers = [pid for pid in hitters if positions[pid] in ("Mitte", "Diagonal")] or hitters
+        return setters + libero + hitters
+
+    def _clock(self) -> datetime.datetime:
+        """Simulierte Uhr: jede Aktion liegt 4-25 Sekunden nach der vorherigen."""
+        self._clock_time += datetime.timedelta(seconds=self.rng.randint(4, 25))
+        return self._clock_time
+
+    def _play_game_with_controller(self, opponent_name: str, lineup: List[int]) -> Tuple[int, int]:
+        controller = GameController(self.db_manager, clock=self._clock)
+        controller.start_new_game(own_team_id=self.own_team_id, opponent_name=opponent_name)
+        controller.add_players_to_active_game(lineup)
+
+        sets_own = sets_opp = 0
+        set_count = 1
+        action_count = 0
+        while True:
+            target = 15 if set_count == 5 else 25
+            own_serves = self.rng.random() < 0.5
+            while not self._is_set_over(controller.get_current_score_own(), controller.get_current_score_opponent(), target):
+                events, own_won = self._play_rally(lineup, own_serves)
+                for action_type, executor_id, result_type, target_id, detail in events:
+                    controller.process_action(executor_id, action_type, result_type, target_id, detail)
+                action_count += len(events)
+                own_serves = own_won
+
+            if controller.get_current_score_own() > controller.get_current_score_opponent():
+                sets_own += 1
+            else:
+                sets_opp += 1
+            if sets_own == 3 or sets_opp == 3:
+                break
+            controller.start_new_set(controller.get_current_game_id())
+            set_count += 1
+
+        controller.end_active_game()
+        return set_count, action_count
+
+    def generate_events(self, action_count: int) -> Tuple[List[int], List[Event]]:
+        """
+        Erzeugt mindestens action_count Ereignisse aus aufeinanderfolgenden Ballwechseln,
+        ohne sie zu speichern (z.B. um process_action isoliert zu messen).
+        Gibt den verwendeten Spieltagskader und die Ereignisse zurück.
+        """
+        lineup = self._pick_lineup()
+        events: List[Event] = []
+        own_serves = self.rng.random() < 0.5
+        while len(events) < action_count:
+            rally, own_won = self._play_rally(lineup, own_serves)
+            events.extend(rally)
+            own_serves = own_won
+        return lineup, events
+
+    def _play_game_bulk(self, opponent_name: str, lineup: List[int]) -> Tuple[int, int]:
+        opponent_team_id = self.db_manager.get_or_create_team(opponent_name)
+        game_id = self.db_manager.execute_query(
+            "INSERT INTO games (date_time, home_team_id, guest_team_id) VALUES (?, ?, ?)",
+            (self._clock_time.strftime("%Y-%m-%d %H:%M:%S"), self.own_team_id, opponent_team_id),
+            fetch_id=True
+        )
+        self.db_manager.save_game_players(game_id, lineup)
+
+        sets_own = sets_opp = 0
+        set_number = 0
+        actions: List[Action] = []
+        while sets_own < 3 and sets_opp < 3:
+            set_number += 1
+            target = 15 if set_number == 5 else 25
+            set_id = self.db_manager.execute_query(
+                "INSERT INTO sets (game_id, set_number, score_own, score_opponent) VALUES (?, ?, 0, 0)",
+                (game_id, set_number), fetch_id=True
+            )
+            score_own = score_opp = 0
+            own_serves = self.rng.random() < 0.5
+            while not self._is_set_over(score_own, score_opp, target):
+                events, own_won = self._play_rally(lineup, own_serves)
+                for action_type, executor_id, result_type, target_id, detail in events:
+                    point_for = resolve_point_for(action_type, result_type, detail)
+                    if point_for == 'OWN':
+                        score_own += 1
+                    elif point_for == 'OPP':
+                        score_opp += 1
+                    actions.append(Action(set_id=set_id, action_type=action_type, executor_player_id=executor_id,
+                                          result_type=result_type, target_player_id=target_id, point_for=point_for,
+                                          point_detail_type=detail, timestamp=self._clock()))
+                own_serves = own_won
+            self.db_manager.update_set_scores(set_id, score_own, score_opp)
+            if score_own > score_opp:
+                sets_own += 1
+            else:
+                sets_opp += 1
+
+        self.db_manager.insert_actions(actions)
+        return set_number, len(actions)
+
+    @staticmethod
+    def _is_set_over(score_own: int, score_opp: int, target: int) -> bool:
+        return max(score_own, score_opp) >= target and abs(score_own - score_opp) >= 2
+
+    # --- BALLWECHSEL ---
+
+    def _choice(self, weights: Dict[str, int]) -> str:
+        return self.rng.choices(list(weights.keys()), weights=list(weights.values()))[0]
+
+    def _play_rally(self, lineup: List[int], own_serves: bool) -> Tuple[List[Event], bool]:
+        """
+        Simuliert einen Ballwechsel aus Sicht des eigenen Teams.
+        Gibt die Ereignisse und den Gewinner (True = eigenes Team) zurück.
+        Endet der Ballwechsel ohne punktbringende Aktion, wird er mit
+        'Unser Punkt'/'Gegner Punkt' abgeschlossen - wie bei der Live-Erfassung.
+        """
+        setters, hitters, blockers = self._setters, self._hitters, self._blockers
+        events: List[Event] = []
+
+        if own_serves:
+            server = self.rng.choice(setters[:1] + hitters)
+            result = self._choice(SERVE_RESULTS)
+            events.append(("Aufschlag", server, result, None, None))
+            if result in ("Ass", "Halbes"):
+                return events, True
+            if result == "Fehler":
+                return events, False
+        else:
+            roll = self.rng.random()
+            if roll < 0.08: # Aufschlagfehler des Gegners
+                return self._finish_rally(events, True)
+            if roll < 0.14: # Ass des Gegners
+                return self._finish_rally(events, False)
+
+        # Bis zu vier eigene Angriffsversuche pro Ballwechsel
+        for _ in range(self.rng.randint(1, 4)):
+            setter = self.rng.choice(setters)
+            attacker = self.rng.choice(hitters)
+            set_result = self._choice(SET_RESULTS)
+            events.append(("Zuspiel", setter, set_result, attacker, None))
+            if set_result == "Fehler":
+                return events, False
+
+            attack_result = self._choice(ATTACK_RESULTS[set_result])
+            events.append(("Angriff", attacker, attack_result, None, None))
+            if attack_result == "Kill":
+                return events, True
+            if attack_result == "Fehler":
+                return events, False
+            if attack_result == "Blockiert" and self.rng.random() < 0.6:
+                return self._finish_rally(events, False)
+
+            # Gegenangriff des Gegners: Block- oder Sicherungsaktion
+            if self.rng.random() < 0.45:
+                block_result = self._choice(BLOCK_RESULTS)
+                detail = self.rng.choice(list(POINT_DETAIL_OUTCOMES.values())) if block_result == "Punkt" else None
+                events.append(("Block", self.rng.choice(blockers), block_result, None, detail))
+                if block_result == "Punkt":
+                    return self._finish_rally(events, True)
+                if block_result == "Fehler":
+                    return events, False
+            elif self.rng.random() < 0.5:
+                save_result = "Gut" if self.rng.random() < 0.8 else "Fehler"
+                events.append(("Sicherung", self.rng.choice(lineup), save_result, None, None))
+                if save_result == "Fehler":
+                    return self._finish_rally(events, False)
+
+        return self._finish_rally(events, self.rng.random() < self.own_strength)
+
+    @staticmethod
+    def _finish_rally(events: List[Event], own_won: bool) -> Tuple[List[Event], bool]:
+        """Schließt einen Ballwechsel ab, falls die letzte Aktion keinen Punkt vergeben hat."""
+        if not events or resolve_point_for(events[-1][0], events[-1][2], events[-1][4]) is None:
+            events.append(("Unser Punkt" if own_won else "Gegner Punkt", 0, None, None, None))
+        return events, own_won
+
+
+def build_benchmark_database(db_path: str, games: int = 100, seed: int = 42, mode: str = "bulk") -> Dict[str, Any]:
+    """
+    Standard-Fixture für Benchmarks: legt eine frische Datenbank an und befüllt
+    sie mit einer generierten Saison. Gibt die Zusammenfassung des Generators zurück.
+    """
+    db_manager = DBManager(db_path=db_path)
+    db_manager.setup_database()
+    generator = SeasonGenerator(db_manager, seed=seed)
+    generator.create_own_team()
+    generator.create_league()
+    summary = generator.generate_games(games, mode=mode)
+    summary["own_team_id"] = generator.own_team_id
+    return summary
@@ -1,9 +1,11 @@
 # src/modules/logic/statistic_calculator.py
 
-from typing import Dict, List, Any, Optional
+from collections import Counter
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Tuple
 import pandas as pd
 import numpy as np
 from modules.data.db_manager import DBManager
+from modules.config import ANALYSIS_MEMORY_LIMIT_MB, ANALYSIS_ROW_BYTES
 
 # PDF-Export Importe
 from reportlab.lib.pagesizes import A4
@@ -12,27 +14,126 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import cm
 
+# Basis-Zählungen der Spielerstatistik: (Spalte, Aktionstyp, Ergebnis oder None = alle Ergebnisse)
+PLAYER_COUNT_STATS = [
+    ('Kills', 'Angriff', 'Kill'),
+    ('Angriffsfehler', 'Angriff', 'Fehler'),
+    ('Blocks', 'Block', 'Punkt'),
+    ('Asse', 'Aufschlag', 'Ass'),
+    ('Halbe_Asse', 'Aufschlag', 'Halbes Ass'),
+    ('Aufschlagfehler', 'Aufschlag', 'Fehler'),
+    ('Angriffe_Gesamt', 'Angriff', None),
+    ('Aufschläge_Gesamt', 'Aufschlag', None),
+]
+
+PAIR_KEYS = ['setter_id', 'attacker_id']
+
+
+def analysis_chunk_rows(memory_limit_mb: Optional[float] = None) -> int:
+    """Blockgröße (Zeilen) der Saison-Auswertung, abgeleitet aus der Speicher-Obergrenze."""
+    limit = ANALYSIS_MEMORY_LIMIT_MB if memory_limit_mb is None else memory_limit_mb
+    return max(1000, int(limit * 1024 * 1024 // ANALYSIS_ROW_BYTES))
+
+
+def _nullable_ids(values: np.ndarray) -> np.ndarray:
+    """
+    Archivierte Spieler-IDs (int32): -1 steht für NULL. Wie beim Lesen aus SQLite int64,
+    mit NULL-Werten float64 mit NaN - sonst weichen die dtypes der Auswertungen ab.
+    """
+    negative = values < 0
+    return np.where(negative, np.nan, values) if negative.any() else values.astype('int64')
+
+
+class _SeasonAggregate:
+    """
+    Laufende Summen einer Saison-Auswertung. Jeder Aktions-Block wird zusammengefasst und
+    verworfen; übrig bleiben nur Zählungen je Spieler bzw. Spieler-Paar. Damit ein Zuspiel am
+    Ende eines Blocks mit dem Angriff am Anfang des nächsten gepaart wird, wird die letzte
+    Spieleraktion jedes Blocks in den nächsten übernommen.
+    Die Summen sind einfache Dicts: über Series.add verkettete pandas-Objekte halten intern
+    Referenzen auf ihre Vorgänger, der Speicher wüchse dann doch mit der Anzahl der Blöcke.
+    """
+
+    def __init__(self):
+        self.player_order: Dict[int, None] = {}          # Reihenfolge des ersten Auftretens
+        self.player_counts: Dict[str, Counter] = {col_name: Counter() for col_name, _, _ in PLAYER_COUNT_STATS}
+        self.pairs: Dict[Tuple[int, int], List[int]] = {} # (setter_id, attacker_id) -> [Total, K, E]
+        self.setting: Counter = Counter()                 # (sid, tid) -> Anzahl
+        self.carry: Optional[pd.DataFrame] = None
+        self.rows = 0
+        self.chunks = 0
+
+    def add(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+        self.chunks += 1
+        df_player = chunk[chunk['executor_player_id'] != 0]
+        self.player_order.update(dict.fromkeys(df_player['executor_player_id'].tolist()))
+        for col_name, counts in StatisticCalculator._player_counts(df_player).items():
+            self.player_counts[col_name].update(counts.to_dict())
+
+        df_clean = df_player if self.carry is None else pd.concat([self.carry, df_player])
+        df_clean = df_clean.reset_index(drop=True)
+        if not df_clean.empty:
+            # Kopie, damit der Übertrag nicht den ganzen Block am Leben hält
+            self.carry = df_clean.iloc[-1:].copy()
+        pairs = StatisticCalculator._count_pairs(df_clean)
+        for setter_id, attacker_id, total, kills, errors in pairs.itertuples(index=False, name=None):
+            sums = self.pairs.setdefault((setter_id, attacker_id), [0, 0, 0])
+            sums[0] += total
+            sums[1] += kills
+            sums[2] += errors
+
+        settings = chunk[chunk['action_type'] == 'Zuspiel']
+        if not settings.empty:
+            self.setting.update(settings.groupby(['executor_player_id', 'target_player_id']).size().to_dict())
+
+
 class StatisticCalculator:
     def __init__(self, db_manager: DBManager):
         self.db_manager = db_manager
 
     def fetch_all_actions_for_game(self, game_id: int) -> pd.DataFrame:
+        # Aktionstyp und Ergebnis kommen als Integer-Codes und werden zu Categoricals:
+        # Filter wie df['action_type'] == 'Angriff' vergleichen dann nur noch Codes.
         query = """
-        SELECT a.executor_player_id, a.action_type, a.result_type, a.target_player_id,
-               a.set_id, a.timestamp 
+        SELECT a.executor_player_id, a.action_type_id AS action_type, a.result_type_id AS result_type,
+               a.target_player_id, a.set_id, a.timestamp 
         FROM actions a
         JOIN sets s ON a.set_id = s.set_id
         WHERE s.game_id = ?
         ORDER BY a.set_id ASC, a.timestamp ASC
         """
-        try:
-            self.db_manager.connect()
-            df = pd.read_sql_query(query, self.db_manager._connection, params=(game_id,))
-            self.db_manager.close()
+        df = self.db_manager.read_sql_query(query, (game_id,),
+                                            categorical={'action_type': 'action_type', 'result_type': 'result_type'})
+        archived = self.db_manager.get_action_archive().load_game(game_id)
+        if archived is None or len(archived['action_id']) == 0:
             return df
-        except Exception as e:
-            print(f"Fehler beim Laden der Aktionen: {e}")
-            return pd.DataFrame()
+        archived_df = self._archived_frame(archived)
+        if df.empty:
+            return archived_df
+        # Nach der Archivierung noch erfasste Aktionen (selten): zusammenführen und neu sortieren
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df = pd.concat([archived_df, df], ignore_index=True)
+        return df.sort_values(['set_id', 'timestamp'], kind='stable', ignore_index=True)
+
+    def _archived_frame(self, columns: Dict[str, np.ndarray], with_game_id: bool = False) -> pd.DataFrame:
+        """
+        DataFrame im Format von fetch_all_actions_for_game aus den (gemappten) Archiv-Spalten.
+        Die Codes werden wie beim Lesen aus SQLite direkt zu Categoricals (0 = NULL -> NaN).
+        """
+        codes = self.db_manager.codes
+        data = {}
+        if with_game_id:
+            data['game_id'] = columns['game_id'].astype('int64')
+        data['executor_player_id'] = _nullable_ids(columns['executor_player_id'])
+        for column in ('action_type', 'result_type'):
+            data[column] = pd.Categorical.from_codes(columns[column].astype('int64') - 1,
+                                                     categories=codes.categories(column))
+        data['target_player_id'] = _nullable_ids(columns['target_player_id'])
+        if not with_game_id:
+            data['set_id'] = columns['set_id'].astype('int64')
+            data['timestamp'] = columns['timestamp']
+        return pd.DataFrame(data, copy=False)
 
     def calculate_player_general_stats(self, game_id: int) -> pd.DataFrame:
         df = self.fetch_all_actions_for_game(game_id)
@@ -41,24 +142,24 @@ class StatisticCalculator:
         df_player = df[df['executor_player_id'] != 0].copy()
         stats = pd.DataFrame(df_player['executor_player_id'].unique(), columns=['executor_player_id'])
 
-        def add_stat(stats_df, df_source, col_name, action_type, result_type=None):
-            if result_type:
-                counts = df_source[(df_source['action_type'] == action_type) & 
-                                   (df_source['result_type'] == result_type)].groupby('executor_player_id').size()
-            else:
-                counts = df_source[df_source['action_type'] == action_type].groupby('executor_player_id').size()
-            stats_df[col_name] = stats_df['executor_player_id'].map(counts).fillna(0).astype(int)
-
         # Basis-Zählungen (Namen synchronisiert mit GUI)
-        add_stat(stats, df_player, 'Kills', 'Angriff', 'Kill')
-        add_stat(stats, df_player, 'Angriffsfehler', 'Angriff', 'Fehler')
-        add_stat(stats, df_player, 'Blocks', 'Block', 'Punkt')
-        add_stat(stats, df_player, 'Asse', 'Aufschlag', 'Ass')
-        add_stat(stats, df_player, 'Halbe_Asse', 'Aufschlag', 'Halbes Ass')
-        add_stat(stats, df_player, 'Aufschlagfehler', 'Aufschlag', 'Fehler')
-        add_stat(stats, df_player, 'Angriffe_Gesamt', 'Angriff')
-        add_stat(stats, df_player, 'Aufschläge_Gesamt', 'Aufschlag')
+        for col_name, counts in self._player_counts(df_player).items():
+            stats[col_name] = stats['executor_player_id'].map(counts).fillna(0).astype(int)
+        return self._add_player_ratios(stats)
+
+    @staticmethod
+    def _player_counts(df_player: pd.DataFrame) -> Dict[str, pd.Series]:
+        """Zählungen aus PLAYER_COUNT_STATS je Spieler (Series: executor_player_id -> Anzahl)."""
+        counts = {}
+        for col_name, action_type, result_type in PLAYER_COUNT_STATS:
+            mask = df_player['action_type'] == action_type
+            if result_type:
+                mask &= df_player['result_type'] == result_type
+            counts[col_name] = df_player[mask].groupby('executor_player_id').size()
+        return counts
 
+    @staticmethod
+    def _add_player_ratios(stats: pd.DataFrame) -> pd.DataFrame:
         # Berechnungen
         stats['Aufschlag_Punkte'] = stats['Asse'].astype(float) + (stats['Halbe_Asse'].astype(float) * 0.5)
         stats['Angriffsquote'] = np.where(stats['Angriffe_Gesamt'] > 0,
@@ -82,19 +183,37 @@ class StatisticCalculator:
         if df.empty: return pd.DataFrame()
         df_clean = df[df['executor_player_id'] != 0].copy()
         df_clean.reset_index(drop=True, inplace=True)
-        seqs = []
-        for i in range(len(df_clean)-1):
-            curr, nxt = df_clean.iloc[i], df_clean.iloc[i+1]
-            if (curr['action_type'] == 'Zuspiel' and curr['target_player_id'] and 
-                nxt['action_type'] == 'Angriff' and nxt['executor_player_id'] == curr['target_player_id']):
-                seqs.append({'setter_id': curr['executor_player_id'], 'attacker_id': nxt['executor_player_id'], 'res': nxt['result_type']})
-        if not seqs: return pd.DataFrame()
-        sdf = pd.DataFrame(seqs)
-        res = sdf.groupby(['setter_id', 'attacker_id']).size().reset_index(name='Total')
-        kills = sdf[sdf['res'] == 'Kill'].groupby(['setter_id', 'attacker_id']).size().reset_index(name='K')
-        errs = sdf[sdf['res'] == 'Fehler'].groupby(['setter_id', 'attacker_id']).size().reset_index(name='E')
-        res = res.merge(kills, on=['setter_id', 'attacker_id'], how='left').fillna(0)
-        res = res.merge(errs, on=['setter_id', 'attacker_id'], how='left').fillna(0)
+        res = self._count_pairs(df_clean)
+        if res.empty: return pd.DataFrame()
+        return self._finish_setter_attacker(res)
+
+    @staticmethod
+    def _count_pairs(df_clean: pd.DataFrame) -> pd.DataFrame:
+        """
+        Zuspiel -> direkt folgender Angriff des Zielspielers (vektorisiert über shift).
+        Gibt je Paar (setter_id, attacker_id) Total, K und E zurück. Hat df_clean eine
+        Spalte game_id, werden nur Paare innerhalb desselben Spiels gezählt.
+        """
+        nxt = df_clean.shift(-1)
+        target = pd.to_numeric(df_clean['target_player_id'], errors='coerce').fillna(0)
+        mask = ((df_clean['action_type'] == 'Zuspiel') & (target != 0) &
+                (nxt['action_type'] == 'Angriff') & (nxt['executor_player_id'] == target))
+        if 'game_id' in df_clean:
+            mask &= nxt['game_id'] == df_clean['game_id']
+        if not mask.any(): return pd.DataFrame()
+        sdf = pd.DataFrame({'setter_id': df_clean.loc[mask, 'executor_player_id'].to_numpy(),
+                            'attacker_id': nxt.loc[mask, 'executor_player_id'].astype(int).to_numpy(),
+                            'res': nxt.loc[mask, 'result_type'].astype(object).to_numpy()})
+        res = sdf.groupby(PAIR_KEYS).size().reset_index(name='Total')
+        kills = sdf[sdf['res'] == 'Kill'].groupby(PAIR_KEYS).size().reset_index(name='K')
+        errs = sdf[sdf['res'] == 'Fehler'].groupby(PAIR_KEYS).size().reset_index(name='E')
+        res = res.merge(kills, on=PAIR_KEYS, how='left').fillna(0)
+        res = res.merge(errs, on=PAIR_KEYS, how='left').fillna(0)
+        # Paare ohne Kill/Fehler machen die Spalte sonst je nach Daten zu float64
+        res[['K', 'E']] = res[['K', 'E']].astype('int64')
+        return res
+
+    def _finish_setter_attacker(self, res: pd.DataFrame) -> pd.DataFrame:
         res['Efficiency'] = ((res['K'] - res['E']) / res['Total'] * 100).round(1)
         res['Zuspieler'] = res['setter_id'].apply(lambda x: self.db_manager.get_player_name_by_id(int(x)))
         res['Angreifer'] = res['attacker_id'].apply(lambda x: self.db_manager.get_player_name_by_id(int(x)))
@@ -102,15 +221,112 @@ class StatisticCalculator:
 
     def calculate_setting_distribution(self, game_id: int) -> pd.DataFrame:
         raw = self.db_manager.fetch_setting_actions(game_id)
+        archived = self.db_manager.get_action_archive().load_game(game_id)
+        if archived is not None:
+            settings = archived['action_type'] == self.db_manager.codes.encode('action_type', 'Zuspiel')
+            targets = archived['target_player_id'][settings].tolist()
+            raw = list(zip(archived['executor_player_id'][settings].tolist(),
+                           [None if target < 0 else target for target in targets])) + raw
         if not raw: return pd.DataFrame()
         df = pd.DataFrame(raw, columns=['sid', 'tid'])
-        dist = df.groupby(['sid', 'tid']).size().reset_index(name='Total')
+        return self._finish_setting_distribution(df.groupby(['sid', 'tid']).size().reset_index(name='Total'))
+
+    def _finish_setting_distribution(self, dist: pd.DataFrame) -> pd.DataFrame:
         dist['Zuspieler'] = dist['sid'].apply(lambda x: self.db_manager.get_player_name_by_id(int(x)))
         dist['Angreifer'] = dist['tid'].apply(lambda x: self.db_manager.get_player_name_by_id(int(x)) if pd.notna(x) else "Kein Ziel")
         total = dist.groupby('Zuspieler')['Total'].transform('sum')
         dist['Prozent'] = (dist['Total'] / total * 100).round(1)
         return dist
 
+    # --- SAISON-AUSWERTUNG (STREAMING) ---
+
+    def iter_season_action_chunks(self, game_ids: Optional[Sequence[int]] = None,
+                                  chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """
+        Aktionen aller (oder der angegebenen) Spiele als DataFrames mit höchstens chunk_rows
+        Zeilen, sortiert wie fetch_all_actions_for_game und zusätzlich nach Spiel.
+        Archivierte Spiele kommen zuerst, direkt aus den gemappten Saison-Dateien.
+        """
+        chunk_rows = chunk_rows or analysis_chunk_rows()
+        archive = self.db_manager.get_action_archive()
+        for season, generation, row_count in archive.seasons():
+            if not row_count:
+                continue
+            columns = archive.season_columns(season, generation)
+            if not game_ids:
+                # Ohne Filter reichen Slices der gemappten Spalten (keine Kopie)
+                for start in range(0, row_count, chunk_rows):
+                    yield self._archived_frame({name: values[start:start + chunk_rows]
+                                                for name, values in columns.items()}, with_game_id=True)
+                continue
+            positions = np.flatnonzero(np.isin(columns['game_id'], list(game_ids)))
+            for start in range(0, len(positions), chunk_rows):
+                rows = positions[start:start + chunk_rows]
+                yield self._archived_frame({name: values[rows] for name, values in columns.items()}, with_game_id=True)
+        yield from self._live_season_chunks(game_ids, chunk_rows)
+
+    def _live_season_chunks(self, game_ids: Optional[Sequence[int]], chunk_rows: int) -> Iterator[pd.DataFrame]:
+        where = ""
+        params: tuple = ()
+        if game_ids:
+            where = f"WHERE s.game_id IN ({', '.join('?' * len(game_ids))})"
+            params = tuple(game_ids)
+        query = f"""
+        SELECT s.game_id, a.executor_player_id, a.action_type_id AS action_type,
+               a.result_type_id AS result_type, a.target_player_id
+        FROM actions a
+        JOIN sets s ON a.set_id = s.set_id
+        {where}
+        ORDER BY s.game_id ASC, a.set_id ASC, a.timestamp ASC
+        """
+        return self.db_manager.read_sql_chunks(query, params, chunk_size=chunk_rows,
+                                               categorical={'action_type': 'action_type', 'result_type': 'result_type'})
+
+    def calculate_season_stats(self, game_ids: Optional[Sequence[int]] = None, chunk_rows: Optional[int] = None,
+                               memory_limit_mb: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Spielerstatistik, Setter-Angreifer-Effizienz und Zuspielverteilung über eine ganze Saison
+        in einem Durchlauf. Die Aktionen werden blockweise gelesen und in laufende Summen
+        gefaltet, der Speicherbedarf hängt daher von der Blockgröße ab (chunk_rows, sonst aus
+        memory_limit_mb bzw. ANALYSIS_MEMORY_LIMIT_MB), nicht von der Anzahl der Spiele.
+        Die Tabellen haben dieselben Spalten wie die Auswertungen eines einzelnen Spiels.
+        Gibt {'players', 'setter_attacker', 'setting_distribution', 'rows', 'chunks'} zurück.
+        Fehler beim Lesen werden nicht abgefangen: leere Tabellen hießen hier "keine Aktionen in der Saison".
+        """
+        aggregate = _SeasonAggregate()
+        chunk_rows = chunk_rows or analysis_chunk_rows(memory_limit_mb)
+        for chunk in self.iter_season_action_chunks(game_ids, chunk_rows):
+            aggregate.add(chunk)
+
+        players = pd.DataFrame()
+        if aggregate.player_order:
+            players = pd.DataFrame(list(aggregate.player_order), columns=['executor_player_id'])
+            for col_name, counts in aggregate.player_counts.items():
+                players[col_name] = players['executor_player_id'].map(counts).fillna(0).astype(int)
+            players = self._add_player_ratios(players)
+
+        # Sortiert nach Schlüssel wie die Ergebnisse von groupby
+        efficiency = pd.DataFrame()
+        if aggregate.pairs:
+            efficiency = pd.DataFrame([key + tuple(sums) for key, sums in sorted(aggregate.pairs.items())],
+                                      columns=PAIR_KEYS + ['Total', 'K', 'E'])
+            efficiency[['Total', 'K', 'E']] = efficiency[['Total', 'K', 'E']].astype('int64')
+            efficiency = self._finish_setter_attacker(efficiency)
+
+        distribution = pd.DataFrame()
+        if aggregate.setting:
+            distribution = pd.DataFrame([key + (count,) for key, count in sorted(aggregate.setting.items())],
+                                        columns=['sid', 'tid', 'Total'])
+            distribution = self._finish_setting_distribution(distribution)
+
+        return {
+            'players': players,
+            'setter_attacker': efficiency,
+            'setting_distribution': distribution,
+            'rows': aggregate.rows,
+            'chunks': aggregate.chunks,
+        }
+
     def export_to_pdf(self, game_id: int, file_path: str) -> bool:
         """Erstellt ein professionelles PDF mit allen GUI-Statistiken."""
         try:
@@ -0,0 +1,310 @@
+# src/modules/logic/stats_api.py
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from ..config import (STATS_API_CACHE_GAMES, STATS_API_GZIP_MIN_BYTES, STATS_API_HOST, STATS_API_MIN_RECOMPUTE_SECONDS,
+                      STATS_API_PORT, STATS_API_WORKERS)
+from .statistic_calculator import StatisticCalculator
+
+# Nur lesende HTTP/JSON-API für Handys und Tablets der Trainer:
+#   GET /api/games                                Spiele (neueste zuerst)
+#   GET /api/games/<id>                           Spiel mit Teams und Sätzen
+#   GET /api/games/<id>/sets                      Sätze mit Spielstand
+#   GET /api/games/<id>/players                   Spielerstatistik (calculate_player_general_stats)
+#   GET /api/games/<id>/setting-distribution      Zuspielverteilung
+#   GET /api/games/<id>/setter-attacker           Effizienz Zuspieler -> Angreifer
+#   GET /api/status                               Cache-Treffer, zwischengespeicherte Spiele
+#
+# Antworten eines Spiels werden fertig serialisiert (und gzip-komprimiert) zwischengespeichert.
+# Gültig sind sie, solange sich das Änderungs-Token des Spiels nicht ändert (Revisionszähler des
+# Spiels und der Spielernamen, per Trigger gepflegt - eine Indexabfrage). Das Token ist zugleich
+# das ETag: pollende Geräte bekommen mit If-None-Match ein 304 ohne Body.
+
+GAME_ENDPOINTS = ('game', 'sets', 'players', 'setting-distribution', 'setter-attacker')
+_GAME_PATH = re.compile(r"^/api/games/(\d+)(?:/([a-z-]+))?/?$")
+
+# Revisionen aus stats_revisions (Trigger, siehe db_manager.STATS_REVISION_TABLE_SQL): die des Spiels
+# und Zeile 0 für Spieler-/Teamnamen. Jede Änderung zählt hoch, auch wenn sie sich in Summen aufheben würde.
+_GAME_TOKEN_SQL = """
+    SELECT g.game_id, IFNULL(r.revision, 0), IFNULL(roster.revision, 0)
+    FROM games g
+    LEFT JOIN stats_revisions r ON r.game_id = g.game_id
+    LEFT JOIN stats_revisions roster ON roster.game_id = 0
+    WHERE g.game_id = :game_id
+"""
+
+
+class _Payload:
+    """Fertige Antwort: JSON-Bytes, optional gzip-Variante und ETag."""
+    __slots__ = ('etag', 'body', 'gzipped')
+
+    def __init__(self, etag: str, body: bytes):
+        self.etag = etag
+        self.body = body
+        self.gzipped = gzip.compress(body, 6) if len(body) >= STATS_API_GZIP_MIN_BYTES else None
+
+
+class _GameEntry:
+    def __init__(self):
+        self.lock = threading.Lock() # Gleichzeitige Abfragen desselben Spiels rechnen nur einmal
+        self.token: Optional[str] = None
+        self.computed_at = 0.0
+        self.payloads: Dict[str, _Payload] = {}
+
+
+class StatsService:
+    """
+    Erzeugt die Antworten der Stats-API über den StatisticCalculator und speichert sie pro Spiel
+    (LRU über cache_games Spiele). Thread-sicher; jeder Worker-Thread liest über seine eigene
+    Lese-Verbindung des DBManagers.
+    """
+
+    def __init__(self, db_manager, cache_games: int = STATS_API_CACHE_GAMES,
+                 min_recompute_seconds: float = STATS_API_MIN_RECOMPUTE_SECONDS):
+        self.db_manager = db_manager
+        self.calculator = StatisticCalculator(db_manager)
+        self.cache_games = cache_games
+        self.min_recompute_seconds = min_recompute_seconds
+        self._games: 'OrderedDict[int, _GameEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def game_token(self, game_id: int) -> Optional[str]:
+        """Änderungs-Token eines Spiels (None = Spiel gibt es nicht)."""
+        row = self.db_manager.execute_query_fetch_one(_GAME_TOKEN_SQL, {'game_id': game_id})
+        if row is None:
+            return None
+        return hashlib.sha1(repr(row).encode('utf-8')).hexdigest()[:20]
+
+    def _entry(self, game_id: int) -> _GameEntry:
+        with self._lock:
+            entry = self._games.get(game_id)
+            if entry is None:
+                entry = self._games[game_id] = _GameEntry()
+                while len(self._games) > self.cache_games:
+                    self._games.popitem(last=False)
+            else:
+                self._games.move_to_end(game_id)
+            return entry
+
+    def game_response(self, game_id: int, endpoint: str) -> Optional[_Payload]:
+        """Antwort eines Spiel-Endpunkts (aus dem Cache, solange das Token passt). None = unbekanntes Spiel."""
+        token = self.game_token(game_id)
+        if token is None:
+            return None
+        entry = self._entry(game_id)
+        with entry.lock:
+            if entry.token != token:
+                # Laufendes Spiel mit Erfassung im Sekundentakt: bis min_recompute_seconds nach der
+                # letzten Berechnung gilt der bisherige Stand weiter, statt bei jedem Tap neu zu rechnen
+                recent = time.monotonic() - entry.computed_at < self.min_recompute_seconds
+                if not (recent and endpoint in entry.payloads):
+                    entry.token, entry.computed_at, entry.payloads = token, time.monotonic(), {}
+            payload = entry.payloads.get(endpoint)
+            self._count(hit=payload is not None)
+            if payload is not None:
+                return payload
+            body = self._build(game_id, endpoint, entry.token)
+            payload = entry.payloads[endpoint] = _Payload(f'"{entry.token}-{endpoint}"', body)
+            return payload
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def games_response(self) -> _Payload:
+        """Spieleliste; das ETag ist eine Prüfsumme des Inhalts (eine Abfrage, kein Cache nötig)."""
+        rows = self.db_manager.execute_query_fetch_all("""
+            SELECT g.game_id, g.date_time, ht.name, gt.name, (SELECT COUNT(*) FROM sets s WHERE s.game_id = g.game_id)
+            FROM games g
+            LEFT JOIN teams ht ON ht.team_id = g.home_team_id
+            LEFT JOIN teams gt ON gt.team_id = g.guest_team_id
+            ORDER BY g.date_time DESC, g.game_id DESC
+        """)
+        games = [{'game_id': game_id, 'date_time': str(date_time), 'home_team': home, 'guest_team': guest,
+                  'sets': sets} for game_id, date_time, home, guest, sets in rows]
+        body = json.dumps({'games': games}, ensure_ascii=False).encode('utf-8')
+        return _Payload(f'"games-{hashlib.sha1(body).hexdigest()[:20]}"', body)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            cached = list(self._games)
+        return {'cached_games': cached, 'hits': self.hits, 'misses': self.misses}
+
+    # --- ANTWORTEN ---
+
+    def _build(self, game_id: int, endpoint: str, token: str) -> bytes:
+        if endpoint in ('game', 'sets'):
+            data = self._game_data(game_id) if endpoint == 'game' else self._sets(game_id)
+            return json.dumps({'game_id': game_id, 'token': token, 'data': data}, ensure_ascii=False).encode('utf-8')
+        if endpoint == 'players':
+            df = self._with_player_names(self.calculator.calculate_player_general_stats(game_id))
+        elif endpoint == 'setting-distribution':
+            df = self.calculator.calculate_setting_distribution(game_id)
+        else:
+            df = self.calculator.calculate_setter_attacker_efficiency(game_id)
+        # DataFrame direkt als JSON (NumPy-Typen und NaN -> null erledigt pandas)
+        records = df.to_json(orient='records', force_ascii=False) if not df.empty else "[]"
+        prefix = json.dumps({'game_id': game_id, 'token': token})[:-1]
+        return f'{prefix}, "data": {records}}}'.encode('utf-8')
+
+    def _sets(self, game_id: int) -> List[Dict[str, Any]]:
+        return [{'set_number': number, 'score_own': own, 'score_opponent': opponent}
+                for number, own, opponent in self.db_manager.execute_query_fetch_all(
+                    "SELECT set_number, score_own, score_opponent FROM sets WHERE game_id = ? ORDER BY set_number",
+                    (game_id,))]
+
+    def _game_data(self, game_id: int) -> Dict[str, Any]:
+        date_time, home, guest = self.db_manager.execute_query_fetch_one("""
+            SELECT g.date_time, ht.name, gt.name FROM games g
+            LEFT JOIN teams ht ON ht.team_id = g.home_team_id
+            LEFT JOIN teams gt ON gt.team_id = g.guest_team_id
+            WHERE g.game_id = ?
+        """, (game_id,))
+        return {'date_time': str(date_time), 'home_team': home, 'guest_team': guest, 'sets': self._sets(game_id)}
+
+    def _with_player_names(self, stats: pd.DataFrame) -> pd.DataFrame:
+        if stats.empty:
+            return stats
+        ids = [int(player_id) for player_id in stats['executor_player_id'].tolist()]
+        names = dict(self.db_manager.execute_query_fetch_all(
+            f"SELECT player_id, name FROM players WHERE player_id IN ({', '.join('?' * len(ids))})", tuple(ids)))
+        stats.insert(1, 'Spieler', [names.get(player_id, "Unbekannt") for player_id in ids])
+        return stats
+
+
+class StatsApiServer(HTTPServer):
+    """
+    HTTP-Server der Stats-API. Anfragen laufen auf einem festen Pool von Worker-Threads (statt
+    einem Thread pro Anfrage): die Zahl der Lese-Verbindungen bleibt konstant, auch wenn Dutzende
+    Geräte im Sekundentakt abfragen. Der Tk-Thread und die Schreibverbindung werden nie benutzt.
+    """
+    request_queue_size = 128 # Viele gleichzeitige Verbindungsaufbauten nicht abweisen
+
+    def __init__(self, db_manager, host: str = STATS_API_HOST, port: int = STATS_API_PORT,
+                 workers: int = STATS_API_WORKERS, verbose: bool = False):
+        self.service = StatsService(db_manager)
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stats-api")
+        self._thread: Optional[threading.Thread] = None
+        super().__init__((host, port), _StatsHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_in_worker, request, client_address)
+
+    def _process_in_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def start(self) -> 'StatsApiServer':
+        """Nimmt Verbindungen in einem Hintergrund-Thread an (App, Tests, Benchmarks)."""
+        self._thread = threading.Thread(target=self.serve_forever, name="stats-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None: # Läuft serve_forever im Vordergrund, ist es hier schon beendet
+            self.shutdown()
+            self._thread.join()
+        self.server_close()
+        self._pool.shutdown(wait=True)
+
+
+class _StatsHandler(BaseHTTPRequestHandler):
+    server: StatsApiServer
+    timeout = 10 # Langsame Clients blockieren einen Worker höchstens so lange
+
+    def do_GET(self):
+        path = urllib.parse.urlsplit(self.path).path
+        service = self.server.service
+        try:
+            if path in ('/api/games', '/api/games/'):
+                self._send_payload(service.games_response())
+                return
+            if path == '/api/status':
+                self._send_json(200, service.status())
+                return
+            match = _GAME_PATH.match(path)
+            endpoint = match and (match.group(2) or 'game')
+            if not match or endpoint not in GAME_ENDPOINTS:
+                self._send_json(404, {'error': f"Unbekannter Pfad {path}"})
+                return
+            payload = service.game_response(int(match.group(1)), endpoint)
+        except Exception as e:
+            print(f"Fehler in der Stats-API bei {path}: {e}")
+            self._send_json(500, {'error': str(e)})
+            return
+        if payload is None:
+            self._send_json(404, {'error': f"Spiel {match.group(1)} nicht gefunden"})
+            return
+        self._send_payload(payload)
+
+    def _send_payload(self, payload: _Payload):
+        if _etag_matches(self.headers.get('If-None-Match'), payload.etag):
+            self.send_response(304)
+            self._common_headers(payload.etag)
+            self.end_headers()
+            return
+        body = payload.body
+        gzipped = payload.gzipped is not None and 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            body = payload.gzipped
+        self.send_response(200)
+        self._common_headers(payload.etag)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _common_headers(self, etag: str):
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache') # Immer per If-None-Match nachfragen
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Access-Control-Allow-Origin', '*')
+
+    def _send_json(self, code: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match: Liste von ETags (auch schwach, W/...) oder '*'."""
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(',')]
+    return '*' in candidates or any(candidate.removeprefix('W/') == etag for candidate in candidates)
@@ -0,0 +1,286 @@
+# src/modules/tracing.py
+
+import json
+import math
+import threading
+import time
+import functools
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+from .config import TRACING_ENABLED, TRACE_BUFFER_SIZE
+
+
+class Span:
+    """Ein abgeschlossener Messabschnitt (Zeiten in Sekunden, perf_counter-Basis)."""
+    __slots__ = ("name", "cat", "start", "duration", "interaction_id", "thread_id", "args")
+
+    def __init__(self, name: str, cat: str, start: float, duration: float,
+                 interaction_id: Optional[int], thread_id: int, args: Optional[Dict[str, Any]]):
+        self.name = name
+        self.cat = cat
+        self.start = start
+        self.duration = duration
+        self.interaction_id = interaction_id
+        self.thread_id = thread_id
+        self.args = args
+
+
+class Interaction:
+    """
+    Eine UI-Interaktion vom Tastendruck bis zum Neuzeichnen (z.B. handle_action ->
+    Dialog -> process_final_action -> Redraw). Alle Spans, die im selben Thread
+    währenddessen entstehen, werden ihr zugeordnet.
+    """
+    __slots__ = ("interaction_id", "name", "start", "end", "thread_id", "status", "args", "counters")
+
+    def __init__(self, interaction_id: int, name: str, args: Optional[Dict[str, Any]]):
+        self.interaction_id = interaction_id
+        self.name = name
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.thread_id = threading.get_ident()
+        self.status = "open"
+        self.args = args
+        self.counters: Dict[str, int] = {}
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class _NullSpan:
+    """Kontextmanager ohne Wirkung - wird zurückgegeben, wenn das Tracing aus ist."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("_tracer", "_name", "_cat", "_args", "_start")
+
+    def __init__(self, tracer: "LatencyTracer", name: str, cat: str, args: Optional[Dict[str, Any]]):
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._args = args
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self._args = dict(self._args or {}, error=exc_type.__name__)
+        self._tracer.record(self._name, self._start, duration, cat=self._cat, args=self._args)
+        return False
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-Rank-Perzentil einer bereits sortierten Liste."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LatencyTracer:
+    """
+    Sammelt Latenz-Spans und UI-Interaktionen in Ringpuffern im Speicher.
+    Ist das Tracing aus, kostet span() nur eine Attributabfrage und liefert
+    einen geteilten No-Op-Kontextmanager.
+    """
+
+    def __init__(self, enabled: bool = False, capacity: int = 5000):
+        self.enabled = enabled
+        self.capacity = capacity
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._interactions: Deque[Interaction] = deque(maxlen=capacity)
+        self._current: Optional[Interaction] = None
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._epoch = time.perf_counter() # Nullpunkt für den Chrome-Trace-Export
+
+    # --- STEUERUNG ---
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        self._current = None
+
+    def clear(self):
+        """Leert beide Ringpuffer."""
+        with self._lock:
+            self._spans.clear()
+            self._interactions.clear()
+            self._current = None
+
+    # --- INTERAKTIONEN ---
+
+    def begin_interaction(self, name: str, **args) -> Optional[Interaction]:
+        """
+        Startet eine neue Interaktion. Eine noch offene Interaktion (z.B. Dialog
+        ohne Speichern geschlossen) wird als 'abandoned' abgeschlossen.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            if self._current is not None:
+                self._finish(self._current, "abandoned")
+            interaction = Interaction(self._next_id, name, args or None)
+            self._next_id += 1
+            self._current = interaction
+            return interaction
+
+    def end_interaction(self, status: str = "ok", interaction: Optional[Interaction] = None):
+        """
+        Schließt die aktuell offene Interaktion ab. Wird eine bestimmte Interaktion
+        übergeben, passiert nichts, falls inzwischen eine andere offen ist.
+        """
+        if self._current is None:
+            return
+        with self._lock:
+            if self._current is not None and (interaction is None or interaction is self._current):
+                self._finish(self._current, status)
+
+    def current_interaction(self) -> Optional[Interaction]:
+        """Gibt die offene Interaktion zurück, falls sie zum aufrufenden Thread gehört."""
+        current = self._current
+        if current is not None and current.thread_id == threading.get_ident():
+            return current
+        return None
+
+    def count(self, counter: str, amount: int = 1):
+        """Erhöht einen Zähler der aktuellen Interaktion (z.B. DB-Queries pro Tap)."""
+        current = self.current_interaction()
+        if current is not None:
+            current.counters[counter] = current.counters.get(counter, 0) + amount
+
+    def _finish(self, interaction: Interaction, status: str):
+        interaction.end = time.perf_counter()
+        interaction.status = status
+        self._interactions.append(interaction)
+        self._current = None
+
+    # --- SPANS ---
+
+    def span(self, name: str, cat: str = "app", **args):
+        """Kontextmanager, der die Laufzeit des Blocks als Span speichert."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _ActiveSpan(self, name, cat, args or None)
+
+    def traced(self, name: Optional[str] = None, cat: str = "app") -> Callable:
+        """Decorator-Variante von span(); der Span-Name ist standardmäßig Klasse.Methode."""
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _ActiveSpan(self, span_name, cat, None):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name: str, start: float, duration: float, cat: str = "app",
+               args: Optional[Dict[str, Any]] = None):
+        """Speichert einen bereits gemessenen Abschnitt (start = perf_counter-Wert)."""
+        if not self.enabled:
+            return
+        current = self.current_interaction()
+        self._spans.append(Span(name, cat, start, duration,
+                                current.interaction_id if current else None,
+                                threading.get_ident(), args))
+
+    # --- AUSWERTUNG ---
+
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def interactions(self) -> List[Interaction]:
+        with self._lock:
+            return list(self._interactions)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        p50/p95/p99/max (in ms) pro Span-Name sowie pro Interaktionstyp
+        (Schlüssel 'interaction:<name>', nur abgeschlossene mit Status 'ok').
+        """
+        samples: Dict[str, List[float]] = {}
+        for span in self.spans():
+            samples.setdefault(span.name, []).append(span.duration * 1000)
+        for interaction in self.interactions():
+            if interaction.status == "ok":
+                samples.setdefault(f"interaction:{interaction.name}", []).append(interaction.duration * 1000)
+
+        result = {}
+        for name, values in sorted(samples.items()):
+            values.sort()
+            result[name] = {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 50), 3),
+                "p95_ms": round(_percentile(values, 95), 3),
+                "p99_ms": round(_percentile(values, 99), 3),
+                "max_ms": round(values[-1], 3),
+            }
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Rohdaten und Zusammenfassung als JSON-fähiges Dictionary."""
+        return {
+            "summary": self.summary(),
+            "interactions": [
+                {"id": i.interaction_id, "name": i.name, "status": i.status,
+                 "start_ms": round((i.start - self._epoch) * 1000, 3),
+                 "duration_ms": round(i.duration * 1000, 3),
+                 "args": i.args, "counters": i.counters}
+                for i in self.interactions()
+            ],
+            "spans": [
+                {"name": s.name, "cat": s.cat, "interaction_id": s.interaction_id,
+                 "start_ms": round((s.start - self._epoch) * 1000, 3),
+                 "duration_ms": round(s.duration * 1000, 3), "args": s.args}
+                for s in self.spans()
+            ],
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Export im Chrome-Trace-Format (chrome://tracing bzw. Perfetto)."""
+        events = []
+        for i in self.interactions():
+            events.append({
+                "name": i.name, "cat": "interaction", "ph": "X", "pid": 1, "tid": i.thread_id,
+                "ts": round((i.start - self._epoch) * 1e6, 1), "dur": round(i.duration * 1e6, 1),
+                "args": dict(i.args or {}, id=i.interaction_id, status=i.status, **i.counters),
+            })
+        for s in self.spans():
+            events.append({
+                "name": s.name, "cat": s.cat, "ph": "X", "pid": 1, "tid": s.thread_id,
+                "ts": round((s.start - self._epoch) * 1e6, 1), "dur": round(s.duration * 1e6, 1),
+                "args": dict(s.args or {}, interaction_id=s.interaction_id),
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_json(self, file_path: str):
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+    def export_chrome_trace(self, file_path: str):
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+
+# Globale Instanz, die von GUI, Logik und Datenbankschicht gemeinsam genutzt wird
+tracer = LatencyTracer(enabled=TRACING_ENABLED, capacity=TRACE_BUFFER_SIZE)
@@ -0,0 +1,104 @@
+# src/replay_games.py
+# Headless-Replay aufgezeichneter Spiele über den GameController.
+#
+# Beispiele (aus dem src-Ordner):
+#   python replay_games.py export --db ../resources/db/stats.db --all --out ../resources/replays
+#   python replay_games.py run ../resources/replays/*.json --workers 8 --corrections 0.05
+#   python replay_games.py selftest --games 50 --workers 8 --processes
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+from modules.data.db_manager import DBManager
+from modules.logic.game_replay import export_game_log, inject_corrections, load_log, run_replays, save_log
+from modules.logic.season_generator import build_benchmark_database
+
+
+def _print_summary(summary, verbose: bool) -> int:
+    for result in summary["results"]:
+        if not result["ok"] or verbose:
+            status = "OK" if result["ok"] else "FEHLER"
+            print(f"Spiel {result['game']}: {status} ({result['actions']} Aktionen, {result['actions_per_sec']} Aktionen/s)")
+            for error in result["errors"][:10]:
+                print(f"  - {error}")
+    print(json.dumps({k: v for k, v in summary.items() if k != "results"}, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+def _replay(logs, args) -> int:
+    if args.corrections:
+        logs = [inject_corrections(log, rate=args.corrections, seed=i) for i, log in enumerate(logs)]
+    logs = logs * args.repeat
+    with tempfile.TemporaryDirectory(prefix="volley_replay_") as work_dir:
+        summary = run_replays(logs, work_dir, workers=args.workers, processes=args.processes,
+                              in_memory=args.in_memory)
+    return _print_summary(summary, args.verbose)
+
+
+def cmd_export(args) -> int:
+    db_manager = DBManager(db_path=args.db)
+    game_ids = [g[0] for g in db_manager.get_all_games()] if args.all else args.game
+    if not game_ids:
+        print("Fehler: Keine Spiele angegeben (--game ID ... oder --all).")
+        return 2
+    os.makedirs(args.out, exist_ok=True)
+    for game_id in game_ids:
+        path = os.path.join(args.out, f"game_{game_id}.json")
+        save_log(export_game_log(db_manager, game_id), path)
+        print(f"Exportiert: {path}")
+    return 0
+
+
+def cmd_run(args) -> int:
+    return _replay([load_log(path) for path in args.logs], args)
+
+
+def cmd_selftest(args) -> int:
+    """Generiert eine Saison, exportiert alle Spiele und spielt sie wieder ein."""
+    with tempfile.TemporaryDirectory(prefix="volley_selftest_") as tmp:
+        db_path = os.path.join(tmp, "source.db")
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            build_benchmark_database(db_path, games=args.games, seed=args.seed, mode="controller")
+            db_manager = DBManager(db_path=db_path)
+            logs = [export_game_log(db_manager, g[0]) for g in db_manager.get_all_games()]
+    return _replay(logs, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spielt aufgezeichnete Spiele ohne GUI über den GameController ab.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = sub.add_parser("export", help="Spiele einer Datenbank als Aktions-Log exportieren")
+    export_parser.add_argument("--db", required=True, help="Quell-Datenbank")
+    export_parser.add_argument("--game", type=int, nargs="+", help="Game-IDs")
+    export_parser.add_argument("--all", action="store_true", help="Alle Spiele exportieren")
+    export_parser.add_argument("--out", required=True, help="Zielordner für die Logs")
+    export_parser.set_defaults(func=cmd_export)
+
+    run_parser = sub.add_parser("run", help="Logs einspielen und Endstände/Statistiken prüfen")
+    run_parser.add_argument("logs", nargs="+", help="Pfade der Aktions-Logs")
+    run_parser.set_defaults(func=cmd_run)
+
+    selftest_parser = sub.add_parser("selftest", help="Generierte Saison exportieren und wieder einspielen")
+    selftest_parser.add_argument("--games", type=int, default=20)
+    selftest_parser.add_argument("--seed", type=int, default=42)
+    selftest_parser.set_defaults(func=cmd_selftest)
+
+    for p in (run_parser, selftest_parser):
+        p.add_argument("--workers", type=int, default=4, help="Parallele Replays (je eigene Datenbank)")
+        p.add_argument("--processes", action="store_true", help="Prozesse statt Threads verwenden")
+        p.add_argument("--in-memory", action="store_true", help="Jedes Replay gegen eine In-Memory-Datenbank")
+        p.add_argument("--repeat", type=int, default=1, help="Jedes Log mehrfach einspielen (Last-Test)")
+        p.add_argument("--corrections", type=float, default=0.0,
+                       help="Anteil der Aktionen mit eingestreuter Korrektur (Bearbeiten/Löschen)")
+        p.add_argument("--verbose", action="store_true", help="Auch erfolgreiche Replays ausgeben")
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
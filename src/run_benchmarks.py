@@ -0,0 +1,86 @@
+# src/run_benchmarks.py
+# Benchmark-Suite auf einer generierten Saison (offline, ohne echte Datenbank).
+#
+# Beispiele (aus dem src-Ordner):
+#   python run_benchmarks.py run                       # Ergebnisse nach resources/benchmarks/results/
+#   python run_benchmarks.py run --save-baseline       # zusätzlich als Baseline speichern
+#   python run_benchmarks.py compare <ergebnis.json>   # gegen die Baseline prüfen (Exit-Code 1 bei Regression)
+
+import argparse
+import datetime
+import os
+import sys
+from modules.config import BENCHMARK_FOLDER, BENCHMARK_BASELINE_PATH, BENCHMARK_REGRESSION_THRESHOLD
+from modules.benchmarks.suite import BenchmarkSuite, compare_results, format_comparison, load_results, save_results
+
+
+def cmd_run(args) -> int:
+    suite = BenchmarkSuite(games=args.games, seed=args.seed, repeat=args.repeat)
+    results = suite.run(only=args.only)
+
+    output = args.output or os.path.join(
+        BENCHMARK_FOLDER, "results", f"bench_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    save_results(results, output)
+    for name, stats in results["benchmarks"].items():
+        if "skipped" in stats:
+            print(f"{name}: übersprungen ({stats['skipped']})")
+            continue
+        extra = "".join(f" ({value} {key[:-len('_per_sec')]}/s)" for key, value in stats.items() if key.endswith("_per_sec"))
+        print(f"{name}: median={stats['median_ms']}ms p95={stats['p95_ms']}ms{extra}")
+    print(f"Ergebnisse gespeichert in: {output}")
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Baseline aktualisiert: {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        return _report_comparison(results, args.baseline, args.threshold)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    if not os.path.exists(args.baseline):
+        print(f"Fehler: Keine Baseline unter {args.baseline} gefunden.")
+        return 2
+    return _report_comparison(load_results(args.results), args.baseline, args.threshold)
+
+
+def _report_comparison(results, baseline_path: str, threshold: float) -> int:
+    rows = compare_results(results, load_results(baseline_path), threshold=threshold)
+    print(format_comparison(rows))
+    regressions = [row["benchmark"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"REGRESSION: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks für Erfassung, Statistik und Export.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Benchmarks ausführen und Ergebnisse als JSON speichern")
+    run_parser.add_argument("--games", type=int, default=100, help="Größe der generierten Saison")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--repeat", type=int, default=20, help="Wiederholungen pro Benchmark")
+    run_parser.add_argument("--only", nargs="+", help="Nur diese Benchmarks ausführen")
+    run_parser.add_argument("--output", help="Pfad der Ergebnis-Datei")
+    run_parser.add_argument("--save-baseline", action="store_true", help="Ergebnis als neue Baseline speichern")
+    run_parser.set_defaults(func=cmd_run)
+
+    compare_parser = sub.add_parser("compare", help="Ergebnis-Datei mit der Baseline vergleichen")
+    compare_parser.add_argument("results", help="Pfad der Ergebnis-Datei")
+    compare_parser.set_defaults(func=cmd_compare)
+
+    for p in (run_parser, compare_parser):
+        p.add_argument("--baseline", default=BENCHMARK_BASELINE_PATH, help="Pfad der Baseline-Datei")
+        p.add_argument("--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+                       help="Erlaubte Verlangsamung des Medians (0.2 = 20 %%)")
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
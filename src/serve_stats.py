@@ -0,0 +1,56 @@
+# src/serve_stats.py
+# Stellt die Statistiken als nur lesende HTTP/JSON-API bereit, z.B. für Trainer-Handys im Hallen-WLAN
+# (siehe modules/logic/stats_api.py). Läuft unabhängig von der App; Erfassung und API teilen sich nur
+# die Datenbankdatei (WAL: Lesen blockiert das Schreiben nicht).
+#
+# Beispiele (aus dem src-Ordner):
+#   python serve_stats.py
+#   python serve_stats.py --port 8080 --verbose
+#   python serve_stats.py --db ../resources/db/zentrale.db --host 127.0.0.1
+#   curl -H 'Accept-Encoding: gzip' --compressed http://localhost:8766/api/games/12/players
+
+import argparse
+import os
+import sys
+from modules.config import ANALYTICS_DB_PROFILE, DB_PATH, STATS_API_HOST, STATS_API_PORT, STATS_API_WORKERS
+from modules.data.db_manager import DBManager
+from modules.logic.stats_api import StatsApiServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nur lesende HTTP/JSON-API für Spiel- und Spielerstatistiken.")
+    parser.add_argument("--db", default=DB_PATH, help="Pfad zur Datenbank")
+    parser.add_argument("--host", default=STATS_API_HOST, help="Adresse (127.0.0.1 = nur dieser Rechner)")
+    parser.add_argument("--port", type=int, default=STATS_API_PORT)
+    parser.add_argument("--workers", type=int, default=STATS_API_WORKERS, help="Worker-Threads")
+    parser.add_argument("--verbose", action="store_true", help="Jede Anfrage ausgeben")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Fehler: Datenbank '{args.db}' nicht gefunden.")
+        return 2
+    # Legt in älteren Datenbanken Revisionszähler und Trigger an (die API selbst liest nur)
+    schema_manager = DBManager(db_path=args.db)
+    schema_manager.setup_database()
+    schema_manager.close()
+    db_manager = DBManager(db_path=args.db, profile=ANALYTICS_DB_PROFILE)
+    try:
+        server = StatsApiServer(db_manager, host=args.host, port=args.port, workers=args.workers,
+                                verbose=args.verbose)
+    except OSError as e:
+        print(f"Fehler: Port {args.port} ist nicht verfügbar: {e}")
+        db_manager.close()
+        return 1
+    print(f"Stats-API unter {server.url}/api/games (Strg+C beendet).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        db_manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# src/share_games.py
+# Tauscht einzelne Spiele als kompakte Pakete (.vgp) mit anderen Vereinen aus,
+# statt die ganze stats.db zu verschicken (siehe modules/data/game_package.py).
+#
+# Beispiele (aus dem src-Ordner):
+#   python share_games.py export --game 12
+#   python share_games.py export --all --out-dir ../resources/packages/liga
+#   python share_games.py import ../resources/packages/liga/*.vgp
+#   python share_games.py import gegner_spiel.vgp --dry-run
+
+import argparse
+import json
+import os
+import sys
+from modules.config import DB_PATH, PACKAGE_FOLDER
+from modules.data.db_manager import DBManager
+from modules.data.game_package import PACKAGE_EXTENSION, export_game_package, import_game_packages
+
+
+def _export(db_manager: DBManager, args) -> int:
+    games = db_manager.execute_query_fetch_all("SELECT game_id, date_time FROM games ORDER BY game_id")
+    if not args.all:
+        wanted = set(args.game or [])
+        missing = wanted - {game_id for game_id, _ in games}
+        if missing:
+            print(f"Fehler: Spiel(e) {', '.join(map(str, sorted(missing)))} nicht gefunden.")
+            return 2
+        games = [game for game in games if game[0] in wanted]
+    if not games:
+        print("Fehler: Keine Spiele ausgewählt (--game ID oder --all).")
+        return 2
+
+    results = []
+    for game_id, date_time in games:
+        path = os.path.join(args.out_dir, f"spiel_{game_id}_{str(date_time)[:10]}{PACKAGE_EXTENSION}")
+        try:
+            results.append(export_game_package(db_manager, game_id, path))
+        except (ValueError, OSError) as e:
+            print(f"Fehler beim Export von Spiel {game_id}: {e}")
+            return 1
+    print(json.dumps({'packages': len(results), 'actions': sum(r['actions'] for r in results),
+                      'bytes': sum(r['bytes'] for r in results), 'out_dir': args.out_dir}, indent=2))
+    return 0
+
+
+def _import(db_manager: DBManager, args) -> int:
+    summary = import_game_packages(db_manager, args.files, dry_run=args.dry_run)
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 1 if summary['errors'] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export/Import einzelner Spiele als Paket.")
+    parser.add_argument("--db", default=DB_PATH, help="Pfad zur Datenbank")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", help="Spiele als Pakete exportieren")
+    export_parser.add_argument("--game", type=int, action="append", help="Spiel-ID (mehrfach angebbar)")
+    export_parser.add_argument("--all", action="store_true", help="Alle Spiele exportieren")
+    export_parser.add_argument("--out-dir", default=PACKAGE_FOLDER, help="Zielordner der Pakete")
+
+    import_parser = commands.add_parser("import", help="Pakete importieren (bereits importierte werden übersprungen)")
+    import_parser.add_argument("files", nargs="+", help=f"Paketdateien ({PACKAGE_EXTENSION})")
+    import_parser.add_argument("--dry-run", action="store_true", help="Nur prüfen, nichts speichern")
+    args = parser.parse_args()
+
+    if args.command == "export" and not os.path.exists(args.db):
+        print(f"Fehler: Datenbank '{args.db}' nicht gefunden.")
+        return 2
+    db_manager = DBManager(db_path=args.db)
+    db_manager.setup_database() # Legt u.a. imported_packages in älteren Datenbanken an
+    try:
+        return _export(db_manager, args) if args.command == "export" else _import(db_manager, args)
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+# src/sync_devices.py
+# Gleicht mehrere Erfassungsgeräte mit einer zentralen Datenbank ab: jedes Gerät sendet nur die
+# Spiele, Sätze und Aktionen, die sich seit dem letzten Abgleich geändert haben (siehe modules/data/sync.py).
+#
+# Beispiele (aus dem src-Ordner):
+#   python sync_devices.py --db ../resources/db/zentrale.db serve --port 8765
+#   python sync_devices.py push --url http://192.168.0.10:8765/sync
+#   python sync_devices.py merge --into ../resources/db/zentrale.db
+#   python sync_devices.py status
+
+import argparse
+import json
+import os
+import sys
+from modules.config import DB_PATH, SYNC_CONFLICT_POLICY, SYNC_HOST, SYNC_PORT
+from modules.data.db_manager import DBManager
+from modules.data.sync import DEFAULT_PEER, DeltaSync, HttpTransport, LocalTransport, SyncServer
+
+
+def _open(db_path: str) -> DBManager:
+    db_manager = DBManager(db_path=db_path)
+    db_manager.setup_database()
+    return db_manager
+
+
+def _serve(db_manager: DBManager, args) -> int:
+    server = SyncServer(db_manager, host=args.host, port=args.port, policy=args.policy, verbose=True)
+    print(f"Zentrale wartet auf Geräte unter {server.url} (Strg+C beendet).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _push(sync: DeltaSync, transport, peer_id: str) -> int:
+    try:
+        result = sync.push(transport, peer_id=peer_id)
+    except RuntimeError as e:
+        print(f"Fehler: {e}")
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Abgleich von Erfassungsgeräten mit einer zentralen Datenbank.")
+    parser.add_argument("--db", default=DB_PATH, help="Pfad zur Datenbank (Gerät bzw. Zentrale bei serve)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Diese Datenbank als Zentrale bereitstellen")
+    serve_parser.add_argument("--host", default=SYNC_HOST, help="Adresse (0.0.0.0 = im ganzen Netzwerk erreichbar)")
+    serve_parser.add_argument("--port", type=int, default=SYNC_PORT)
+    serve_parser.add_argument("--policy", choices=['newest', 'central', 'device'], default=SYNC_CONFLICT_POLICY,
+                              help="Regel bei Änderungen auf beiden Seiten")
+
+    push_parser = commands.add_parser("push", help="Änderungen per HTTP an die Zentrale senden")
+    push_parser.add_argument("--url", required=True, help="Adresse der Zentrale, z.B. http://host:8765/sync")
+    push_parser.add_argument("--peer", default=DEFAULT_PEER, help="Name der Zentrale (eigener Stand je Name)")
+
+    merge_parser = commands.add_parser("merge", help="Änderungen direkt in eine zentrale Datenbankdatei einspielen")
+    merge_parser.add_argument("--into", required=True, help="Pfad der zentralen Datenbank")
+    merge_parser.add_argument("--peer", default=None, help="Name der Zentrale (Standard: Pfad der Datei)")
+    merge_parser.add_argument("--policy", choices=['newest', 'central', 'device'], default=SYNC_CONFLICT_POLICY)
+
+    commands.add_parser("status", help="Device-ID, offene Änderungen, Geräte und Konflikte anzeigen")
+    args = parser.parse_args()
+
+    if args.command != "serve" and not os.path.exists(args.db):
+        print(f"Fehler: Datenbank '{args.db}' nicht gefunden.")
+        return 2
+    if args.command == "merge" and os.path.abspath(args.into) == os.path.abspath(args.db):
+        print("Fehler: Gerät und Zentrale sind dieselbe Datei.")
+        return 2
+
+    db_manager = _open(args.db)
+    sync = DeltaSync(db_manager)
+    sync.enable()
+    try:
+        if args.command == "serve":
+            return _serve(db_manager, args)
+        if args.command == "push":
+            return _push(sync, HttpTransport(args.url), args.peer)
+        if args.command == "merge":
+            central = _open(args.into)
+            try:
+                return _push(sync, LocalTransport(central, policy=args.policy),
+                             args.peer or os.path.abspath(args.into))
+            finally:
+                central.close()
+        print(json.dumps(sync.status(), indent=2))
+        return 0
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+# src/tests/conftest.py
+# Tests aus dem src-Ordner:  python -m pytest -q tests
+
+import os
+import sys
+
+# Wie bei den Skripten in src: 'modules' muss importierbar sein
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
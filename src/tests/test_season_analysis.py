@@ -0,0 +1,57 @@
+# src/tests/test_season_analysis.py
+
+import contextlib
+import io
+import tracemalloc
+
+import pytest
+
+from modules.data.db_manager import DBManager
+from modules.logic.season_generator import SeasonGenerator
+from modules.logic.statistic_calculator import StatisticCalculator
+
+CHUNK_ROWS = 500
+GAMES = 8
+
+
+@pytest.fixture
+def season_calculator():
+    """Baut eine generierte Saison mit n Spielen (temporäre Datei, wird danach gelöscht)."""
+    databases = []
+
+    def build(games: int) -> StatisticCalculator:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db = DBManager.temp_file()
+            databases.append(db)
+            SeasonGenerator(db, seed=7).generate_games(games)
+        return StatisticCalculator(db)
+
+    yield build
+    for db in databases:
+        db.dispose()
+
+
+def _peak_bytes(calculator: StatisticCalculator) -> int:
+    # Erster Aufruf außerhalb der Messung: Importe, Lookup-Caches, Verbindungen
+    calculator.calculate_season_stats(chunk_rows=CHUNK_ROWS)
+    tracemalloc.start()
+    try:
+        result = calculator.calculate_season_stats(chunk_rows=CHUNK_ROWS)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert result['chunks'] > 1
+    return peak
+
+
+def test_season_stats_peak_memory_is_flat(season_calculator):
+    """Doppelt so viele Spiele bei gleicher Blockgröße: der Speicher-Peak darf nicht mitwachsen."""
+    small = season_calculator(GAMES)
+    large = season_calculator(2 * GAMES)
+    rows_small = small.db_manager.execute_query_fetch_one("SELECT COUNT(*) FROM actions")[0]
+    rows_large = large.db_manager.execute_query_fetch_one("SELECT COUNT(*) FROM actions")[0]
+    assert rows_large >= 1.8 * rows_small
+
+    peak_small = _peak_bytes(small)
+    peak_large = _peak_bytes(large)
+    assert peak_large / peak_small <= 1.25, (peak_small, peak_large)